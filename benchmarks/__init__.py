@@ -0,0 +1,6 @@
+"""
+Benchmark suite, see README.md
+
+Is a regular package (rather than a directory of scripts, like testx) so that it
+takes precedence over any installed top-level "benchmarks" package (pysbd ships one).
+"""
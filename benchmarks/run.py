@@ -0,0 +1,357 @@
+"""
+Benchmarks the non-model parts of the app (generation loop, validation, alignment,
+project load/save, sound segment catalog, concatenation) on synthetic projects,
+using stub TTS and STT models. CPU-only, no network.
+
+Prints results as JSON (or writes them to --out), one record per benchmark per project size.
+
+    python -m benchmarks.run [--sizes 1000,10000,50000] [--only generate,concat] [--out results.json]
+
+Concatenation requires ffmpeg.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import patch
+
+from watchdog.events import FileModifiedEvent
+
+from benchmarks import synthetic
+from benchmarks.stubs import LEAD_SECONDS, StubStt, StubTtsModel, stub_backends
+from tts_audiobook_tool import ask
+from tts_audiobook_tool.app_types import SttVariant
+from tts_audiobook_tool.concat_util import ConcatUtil
+from tts_audiobook_tool.enhance import enhance_alignment
+from tts_audiobook_tool.generate_util import GenerateUtil
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.prefs import Prefs
+from tts_audiobook_tool.project import Project
+from tts_audiobook_tool.project_support.project_load_util import ProjectLoadUtil
+from tts_audiobook_tool.project_support.sound_segment_util import SoundSegmentUtil
+from tts_audiobook_tool.state import State
+from tts_audiobook_tool.text_ops.whitelist import Whitelist
+from tts_audiobook_tool.validator import Validator
+
+
+class Context:
+    """ Per-project-size state shared by the benchmarks """
+
+    def __init__(self, args: argparse.Namespace, num_lines: int, dir_path: str, tts: StubTtsModel, stt: StubStt) -> None:
+        self.args = args
+        self.num_lines = num_lines
+        self.dir_path = dir_path
+        self.tts = tts
+        self.stt = stt
+        self.project: Project | None = None
+        self.did_generate = False
+
+    def get_project(self) -> Project:
+        if self.project is None:
+            self.project = synthetic.make_project(self.dir_path, self.num_lines, self.args.seed)
+        return self.project
+
+    def make_state(self) -> State:
+        prefs = Prefs(
+            stt_variant=SttVariant.get_default(),
+            save_debug_files=False,
+            pipelined_generation=not self.args.no_pipeline,
+            export_workers=1,
+            voice_clone_disk_cache=False,
+        )
+        return State(prefs=prefs, project=self.get_project())
+
+    def ensure_generated(self) -> None:
+        """ Generates all lines (if not already done), for benchmarks that need sound segments """
+        if not self.did_generate:
+            bench_generate(self)
+
+    def kill(self) -> None:
+        if self.project is not None:
+            self.project.kill()
+            self.project = None
+
+
+def bench_project_save(ctx: Context) -> dict:
+    ctx.kill()
+    shutil.rmtree(ctx.dir_path, ignore_errors=True)
+    ctx.did_generate = False
+
+    start_time = time.perf_counter()
+    project = ctx.get_project()
+    make_elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    err = project.save()
+    save_elapsed = time.perf_counter() - start_time
+    if err:
+        raise RuntimeError(err)
+
+    return make_record("project_save", ctx, save_elapsed, ctx.num_lines, set_text_seconds=round(make_elapsed, 6))
+
+
+def bench_project_load(ctx: Context) -> dict:
+    ctx.get_project()
+    start_time = time.perf_counter()
+    result = ProjectLoadUtil.load_using_dir_path(ctx.dir_path)
+    elapsed = time.perf_counter() - start_time
+    if isinstance(result, str):
+        raise RuntimeError(result)
+    result.kill()
+    return make_record("project_load", ctx, elapsed, ctx.num_lines)
+
+
+def bench_generate(ctx: Context) -> dict:
+    project = ctx.get_project()
+    project.sound_segments.delete_all()
+    state = ctx.make_state()
+    # Keeps the stub STT's fingerprinting out of the timed section
+    ctx.tts.add_fingerprints([
+        ctx.tts.prepare_text_for_inference(project, GenerateUtil.phrase_group_to_prompt(phrase_group, project))
+        for phrase_group in project.phrase_groups
+    ])
+
+    start_time = time.perf_counter()
+    did_interrupt = GenerateUtil.generate_files(
+        state, set(range(ctx.num_lines)), batch_size=ctx.args.batch_size, is_regen=False
+    )
+    elapsed = time.perf_counter() - start_time
+    if did_interrupt:
+        raise RuntimeError("Generation was interrupted")
+    ctx.did_generate = True
+
+    num_generated = project.sound_segments.num_generated()
+    num_failed = len(project.sound_segments.get_failed_indices_in_generate_range())
+    return make_record(
+        "generate", ctx, elapsed, ctx.num_lines,
+        num_generated=num_generated, num_failed=num_failed,
+        rtf=ctx.args.rtf, batch_size=ctx.args.batch_size, pipelined=not ctx.args.no_pipeline
+    )
+
+
+def bench_catalog_scan(ctx: Context) -> dict:
+    ctx.ensure_generated()
+    project = ctx.get_project()
+    sound_segments = project.sound_segments
+    paths = sorted(str(path) for path in Path(project.sound_segments_path).glob("*.flac"))
+
+    # Full rescan (segment hashes are memoized after the first one)
+    sound_segments.force_invalidate()
+    start_time = time.perf_counter()
+    full_map = sound_segments.sound_segments_map
+    elapsed = time.perf_counter() - start_time
+    if len(full_map) != sound_segments.num_generated():
+        raise RuntimeError("Catalog mismatch")
+
+    # Incremental update after file events for 1% of the files
+    changed_paths = paths[::CATALOG_UPDATE_STRIDE]
+    for path in changed_paths:
+        sound_segments.on_dir_contents_change(FileModifiedEvent(path))
+    start_time = time.perf_counter()
+    _ = sound_segments.sound_segments_map
+    update_elapsed = time.perf_counter() - start_time
+
+    # Uncached scan
+    start_time = time.perf_counter()
+    SoundSegmentUtil.make_sound_segments_map(project)
+    uncached_elapsed = time.perf_counter() - start_time
+
+    return make_record(
+        "catalog_scan", ctx, elapsed, len(paths),
+        update_seconds=round(update_elapsed, 6), num_updated=len(changed_paths),
+        uncached_seconds=round(uncached_elapsed, 6)
+    )
+
+
+def bench_validate(ctx: Context) -> dict:
+    project = ctx.get_project()
+    Whitelist().set_language_code(project.language_code)
+    elapsed = 0.0
+    num_failed = 0
+    for phrase_group in project.phrase_groups:
+        text = phrase_group.as_flattened_phrase().text
+        sound = ctx.tts.synthesize(text)
+        words = ctx.stt.make_words(text, LEAD_SECONDS, sound.duration - LEAD_SECONDS)
+        start_time = time.perf_counter()
+        result = Validator.validate(sound, text, words, project.language_code, strictness=project.strictness)
+        elapsed += time.perf_counter() - start_time
+        num_failed += int(result.is_fail)
+    return make_record("validate", ctx, elapsed, ctx.num_lines, num_failed=num_failed)
+
+
+def bench_align(ctx: Context) -> dict:
+    project = ctx.get_project()
+    phrases = [phrase for phrase_group in project.phrase_groups for phrase in phrase_group.phrases]
+    words = []
+    t = 0.0
+    for phrase in phrases:
+        duration = len(phrase.text.split()) * ctx.tts.seconds_per_word
+        words.extend(ctx.stt.make_words(phrase.text, t, t + duration))
+        t += duration + LEAD_SECONDS * 2
+
+    with patch.object(enhance_alignment, "DEBUG", False):
+        start_time = time.perf_counter()
+        timed_phrases, _, _ = enhance_alignment.align_phrases_with_state(phrases, words, print_info=False)
+        elapsed = time.perf_counter() - start_time
+
+    num_matched = sum(1 for item in timed_phrases if item.time_end > 0)
+    return make_record(
+        "align", ctx, elapsed, len(phrases),
+        num_transcript_words=len(words), num_matched=num_matched
+    )
+
+
+def bench_concat(ctx: Context) -> dict:
+    ctx.ensure_generated()
+    project = ctx.get_project()
+    state = ctx.make_state()
+
+    def ask_error(message: str = "", *args, **kwargs) -> None:
+        raise RuntimeError(message)
+
+    with patch.object(ask, "ask_hotkey", return_value=""), \
+            patch.object(ask, "ask_error", side_effect=ask_error), \
+            patch("tts_audiobook_tool.concat_util.app_support.play_done_sound"), \
+            patch("tts_audiobook_tool.concat_util.app_hint_util.show_player_hint"), \
+            patch("tts_audiobook_tool.concat_util.get_chromium_info", return_value=None):
+        start_time = time.perf_counter()
+        ConcatUtil.make_files(state, [], [])
+        elapsed = time.perf_counter() - start_time
+
+    output_paths = [path for path in Path(project.concat_path).rglob("*.abr.*")]
+    if not output_paths:
+        raise RuntimeError("No output file")
+    return make_record(
+        "concat", ctx, elapsed, project.sound_segments.num_generated(),
+        export_type=project.export_type.id, output_bytes=sum(path.stat().st_size for path in output_paths)
+    )
+
+
+def make_record(name: str, ctx: Context, elapsed: float, num_items: int, **extras: Any) -> dict:
+    return {
+        "benchmark": name,
+        "lines": ctx.num_lines,
+        "seconds": round(elapsed, 6),
+        "items": num_items,
+        "items_per_second": round(num_items / elapsed, 3) if elapsed > 0 else None,
+        **extras,
+    }
+
+
+def make_meta(args: argparse.Namespace) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": {key: value for key, value in vars(args).items() if key != "out"},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the app's non-model processing using stub TTS/STT models")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="Comma-separated project sizes, in lines")
+    parser.add_argument("--only", default="", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--out", default="", help="JSON output file path (default: stdout)")
+    parser.add_argument("--rtf", type=float, default=0.0, help="Stub TTS seconds per second of audio (default: 0, no delay)")
+    parser.add_argument("--seconds-per-word", type=float, default=0.0, help="Stub TTS speech rate")
+    parser.add_argument("--word-error-rate", type=float, default=DEFAULT_WORD_ERROR_RATE, help="Stub STT word error rate")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--no-pipeline", action="store_true", help="Disable pipelined generation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default="", help="Where to make the projects (default: temp dir, deleted afterwards)")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's console output")
+    args = parser.parse_args()
+
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    names = [item.strip() for item in args.only.split(",") if item.strip()] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark: {', '.join(unknown)}")
+
+    L.init("tts_audiobook_tool_benchmarks")
+
+    tts = StubTtsModel(rtf=args.rtf, seconds_per_word=args.seconds_per_word)
+    stt = StubStt(tts, word_error_rate=args.word_error_rate, seed=args.seed)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="tts_audiobook_tool_benchmarks_")
+    results = []
+    try:
+        for size in sizes:
+            ctx = Context(args, size, os.path.join(work_dir, f"project_{size}"), tts, stt)
+            try:
+                for name in BENCHMARKS:
+                    if name not in names:
+                        continue
+                    print(f"{name} ({size} lines)...", file=sys.stderr, flush=True)
+                    with stub_backends(tts, stt), quiet(not args.verbose):
+                        record = BENCHMARKS[name](ctx)
+                    print(f"    {record['seconds']:.3f}s", file=sys.stderr, flush=True)
+                    results.append(record)
+            finally:
+                ctx.kill()
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps({"meta": make_meta(args), "results": results}, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool):
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+# ---
+
+# Run in this order
+BENCHMARKS: dict[str, Callable[[Context], dict]] = {
+    "project_save": bench_project_save,
+    "project_load": bench_project_load,
+    "validate": bench_validate,
+    "align": bench_align,
+    "generate": bench_generate,
+    "catalog_scan": bench_catalog_scan,
+    "concat": bench_concat,
+}
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000]
+
+DEFAULT_BATCH_SIZE = 8
+
+DEFAULT_WORD_ERROR_RATE = 0.02
+
+# Every nth sound segment file gets a file event in the incremental catalog update
+CATALOG_UPDATE_STRIDE = 100
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Deterministic stand-ins for the TTS and STT models, for benchmarking the non-model
+parts of the app CPU-only and offline.
+
+`StubTtsModel` synthesizes one short tone per word (with seeded noise, and brief gaps
+between words so that silence trimming etc has something to work on), optionally
+sleeping to simulate a given real-time factor. It keeps a spectral fingerprint
+of the tones of every text it's given, which can be made ahead of time
+(see `StubTtsModel.add_fingerprints()`), so as to stay out of timed sections.
+
+`StubStt` is a whisper backend which "transcribes" a sound by looking up the text whose
+fingerprint is closest to the sound's, and spreading that text's words over the sound's
+duration, with a seeded word error rate (varying with the exact audio), so that
+validation failures and retries get exercised.
+
+`stub_backends()` installs both (see `Tts._install_model()` and `Stt._install_backend()`).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+import zlib
+from typing import Any, Iterator
+
+import numpy as np
+
+from tts_audiobook_tool.app_types import ConcreteSegment, ConcreteWord, Sound, StreamChunkCallback, StreamEndCallback, Word
+from tts_audiobook_tool.constants import WHISPER_SAMPLERATE
+from tts_audiobook_tool.stt import Stt
+from tts_audiobook_tool.tts import Tts
+from tts_audiobook_tool.tts_models.tts_base_model import TtsBaseModel
+from tts_audiobook_tool.tts_models.tts_model_type import TtsModelType
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from tts_audiobook_tool.project import Project
+else:
+    Project = object
+
+
+class StubTtsModel(TtsBaseModel):
+    """
+    Presents as VibeVoice (a local model which can batch and doesn't require a voice sample),
+    so generated files are tagged as such.
+    """
+
+    INFO = TtsModelType.VIBEVOICE.value
+
+    def __init__(self, rtf: float = 0.0, seconds_per_word: float = 0.0) -> None:
+        """
+        :param rtf: Seconds spent per second of generated audio (0 = as fast as possible)
+        """
+        self.rtf = rtf
+        self.seconds_per_word = seconds_per_word or SECONDS_PER_WORD
+        self._num_random_seeds = 0
+        self._lock = threading.Lock()
+        self._texts: list[str] = []
+        self._text_set: set[str] = set()
+        self._fingerprints = np.zeros((0, len(FINGERPRINT_BAND_EDGES) - 1), dtype=np.float32)
+
+    def kill(self) -> None:
+        ...
+
+    def generate_using_project(
+            self,
+            project: Project,
+            prompts: list[str],
+            force_random_seed: bool=False,
+            on_stream_chunk: StreamChunkCallback | None = None,
+            on_stream_end: StreamEndCallback | None = None,
+            voice_selection_index: int = 0,
+    ) -> list[Sound | str] | str:
+        start_time = time.perf_counter()
+        sounds: list[Sound | str] = [
+            self.synthesize(prompt, random_seed=force_random_seed) for prompt in prompts
+        ]
+        if self.rtf > 0:
+            duration = sum(sound.duration for sound in sounds if isinstance(sound, Sound))
+            remaining = duration * self.rtf - (time.perf_counter() - start_time)
+            if remaining > 0:
+                time.sleep(remaining)
+        if on_stream_chunk:
+            for sound in sounds:
+                if isinstance(sound, Sound):
+                    on_stream_chunk(sound.data)
+        if on_stream_end:
+            on_stream_end()
+        return sounds
+
+    def synthesize(self, text: str, random_seed: bool = False) -> Sound:
+        """
+        Same text gives the same sound, unless `random_seed`, in which case the noise
+        varies from call to call (but the sequence of sounds is still reproducible).
+        The tones only depend on the text.
+        """
+        variant = 0
+        if random_seed:
+            with self._lock:
+                self._num_random_seeds += 1
+                variant = self._num_random_seeds
+        data = self.make_tones(text)
+        rng = np.random.default_rng([zlib.crc32(text.encode("utf-8")), variant])
+        data += rng.normal(0.0, NOISE_LEVEL, len(data)).astype(np.float32)
+        self._add_fingerprint(text, data)
+        return Sound(data, self.INFO.sample_rate)
+
+    def make_tones(self, text: str) -> np.ndarray:
+        """ Returns the noiseless sound data for `text`, at the model's sample rate """
+        rng = np.random.default_rng([zlib.crc32(text.encode("utf-8"))])
+        sr = self.INFO.sample_rate
+
+        num_word_samples = int(self.seconds_per_word * 0.8 * sr)
+        num_gap_samples = int(self.seconds_per_word * 0.2 * sr)
+        num_words = max(1, len(text.split()))
+        t = np.arange(num_word_samples, dtype=np.float32) / sr
+        envelope = np.sin(np.pi * t / max(t[-1], 1e-6)).astype(np.float32) if len(t) else t
+
+        parts = [np.zeros(int(LEAD_SECONDS * sr), dtype=np.float32)]
+        for _ in range(num_words):
+            frequency = rng.uniform(MIN_FREQUENCY, MAX_FREQUENCY)
+            tone = np.sin(2 * np.pi * frequency * t) * envelope * 0.5
+            parts.append(tone.astype(np.float32))
+            parts.append(np.zeros(num_gap_samples, dtype=np.float32))
+        parts.append(np.zeros(int(LEAD_SECONDS * sr), dtype=np.float32))
+
+        return np.concatenate(parts)
+
+    def add_fingerprints(self, texts: list[str]) -> None:
+        """
+        Fingerprints the sounds of `texts` (as passed to `generate_using_project()`)
+        ahead of time, so that synthesizing them doesn't have to
+        """
+        for text in texts:
+            if text not in self._text_set:
+                self._add_fingerprint(text, self.make_tones(text))
+
+    def recognize(self, data: np.ndarray, sr: int) -> str | None:
+        """
+        Returns the text whose fingerprint is closest to that of `data` (which may have
+        been resampled, trimmed etc), or None if there's no close match.
+        """
+        fingerprint = make_fingerprint(data, sr)
+        with self._lock:
+            if not self._texts:
+                return None
+            similarities = self._fingerprints[:len(self._texts)] @ fingerprint
+            index = int(np.argmax(similarities))
+            if similarities[index] < MIN_FINGERPRINT_SIMILARITY:
+                return None
+            return self._texts[index]
+
+    def _add_fingerprint(self, text: str, data: np.ndarray) -> None:
+        with self._lock:
+            if text in self._text_set:
+                return
+        fingerprint = make_fingerprint(data, self.INFO.sample_rate)
+        with self._lock:
+            if text in self._text_set:
+                return
+            num_texts = len(self._texts)
+            if num_texts == len(self._fingerprints):
+                # Grow by doubling
+                grown = np.zeros((max(num_texts * 2, 256), self._fingerprints.shape[1]), dtype=np.float32)
+                grown[:num_texts] = self._fingerprints
+                self._fingerprints = grown
+            self._fingerprints[num_texts] = fingerprint
+            self._texts.append(text)
+            self._text_set.add(text)
+
+
+class StubStt:
+    """
+    Whisper backend (see `WhisperBackend`) for sounds made by `tts`.
+    Transcribes sounds it doesn't recognize as silence.
+    """
+
+    supports_clip_batching = True
+
+    def __init__(self, tts: StubTtsModel, word_error_rate: float = 0.0, seed: int = 0) -> None:
+        self.tts = tts
+        self.word_error_rate = word_error_rate
+        self.seed = seed
+
+    @property
+    def supported_languages(self) -> list[str]:
+        return ["en"]
+
+    def transcribe(
+        self,
+        audio: Any,
+        *,
+        word_timestamps: bool = False,
+        language: str | None = None,
+        **kwargs: Any,
+    ) -> tuple[Iterator[ConcreteSegment], None]:
+        return iter(self.transcribe_span(audio, 0, len(audio))), None
+
+    def transcribe_clips(
+        self,
+        audio: Any,
+        clip_timestamps: list[dict[str, float]],
+        *,
+        word_timestamps: bool = False,
+        language: str | None = None,
+    ) -> tuple[Iterator[ConcreteSegment], None]:
+        segments: list[ConcreteSegment] = []
+        for clip in clip_timestamps:
+            start = int(round(clip["start"] * WHISPER_SAMPLERATE))
+            end = int(round(clip["end"] * WHISPER_SAMPLERATE))
+            segments.extend(self.transcribe_span(audio, start, end))
+        return iter(segments), None
+
+    def transcribe_span(self, audio: np.ndarray, start: int, end: int) -> list[ConcreteSegment]:
+        """ Transcribes samples `start` to `end` of whisper-samplerate `audio` """
+        clip = audio[start:end]
+        text = self.tts.recognize(clip, WHISPER_SAMPLERATE)
+        if text is None:
+            return []
+        # Same sound, same errors (regenerated sounds have different noise)
+        variant = zlib.crc32(np.ascontiguousarray(clip).tobytes())
+        start_time = start / WHISPER_SAMPLERATE
+        end_time = end / WHISPER_SAMPLERATE
+        words = self.make_words(text, start_time, end_time, variant=variant)
+        if not words:
+            return []
+        return [ConcreteSegment(start_time, end_time, "".join(word.word for word in words), words)]
+
+    def make_words(self, text: str, start: float, end: float, variant: int = 0) -> list[Word]:
+        """
+        Returns the words of `text` spread evenly between `start` and `end`,
+        with some of them dropped or misspelled at the configured word error rate.
+
+        :param variant: Varies which words get errors (eg, so that regenerated audio can pass)
+        """
+        rng = np.random.default_rng([self.seed, zlib.crc32(text.encode("utf-8")), variant])
+        source_words = text.split()
+        if not source_words:
+            return []
+        step = (end - start) / len(source_words)
+        words: list[Word] = []
+        for i, source_word in enumerate(source_words):
+            if self.word_error_rate > 0 and rng.random() < self.word_error_rate:
+                if rng.random() < 0.5:
+                    continue
+                source_word = source_word[::-1] + "x"
+            word_start = start + i * step
+            words.append(ConcreteWord(word_start, word_start + step * 0.8, " " + source_word, 0.9))
+        return words
+
+
+def make_fingerprint(data: np.ndarray, sr: int) -> np.ndarray:
+    """ Returns the unit-length vector of the energy of `data` per narrow frequency band """
+    # Decimate (without filtering, which only lets some of the noise alias) to speed up the FFT
+    step = max(sr // FINGERPRINT_SAMPLE_RATE, 1)
+    data = data[::step]
+    n = 1 << max(len(data) - 1, 1).bit_length()
+    frequencies = np.fft.rfftfreq(n, step / sr)
+    lo, hi = np.searchsorted(frequencies, [FINGERPRINT_BAND_EDGES[0], FINGERPRINT_BAND_EDGES[-1]])
+    power = np.abs(np.fft.rfft(data, n)[lo:hi]) ** 2
+    bands, _ = np.histogram(frequencies[lo:hi], bins=FINGERPRINT_BAND_EDGES, weights=power)
+    norm = np.linalg.norm(bands)
+    if norm > 0:
+        bands = bands / norm
+    return bands.astype(np.float32)
+
+
+@contextlib.contextmanager
+def stub_backends(tts: StubTtsModel, stt: StubStt) -> Iterator[None]:
+    """ Installs the stub TTS model and STT backend as the app's active ones """
+    Tts._install_model(tts)
+    Stt._install_backend(stt)
+    try:
+        yield
+    finally:
+        Stt._install_backend(None)
+        Tts._install_model(None)
+
+# ---
+
+SECONDS_PER_WORD = 0.1
+
+# Range of the per-word tone frequencies
+MIN_FREQUENCY = 120.0
+MAX_FREQUENCY = 320.0
+
+# Silence at start and end of each generated sound
+LEAD_SECONDS = 0.15
+
+NOISE_LEVEL = 0.002
+
+# 2 Hz bands spanning the tone frequencies (with margin for the tones' spectral spread)
+FINGERPRINT_BAND_EDGES = np.arange(MIN_FREQUENCY - 20.0, MAX_FREQUENCY + 20.0 + 1.0, 2.0)
+
+FINGERPRINT_SAMPLE_RATE = 2000
+
+# Cosine similarity below which a sound is considered unrecognized
+MIN_FINGERPRINT_SIMILARITY = 0.8
+
+
@@ -0,0 +1,79 @@
+"""
+Reproducible synthetic book text and projects.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+
+from tts_audiobook_tool.app_types import SegmentationStrategy
+from tts_audiobook_tool.app_types.phrase import Phrase, PhraseGroup, Reason
+from tts_audiobook_tool.constants import PROJECT_CONCAT_SUBDIR, PROJECT_SOUND_SEGMENTS_SUBDIR
+from tts_audiobook_tool.project import Project
+from tts_audiobook_tool.project_support.project_text_io_util import ProjectTextIOUtil
+
+
+def make_phrase_groups(num_lines: int, seed: int = 0) -> list[PhraseGroup]:
+    """
+    Returns `num_lines` phrase groups of one to three sentences each,
+    with a paragraph break every few lines and a space break now and then.
+    """
+    rng = random.Random(seed)
+    phrase_groups: list[PhraseGroup] = []
+    for line_index in range(num_lines):
+        phrases: list[Phrase] = []
+        for _ in range(rng.randint(1, 3)):
+            words = [rng.choice(VOCABULARY) for _ in range(rng.randint(3, 14))]
+            text = " ".join(words).capitalize() + rng.choice([".", ".", ".", "!", "?"])
+            phrases.append(Phrase(text + " ", Reason.SENTENCE))
+        if line_index % LINES_PER_SPACE_BREAK == LINES_PER_SPACE_BREAK - 1:
+            phrases[-1].reason = Reason.SPACE_BREAK
+        elif rng.random() < PARAGRAPH_BREAK_CHANCE:
+            phrases[-1].reason = Reason.PARAGRAPH
+        phrase_groups.append(PhraseGroup(phrases))
+    return phrase_groups
+
+
+def make_project(dir_path: str, num_lines: int, seed: int = 0) -> Project:
+    """
+    Makes and saves a new project in empty-or-nonexistent `dir_path`, with synthetic text.
+    Caller should `kill()` the project when done with it.
+    """
+    os.makedirs(os.path.join(dir_path, PROJECT_SOUND_SEGMENTS_SUBDIR), exist_ok=True)
+    os.makedirs(os.path.join(dir_path, PROJECT_CONCAT_SUBDIR), exist_ok=True)
+    project = Project(dir_path=dir_path)
+    set_text(project, num_lines, seed)
+    return project
+
+
+def set_text(project: Project, num_lines: int, seed: int = 0) -> None:
+    """ Replaces the project's text with synthetic text, and saves """
+    phrase_groups = make_phrase_groups(num_lines, seed)
+    raw_text = "\n".join(phrase_group.text for phrase_group in phrase_groups)
+    ProjectTextIOUtil.set_phrase_groups_and_save(
+        project,
+        phrase_groups,
+        strategy=SegmentationStrategy.SENTENCE,
+        max_words=MAX_WORDS,
+        language_code="en",
+        raw_text=raw_text,
+        title=f"Synthetic book ({num_lines} lines)",
+    )
+
+# ---
+
+MAX_WORDS = 40
+
+LINES_PER_SPACE_BREAK = 250
+
+PARAGRAPH_BREAK_CHANCE = 0.2
+
+VOCABULARY = [
+    "the", "a", "and", "of", "to", "in", "he", "she", "said", "was", "it", "that", "his", "her",
+    "house", "river", "morning", "letter", "window", "captain", "garden", "silence", "stranger",
+    "quickly", "never", "always", "remembered", "walked", "across", "beneath", "thousand",
+    "winter", "lantern", "station", "village", "whisper", "promise", "carriage", "harbour",
+    "evening", "mountain", "forest", "kitchen", "doctor", "brother", "sister", "answered",
+    "slowly", "suddenly", "through", "against", "without", "between", "another", "nothing",
+]
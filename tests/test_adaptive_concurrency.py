@@ -0,0 +1,63 @@
+import threading
+import time
+
+from tts_audiobook_tool.app_support.adaptive_concurrency import AdaptiveConcurrency
+
+
+def test_starts_at_max_and_decreases_once_per_round():
+    concurrency = AdaptiveConcurrency(8)
+    assert concurrency.limit == 8
+
+    tickets = [concurrency.acquire() for _ in range(8)]
+    for ticket in tickets:
+        concurrency.release(ticket, is_overloaded=True)
+    # All eight were in flight before the first failure, so only one halving
+    assert concurrency.limit == 4
+
+    ticket = concurrency.acquire()
+    concurrency.release(ticket, is_overloaded=True)
+    assert concurrency.limit == 2
+
+    for _ in range(5):
+        ticket = concurrency.acquire()
+        concurrency.release(ticket, is_overloaded=True)
+    assert concurrency.limit == 1
+
+
+def test_additive_increase_up_to_max():
+    concurrency = AdaptiveConcurrency(4)
+    concurrency.release(concurrency.acquire(), is_overloaded=True)
+    concurrency.release(concurrency.acquire(), is_overloaded=True)
+    assert concurrency.limit == 1
+
+    for _ in range(100):
+        concurrency.release(concurrency.acquire(), elapsed=1.0, audio_duration=1.0)
+    assert concurrency.limit == 4
+
+
+def test_slow_requests_count_as_overload():
+    concurrency = AdaptiveConcurrency(8)
+    concurrency.release(concurrency.acquire(), elapsed=1.0, audio_duration=2.0)
+    concurrency.release(concurrency.acquire(), elapsed=1.5, audio_duration=2.0)
+    assert concurrency.limit == 8
+    concurrency.release(concurrency.acquire(), elapsed=4.0, audio_duration=2.0)
+    assert concurrency.limit == 4
+
+
+def test_acquire_blocks_at_limit():
+    concurrency = AdaptiveConcurrency(1)
+    ticket = concurrency.acquire()
+    acquired = threading.Event()
+
+    def worker():
+        concurrency.release(concurrency.acquire())
+        acquired.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+    concurrency.release(ticket)
+    thread.join(timeout=2.0)
+    assert acquired.is_set()
+    assert concurrency.in_flight == 0
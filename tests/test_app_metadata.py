@@ -259,7 +259,7 @@ class TestAppMetadata(unittest.TestCase):
                  patch.object(ConcatUtil, "concatenate_sound_segments", return_value=[1.0, 2.0, 3.0, 4.0]), \
                  patch("tts_audiobook_tool.concat_util.make_app_metadata_sections", return_value=sections), \
                  patch("tts_audiobook_tool.concat_util.m4b_chapter_util.make_metadata", return_value="meta") as make_metadata_mock, \
-                 patch("tts_audiobook_tool.concat_util.m4b_chapter_util.make_copy_with_metadata", return_value="") as make_copy_mock, \
+                 patch.object(ConcatUtil, "encode_final_file", return_value="") as encode_mock, \
                  patch("tts_audiobook_tool.concat_util.AppMetadata.save_to_mp4", return_value="") as save_to_mp4_mock, \
                  patch("tts_audiobook_tool.concat_util.delete_silently"):
                 result_path, err = ConcatUtil.make_file(
@@ -273,14 +273,60 @@ class TestAppMetadata(unittest.TestCase):
             self.assertEqual(err, "")
             self.assertEqual(result_path, stem_path + ".abr.m4b")
             make_metadata_mock.assert_called_once()
-            make_copy_mock.assert_called_once_with(
-                source_path=stem_path + " [concat].m4b",
-                dest_path=stem_path + " [chaptermeta].m4b",
-                metadata="meta",
-            )
+            encode_mock.assert_called_once()
+            self.assertEqual(encode_mock.call_args.kwargs["source_flac"], stem_path + " [concat].flac")
+            self.assertEqual(encode_mock.call_args.kwargs["dest_path"], stem_path + ".abr.m4b")
+            self.assertEqual(encode_mock.call_args.kwargs["chapter_meta_path"], stem_path + " [chaptermeta].txt")
+            self.assertIsNone(encode_mock.call_args.kwargs["loudness_stats"])
+            self.assertEqual(Path(stem_path + " [chaptermeta].txt").read_text(encoding="utf-8"), "meta")
             save_to_mp4_mock.assert_called_once()
-            self.assertEqual(save_to_mp4_mock.call_args.args[1], stem_path + " [chaptermeta].m4b")
-            self.assertEqual(save_to_mp4_mock.call_args.args[2], stem_path + ".abr.m4b")
+            self.assertEqual(save_to_mp4_mock.call_args.args[1:], (stem_path + ".abr.m4b",))
+
+
+    def test_concat_make_file_concatenates_directly_to_aac_without_normalization_or_chapters(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = Project.model_validate({
+                "dir_path": temp_dir,
+                "book": Book(sections=[BookSection(title="Only Section", phrase_groups=[
+                    self.make_phrase_group("Text one."),
+                    self.make_phrase_group("Text two."),
+                ])]),
+            })
+            project.export_type = ExportType.AAC
+            project.normalization_type = NormalizationType.DISABLED
+            project.use_break_sound_effect = False
+
+            state = SimpleNamespace(
+                project=project,
+                prefs=SimpleNamespace(aac_bitrate="128k", save_debug_files=False),
+            )
+
+            phrases_and_paths = [
+                (Phrase("Text one.", Reason.SENTENCE), "/tmp/one.flac", False),
+                (Phrase("Text two.", Reason.SENTENCE), "/tmp/two.flac", False),
+            ]
+            stem_path = str(Path(temp_dir) / "book")
+
+            with patch("tts_audiobook_tool.concat_util.ProjectTextIOUtil.load_raw_text", return_value="raw"), \
+                 patch.object(ConcatUtil, "make_phrases_and_paths", return_value=phrases_and_paths), \
+                 patch.object(ConcatUtil, "concatenate_sound_segments", return_value=[1.0, 2.0]) as concat_mock, \
+                 patch.object(ConcatUtil, "encode_final_file", return_value="") as encode_mock, \
+                 patch("tts_audiobook_tool.concat_util.AppMetadata.save_to_mp4", return_value=""), \
+                 patch("tts_audiobook_tool.concat_util.delete_silently") as delete_mock:
+                result_path, err = ConcatUtil.make_file(
+                    state=cast(State, state),
+                    index_start=0,
+                    index_end=1,
+                    bookmark_indices=[],
+                    stem_path=stem_path,
+                )
+
+            self.assertEqual(err, "")
+            self.assertEqual(result_path, stem_path + ".abr.m4b")
+            self.assertEqual(concat_mock.call_args.args[0], stem_path + ".abr.m4b")
+            self.assertIsNone(concat_mock.call_args.kwargs["loudness_meter"])
+            encode_mock.assert_not_called()
+            self.assertNotIn((stem_path + ".abr.m4b",), [call.args for call in delete_mock.call_args_list])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+import sys
+import threading
+import time
+
+import numpy as np
+
+from tts_audiobook_tool.server.audio_stream import BLOCKSIZE, SAMPLE_RATE, AudioStream
+
+
+def test_headless_stream_plays_to_listener_in_real_time(monkeypatch) -> None:
+    # Importing sounddevice would raise
+    monkeypatch.setitem(sys.modules, "sounddevice", None)
+    played: list[np.ndarray] = []
+    done = threading.Event()
+    num_samples = BLOCKSIZE * 4
+
+    def listener(data: np.ndarray, sr: int) -> None:
+        assert sr == SAMPLE_RATE
+        played.append(data)
+        if sum(len(item) for item in played) >= num_samples:
+            done.set()
+
+    stream = AudioStream(headless=True)
+    try:
+        assert stream.headless
+        stream.set_playback_listener(listener)
+        data = np.linspace(-1.0, 1.0, num_samples, dtype=np.float32)
+        start_time = time.monotonic()
+        stream.append_data(data, SAMPLE_RATE, "hello")
+        assert done.wait(5.0)
+        elapsed = time.monotonic() - start_time
+    finally:
+        stream.close()
+
+    # Paced like a sound device, not dumped all at once
+    assert elapsed >= (num_samples - BLOCKSIZE) / SAMPLE_RATE
+    assert np.array_equal(np.concatenate(played), data)
+    assert stream.get_seconds_left() == 0
+
+
+def test_wait_until_seconds_left_returns_once_drained(monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "sounddevice", None)
+    num_samples = BLOCKSIZE * 8
+    stream = AudioStream(headless=True)
+    try:
+        stream.append_data(np.zeros(num_samples, dtype=np.float32), SAMPLE_RATE, "hello")
+        assert 0 < stream.get_seconds_left() <= num_samples / SAMPLE_RATE
+        assert not stream.wait_until_seconds_left(0.0, timeout=0.001)
+
+        start_time = time.monotonic()
+        assert stream.wait_until_seconds_left(0.0, timeout=5.0)
+        elapsed = time.monotonic() - start_time
+    finally:
+        stream.close()
+
+    assert stream.get_seconds_left() == 0
+    # Woken by playback, rather than polling at a coarse interval
+    assert elapsed < num_samples / SAMPLE_RATE + 0.5
@@ -0,0 +1,121 @@
+import io
+import json
+import struct
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from tts_audiobook_tool.server import audio_stream_http
+from tts_audiobook_tool.server.audio_stream_http import AudioStreamHttp, get_encoding
+
+
+def parse_frame(frame: bytes) -> tuple[dict, bytes]:
+    (message_length,) = struct.unpack(">I", frame[:4])
+    message = frame[4:4 + message_length]
+    (header_length,) = struct.unpack(">I", message[:4])
+    header = json.loads(message[4:4 + header_length])
+    return header, message[4 + header_length:]
+
+
+def test_get_encoding() -> None:
+    assert get_encoding() == "float32"
+    assert get_encoding("Opus") == "opus"
+    assert get_encoding("mp3") == ""
+    assert get_encoding("", "audio/mpeg, audio/flac;q=0.9, audio/ogg") == "flac"
+    assert get_encoding("pcm16", "audio/ogg") == "pcm16"
+    assert get_encoding("", "*/*") == "float32"
+
+
+def test_each_block_is_encoded_once_per_encoding_in_use() -> None:
+    stream = AudioStreamHttp()
+    clients = {
+        "a": stream.connect("pcm16"),
+        "b": stream.connect("pcm16"),
+        "c": stream.connect("opus"),
+        "d": stream.connect(),
+    }
+    data = (np.sin(np.arange(2400) / 10) * 0.5).astype(np.float32)
+    stream._accumulator = data
+    stream._accum_sr = 48000
+
+    with patch.object(audio_stream_http, "_encode_pcm", wraps=audio_stream_http._encode_pcm) as encode:
+        stream._flush()
+    assert sorted(call.args[2] for call in encode.call_args_list) == ["float32", "opus", "pcm16"]
+
+    frames = {name: stream.read(client, timeout=0) for name, client in clients.items()}
+    frame_a, frame_c, frame_d = frames["a"], frames["c"], frames["d"]
+    assert frame_a is not None and frame_c is not None and frame_d is not None
+    assert frame_a is frames["b"]
+
+    header, payload = parse_frame(frame_a)
+    assert header["encoding"] == "pcm16"
+    assert header["sampleCount"] == len(data)
+    decoded, sr = sf.read(io.BytesIO(payload), dtype="float32")
+    assert sr == 48000
+    assert np.allclose(decoded, data, atol=1 / 2**14)
+
+    header, payload = parse_frame(frame_c)
+    assert header["encoding"] == "opus"
+    assert header["sequence"] == parse_frame(frame_d)[0]["sequence"]
+    assert len(payload) < len(parse_frame(frame_d)[1]) / 4
+
+
+def test_nothing_is_encoded_without_clients() -> None:
+    stream = AudioStreamHttp()
+    stream._accumulator = np.zeros(100, dtype=np.float32)
+    with patch.object(audio_stream_http, "_encode_pcm") as encode:
+        stream._flush()
+    encode.assert_not_called()
+    assert stream._timeline_sample_index == 100
+
+    client = stream.connect("flac")
+    assert stream.read(client, timeout=0) is None
+    stream.disconnect(client)
+    assert stream.client_count() == 0
+
+
+def flush_block(stream: AudioStreamHttp, seconds: float) -> None:
+    stream._accum_sr = 1000
+    stream._accumulator = np.zeros(int(seconds * 1000), dtype=np.float32)
+    stream._flush()
+
+
+def test_slow_client_catches_up_within_window() -> None:
+    stream = AudioStreamHttp(max_lag_seconds=2.0)
+    client = stream.connect("pcm16")
+    for _ in range(3):
+        flush_block(stream, 0.5)
+    assert stream.get_metrics() == {"lagging_clients": 1, "dropped_clients": 0, "max_lag": 1.5}
+
+    frames = [stream.read(client, timeout=0) for _ in range(3)]
+    assert [parse_frame(frame)[0]["sequence"] for frame in frames if frame] == [0, 1, 2]
+    assert stream.read(client, timeout=0) is None
+    assert not client.drop_reason
+    assert stream.get_metrics()["lagging_clients"] == 0
+
+
+def test_client_is_dropped_beyond_window() -> None:
+    stream = AudioStreamHttp(max_lag_seconds=1.0)
+    slow_client = stream.connect("pcm16")
+    fast_client = stream.connect("pcm16")
+    for _ in range(4):
+        flush_block(stream, 0.5)
+        assert stream.read(fast_client, timeout=0) is not None
+
+    assert stream.read(slow_client, timeout=0) is None
+    assert slow_client.drop_reason
+    assert stream.read(slow_client, timeout=0) is None
+    assert not fast_client.drop_reason
+    assert stream.get_metrics()["dropped_clients"] == 1
+
+
+def test_clear_skips_clients_past_buffered_blocks() -> None:
+    stream = AudioStreamHttp()
+    client = stream.connect()
+    flush_block(stream, 0.5)
+    stream.clear()
+    assert stream.read(client, timeout=0) is None
+    flush_block(stream, 0.5)
+    frame = stream.read(client, timeout=0)
+    assert frame is not None and parse_frame(frame)[0]["sequence"] == 1
@@ -0,0 +1,73 @@
+import argparse
+
+import numpy as np
+
+from benchmarks.run import BENCHMARKS, Context
+from benchmarks.stubs import StubStt, StubTtsModel, stub_backends
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.transcriber import Transcriber
+from tts_audiobook_tool.tts import Tts
+
+
+def test_stub_tts_is_deterministic() -> None:
+    tts = StubTtsModel()
+    a = tts.synthesize("Hello there, said the stranger.")
+    b = tts.synthesize("Hello there, said the stranger.")
+    c = tts.synthesize("Hello there, said the stranger.", random_seed=True)
+    assert (a.data == b.data).all()
+    assert len(a.data) == len(c.data)
+    assert not (a.data == c.data).all()
+
+
+def test_stub_stt_word_error_rate() -> None:
+    text = " ".join(["word"] * 1000)
+    assert len(StubStt(StubTtsModel()).make_words(text, 0.0, 10.0)) == 1000
+    words = StubStt(StubTtsModel(), word_error_rate=0.2).make_words(text, 0.0, 10.0)
+    num_errors = 1000 - sum(1 for word in words if word.word == " word")
+    assert 100 < num_errors < 300
+
+
+def test_stub_stt_recognizes_stub_tts_sounds() -> None:
+    tts = StubTtsModel()
+    stt = StubStt(tts)
+    texts = ["Hello there, said the stranger.", "The river was quiet that morning.", "Never."]
+    tts.add_fingerprints(texts)
+    sounds = [tts.synthesize(text) for text in texts]
+    regenerated = tts.synthesize(texts[0], random_seed=True)
+
+    for text, sound in zip(texts, sounds):
+        data = Transcriber.prepare_sound_for_whisper(sound).data
+        segments, _ = stt.transcribe(data)
+        assert Transcriber.get_flat_text_from_segments(segments) == text
+    assert tts.recognize(regenerated.data, regenerated.sr) == texts[0]
+    assert tts.recognize(np.zeros(16000, dtype=np.float32), 16000) is None
+
+    # As one batch
+    datas = [Transcriber.prepare_sound_for_whisper(sound).data for sound in sounds]
+    edges = np.cumsum([0] + [len(data) for data in datas]) / 16000
+    clips = [{"start": start, "end": end} for start, end in zip(edges[:-1], edges[1:])]
+    segments, _ = stt.transcribe_clips(np.concatenate(datas), clips)
+    assert [segment.text.strip() for segment in segments] == texts
+
+
+def test_benchmarks_run_on_small_project(tmp_path) -> None:
+    L.init("test_benchmarks")
+    args = argparse.Namespace(rtf=0.0, seed=0, batch_size=4, no_pipeline=False)
+    tts = StubTtsModel()
+    stt = StubStt(tts, word_error_rate=0.05)
+    ctx = Context(args, 12, str(tmp_path / "project"), tts, stt)
+    original_type = vars(Tts).get("_type")
+    records = {}
+    try:
+        with stub_backends(tts, stt):
+            for name in ["project_save", "project_load", "validate", "align", "generate", "catalog_scan"]:
+                records[name] = BENCHMARKS[name](ctx)
+    finally:
+        ctx.kill()
+
+    assert vars(Tts).get("_type") == original_type
+    assert Tts.get_instance_if_exists() is not tts
+    assert records["generate"]["num_generated"] == 12
+    assert records["catalog_scan"]["items"] == 12
+    assert records["align"]["num_matched"] > 0
+    assert all(record["seconds"] >= 0 for record in records.values())
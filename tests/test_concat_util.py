@@ -1,3 +1,6 @@
+import threading
+from types import SimpleNamespace
+from typing import cast
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -9,6 +12,7 @@ from tts_audiobook_tool.concat_util import ConcatUtil, make_stem
 from tts_audiobook_tool.project_support.sound_segment_util import SoundSegmentUtil
 from tts_audiobook_tool.reason_pauses import ReasonPauseTypes
 from tts_audiobook_tool.sound.sound_pipeline import SoundPipeline
+from tts_audiobook_tool.state import State
 
 
 def make_fake_project(num_groups: int, missing_indices: frozenset[int] = frozenset()) -> MagicMock:
@@ -241,3 +245,50 @@ class TestVoiceTagSummary:
             )
 
         assert "[none]" in stem
+
+
+class TestMakeFilesInParallel:
+
+    def make_jobs(self, num_files: int) -> list[tuple[int, int, int, str]]:
+        return [(i, i * 10, i * 10 + 9, f"/tmp/out/book [{i + 1}]") for i in range(num_files)]
+
+    def test_makes_files_concurrently_in_quiet_mode(self) -> None:
+        state = cast(State, SimpleNamespace())
+        barrier = threading.Barrier(2, timeout=5)
+        calls: list[dict] = []
+
+        def make_file(**kwargs) -> tuple[str, str]:
+            calls.append(kwargs)
+            barrier.wait() # Deadlocks (times out) unless two files are in progress at once
+            kwargs["on_progress"]("00:00:01")
+            return kwargs["stem_path"] + ".abr.m4b", ""
+
+        with patch.object(ConcatUtil, "make_file", side_effect=make_file), \
+             patch("tts_audiobook_tool.concat_util.printt"), \
+             patch("builtins.print"):
+            last_path, err = ConcatUtil.make_files_in_parallel(
+                state, self.make_jobs(4), bookmark_indices=[], use_upsampler=False, num_workers=2
+            )
+
+        assert err == ""
+        assert last_path.endswith(".abr.m4b")
+        assert sorted(call["index_start"] for call in calls) == [0, 10, 20, 30]
+        assert all(call["on_progress"] is not None for call in calls)
+
+    def test_stops_starting_files_after_error(self) -> None:
+        state = cast(State, SimpleNamespace())
+        started: list[int] = []
+
+        def make_file(**kwargs) -> tuple[str, str]:
+            started.append(kwargs["index_start"])
+            return "", "Disk full"
+
+        with patch.object(ConcatUtil, "make_file", side_effect=make_file), \
+             patch("tts_audiobook_tool.concat_util.printt"), \
+             patch("builtins.print"):
+            _, err = ConcatUtil.make_files_in_parallel(
+                state, self.make_jobs(20), bookmark_indices=[], use_upsampler=False, num_workers=2
+            )
+
+        assert "Disk full" in err
+        assert len(started) < 20
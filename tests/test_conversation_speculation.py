@@ -0,0 +1,42 @@
+import threading
+
+from tts_audiobook_tool.app_types.phrase import Reason
+from tts_audiobook_tool.conversation.conversation_internals import ResponseSession
+from tts_audiobook_tool.conversation.conversation_types import ChunkingConfig, SpeculativeChunk
+
+CONFIG = ChunkingConfig(language_code="en")
+
+
+def test_speculative_prefix_at_clause_punctuation() -> None:
+    assert ResponseSession.take_speculative_prefix("Well, that is a good question,", CONFIG) == (
+        "Well, that is a good question,", Reason.PHRASE
+    )
+    # Too short
+    assert ResponseSession.take_speculative_prefix("Good question,", CONFIG) is None
+    # No clause punctuation yet, and under the word count threshold
+    assert ResponseSession.take_speculative_prefix("Well that is a good question", CONFIG) is None
+
+
+def test_speculative_prefix_by_word_count_excludes_incomplete_word() -> None:
+    words = "one two three four five six seven eight nine ten eleven twelve"
+    assert ResponseSession.take_speculative_prefix(words + " thir", CONFIG) == (words, Reason.WORD)
+    assert ResponseSession.take_speculative_prefix(words + " ", CONFIG) == (words, Reason.WORD)
+    assert ResponseSession.take_speculative_prefix(words, CONFIG) is None
+
+
+def test_resolve_speculation() -> None:
+    assert ResponseSession.resolve_speculation("") is None
+    assert ResponseSession.resolve_speculation(" and then") is True
+    assert ResponseSession.resolve_speculation("000 dollars") is False
+
+
+def test_speculative_chunk_wait() -> None:
+    chunk = SpeculativeChunk("It costs 1,")
+    stop = threading.Event()
+    threading.Timer(0.05, chunk.cancelled.set).start()
+    assert not chunk.wait(stop)
+
+    chunk = SpeculativeChunk("Well, that is a good question,")
+    threading.Timer(0.05, chunk.confirmed.set).start()
+    assert chunk.wait(stop)
+    assert chunk.is_resolved
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from tts_audiobook_tool.app_support.interrupts import Interrupts
+from tts_audiobook_tool.app_types import ConcreteWord, Sound, Word
+from tts_audiobook_tool.app_types.phrase import Phrase, Reason
+from tts_audiobook_tool.enhance import enhance_alignment
+from tts_audiobook_tool.enhance.enhance_alignment import AlignmentState, TranscriptTokens
+
+
+def make_words(text: str, seconds_per_word: float = 1.0) -> list[Word]:
+    return [
+        ConcreteWord(i * seconds_per_word, i * seconds_per_word + 0.5, " " + word, 1.0)
+        for i, word in enumerate(text.split(" "))
+    ]
+
+
+class TestEnhanceAlignment(unittest.TestCase):
+
+    def align(self, phrases: list[str], words: list[Word], state: AlignmentState | None = None):
+        timed_phrases, state, did_interrupt = enhance_alignment.align_phrases_with_state(
+            [Phrase(text, Reason.SENTENCE) for text in phrases], words, state, print_info=False
+        )
+        self.assertFalse(did_interrupt)
+        return [(item.time_start, item.time_end) for item in timed_phrases], state
+
+    def test_aligns_phrases_skipping_extra_transcript_words(self):
+        words = make_words("chapter one read by someone the cat sat on the mat. it was - a sunny day")
+        timings, state = self.align(["The cat sat on the mat.", "It was a sunny day."], words)
+
+        self.assertEqual(timings, [(5.0, 11.0), (11.0, 16.5)])
+        self.assertEqual(state.cursor, len(words))
+
+    def test_near_miss_words_still_match(self):
+        words = make_words("he sad hello to the captian")
+        timings, _ = self.align(["He said hello to the captain."], words)
+
+        self.assertEqual(timings, [(0.0, 5.5)])
+
+    def test_unmatched_phrase_keeps_cursor_and_widens_search(self):
+        words = make_words("alpha beta gamma delta epsilon zeta eta theta")
+        timings, state = self.align(["Completely different words here.", "Gamma delta epsilon."], words)
+
+        self.assertEqual(timings, [(0.0, 0.0), (2.0, 5.0)])
+        self.assertEqual(state.cursor, 5)
+
+    def test_tokens_are_reused_across_calls_with_same_words(self):
+        words = make_words("one two three four five six")
+        _, state = self.align(["One two three."], words)
+        tokens = state.transcript_tokens
+        timings, state = self.align(["Four five six."], words, state)
+
+        self.assertIs(state.transcript_tokens, tokens)
+        self.assertEqual(timings, [(3.0, 5.5)])
+
+    def test_transcript_tokens_skip_words_without_text(self):
+        tokens = TranscriptTokens.make(make_words("Hello, - world! hello"))
+
+        self.assertEqual(tokens.texts, ["hello", "world", "hello"])
+        self.assertEqual(tokens.word_indices.tolist(), [0, 2, 3])
+        self.assertEqual(tokens.ids.tolist(), [0, 1, 0])
+
+
+
+class TestEnhanceTranscription(unittest.TestCase):
+    """
+    Chunks are fake audio whose first sample holds the chunk's index,
+    and the fake transcriber outputs one word per chunk, naming that index.
+    """
+
+    NUM_CHUNKS = 11
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.temp_dir.name, "transcription.partial.pkl")
+        self.start_times: list[float] = []
+        self.batch_sizes: list[int] = []
+        self.interrupt_after_batches = 0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        Interrupts().clear()
+
+    def stream(self, file_path: str, chunk_duration: int, overlap_duration: int, start_time: float = 0.0):
+        self.start_times.append(start_time)
+        stride = chunk_duration - overlap_duration
+        for index in range(int(start_time // stride), self.NUM_CHUNKS):
+            yield np.full(16000, index, dtype=np.float32)
+
+    def transcribe_batch(self, sounds: list[Sound], **_) -> list:
+        self.batch_sizes.append(len(sounds))
+        if len(self.batch_sizes) == self.interrupt_after_batches:
+            Interrupts()._flag = True
+        return [[ConcreteWord(1.0, 1.5, f"w{int(sound.data[0])}", 1.0)] for sound in sounds]
+
+    def transcribe(self) -> tuple[list[list[Word]] | None, str]:
+        with patch.object(enhance_alignment, "_stream_audio_with_overlap", side_effect=self.stream), \
+                patch.object(enhance_alignment.Transcriber, "transcribe_batch", side_effect=self.transcribe_batch), \
+                patch.object(enhance_alignment.AudioMetaUtil, "get_audio_duration", return_value=None), \
+                patch.object(enhance_alignment.Stt, "get_variant"), \
+                patch.object(enhance_alignment.Stt, "get_config"), \
+                patch("builtins.print"):
+            return enhance_alignment._transcribe_stream_with_overlap("book.m4b", self.checkpoint_path)
+
+    def test_transcribes_chunks_in_batches_with_time_offsets(self):
+        list_of_lists, err = self.transcribe()
+
+        self.assertEqual(err, "")
+        assert list_of_lists is not None
+        self.assertEqual([words[0].word for words in list_of_lists], [f"w{i}" for i in range(self.NUM_CHUNKS)])
+        self.assertEqual([words[0].start for words in list_of_lists[:3]], [1.0, 26.0, 51.0])
+        self.assertEqual(self.batch_sizes, [8, 3])
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_interrupted_transcription_resumes_from_checkpoint(self):
+        self.interrupt_after_batches = 1
+        list_of_lists, err = self.transcribe()
+        self.assertIsNone(list_of_lists)
+        self.assertEqual(err, "")
+        self.assertEqual(len(enhance_alignment.load_transcription_checkpoint(self.checkpoint_path)), 8)
+
+        self.interrupt_after_batches = 0
+        list_of_lists, err = self.transcribe()
+
+        assert list_of_lists is not None
+        self.assertEqual(self.start_times, [0.0, 8 * 25])
+        self.assertEqual([words[0].word for words in list_of_lists], [f"w{i}" for i in range(self.NUM_CHUNKS)])
+        self.assertEqual(list_of_lists[-1][0].start, 1.0 + 10 * 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -69,7 +69,7 @@ def run_generate_files(
         State,
         SimpleNamespace(
             project=project,
-            prefs=SimpleNamespace(stt_variant=None, stt_config=None, save_debug_files=False),
+            prefs=SimpleNamespace(stt_variant=None, stt_config=None, save_debug_files=False, pipelined_generation=False),
         ),
     )
     calls: list[tuple[list[int], int]] = []
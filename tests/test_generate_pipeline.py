@@ -0,0 +1,223 @@
+import threading
+from types import SimpleNamespace
+from typing import cast
+from unittest.mock import MagicMock, patch
+
+from tts_audiobook_tool.app_support.interrupts import Interrupts
+from tts_audiobook_tool.app_types.phrase import Phrase, PhraseGroup, Reason
+from tts_audiobook_tool.generate_pipeline import GeneratePipeline
+from tts_audiobook_tool.generate_util import GenerateUtil
+from tts_audiobook_tool.state import State
+
+
+class StubValidationResult:
+    def __init__(self, index: int, is_fail: bool) -> None:
+        self.index = index
+        self.is_fail = is_fail
+        self.voice_tag = ""
+
+    def get_ui_message_with_extras(self) -> str:
+        return "Failed" if self.is_fail else "Passed"
+
+
+def test_pipeline_returns_items_in_submission_order_through_both_stages() -> None:
+    stage_threads: set[str] = set()
+
+    def validate(tag: str, gen_results: list) -> list:
+        stage_threads.add(threading.current_thread().name)
+        return [f"{tag}:validated:{item}" for item in gen_results]
+
+    def save(tag: str, results: list) -> list:
+        stage_threads.add(threading.current_thread().name)
+        return [("", f"{result}.flac", None) for result in results]
+
+    pipeline = GeneratePipeline(validate=validate, save=save)
+    for tag in ["a", "b", "c"]:
+        pipeline.submit(tag, [1, 2])
+
+    items = []
+    while pipeline.num_in_flight:
+        items.extend(pipeline.get_completed(block=True))
+    items.extend(pipeline.close())
+
+    assert [item.tag for item in items] == ["a", "b", "c"]
+    assert items[1].results == ["b:validated:1", "b:validated:2"]
+    assert items[1].saves == [("", "b:validated:1.flac", None), ("", "b:validated:2.flac", None)]
+    assert threading.current_thread().name not in stage_threads
+
+
+def test_pipeline_converts_stage_exceptions_into_per_item_errors() -> None:
+
+    def validate(tag: str, gen_results: list) -> list:
+        raise RuntimeError("stt failed")
+
+    pipeline = GeneratePipeline(validate=validate, save=lambda tag, results: [None] * len(results))
+    pipeline.submit("a", [1, 2])
+    items = pipeline.close()
+
+    assert len(items) == 1
+    assert items[0].results is not None
+    assert len(items[0].results) == 2
+    assert all("stt failed" in result for result in items[0].results)
+    assert pipeline.num_in_flight == 0
+
+
+def test_generate_files_pipelined_saves_in_background_and_retries_failures() -> None:
+    phrase_groups = [PhraseGroup([Phrase(f"Line {i}.", Reason.SENTENCE)]) for i in range(3)]
+    sound_segments = MagicMock()
+    sound_segments.get_word_error_counts_in_generate_range.return_value = {}
+    project = SimpleNamespace(
+        max_retries=1,
+        phrase_groups=phrase_groups,
+        sound_segments=sound_segments,
+        generate_range_string="all",
+        save=MagicMock(return_value=""),
+        voice_select_mode=None,
+    )
+    state = cast(
+        State,
+        SimpleNamespace(
+            project=project,
+            prefs=SimpleNamespace(stt_variant=None, stt_config=None, save_debug_files=False, pipelined_generation=True),
+        ),
+    )
+    generated: list[tuple[list[int], bool]] = []
+    failing = {1}
+    save_threads: set[str] = set()
+
+    def generate_batch(**kwargs: object) -> list[int]:
+        indices = list(kwargs["indices"])  # type: ignore[index]
+        generated.append((indices, bool(kwargs["force_random_seed"])))
+        return indices
+
+    def validate_batch(**kwargs: object) -> list[StubValidationResult]:
+        results = []
+        for index in kwargs["gen_results"]:  # type: ignore[union-attr]
+            is_fail = index in failing
+            failing.discard(index)
+            results.append(StubValidationResult(index, is_fail))
+        return results
+
+    def save_sound_and_timing_json(*args: object, **kwargs: object) -> tuple[str, str]:
+        save_threads.add(threading.current_thread().name)
+        return "", f"{args[2]}.flac"
+
+    model_class = SimpleNamespace(uses_rolling_continuation=lambda _: False)
+    with patch("tts_audiobook_tool.generate_util.ModelManager.warm_up_models", return_value=SimpleNamespace(should_stop=False)), \
+            patch("tts_audiobook_tool.generate_util.readiness.get_generate_blocker_text", return_value=""), \
+            patch("tts_audiobook_tool.generate_util.Tts.get_instance", return_value=SimpleNamespace(get_warning_issues=lambda _: [])), \
+            patch("tts_audiobook_tool.generate_util.Tts.get_class", return_value=model_class), \
+            patch("tts_audiobook_tool.generate_util.Tts.clear_continuation"), \
+            patch("tts_audiobook_tool.generate_util.Tts.reset_voice_selection_index"), \
+            patch("tts_audiobook_tool.generate_util.ProjectVoiceUtil.is_language_cjk", return_value=False), \
+            patch("tts_audiobook_tool.generate_util.app_memory.show_vram_memory_warning_if_necessary", return_value=False), \
+            patch("tts_audiobook_tool.generate_util.Stt.should_skip", return_value=""), \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.generate_and_validate_batch") as generate_and_validate_batch, \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.generate_batch", side_effect=generate_batch), \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.validate_batch", side_effect=validate_batch), \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.save_sound_and_timing_json", side_effect=save_sound_and_timing_json), \
+            patch("tts_audiobook_tool.generate_util.Stt.has_instance", return_value=False):
+        did_interrupt = GenerateUtil.generate_files(state, {0, 1, 2}, batch_size=1, is_regen=False)
+
+    assert not did_interrupt
+    generate_and_validate_batch.assert_not_called()
+    assert sorted(indices[0] for indices, _ in generated) == [0, 1, 1, 2]
+    assert generated.count(([1], True)) == 1
+    assert threading.current_thread().name not in save_threads
+    assert project.generate_range_string == "none"
+
+
+def test_generate_files_pipelined_reports_retries_dropped_on_interrupt() -> None:
+    phrase_groups = [PhraseGroup([Phrase(f"Line {i}.", Reason.SENTENCE)]) for i in range(3)]
+    sound_segments = MagicMock()
+    sound_segments.get_word_error_counts_in_generate_range.return_value = {}
+    project = SimpleNamespace(
+        max_retries=1,
+        phrase_groups=phrase_groups,
+        sound_segments=sound_segments,
+        generate_range_string="all",
+        save=MagicMock(return_value=""),
+        voice_select_mode=None,
+    )
+    state = cast(
+        State,
+        SimpleNamespace(
+            project=project,
+            prefs=SimpleNamespace(stt_variant=None, stt_config=None, save_debug_files=False, pipelined_generation=True),
+        ),
+    )
+    generated: list[int] = []
+
+    def generate_batch(**kwargs: object) -> list[int]:
+        indices = list(kwargs["indices"])  # type: ignore[index]
+        generated.extend(indices)
+        if 2 in indices:
+            # Control-c while the last line is being generated
+            Interrupts().signal_handler(None, None)
+        return indices
+
+    def validate_batch(**kwargs: object) -> list[StubValidationResult]:
+        return [StubValidationResult(index, index == 2) for index in kwargs["gen_results"]]  # type: ignore[union-attr]
+
+    printed: list[str] = []
+    model_class = SimpleNamespace(uses_rolling_continuation=lambda _: False)
+    with patch("tts_audiobook_tool.generate_util.ModelManager.warm_up_models", return_value=SimpleNamespace(should_stop=False)), \
+            patch("tts_audiobook_tool.generate_util.readiness.get_generate_blocker_text", return_value=""), \
+            patch("tts_audiobook_tool.generate_util.Tts.get_instance", return_value=SimpleNamespace(get_warning_issues=lambda _: [])), \
+            patch("tts_audiobook_tool.generate_util.Tts.get_class", return_value=model_class), \
+            patch("tts_audiobook_tool.generate_util.Tts.clear_continuation"), \
+            patch("tts_audiobook_tool.generate_util.Tts.reset_voice_selection_index"), \
+            patch("tts_audiobook_tool.generate_util.ProjectVoiceUtil.is_language_cjk", return_value=False), \
+            patch("tts_audiobook_tool.generate_util.app_memory.show_vram_memory_warning_if_necessary", return_value=False), \
+            patch("tts_audiobook_tool.generate_util.Stt.should_skip", return_value=""), \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.generate_batch", side_effect=generate_batch), \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.validate_batch", side_effect=validate_batch), \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.save_sound_and_timing_json", return_value=("", "saved.flac")), \
+            patch("tts_audiobook_tool.generate_util.printt", side_effect=lambda s="", *args, **kwargs: printed.append(str(s))), \
+            patch("tts_audiobook_tool.generate_util.Stt.has_instance", return_value=False):
+        did_interrupt = GenerateUtil.generate_files(state, {0, 1, 2}, batch_size=1, is_regen=False)
+
+    assert did_interrupt
+    assert generated == [0, 1, 2]
+    summary = next(s for s in printed if "Lines saved:" in s)
+    assert "Lines not retried: " in summary and "(3)" in summary
+
+
+def test_generate_files_does_not_pipeline_with_rolling_continuation() -> None:
+    phrase_group = PhraseGroup([Phrase("Hello world.", Reason.SENTENCE)])
+    sound_segments = MagicMock()
+    sound_segments.get_word_error_counts_in_generate_range.return_value = {}
+    project = SimpleNamespace(
+        max_retries=0,
+        phrase_groups=[phrase_group],
+        sound_segments=sound_segments,
+        generate_range_string="all",
+        save=MagicMock(return_value=""),
+        voice_select_mode=None,
+    )
+    state = cast(
+        State,
+        SimpleNamespace(
+            project=project,
+            prefs=SimpleNamespace(stt_variant=None, stt_config=None, save_debug_files=False, pipelined_generation=True),
+        ),
+    )
+
+    model_class = SimpleNamespace(uses_rolling_continuation=lambda _: True)
+    with patch("tts_audiobook_tool.generate_util.ModelManager.warm_up_models", return_value=SimpleNamespace(should_stop=False)), \
+            patch("tts_audiobook_tool.generate_util.readiness.get_generate_blocker_text", return_value=""), \
+            patch("tts_audiobook_tool.generate_util.Tts.get_instance", return_value=SimpleNamespace(get_warning_issues=lambda _: [])), \
+            patch("tts_audiobook_tool.generate_util.Tts.get_class", return_value=model_class), \
+            patch("tts_audiobook_tool.generate_util.Tts.clear_continuation"), \
+            patch("tts_audiobook_tool.generate_util.Tts.reset_voice_selection_index"), \
+            patch("tts_audiobook_tool.generate_util.ProjectVoiceUtil.is_language_cjk", return_value=False), \
+            patch("tts_audiobook_tool.generate_util.app_memory.show_vram_memory_warning_if_necessary", return_value=False), \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.generate_and_validate_batch", return_value=[StubValidationResult(0, False)]) as generate_and_validate_batch, \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.generate_batch") as generate_batch, \
+            patch("tts_audiobook_tool.generate_util.GenerateUtil.save_sound_and_timing_json", return_value=("", "saved.flac")), \
+            patch("tts_audiobook_tool.generate_util.Stt.has_instance", return_value=False):
+        did_interrupt = GenerateUtil.generate_files(state, {0}, batch_size=1, is_regen=False)
+
+    assert not did_interrupt
+    generate_and_validate_batch.assert_called_once()
+    generate_batch.assert_not_called()
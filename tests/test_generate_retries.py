@@ -31,7 +31,7 @@ def test_generate_files_retries_validation_failures_up_to_project_limit() -> Non
         State,
         SimpleNamespace(
             project=project,
-            prefs=SimpleNamespace(stt_variant=None, stt_config=None, save_debug_files=False),
+            prefs=SimpleNamespace(stt_variant=None, stt_config=None, save_debug_files=False, pipelined_generation=False),
         ),
     )
     results = [StubValidationResult(True), StubValidationResult(True), StubValidationResult(False)]
@@ -113,6 +113,7 @@ def test_concat_with_persisted_setting_skips_unavailable_lava_sr() -> None:
     project = SimpleNamespace(
         use_upsampler=True,
         concat_path="output",
+        render_cache_path="",
         chapter_mode=SimpleNamespace(),
         markers=[],
         phrase_groups=[],
@@ -121,7 +122,7 @@ def test_concat_with_persisted_setting_skips_unavailable_lava_sr() -> None:
         State,
         SimpleNamespace(
             project=project,
-            prefs=SimpleNamespace(),
+            prefs=SimpleNamespace(export_workers=1),
         ),
     )
 
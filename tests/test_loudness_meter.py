@@ -0,0 +1,67 @@
+import numpy as np
+
+from tts_audiobook_tool.sound.loudness_meter import LoudnessMeter
+
+SR = 48000
+
+
+def make_sine(freq: float, amplitude: float, seconds: float, phase: float = 0.0) -> np.ndarray:
+    t = np.arange(int(SR * seconds)) / SR
+    return (amplitude * np.sin(2 * np.pi * freq * t + phase)).astype(np.float32)
+
+
+def test_full_scale_997hz_sine_measures_minus_3_lufs() -> None:
+    meter = LoudnessMeter(SR)
+    meter.add(make_sine(997, 1.0, 10.0))
+
+    stats = meter.get_stats()
+
+    assert abs(stats.i - -3.01) < 0.05
+    assert abs(stats.thresh - (stats.i - 10.0)) < 0.05
+    assert stats.lra < 0.1
+
+
+def test_measurements_do_not_depend_on_chunk_sizes() -> None:
+    rng = np.random.default_rng(0)
+    data = np.concatenate([
+        make_sine(440, amplitude, 2.0) for amplitude in (0.05, 0.5, 0.1, 0.3, 0.02, 0.4)
+    ])
+
+    whole = LoudnessMeter(SR)
+    whole.add(data)
+    chunked = LoudnessMeter(SR)
+    position = 0
+    while position < data.size:
+        size = int(rng.integers(1, 20000))
+        chunked.add(data[position:position + size])
+        position += size
+
+    a, b = whole.get_stats(), chunked.get_stats()
+    assert abs(a.i - b.i) < 1e-6
+    assert abs(a.lra - b.lra) < 1e-6
+    assert abs(a.tp - b.tp) < 1e-6
+    assert a.lra > 5.0
+
+
+def test_true_peak_finds_inter_sample_peak() -> None:
+    # Samples of a quarter-sample-rate sine at 45 degrees phase only reach ~0.707 of its amplitude
+    data = make_sine(SR / 4, 0.5, 1.0, phase=np.pi / 4)
+    assert np.max(np.abs(data)) < 0.36
+
+    meter = LoudnessMeter(SR)
+    for chunk in np.array_split(data, 7):
+        meter.add(chunk)
+
+    assert abs(meter.get_stats().tp - 20 * np.log10(0.5)) < 0.2
+
+
+def test_silence_measures_as_floor() -> None:
+    meter = LoudnessMeter(SR)
+    meter.add(np.zeros(SR * 5, dtype=np.float32))
+
+    stats = meter.get_stats()
+
+    assert stats.i == LoudnessMeter.FLOOR
+    assert stats.tp == LoudnessMeter.FLOOR
+    assert stats.lra == 0.0
+    assert stats.to_loudnorm_dict()["input_i"] == "-99.00"
@@ -0,0 +1,58 @@
+import numpy as np
+
+from tts_audiobook_tool.app_types import Sound
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.server.phrase_audio_cache import PhraseAudioCache
+
+
+def make_sound(num_samples: int, value: float = 0.5) -> Sound:
+    return Sound(np.full(num_samples, value, dtype=np.float32), 24000)
+
+
+def test_key_ignores_whitespace_but_not_voice_or_params() -> None:
+    key = PhraseAudioCache.make_key("Chapter  one.\n", "model", "voice", "params")
+    assert key == PhraseAudioCache.make_key(" Chapter one.", "model", "voice", "params")
+    assert key != PhraseAudioCache.make_key("Chapter one.", "model", "other voice", "params")
+    assert key != PhraseAudioCache.make_key("Chapter one.", "model", "voice", "other params")
+    assert key != PhraseAudioCache.make_key("chapter one.", "model", "voice", "params")
+
+
+def test_least_recently_used_entries_are_evicted_past_memory_budget() -> None:
+    cache = PhraseAudioCache(max_bytes=1000 * 4 * 2)
+    cache.put("a", make_sound(1000))
+    cache.put("b", make_sound(1000))
+    assert cache.get("a") is not None
+    cache.put("c", make_sound(1000))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    metrics = cache.get_metrics()
+    assert metrics["entries"] == 2
+    assert metrics["bytes"] == 1000 * 4 * 2
+    assert metrics["evictions"] == 1
+    assert metrics["hits"] == 3 and metrics["misses"] == 1
+
+
+def test_disk_tier_outlives_memory(tmp_path) -> None:
+    L.init("test_phrase_audio_cache")
+    cache = PhraseAudioCache(max_bytes=1000 * 4, dir_path=str(tmp_path))
+    cache.put("a", make_sound(1000, 0.25))
+    cache.put("b", make_sound(1000))
+
+    sound = cache.get("a")
+    assert sound is not None and sound.sr == 24000 and np.all(sound.data == 0.25)
+    assert cache.get_metrics()["disk_hits"] == 1
+
+    # New instance, as on server restart
+    cache = PhraseAudioCache(max_bytes=1000 * 4, dir_path=str(tmp_path))
+    assert cache.get("b") is not None
+    assert cache.get_metrics()["disk_bytes"] > 0
+
+
+def test_disk_tier_is_pruned_past_disk_budget(tmp_path) -> None:
+    cache = PhraseAudioCache(dir_path=str(tmp_path), max_disk_bytes=1000 * 4 + 1000)
+    cache.put("a", make_sound(1000))
+    cache.put("b", make_sound(1000))
+
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    assert cache.get_metrics()["disk_evictions"] == 1
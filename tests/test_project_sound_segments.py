@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from watchdog.events import FileCreatedEvent, FileDeletedEvent, FileMovedEvent
+
+from tts_audiobook_tool.app_types.phrase import Phrase, PhraseGroup, Reason
+from tts_audiobook_tool.project_support.project_sound_segments import ProjectSoundSegments
+from tts_audiobook_tool.project_support.sound_segment_util import SoundSegmentUtil
+
+
+def make_project(dir_path: Path, texts: list[str]) -> SimpleNamespace:
+    segments_path = dir_path / "segments"
+    segments_path.mkdir(exist_ok=True)
+    return SimpleNamespace(
+        dir_path=str(dir_path),
+        sound_segments_path=str(segments_path),
+        phrase_groups=[PhraseGroup([Phrase(text, Reason.SENTENCE)]) for text in texts],
+    )
+
+
+def write_segment(project: SimpleNamespace, index: int, num_errors: int = 0) -> str:
+    segment_hash = SoundSegmentUtil.calc_segment_hash(index, project.phrase_groups[index].text)
+    errors_tag = f" [{num_errors}]" if num_errors else ""
+    file_name = f"[{str(index + 1).zfill(5)}] [{segment_hash}] [oute] [voice]{errors_tag} text.flac"
+    path = os.path.join(project.sound_segments_path, file_name)
+    with open(path, "wb") as file:
+        file.write(b"data")
+    return path
+
+
+def make_catalog(project: SimpleNamespace) -> ProjectSoundSegments:
+    catalog = ProjectSoundSegments(project) # type: ignore
+    # Events get fed in explicitly, for determinism
+    catalog.observer.stop()
+    catalog.observer.join()
+    return catalog
+
+
+def test_file_events_update_catalog_without_rescanning(tmp_path: Path) -> None:
+    project = make_project(tmp_path, ["One.", "Two.", "Three."])
+    write_segment(project, 0)
+    catalog = make_catalog(project)
+    assert catalog.get_existing_indices() == {0}
+
+    with patch.object(SoundSegmentUtil, "make_sound_segments_map") as full_scan:
+        path_1 = write_segment(project, 1, num_errors=3)
+        catalog.on_dir_contents_change(FileCreatedEvent(path_1))
+        assert catalog.get_existing_indices() == {0, 1}
+
+        renamed_path = path_1.replace(" [3]", "")
+        os.rename(path_1, renamed_path)
+        catalog.on_dir_contents_change(FileMovedEvent(path_1, renamed_path))
+        assert catalog.get_filenames_for(1) == [Path(renamed_path).name]
+
+        os.remove(renamed_path)
+        catalog.on_dir_contents_change(FileDeletedEvent(renamed_path))
+        assert catalog.get_existing_indices() == {0}
+
+        full_scan.assert_not_called()
+
+
+def test_files_not_matching_current_text_are_ignored(tmp_path: Path) -> None:
+    project = make_project(tmp_path, ["One.", "Two."])
+    catalog = make_catalog(project)
+    assert catalog.get_existing_indices() == set()
+
+    path = write_segment(project, 1)
+    stale_path = path.replace(SoundSegmentUtil.calc_segment_hash(1, "Two."), "0123456789abcdef")
+    os.rename(path, stale_path)
+    empty_path = write_segment(project, 0)
+    open(empty_path, "wb").close()
+    for event_path in (stale_path, empty_path):
+        catalog.on_dir_contents_change(FileCreatedEvent(event_path))
+
+    assert catalog.get_existing_indices() == set()
+
+
+def test_text_change_triggers_full_rescan(tmp_path: Path) -> None:
+    project = make_project(tmp_path, ["One.", "Two."])
+    write_segment(project, 0)
+    write_segment(project, 1)
+    catalog = make_catalog(project)
+    assert catalog.get_existing_indices() == {0, 1}
+
+    project.phrase_groups = [PhraseGroup([Phrase("One.", Reason.SENTENCE)]), PhraseGroup([Phrase("Changed.", Reason.SENTENCE)])]
+
+    assert catalog.get_existing_indices() == {0}
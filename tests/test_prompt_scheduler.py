@@ -0,0 +1,93 @@
+import threading
+import time
+
+from tts_audiobook_tool.server.prompt_scheduler import PRIORITY_HIGH, PRIORITY_LOW, PromptScheduler
+
+
+def take_all(scheduler: PromptScheduler, max_size: int = 1) -> list[list[str]]:
+    batches = []
+    while True:
+        jobs = scheduler.get_batch(max_size, timeout=0)
+        if not jobs:
+            return batches
+        batches.append([job.payload for job in jobs])
+        for job in jobs:
+            scheduler.finish(job)
+
+
+def test_priority_then_round_robin_across_clients() -> None:
+    scheduler = PromptScheduler()
+    for payload in ["a1", "a2", "a3"]:
+        scheduler.put(payload, client_id="a")
+    scheduler.put("b1", client_id="b")
+    scheduler.put("b2", client_id="b")
+    scheduler.put("low", client_id="c", priority=PRIORITY_LOW)
+    scheduler.put("high", client_id="c", priority=PRIORITY_HIGH)
+
+    assert take_all(scheduler) == [["high"], ["a1"], ["b1"], ["a2"], ["b2"], ["a3"], ["low"]]
+    metrics = scheduler.get_metrics()
+    assert metrics["normal"]["dispatched"] == 5 and metrics["normal"]["completed"] == 5
+    assert metrics["low"]["queued"] == 0
+
+
+def test_batchable_jobs_are_coalesced() -> None:
+    scheduler = PromptScheduler()
+    for payload in ["a1", "a2", "a3"]:
+        scheduler.put(payload, client_id="a")
+    scheduler.put("b1", client_id="b", batchable=False)
+    scheduler.put("b2", client_id="b")
+
+    assert take_all(scheduler, max_size=4) == [["a1"], ["b1"], ["a2", "b2", "a3"]]
+
+
+def test_expired_jobs_are_discarded() -> None:
+    scheduler = PromptScheduler()
+    scheduler.put("late", deadline_seconds=0.01)
+    scheduler.put("on time")
+    time.sleep(0.02)
+
+    assert take_all(scheduler) == [["on time"]]
+    assert scheduler.get_metrics()["normal"]["expired"] == 1
+
+
+def test_output_waits_for_earlier_jobs() -> None:
+    scheduler = PromptScheduler()
+    scheduler.put("first")
+    scheduler.put("second")
+    first = scheduler.get_batch()[0]
+    second = scheduler.get_batch()[0]
+    output: list[str] = []
+
+    def output_second() -> None:
+        if scheduler.wait_for_turn(second):
+            output.append("second")
+        scheduler.finish(second)
+
+    thread = threading.Thread(target=output_second)
+    thread.start()
+    time.sleep(0.05)
+    assert output == []
+
+    assert scheduler.wait_for_turn(first)
+    output.append("first")
+    scheduler.finish(first)
+    thread.join(timeout=5.0)
+    assert output == ["first", "second"]
+
+
+def test_clear_cancels_turns() -> None:
+    scheduler = PromptScheduler()
+    scheduler.put("first")
+    scheduler.put("second")
+    scheduler.put("queued")
+    first = scheduler.get_batch()[0]
+    second = scheduler.get_batch()[0]
+
+    scheduler.clear()
+    assert scheduler.qsize() == 0
+    assert not scheduler.wait_for_turn(second)
+    scheduler.finish(first)
+
+    scheduler.put("next")
+    next_job = scheduler.get_batch()[0]
+    assert scheduler.wait_for_turn(next_job)
@@ -0,0 +1,69 @@
+from tts_audiobook_tool.app_types.phrase import Phrase, PhraseGroup, Reason
+from tts_audiobook_tool.constants_config import REAL_TIME_BUFFER_MAX_SECONDS
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.real_time_lookahead import (
+    DEFAULT_FAILURE_RATE,
+    DEFAULT_SECONDS_PER_RETRY,
+    LOOKAHEAD_MIN_SECONDS,
+    RealTimeLookahead,
+)
+
+
+def test_defaults_before_any_measurements() -> None:
+    L.init("test_real_time_lookahead")
+    lookahead = RealTimeLookahead()
+    assert lookahead.rtf is None
+    assert lookahead.get_target_seconds(20, max_retries=2) == REAL_TIME_BUFFER_MAX_SECONDS
+    assert lookahead.get_failure_rate(20) == DEFAULT_FAILURE_RATE
+    assert not lookahead.should_validate(0.0, 20)
+    assert lookahead.should_validate(DEFAULT_SECONDS_PER_RETRY, 20)
+    assert not lookahead.should_retry(DEFAULT_SECONDS_PER_RETRY - 1, 20)
+    assert not lookahead.should_split(0.0, 40)
+
+
+def test_decisions_follow_measured_timings() -> None:
+    L.init("test_real_time_lookahead")
+    lookahead = RealTimeLookahead()
+    # 4s generation + 1s transcription per 20 words, producing 8s of audio
+    lookahead.add_attempt(20, generation_seconds=4.0, stt_seconds=1.0, audio_seconds=8.0, is_fail=False)
+    lookahead.add_attempt(20, generation_seconds=4.0, stt_seconds=None, audio_seconds=8.0, is_fail=None)
+    assert lookahead.rtf == 9.0 / 16.0
+    assert lookahead.estimate_generation_seconds(40) == 8.0
+    assert lookahead.estimate_attempt_seconds(40) == 10.0
+
+    assert lookahead.should_validate(10.0, 40)
+    assert not lookahead.should_validate(9.0, 40)
+    assert lookahead.should_retry(10.0, 40)
+    assert not lookahead.should_retry(9.0, 40)
+    assert lookahead.should_split(7.0, 40)
+    assert not lookahead.should_split(8.0, 40)
+    assert lookahead.get_target_seconds(40, max_retries=2) == 60.0
+    assert lookahead.get_target_seconds(1, max_retries=0) == LOOKAHEAD_MIN_SECONDS
+
+
+def test_segment_lengths_that_keep_failing_are_not_retried() -> None:
+    L.init("test_real_time_lookahead")
+    lookahead = RealTimeLookahead()
+    for _ in range(20):
+        lookahead.add_attempt(35, generation_seconds=1.0, stt_seconds=0.1, audio_seconds=10.0, is_fail=True)
+        lookahead.add_attempt(5, generation_seconds=1.0, stt_seconds=0.1, audio_seconds=10.0, is_fail=False)
+    assert lookahead.get_failure_rate(38) > 0.9
+    assert lookahead.get_failure_rate(5) < 0.1
+    assert not lookahead.should_retry(100.0, 38)
+    assert lookahead.should_retry(100.0, 5)
+
+
+def test_split_at_phrase_boundary_nearest_middle() -> None:
+    phrases = [
+        Phrase("One two three four five six.", Reason.SENTENCE),
+        Phrase("Seven eight.", Reason.SENTENCE),
+        Phrase("Nine ten eleven twelve.", Reason.PARAGRAPH),
+    ]
+    parts = RealTimeLookahead.split_phrase_group(PhraseGroup(phrases, voice_index=2))
+    assert [[phrase.text for phrase in part.phrases] for part in parts] == [
+        [phrases[0].text], [phrases[1].text, phrases[2].text]
+    ]
+    assert all(part.voice_index == 2 for part in parts)
+
+    single = PhraseGroup(phrases[:1])
+    assert RealTimeLookahead.split_phrase_group(single) == [single]
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import numpy as np
+
+from tts_audiobook_tool.app_types import ConcreteSegment, ConcreteWord
+from tts_audiobook_tool.conversation.realtime_transcriber import IncrementalTranscript, PartialTranscriptionWorker
+from tts_audiobook_tool.constants import WHISPER_SAMPLERATE
+from tts_audiobook_tool.l import L
+
+# Word, start time, end time
+SCRIPT = [
+    (" Hello", 0.0, 0.4),
+    (" there,", 0.5, 0.9),
+    (" how", 1.0, 1.4),
+    (" are", 1.5, 1.9),
+    (" you", 2.0, 2.4),
+    (" doing", 2.5, 2.9),
+    (" today?", 3.0, 3.4),
+]
+
+
+class FakeWhisper:
+    """ Transcribes audio made by `make_audio()`, returning the script's words which it fully contains """
+
+    def __init__(self, script: list[tuple[str, float, float]] = SCRIPT):
+        self.script = script
+        # (audio duration, prompt)
+        self.calls: list[tuple[float, str]] = []
+
+    def transcribe(self, audio: np.ndarray, initial_prompt: str) -> list:
+        offset = float(audio[0]) / WHISPER_SAMPLERATE
+        duration = len(audio) / WHISPER_SAMPLERATE
+        self.calls.append((duration, initial_prompt))
+        words = [
+            ConcreteWord(start - offset, end - offset, word, 1.0)
+            for word, start, end in self.script
+            if start >= offset - 0.01 and end <= offset + duration
+        ]
+        if not words:
+            return []
+        return [ConcreteSegment(words[0].start, words[-1].end, "".join(word.word for word in words), words)]
+
+
+def make_audio(seconds: float) -> np.ndarray:
+    # Each sample holds its own index, so FakeWhisper can tell where a slice starts
+    return np.arange(int(seconds * WHISPER_SAMPLERATE), dtype=np.float32)
+
+
+def test_agreed_words_are_committed_and_only_tail_is_transcribed_at_end() -> None:
+    L.init("test_realtime_transcriber")
+    whisper = FakeWhisper()
+    transcript = IncrementalTranscript(whisper.transcribe, commit_guard_s=1.0)
+
+    assert transcript.update(make_audio(1.5)) == "Hello there, how"
+    assert transcript.committed_text == ""
+
+    assert transcript.update(make_audio(3.0)) == "Hello there, how are you doing"
+    assert transcript.committed_text == "Hello there, how"
+
+    segments = transcript.finish(make_audio(3.5))
+    tail_duration, tail_prompt = whisper.calls[-1]
+    assert abs(tail_duration - 2.1) < 0.01
+    assert tail_prompt == "Hello there, how"
+
+    assert " ".join(segment.text.strip() for segment in segments) == "Hello there, how are you doing today?"
+    words = [word for segment in segments for word in segment.words]
+    assert [(word.word, round(word.start, 2), round(word.end, 2)) for word in words] == [
+        (word, start, end) for word, start, end in SCRIPT
+    ]
+    assert transcript.committed_text == ""
+
+
+def test_words_that_change_between_transcriptions_are_not_committed() -> None:
+    L.init("test_realtime_transcriber")
+    whisper = FakeWhisper()
+    transcript = IncrementalTranscript(whisper.transcribe, commit_guard_s=0.5)
+    transcript.update(make_audio(2.0))
+
+    whisper.script = [(" Hello", 0.0, 0.4), (" they're", 0.5, 0.9)] + SCRIPT[2:]
+    transcript.update(make_audio(3.0))
+    assert transcript.committed_text == "Hello"
+
+
+def test_partial_worker_transcribes_only_latest_audio_and_finish_drops_pending() -> None:
+    L.init("test_realtime_transcriber")
+    whisper = FakeWhisper()
+    started = threading.Event()
+    release = threading.Event()
+
+    def transcribe(audio: np.ndarray, initial_prompt: str) -> list:
+        started.set()
+        release.wait(timeout=5)
+        return whisper.transcribe(audio, initial_prompt)
+
+    partials: list[str] = []
+    worker = PartialTranscriptionWorker(IncrementalTranscript(transcribe, commit_guard_s=1.0), partials.append)
+    try:
+        worker.submit(make_audio(1.0))
+        assert started.wait(timeout=5)
+        # Submitted while the first is in flight; only the last of these is still pending
+        worker.submit(make_audio(1.5))
+        worker.submit(make_audio(2.0))
+        release.set()
+        deadline = time.monotonic() + 5
+        while len(partials) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [duration for duration, _ in whisper.calls] == [1.0, 2.0]
+        assert partials == ["Hello there,", "Hello there, how are"]
+
+        # Pending audio doesn't get transcribed once the utterance is finished
+        release.clear()
+        started.clear()
+        worker.submit(make_audio(3.0))
+        assert started.wait(timeout=5)
+        worker.submit(make_audio(3.2))
+        release.set()
+        segments = worker.finish(make_audio(3.5))
+        assert " ".join(segment.text.strip() for segment in segments) == "Hello there, how are you doing today?"
+        assert all(duration != 3.2 for duration, _ in whisper.calls)
+    finally:
+        release.set()
+        worker.stop()
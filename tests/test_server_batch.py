@@ -0,0 +1,102 @@
+import threading
+
+import numpy as np
+
+from tts_audiobook_tool.app_types import Sound, StreamChunkCallback, StreamEndCallback
+from tts_audiobook_tool.app_types.phrase import Phrase, PhraseGroup, Reason
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.project import Project
+from tts_audiobook_tool.server.prompt_scheduler import PromptScheduler
+from tts_audiobook_tool.server.server import PromptItem, Server
+from tts_audiobook_tool.tts import Tts
+from tts_audiobook_tool.tts_models.tts_base_model import TtsBaseModel
+from tts_audiobook_tool.tts_models.tts_model_type import TtsModelType
+
+
+class FailingItemModel(TtsBaseModel):
+    """ Batching model which fails any prompt containing "bad" """
+
+    INFO = TtsModelType.VIBEVOICE.value
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def kill(self) -> None:
+        ...
+
+    def generate_using_project(
+            self,
+            project,
+            prompts: list[str],
+            force_random_seed: bool = False,
+            on_stream_chunk: StreamChunkCallback | None = None,
+            on_stream_end: StreamEndCallback | None = None,
+            voice_selection_index: int = 0,
+    ) -> list[Sound | str] | str:
+        self.batches.append(prompts)
+        sr = self.INFO.sample_rate
+        tone = (np.sin(np.arange(sr // 2) / 10) * 0.5).astype(np.float32)
+        return ["Out of memory" if "bad" in prompt else Sound(tone, sr) for prompt in prompts]
+
+
+class FakeAudioStream:
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def append(self, sound: Sound, text: str) -> tuple[int, int]:
+        self.texts.append(text)
+        return 0, len(sound.data)
+
+    def set_first_audio_output_callback(self, sample_index: int, callback) -> None:
+        ...
+
+
+def make_server() -> Server:
+    server = Server.__new__(Server)
+    server._project = Project(dir_path="")
+    server._audio_cache = None
+    server._scheduler = PromptScheduler()
+    server._generation_id = 0
+    server._tts_lock = threading.Lock()
+    server._audio_stream = FakeAudioStream() # type: ignore
+    return server
+
+
+def test_failed_item_does_not_drop_rest_of_coalesced_batch() -> None:
+    L.init("test_server_batch")
+    server = make_server()
+    for client_id, text in [("a", "First good line. "), ("b", "A bad line. "), ("c", "Second good line. ")]:
+        item = PromptItem(
+            PhraseGroup([Phrase(text, Reason.SENTENCE)]),
+            can_eager=False, use_tts_streaming=False, prompt_id=0, generation_id=0
+        )
+        server._scheduler.put(item, client_id=client_id)
+    jobs = server._scheduler.get_batch(3, timeout=0)
+    assert len(jobs) == 3
+
+    model = FailingItemModel()
+    Tts._install_model(model)
+    try:
+        did_output = server.generate_non_streaming_output(
+            [job.payload.phrase_group.text for job in jobs],
+            [job.payload.phrase_group for job in jobs],
+            jobs,
+        )
+    finally:
+        Tts._install_model(None)
+
+    assert len(model.batches) == 1 and len(model.batches[0]) == 3
+    assert did_output
+    assert server._audio_stream.texts == ["First good line. ", "Second good line. "] # type: ignore
+    assert all(job.is_finished for job in jobs)
+
+
+def test_audio_cache_params_hash_follows_project_settings_and_output_mode() -> None:
+    server = make_server()
+    streamed_hash = server.make_audio_cache_params_hash(is_streamed=True)
+    non_streamed_hash = server.make_audio_cache_params_hash(is_streamed=False)
+    assert streamed_hash != non_streamed_hash
+    assert server.make_audio_cache_params_hash(is_streamed=True) == streamed_hash
+
+    server._project.limit_silence_gaps = not server._project.limit_silence_gaps
+    assert server.make_audio_cache_params_hash(is_streamed=True) != streamed_hash
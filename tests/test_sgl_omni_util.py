@@ -69,6 +69,7 @@ def test_generate_streaming_decodes_sse_audio_chunks_and_callbacks():
         return old_transport(*args, **kwargs)
 
     httpx.Client = make_client
+    SglOmniUtil.close_client() # So that the shared client gets recreated with the mock transport
     try:
         result = SglOmniUtil.generate_streaming(
             "http://example.test",
@@ -78,6 +79,7 @@ def test_generate_streaming_decodes_sse_audio_chunks_and_callbacks():
         )
     finally:
         httpx.Client = old_transport
+        SglOmniUtil.close_client()
 
     assert isinstance(result, Sound)
     assert request_payloads == [{"input": "hello", "stream": True}]
@@ -117,6 +119,7 @@ def test_generate_streaming_decodes_raw_pcm_audio_chunks_and_callbacks():
         return old_transport(*args, **kwargs)
 
     httpx.Client = make_client
+    SglOmniUtil.close_client() # So that the shared client gets recreated with the mock transport
     try:
         result = SglOmniUtil.generate_streaming(
             "http://example.test",
@@ -126,6 +129,7 @@ def test_generate_streaming_decodes_raw_pcm_audio_chunks_and_callbacks():
         )
     finally:
         httpx.Client = old_transport
+        SglOmniUtil.close_client()
 
     assert isinstance(result, Sound)
     assert request_payloads == [{"input": "hello", "stream": True, "response_format": "pcm"}]
@@ -162,6 +166,7 @@ def test_generate_streaming_invokes_pcm_callback_per_raw_stream_chunk():
         return old_transport(*args, **kwargs)
 
     httpx.Client = make_client
+    SglOmniUtil.close_client() # So that the shared client gets recreated with the mock transport
     try:
         result = SglOmniUtil.generate_streaming(
             "http://example.test",
@@ -170,8 +175,107 @@ def test_generate_streaming_invokes_pcm_callback_per_raw_stream_chunk():
         )
     finally:
         httpx.Client = old_transport
+        SglOmniUtil.close_client()
 
     assert isinstance(result, Sound)
     assert len(streamed_chunks) == 2
     np.testing.assert_allclose(streamed_chunks[0], chunk_1_i16.astype(np.float32) / 32768.0)
     np.testing.assert_allclose(streamed_chunks[1], chunk_2_i16.astype(np.float32) / 32768.0)
+
+
+def test_generate_concurrent_reuses_shared_client_and_keeps_payload_order():
+    created_clients = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        value = json.loads(request.content.decode("utf-8"))["value"]
+        return httpx.Response(200, content=encode_wav(np.full(4, value, dtype=np.float32)))
+
+    old_transport = httpx.Client
+
+    def make_client(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        client = old_transport(*args, **kwargs)
+        created_clients.append(client)
+        return client
+
+    httpx.Client = make_client
+    SglOmniUtil.close_client()
+    try:
+        first = SglOmniUtil.generate_concurrent("http://example.test", [{"value": 0.25}, {"value": -0.5}])
+        executor = SglOmniUtil.get_executor()
+        second = SglOmniUtil.generate_concurrent("http://example.test", [{"value": 0.5}])
+        assert SglOmniUtil.get_executor() is executor
+    finally:
+        httpx.Client = old_transport
+        SglOmniUtil.close_client()
+
+    assert isinstance(first, list) and isinstance(second, list)
+    sounds = [sound for sound in first + second if isinstance(sound, Sound)]
+    assert len(sounds) == 3
+    assert [round(float(sound.data[0]), 2) for sound in sounds] == [0.25, -0.5, 0.5]
+    assert len(created_clients) == 1
+    assert created_clients[0].is_closed
+
+
+def test_changing_base_url_or_max_connections_recreates_client():
+    old_base_url = SglOmniUtil.get_base_url()
+    old_max_connections = SglOmniUtil.get_max_connections()
+    try:
+        SglOmniUtil.set_base_url("http://one.test")
+        client = SglOmniUtil.get_client()
+        SglOmniUtil.set_base_url("http://one.test")
+        assert SglOmniUtil.get_client() is client
+
+        SglOmniUtil.set_base_url("http://two.test")
+        assert client.is_closed
+        client = SglOmniUtil.get_client()
+
+        SglOmniUtil.set_max_connections(old_max_connections + 1)
+        assert client.is_closed
+    finally:
+        SglOmniUtil.set_max_connections(old_max_connections)
+        SglOmniUtil.set_base_url(old_base_url)
+        SglOmniUtil.close_client()
+
+
+def test_generate_concurrent_isolates_failed_items():
+    def handler(request: httpx.Request) -> httpx.Response:
+        value = json.loads(request.content.decode("utf-8"))["value"]
+        if value < 0:
+            return httpx.Response(500, content=b"out of memory")
+        return httpx.Response(200, content=encode_wav(np.full(4, value, dtype=np.float32)))
+
+    old_transport = httpx.Client
+
+    def make_client(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return old_transport(*args, **kwargs)
+
+    httpx.Client = make_client
+    SglOmniUtil.close_client()
+    try:
+        results = SglOmniUtil.generate_concurrent(
+            "http://example.test", [{"value": 0.25}, {"value": -1.0}, {"value": 0.5}]
+        )
+        all_failed = SglOmniUtil.generate_concurrent("http://example.test", [{"value": -1.0}])
+    finally:
+        httpx.Client = old_transport
+        SglOmniUtil.close_client()
+
+    assert isinstance(results, list) and len(results) == 3
+    assert isinstance(results[0], Sound) and isinstance(results[2], Sound)
+    assert isinstance(results[1], str) and "out of memory" in results[1]
+    assert isinstance(all_failed, str) and "500" in all_failed
+
+
+def test_is_overload_error():
+    request = httpx.Request("POST", "http://example.test")
+
+    def status_error(code: int) -> httpx.HTTPStatusError:
+        return httpx.HTTPStatusError("", request=request, response=httpx.Response(code, request=request))
+
+    assert SglOmniUtil.is_overload_error(httpx.ReadTimeout("", request=request))
+    assert not SglOmniUtil.is_overload_error(httpx.PoolTimeout("", request=request))
+    assert SglOmniUtil.is_overload_error(status_error(503))
+    assert not SglOmniUtil.is_overload_error(status_error(422))
+    assert not SglOmniUtil.is_overload_error(ValueError())
@@ -1,8 +1,14 @@
+import os
+import time
+from unittest.mock import patch
+
 import numpy as np
+import soundfile
 
-from tts_audiobook_tool.app_types import Sound
-from tts_audiobook_tool.app_types.phrase import Reason
+from tts_audiobook_tool.app_types import HighShelfEq, Sound
+from tts_audiobook_tool.app_types.phrase import Phrase, Reason
 from tts_audiobook_tool.reason_pauses import ReasonPauseTypes
+from tts_audiobook_tool.sound.concat_render_cache import ConcatRenderCache
 from tts_audiobook_tool.sound.sound_pipeline import SoundPipeline
 
 
@@ -54,3 +60,57 @@ def test_append_pause_or_section_effect_uses_selected_pause_policy() -> None:
     assert normal_result.duration == sound.duration + normal_pause
     assert shorter_result.duration == sound.duration + shorter_pause
     assert shorter_result.duration < normal_result.duration
+
+
+def test_concat_render_cache_reuses_rendered_segment_until_source_changes(tmp_path) -> None:
+    segment_path = str(tmp_path / "segment.flac")
+    cache_dir = str(tmp_path / "render_cache")
+    soundfile.write(segment_path, np.full(2400, 0.25, dtype=np.float32), 24000, format="FLAC", subtype="PCM_16")
+    phrase = Phrase("Hello.", Reason.SENTENCE)
+
+    def render() -> Sound | str:
+        return SoundPipeline.make_concat_rendered_sound_segment(
+            phrase, segment_path,
+            use_break_sound_effect=False,
+            high_shelf=HighShelfEq.DISABLED,
+            reason_pauses=ReasonPauseTypes.NORMAL.value,
+            add_pause=False,
+            render_cache_dir=cache_dir,
+        )
+
+    with patch.object(SoundPipeline, "render_sound_segment", wraps=SoundPipeline.render_sound_segment) as render_mock:
+        first = render()
+        second = render()
+        assert render_mock.call_count == 1
+
+        soundfile.write(segment_path, np.full(4800, 0.25, dtype=np.float32), 24000, format="FLAC", subtype="PCM_16")
+        third = render()
+        assert render_mock.call_count == 2
+
+    assert isinstance(first, Sound) and isinstance(second, Sound) and isinstance(third, Sound)
+    assert first.sr == second.sr == 48000
+    assert len(first.data) == len(second.data)
+    assert np.allclose(first.data, second.data, atol=1e-6)
+    assert len(third.data) == 2 * len(first.data)
+
+
+def test_concat_render_cache_key_depends_on_render_params() -> None:
+    keys = {
+        ConcatRenderCache.make_params_key(use_upsampler, high_shelf)
+        for use_upsampler in (False, True)
+        for high_shelf in HighShelfEq
+    }
+    assert len(keys) == 2 * len(HighShelfEq)
+
+
+def test_concat_render_cache_prune_deletes_only_stale_entries(tmp_path) -> None:
+    fresh = tmp_path / "fresh.flac"
+    stale = tmp_path / "stale.flac"
+    temp = tmp_path / "partial.flac.tmp"
+    for path in (fresh, stale, temp):
+        path.write_bytes(b"x")
+    old = time.time() - ConcatRenderCache.MAX_AGE_SECONDS - 60
+    os.utime(stale, (old, old))
+
+    assert ConcatRenderCache.prune(str(tmp_path)) == 2
+    assert fresh.exists() and not stale.exists() and not temp.exists()
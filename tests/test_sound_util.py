@@ -0,0 +1,59 @@
+import base64
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import soundfile
+
+from tts_audiobook_tool.app_types import Sound
+from tts_audiobook_tool.sound.sound_file_util import SoundFileUtil
+from tts_audiobook_tool.sound.sound_util import SoundUtil
+
+
+def test_make_audio_data_uri_reads_file_once_until_it_changes(tmp_path: Path) -> None:
+    path = tmp_path / "voice.flac"
+    path.write_bytes(b"first")
+
+    def num_reads() -> int:
+        return [call.args[0] for call in wrapped_open.call_args_list].count(str(path))
+
+    with patch("builtins.open", wraps=open) as wrapped_open:
+        first = SoundUtil.make_audio_data_uri(str(path))
+        again = SoundUtil.make_audio_data_uri(str(path))
+        assert num_reads() == 1
+
+        path.write_bytes(b"second!")
+        os.utime(path, ns=(1, 1))
+        changed = SoundUtil.make_audio_data_uri(str(path))
+        assert num_reads() == 2
+
+    assert first == again == "data:audio/flac;base64," + base64.b64encode(b"first").decode("ascii")
+    assert changed.endswith(base64.b64encode(b"second!").decode("ascii"))
+    assert [key[0] for key in SoundUtil._data_uri_cache].count(str(path.resolve())) == 1
+
+
+def test_load_effect_sound_decodes_once_per_file_version_and_sample_rate(tmp_path: Path) -> None:
+    path = tmp_path / "effect.wav"
+    soundfile.write(str(path), np.full(1600, 0.25, dtype=np.float32), 16000)
+
+    with patch.object(SoundFileUtil, "load", wraps=SoundFileUtil.load) as wrapped_load:
+        first = SoundUtil.load_effect_sound(str(path), 16000)
+        again = SoundUtil.load_effect_sound(str(path), 16000)
+        assert wrapped_load.call_count == 1
+        resampled = SoundUtil.load_effect_sound(str(path), 32000)
+        assert wrapped_load.call_count == 2
+
+        soundfile.write(str(path), np.full(800, 0.5, dtype=np.float32), 16000)
+        os.utime(path, ns=(1, 1))
+        changed = SoundUtil.load_effect_sound(str(path), 16000)
+        assert wrapped_load.call_count == 3
+
+    assert isinstance(first, Sound) and first is again
+    assert first.data.dtype == np.float32 and not first.data.flags.writeable
+    assert isinstance(resampled, Sound) and resampled.sr == 32000 and len(resampled.data) == 3200
+    assert isinstance(changed, Sound) and len(changed.data) == 800
+    assert isinstance(SoundUtil.load_effect_sound(str(tmp_path / "missing.wav"), 16000), str)
+
+    appended = SoundUtil.append_sound_using_path(Sound(np.zeros(10, dtype=np.float32), 16000), str(path))
+    assert len(appended.data) == 810
@@ -93,6 +93,35 @@ class TestTranscribeGranular(unittest.TestCase):
             ]
         )
 
+    def test_word_error_alignment_all_action_types(self):
+        alignment = Validator.get_word_error_alignment(
+            "i saw their angroo",
+            "extra i saw there anne grew",
+            language_code="en",
+        )
+
+        self.assertEqual(
+            [(item.action, item.source_text, item.transcript_text) for item in alignment],
+            [
+                ("skip_transcript", "-", "extra"),
+                ("match_direct", "i", "i"),
+                ("match_direct", "saw", "saw"),
+                ("match_homophone", "their", "there"),
+                ("uncommon_pass_2", "angroo", "anne grew"),
+            ]
+        )
+
+    def test_word_error_alignment_empty_inputs(self):
+        self.assertEqual(Validator.get_word_error_alignment("", "", language_code="en"), [])
+        self.assertEqual(
+            [item.action for item in Validator.get_word_error_alignment("one two", "", language_code="en")],
+            ["skip_source", "skip_source"]
+        )
+        self.assertEqual(
+            [item.action for item in Validator.get_word_error_alignment("", "one two", language_code="en")],
+            ["skip_transcript", "skip_transcript"]
+        )
+
     def test_word_error_visualization(self):
         info = SegmentTranscriptData(
             version=SegmentTranscriptUtil.VERSION,
@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+from typing import cast
+
+import numpy as np
+import pytest
+
+from tts_audiobook_tool.app_types import ConcreteSegment, ConcreteWord, Sound, Strictness
+from tts_audiobook_tool.app_types.phrase import Phrase, PhraseGroup, Reason
+from tts_audiobook_tool.app_types.validation_result import ValidationResult
+from tts_audiobook_tool.constants import WHISPER_SAMPLERATE
+from tts_audiobook_tool.generate_util import GenerateUtil
+from tts_audiobook_tool.state import State
+from tts_audiobook_tool.stt import Stt
+from tts_audiobook_tool.transcriber import Transcriber
+
+
+class FakeBatchingWhisper:
+    """ Emits one word per clip, at 0.5s into the clip """
+
+    supports_clip_batching = True
+    supported_languages = ["en"]
+
+    def __init__(self) -> None:
+        self.clip_calls: list[list[dict[str, float]]] = []
+        self.single_calls = 0
+
+    def transcribe_clips(self, audio, clip_timestamps, *, word_timestamps=False, language=None):
+        self.clip_calls.append(clip_timestamps)
+        segments = []
+        for i, clip in enumerate(clip_timestamps):
+            start = clip["start"] + 0.5
+            word = ConcreteWord(start=start, end=start + 0.25, word=f" clip{i}", probability=0.9)
+            segments.append(ConcreteSegment(start=clip["start"], end=clip["end"], text=word.word, words=[word]))
+        return iter(segments), None
+
+    def transcribe(self, audio, *, word_timestamps=False, language=None, **kwargs):
+        self.single_calls += 1
+        word = ConcreteWord(start=0.1, end=0.2, word=" single", probability=0.9)
+        return iter([ConcreteSegment(start=0.0, end=0.2, text=word.word, words=[word])]), None
+
+
+@pytest.fixture
+def fake_whisper():
+    previous = Stt._whisper
+    whisper = FakeBatchingWhisper()
+    Stt._whisper = whisper  # type: ignore[assignment]
+    try:
+        yield whisper
+    finally:
+        Stt._whisper = previous
+
+
+def make_sound(seconds: float) -> Sound:
+    num_samples = int(seconds * WHISPER_SAMPLERATE)
+    data = (0.1 * np.sin(np.arange(num_samples) / 10)).astype(np.float32)
+    return Sound(data, WHISPER_SAMPLERATE)
+
+
+def test_transcribe_batch_unpacks_words_per_item_with_relative_timestamps(fake_whisper) -> None:
+    sounds = [make_sound(2.0), make_sound(3.0), make_sound(1.0)]
+
+    results = Transcriber.transcribe_batch(sounds, "en", Stt.get_variant(), Stt.get_config())
+
+    assert len(fake_whisper.clip_calls) == 1
+    assert [clip["start"] for clip in fake_whisper.clip_calls[0]] == pytest.approx([0.0, 2.0, 5.0])
+    for i, words in enumerate(results):
+        assert not isinstance(words, str)
+        assert [word.word for word in words] == [f" clip{i}"]
+        assert words[0].start == pytest.approx(0.5)
+        assert words[0].end == pytest.approx(0.75)
+    assert fake_whisper.single_calls == 0
+
+
+def test_transcribe_batch_transcribes_overlong_sounds_individually(fake_whisper) -> None:
+    sounds = [make_sound(1.0), make_sound(31.0), make_sound(1.0)]
+
+    results = Transcriber.transcribe_batch(sounds, "en", Stt.get_variant(), Stt.get_config())
+
+    assert fake_whisper.single_calls == 1
+    assert len(fake_whisper.clip_calls[0]) == 2
+    assert [[word.word for word in words] for words in results] == [[" clip0"], [" single"], [" clip1"]]  # type: ignore[union-attr]
+
+
+def test_transcribe_batch_falls_back_when_backend_cannot_batch(fake_whisper) -> None:
+    fake_whisper.supports_clip_batching = False
+
+    results = Transcriber.transcribe_batch([make_sound(1.0), make_sound(1.0)], "en", Stt.get_variant(), Stt.get_config())
+
+    assert fake_whisper.single_calls == 2
+    assert fake_whisper.clip_calls == []
+    assert [[word.word for word in words] for words in results] == [[" single"], [" single"]]  # type: ignore[union-attr]
+
+
+def test_transcribe_batch_returns_error_string_per_batched_item(fake_whisper) -> None:
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("cuda error")
+
+    fake_whisper.transcribe_clips = fail
+
+    results = Transcriber.transcribe_batch([make_sound(1.0), make_sound(1.0)], "en", Stt.get_variant(), Stt.get_config())
+
+    assert all(isinstance(result, str) and "cuda error" in result for result in results)
+
+
+def test_validate_batch_rechecks_failed_batched_items_individually(fake_whisper) -> None:
+    text = "The quick brown fox jumps over the lazy dog."
+
+    def transcribe(audio, *, word_timestamps=False, language=None, **kwargs):
+        fake_whisper.single_calls += 1
+        words = [
+            ConcreteWord(start=i * 0.1, end=i * 0.1 + 0.05, word=f" {word}", probability=0.9)
+            for i, word in enumerate(text.split())
+        ]
+        return iter([ConcreteSegment(start=0.0, end=1.0, text=text, words=words)]), None
+
+    fake_whisper.transcribe = transcribe
+    phrase_groups = [PhraseGroup([Phrase(text, Reason.SENTENCE)]) for _ in range(2)]
+    state = cast(State, SimpleNamespace(
+        project=SimpleNamespace(language_code="en", strictness=list(Strictness)[0]),
+        prefs=SimpleNamespace(save_debug_files=False),
+    ))
+    gen_results: list = [(make_sound(1.0), [], None, None, 1.0, None, "") for _ in phrase_groups]
+
+    results = GenerateUtil.validate_batch(
+        state, [0, 1], phrase_groups, gen_results, Stt.get_variant(), Stt.get_config(),
+        is_realtime=False, skip_reason="", print_progress=False
+    )
+
+    # The batched transcripts (" clip0", " clip1") fail, the individual ones pass
+    assert len(fake_whisper.clip_calls) == 1
+    assert fake_whisper.single_calls == 2
+    assert all(isinstance(result, ValidationResult) and not result.is_fail for result in results)
@@ -1,9 +1,12 @@
 import os
 
+import numpy as np
 import pytest
 
+from tts_audiobook_tool.l import L
 from tts_audiobook_tool.tts_models.tts_base_model import TtsBaseModel
 from tts_audiobook_tool.tts_models.tts_model_type import TtsModelType
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 
 
 class FakeTtsModel(TtsBaseModel):
@@ -23,6 +26,27 @@ class MultiVoiceFakeTtsModel(FakeTtsModel):
     SUPPORTS_MULTIPLE_VOICE_CLONES = True
 
 
+class DiskCachingFakeTtsModel(FakeTtsModel):
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
+
+    def _voice_clone_to_arrays(self, value):
+        return {"value": np.array(value)}
+
+    def _voice_clone_from_arrays(self, arrays, source_path, transcript):
+        return str(arrays["value"])
+
+
+@pytest.fixture
+def voice_clone_disk_cache(tmp_path):
+    VoiceCloneDiskCache.set_dir(str(tmp_path / "cache"))
+    VoiceCloneDiskCache.set_enabled(True)
+    try:
+        yield str(tmp_path / "cache")
+    finally:
+        VoiceCloneDiskCache.set_enabled(False)
+        VoiceCloneDiskCache.set_dir("")
+
+
 def make_factory(calls: list[str], value: str):
     def factory():
         calls.append(value)
@@ -141,3 +165,75 @@ def test_clear_voice_clone_cache_is_idempotent(tmp_path):
     model.clear_voice_clone_cache()
 
     assert model._voice_clone_cache == {}
+
+
+def test_disk_cache_survives_new_model_instance_and_voice_alternation(tmp_path, voice_clone_disk_cache):
+    voice_a = tmp_path / "a.wav"
+    voice_b = tmp_path / "b.wav"
+    voice_a.write_bytes(b"a")
+    voice_b.write_bytes(b"b")
+    calls: list[str] = []
+
+    model = DiskCachingFakeTtsModel()
+    assert model.get_or_create(str(voice_a), "a", make_factory(calls, "a1")) == "a1"
+    assert model.get_or_create(str(voice_b), "b", make_factory(calls, "b1")) == "b1"
+    # Single-voice model drops "a" from memory, but it comes back from disk
+    assert model.get_or_create(str(voice_a), "a", make_factory(calls, "unused")) == "a1"
+
+    model = DiskCachingFakeTtsModel()
+    assert model.get_or_create(str(voice_b), "b", make_factory(calls, "unused")) == "b1"
+    assert calls == ["a1", "b1"]
+    assert len(os.listdir(voice_clone_disk_cache)) == 2
+
+    # Different transcript is a different entry
+    assert model.get_or_create(str(voice_b), "other", make_factory(calls, "b2")) == "b2"
+    assert calls == ["a1", "b1", "b2"]
+
+
+def test_disk_cache_is_opt_in(tmp_path, voice_clone_disk_cache):
+    voice_path = tmp_path / "voice.wav"
+    voice_path.write_bytes(b"voice")
+    calls: list[str] = []
+
+    # Model without disk cache support
+    FakeTtsModel().get_or_create(str(voice_path), "words", make_factory(calls, "one"))
+    assert not os.path.exists(voice_clone_disk_cache)
+
+    VoiceCloneDiskCache.set_enabled(False)
+    DiskCachingFakeTtsModel().get_or_create(str(voice_path), "words", make_factory(calls, "two"))
+    assert not os.path.exists(voice_clone_disk_cache)
+
+
+def test_unreadable_disk_cache_entry_falls_back_to_factory(tmp_path, voice_clone_disk_cache):
+    L.init("test_tts_base_model_voice_cache")
+    voice_path = tmp_path / "voice.wav"
+    voice_path.write_bytes(b"voice")
+    calls: list[str] = []
+
+    DiskCachingFakeTtsModel().get_or_create(str(voice_path), "words", make_factory(calls, "one"))
+    entry_path = os.path.join(voice_clone_disk_cache, os.listdir(voice_clone_disk_cache)[0])
+    with open(entry_path, "wb") as f:
+        f.write(b"garbage")
+
+    assert DiskCachingFakeTtsModel().get_or_create(str(voice_path), "words", make_factory(calls, "two")) == "two"
+    assert calls == ["one", "two"]
+
+
+def test_disk_cache_tensor_round_trip_keeps_dtype():
+    torch = pytest.importorskip("torch")
+    tensors = {
+        "tokens": torch.arange(6, dtype=torch.int64).reshape(2, 3),
+        "embedding": torch.tensor([0.5, -1.25], dtype=torch.bfloat16),
+        "missing": None,
+    }
+
+    arrays = VoiceCloneDiskCache.tensors_to_arrays(tensors)
+    arrays["other"] = np.array("not a tensor")
+    restored = VoiceCloneDiskCache.arrays_to_tensors(arrays)
+
+    assert set(restored) == {"tokens", "embedding"}
+    assert restored["tokens"].dtype == torch.int64
+    assert torch.equal(restored["tokens"], tensors["tokens"])
+    assert restored["embedding"].dtype == torch.bfloat16
+    assert torch.equal(restored["embedding"], tensors["embedding"])
+
@@ -0,0 +1,170 @@
+"""
+Benchmarks the enhance-flow forced alignment (`enhance_alignment.align_phrases_with_state`)
+against the previous implementation (character-level difflib scoring of every candidate span),
+using a synthetic book and a noisy synthetic transcript.
+
+Reports elapsed time for both, and how many phrases got identical timings.
+
+    python testx/enhance_alignment_benchmark.py [num_phrases] [num_phrases_new_only]
+"""
+
+from __future__ import annotations
+
+import difflib
+import random
+import sys
+import time
+from unittest.mock import patch
+
+from tts_audiobook_tool.app_types import ConcreteWord, Word
+from tts_audiobook_tool.app_types.phrase import Phrase, Reason
+from tts_audiobook_tool.app_types.timed_phrase import TimedPhrase
+from tts_audiobook_tool.enhance import enhance_alignment
+from tts_audiobook_tool.enhance.enhance_alignment import (
+    MAX_SKIP_WORDS_BASE, MAX_SKIP_WORDS_LIMIT, MIN_MATCH_RATIO, AlignmentState, normalize_text
+)
+
+SEED = 1234
+SECONDS_PER_WORD = 0.35
+DROP_RATE = 0.03
+MISSPELL_RATE = 0.03
+INSERT_RATE = 0.02
+HALLUCINATION_EVERY_N_PHRASES = 150
+
+
+def make_book(num_phrases: int, rng: random.Random) -> tuple[list[Phrase], list[Word]]:
+    vocabulary = [
+        "the", "a", "and", "of", "to", "in", "he", "she", "said", "was", "it", "that", "his", "her",
+        "house", "river", "morning", "letter", "window", "captain", "garden", "silence", "stranger",
+        "quickly", "never", "always", "remembered", "walked", "across", "beneath", "thousand",
+        "winter", "lantern", "station", "village", "whisper", "promise", "carriage", "harbour",
+    ] + [f"name{i}" for i in range(200)]
+
+    phrases: list[Phrase] = []
+    words: list[Word] = []
+    t = 0.0
+
+    def add_word(text: str) -> None:
+        nonlocal t
+        words.append(ConcreteWord(t, t + SECONDS_PER_WORD * 0.8, " " + text, 1.0))
+        t += SECONDS_PER_WORD
+
+    for phrase_index in range(num_phrases):
+        phrase_words = [rng.choice(vocabulary) for _ in range(rng.randint(3, 25))]
+        text = " ".join(phrase_words).capitalize() + rng.choice([".", ",", "!", "?"])
+        phrases.append(Phrase(text + " ", Reason.SENTENCE))
+
+        if phrase_index % HALLUCINATION_EVERY_N_PHRASES == HALLUCINATION_EVERY_N_PHRASES - 1:
+            for _ in range(12):
+                add_word(rng.choice(vocabulary))
+
+        for word in phrase_words:
+            roll = rng.random()
+            if roll < DROP_RATE:
+                continue
+            if roll < DROP_RATE + MISSPELL_RATE and len(word) > 3:
+                position = rng.randrange(len(word))
+                word = word[:position] + word[position + 1:]
+            add_word(word)
+            if rng.random() < INSERT_RATE:
+                add_word(rng.choice(vocabulary))
+        words[-1] = ConcreteWord(words[-1].start, words[-1].end, words[-1].word + text[-1], 1.0)
+        t += 0.5
+
+    return phrases, words
+
+
+def legacy_align(phrases: list[Phrase], transcribed_words: list[Word]) -> list[TimedPhrase]:
+    """ Previous implementation, minus printing """
+    result: list[TimedPhrase] = []
+    state = AlignmentState()
+
+    for segment_index, segment in enumerate(phrases):
+        text_normed = normalize_text(segment.text)
+        num_words = len(text_normed.split())
+        best = None
+
+        start_max = min(state.cursor + state.max_skip_words, len(transcribed_words))
+        for start in range(state.cursor, start_max):
+            length_min = int(num_words * 0.75) or 1
+            length_max = num_words + max(int(num_words * 0.25), 2)
+            end_max = min(start + length_max, len(transcribed_words))
+            for end in range(start + length_min, end_max + 1):
+                trans_words = transcribed_words[start:end]
+                if not trans_words:
+                    continue
+                trans_text_normed = " ".join(normalize_text(item.word) for item in trans_words)
+                if not trans_text_normed:
+                    continue
+                a, b = text_normed, trans_text_normed
+                if segment_index > 0 and state.cursor > 0 and start > 0:
+                    previous_segment_word = normalize_text(normalize_text(phrases[segment_index - 1].text).split(" ")[-1])
+                    previous_trans_word = normalize_text(transcribed_words[state.cursor - 1].word)
+                    if previous_segment_word and previous_trans_word:
+                        a = previous_segment_word + " " + a
+                        b = previous_trans_word + " " + b
+                score = difflib.SequenceMatcher(None, a, b).ratio()
+                if not best or score > best[2]:
+                    best = (start, end, score)
+
+        if best and best[2] >= MIN_MATCH_RATIO:
+            start, end, _ = best
+            end_time = transcribed_words[end].start if end < len(transcribed_words) else transcribed_words[end - 1].end
+            result.append(TimedPhrase(segment.text, transcribed_words[start].start, end_time))
+            state.cursor = end
+            state.max_skip_words = MAX_SKIP_WORDS_BASE
+        else:
+            result.append(TimedPhrase(segment.text, 0.0, 0.0))
+            state.max_skip_words = min(state.max_skip_words + len(segment.text.split(" ")) * 2, MAX_SKIP_WORDS_LIMIT)
+
+        if state.cursor >= len(transcribed_words) - 1:
+            result.extend(TimedPhrase(item.text, 0.0, 0.0) for item in phrases[segment_index + 1:])
+            break
+
+    return result
+
+
+def align(phrases: list[Phrase], words: list[Word]) -> list[TimedPhrase]:
+    timed_phrases, _, _ = enhance_alignment.align_phrases_with_state(phrases, words, print_info=False)
+    return timed_phrases
+
+
+def num_matched(timed_phrases: list[TimedPhrase]) -> int:
+    return sum(1 for item in timed_phrases if item.time_end > 0)
+
+
+def main() -> None:
+    num_phrases = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    num_phrases_new_only = int(sys.argv[2]) if len(sys.argv) > 2 else 15_000
+
+    phrases, words = make_book(num_phrases, random.Random(SEED))
+    print(f"Book: {len(phrases)} phrases, {len(words)} transcript words ({words[-1].end / 3600:.1f}h)")
+
+    with patch.object(enhance_alignment, "DEBUG", False):
+        start_time = time.perf_counter()
+        legacy = legacy_align(phrases, words)
+        legacy_elapsed = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        new = align(phrases, words)
+        new_elapsed = time.perf_counter() - start_time
+
+        same = sum(
+            1 for a, b in zip(legacy, new)
+            if abs(a.time_start - b.time_start) < 1e-6 and abs(a.time_end - b.time_end) < 1e-6
+        )
+        print(f"legacy: {legacy_elapsed:8.3f}s  matched {num_matched(legacy)}/{len(legacy)}")
+        print(f"new:    {new_elapsed:8.3f}s  matched {num_matched(new)}/{len(new)}")
+        print(f"speedup: {legacy_elapsed / max(new_elapsed, 1e-9):.1f}x, identical timings: {same}/{len(phrases)}")
+
+        if num_phrases_new_only:
+            phrases, words = make_book(num_phrases_new_only, random.Random(SEED))
+            print()
+            print(f"Book: {len(phrases)} phrases, {len(words)} transcript words ({words[-1].end / 3600:.1f}h)")
+            start_time = time.perf_counter()
+            new = align(phrases, words)
+            print(f"new:    {time.perf_counter() - start_time:8.3f}s  matched {num_matched(new)}/{len(new)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -365,6 +365,12 @@ def main() -> None:
                                         pending_sentences.pop(0)
                                 continue
                             sound = result[0]
+                            if isinstance(sound, str):
+                                print(f"\n[TTS error: {sound}]", flush=True)
+                                with state_lock:
+                                    if pending_sentences and pending_sentences[0] == text:
+                                        pending_sentences.pop(0)
+                                continue
                             if sound_stream is None:
                                 sound_stream = SoundDeviceStream(sound.sr)
                                 sound_stream.start()
@@ -0,0 +1,86 @@
+import threading
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD (additive increase, multiplicative decrease) limit on the number of requests
+    in flight to a server, shared by all threads making requests.
+
+    Each request is bracketed by `acquire()` / `release()`. The limit:
+    - grows by about one slot per "round" of requests that complete normally
+    - is halved when a request fails in a way that suggests an overloaded server
+      (timeout, 5xx), or when it's slow compared to the fastest seen so far
+
+    Latency is judged in terms of seconds per second of generated audio, since
+    line lengths (and thus raw request durations) vary a lot.
+
+    Only requests started after the most recent decrease can cause another decrease,
+    so that a burst of failures from the same round only halves the limit once.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_tolerance: float = 0.0) -> None:
+        self._max_limit = max(1, max_limit)
+        self._min_limit = max(1, min(min_limit, self._max_limit))
+        self._latency_tolerance = latency_tolerance or LATENCY_TOLERANCE
+        self._limit = float(self._max_limit)
+        self._in_flight = 0
+        self._num_started = 0
+        self._decrease_ticket = 0
+        self._best_rtf = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        with self._condition:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        with self._condition:
+            return self._in_flight
+
+    def acquire(self) -> int:
+        """
+        Blocks until a slot is available. Returns a ticket to pass to `release()`.
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            self._num_started += 1
+            return self._num_started
+
+    def release(self, ticket: int, is_overloaded: bool = False, elapsed: float = 0.0, audio_duration: float = 0.0) -> None:
+        """
+        :param is_overloaded: Request failed in a way that suggests the server is overloaded
+        :param elapsed: Request duration in seconds
+        :param audio_duration: Duration of the generated audio, if any
+        """
+        with self._condition:
+            self._in_flight -= 1
+
+            is_slow = False
+            if not is_overloaded and elapsed > 0 and audio_duration > 0:
+                rtf = elapsed / audio_duration
+                if self._best_rtf <= 0 or rtf < self._best_rtf:
+                    self._best_rtf = rtf
+                else:
+                    is_slow = rtf > self._best_rtf * self._latency_tolerance
+                    # Let the baseline drift up slowly, in case the server's best case changes
+                    self._best_rtf *= BASELINE_DRIFT
+
+            if is_overloaded or is_slow:
+                if ticket > self._decrease_ticket:
+                    self._limit = max(float(self._min_limit), self._limit / 2)
+                    self._decrease_ticket = self._num_started
+            else:
+                self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+
+            self._condition.notify_all()
+
+# ---
+
+# A request is "slow" when its seconds-per-audio-second is this many times the best seen
+LATENCY_TOLERANCE = 2.0
+
+BASELINE_DRIFT = 1.01
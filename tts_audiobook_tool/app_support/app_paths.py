@@ -21,6 +21,14 @@ def get_chromium_user_data_dir() -> str:
     return os.path.join(get_app_user_dir(), CHROME_USER_DATA_DIR_NAME)
 
 
+def get_voice_clone_cache_dir() -> str:
+    return os.path.join(get_app_user_dir(), VOICE_CLONE_CACHE_DIR_NAME)
+
+
+def get_server_audio_cache_dir() -> str:
+    return os.path.join(get_app_user_dir(), SERVER_AUDIO_CACHE_DIR_NAME)
+
+
 def get_temp_file_path_by_hash(hash: str) -> str:
     """
     Returns file path of item in the app temp directory or empty string
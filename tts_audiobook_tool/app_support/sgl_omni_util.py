@@ -1,14 +1,19 @@
 from io import BytesIO
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import base64
 import json
+import threading
+import time
+from typing import cast
 import httpx
 import numpy as np
 import soundfile
 
 from tts_audiobook_tool.l import L
+from tts_audiobook_tool.app_support.adaptive_concurrency import AdaptiveConcurrency
 from tts_audiobook_tool.app_types import ReadinessIssue, Sound, StreamChunkCallback, StreamEndCallback
 from tts_audiobook_tool.constants import COL_DIM_ITALICS
+from tts_audiobook_tool.constants_config import SGL_OMNI_MAX_CONNECTIONS_DEFAULT
 from tts_audiobook_tool.text_util import make_terminal_hyperlink
 from tts_audiobook_tool.tts_models.tts_model_type import TtsModelType
 from tts_audiobook_tool.util import *
@@ -18,19 +23,91 @@ class SglOmniUtil:
     """
     Utility functions for interacting with SGL-Omni server
     Maintains some static state
+
+    All requests go through a single long-lived httpx client (see `get_client()`),
+    so that connections to the server are kept alive and reused across requests,
+    and concurrent requests are dispatched on a persistent thread pool.
     """
 
     _base_url: str = ""
     _model_id: str = ""
 
+    _max_connections: int = SGL_OMNI_MAX_CONNECTIONS_DEFAULT
+    _client: httpx.Client | None = None
+    _executor: ThreadPoolExecutor | None = None
+    _concurrency: AdaptiveConcurrency | None = None
+    _client_lock = threading.Lock()
+
     @staticmethod
     def get_base_url() -> str:
         return SglOmniUtil._base_url
     
     @staticmethod
     def set_base_url(s: str) -> None:
+        if s != SglOmniUtil._base_url:
+            # Don't hold on to idle connections to the previous server
+            SglOmniUtil.close_client()
         SglOmniUtil._base_url = s
 
+    @staticmethod
+    def get_max_connections() -> int:
+        return SglOmniUtil._max_connections
+
+    @staticmethod
+    def set_max_connections(value: int) -> None:
+        """
+        Max number of simultaneous connections (and concurrent requests) to the server
+        (see the `--sgl-omni-connections` command line argument)
+        """
+        value = max(1, value)
+        if value != SglOmniUtil._max_connections:
+            SglOmniUtil._max_connections = value
+            SglOmniUtil.close_client()
+            with SglOmniUtil._client_lock:
+                SglOmniUtil._concurrency = None
+
+    @staticmethod
+    def get_client() -> httpx.Client:
+        """
+        Returns the lazy-initialized, shared httpx client (thread-safe)
+        """
+        with SglOmniUtil._client_lock:
+            if SglOmniUtil._client is None:
+                limits = httpx.Limits(
+                    max_connections=SglOmniUtil._max_connections,
+                    max_keepalive_connections=SglOmniUtil._max_connections,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                )
+                SglOmniUtil._client = httpx.Client(timeout=GENERATE_TIMEOUT, limits=limits)
+            return SglOmniUtil._client
+
+    @staticmethod
+    def get_executor() -> ThreadPoolExecutor:
+        """
+        Returns the lazy-initialized thread pool used by `generate_concurrent()`
+        """
+        with SglOmniUtil._client_lock:
+            if SglOmniUtil._executor is None:
+                SglOmniUtil._executor = ThreadPoolExecutor(
+                    max_workers=SglOmniUtil._max_connections, thread_name_prefix="sgl-omni"
+                )
+            return SglOmniUtil._executor
+
+    @staticmethod
+    def close_client() -> None:
+        """
+        Closes the shared client and thread pool, if any. They get recreated on next use.
+        """
+        with SglOmniUtil._client_lock:
+            client = SglOmniUtil._client
+            executor = SglOmniUtil._executor
+            SglOmniUtil._client = None
+            SglOmniUtil._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if client is not None:
+            client.close()
+
     @staticmethod
     def get_model_id() -> str:
         return SglOmniUtil._model_id
@@ -42,7 +119,7 @@ class SglOmniUtil:
         """
         url = SglOmniUtil._base_url + MODELS_PATH
         try:
-            response = httpx.get(url, timeout=2.0)
+            response = SglOmniUtil.get_client().get(url, timeout=2.0)
             response.raise_for_status()
             data = response.json()
         except Exception as e:
@@ -76,7 +153,7 @@ class SglOmniUtil:
         # Ping health endpoint
         url = base_url + HEALTH_PATH
         try:
-            response = httpx.get(url, timeout=2.0)
+            response = SglOmniUtil.get_client().get(url, timeout=2.0)
             response.raise_for_status()
             data = response.json()
         except Exception as e:
@@ -101,7 +178,7 @@ class SglOmniUtil:
         # Ping models endpoint
         url = base_url + MODELS_PATH
         try:
-            response = httpx.get(url, timeout=2.0)
+            response = SglOmniUtil.get_client().get(url, timeout=2.0)
             response.raise_for_status()
             data = response.json()
         except Exception as e:
@@ -130,60 +207,104 @@ class SglOmniUtil:
         """
         POSTs to sgl-omni sound generation endpoint (.../speech) and returns Sound or error string
         """
-        
-        url = base_url + SPEECH_PATH
-
-        if print:
-            s = f"{COL_DIM_ITALICS}Sending generation request to {make_terminal_hyperlink(url)}...{Ansi.RESET}\n"
-            s += COL_DIM + pretty_json_string(payload)
-            printt(s)
-
         try:
-            with httpx.Client(timeout=GENERATE_TIMEOUT) as client:
-                with client.stream("POST", url, json=payload) as response:
-                    SglOmniUtil.raise_for_response_error(response)
-
-                    content = response.read()
-
-            return SglOmniUtil.sound_from_encoded_audio(content)
-
+            return SglOmniUtil._post_generate(base_url, payload, print)
         except Exception as e:
             return make_error_string(e)
 
     @staticmethod
-    def generate_concurrent(endpoint: str, payloads: list[dict], print_request: bool = False) -> list[Sound] | str:
+    def generate_concurrent(endpoint: str, payloads: list[dict], print_request: bool = False) -> list[Sound | str] | str:
+        """
+        Generates one sound per payload, concurrently.
+
+        Returns a list of results in the same order as `payloads`, where a failed item is
+        an error string rather than a Sound (so that the caller can retry just that item).
+        Returns a single error string if every item failed.
+
+        The number of requests in flight is governed by `get_concurrency()`, which backs off
+        when the server times out, returns 5xx errors, or gets slower under load.
+        """
 
         if len(payloads) == 0:
             return []
 
-        num_workers = len(payloads)
-        executor = ThreadPoolExecutor(max_workers=num_workers)
-        futures = {
-            executor.submit(SglOmniUtil.generate, endpoint, payload, print=print_request): index
+        executor = SglOmniUtil.get_executor()
+        futures: dict[Future, int] = {
+            executor.submit(SglOmniUtil._generate_limited, endpoint, payload, print_request): index
             for index, payload in enumerate(payloads)
         }
-        results: list[Sound | None] = [None] * len(payloads)
+        results: list[Sound | str] = [""] * len(payloads)
 
         try:
             for future in as_completed(futures):
                 index = futures[future]
                 try:
-                    result = future.result()
+                    results[index] = future.result()
                 except Exception as e:
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    return make_error_string(e)
+                    results[index] = make_error_string(e)
+        finally:
+            # Cancels any requests not yet started (no-op when all are done)
+            for future in futures:
+                future.cancel()
 
-                if isinstance(result, str):
-                    # On any error, immediately return error string 
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    return result
+        if all(isinstance(result, str) for result in results):
+            return cast(str, results[0])
+        return results
 
-                results[index] = result
+    @staticmethod
+    def get_concurrency() -> AdaptiveConcurrency:
+        """
+        Returns the adaptive limit on concurrent generation requests (thread-safe)
+        """
+        with SglOmniUtil._client_lock:
+            if SglOmniUtil._concurrency is None:
+                SglOmniUtil._concurrency = AdaptiveConcurrency(SglOmniUtil._max_connections)
+            return SglOmniUtil._concurrency
 
-        finally:
-            executor.shutdown(wait=False, cancel_futures=True)
+    @staticmethod
+    def _generate_limited(base_url: str, payload: dict, print: bool) -> Sound | str:
+        concurrency = SglOmniUtil.get_concurrency()
+        ticket = concurrency.acquire()
+        start_time = time.perf_counter()
+        try:
+            sound = SglOmniUtil._post_generate(base_url, payload, print)
+        except Exception as e:
+            concurrency.release(ticket, is_overloaded=SglOmniUtil.is_overload_error(e))
+            return make_error_string(e)
+        concurrency.release(ticket, elapsed=time.perf_counter() - start_time, audio_duration=sound.duration)
+        return sound
 
-        return [result for result in results if result is not None]
+    @staticmethod
+    def _post_generate(base_url: str, payload: dict, print: bool) -> Sound:
+        """ Raises on error """
+
+        url = base_url + SPEECH_PATH
+
+        if print:
+            s = f"{COL_DIM_ITALICS}Sending generation request to {make_terminal_hyperlink(url)}...{Ansi.RESET}\n"
+            s += COL_DIM + pretty_json_string(payload)
+            printt(s)
+
+        with SglOmniUtil.get_client().stream("POST", url, json=payload) as response:
+            SglOmniUtil.raise_for_response_error(response)
+            content = response.read()
+
+        return SglOmniUtil.sound_from_encoded_audio(content)
+
+    @staticmethod
+    def is_overload_error(e: Exception) -> bool:
+        """
+        Returns True if the exception suggests the server is saturated (as opposed to
+        eg a bad request), ie, a timeout or a 5xx response.
+        A pool timeout doesn't count: it means our own connection pool is exhausted.
+        """
+        if isinstance(e, httpx.PoolTimeout):
+            return False
+        if isinstance(e, httpx.TimeoutException):
+            return True
+        if isinstance(e, httpx.HTTPStatusError):
+            return e.response.status_code >= 500
+        return False
 
     @staticmethod
     def generate_streaming(
@@ -213,41 +334,40 @@ class SglOmniUtil:
         sample_rate = 0
 
         try:
-            with httpx.Client(timeout=GENERATE_TIMEOUT) as client:
-                with client.stream("POST", url, json=payload) as response:
-                    SglOmniUtil.raise_for_response_error(response)
-
-                    content_type = response.headers.get("content-type", "").lower()
-                    if content_type.startswith("audio/pcm") or payload.get("response_format") == "pcm":
-                        return SglOmniUtil.consume_pcm_streaming_response(
-                            response,
-                            on_stream_chunk=on_stream_chunk,
-                            on_stream_end=on_stream_end,
-                        )
-
-                    for line in response.iter_lines():
-                        if not line:
-                            continue
-                        if line == "data: [DONE]":
-                            break
-                        if not line.startswith("data: "):
-                            continue
-
-                        event = json.loads(line[len("data: "):])
-                        if event.get("finish_reason") == "stop":
-                            break
-
-                        audio = event.get("audio") or {}
-                        audio_data = audio.get("data")
-                        if not audio_data:
-                            continue
-
-                        sound = SglOmniUtil.sound_from_encoded_audio(base64.b64decode(audio_data))
-                        L.i(f"received streaming audio chunk: {sound.data.size} samples at {sound.sr} Hz")
-                        sample_rate = sound.sr or sample_rate
-                        chunks.append(sound.data)
-                        if on_stream_chunk is not None:
-                            on_stream_chunk(sound.data)
+            with SglOmniUtil.get_client().stream("POST", url, json=payload) as response:
+                SglOmniUtil.raise_for_response_error(response)
+
+                content_type = response.headers.get("content-type", "").lower()
+                if content_type.startswith("audio/pcm") or payload.get("response_format") == "pcm":
+                    return SglOmniUtil.consume_pcm_streaming_response(
+                        response,
+                        on_stream_chunk=on_stream_chunk,
+                        on_stream_end=on_stream_end,
+                    )
+
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    if line == "data: [DONE]":
+                        break
+                    if not line.startswith("data: "):
+                        continue
+
+                    event = json.loads(line[len("data: "):])
+                    if event.get("finish_reason") == "stop":
+                        break
+
+                    audio = event.get("audio") or {}
+                    audio_data = audio.get("data")
+                    if not audio_data:
+                        continue
+
+                    sound = SglOmniUtil.sound_from_encoded_audio(base64.b64decode(audio_data))
+                    L.i(f"received streaming audio chunk: {sound.data.size} samples at {sound.sr} Hz")
+                    sample_rate = sound.sr or sample_rate
+                    chunks.append(sound.data)
+                    if on_stream_chunk is not None:
+                        on_stream_chunk(sound.data)
 
             if not chunks:
                 return "No audio output"
@@ -368,6 +488,9 @@ GENERATE_TIMEOUT = httpx.Timeout(
     pool=5.0,
 )
 
+# Seconds an idle kept-alive connection is held on to
+KEEPALIVE_EXPIRY = 60.0
+
 HEALTH_PATH = "/health"
 MODELS_PATH = "/v1/models"
 SPEECH_PATH = "/v1/audio/speech"
@@ -1,8 +1,13 @@
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import partial
 import json
 import os
+import shutil
 import subprocess
+import threading
 import time
+from typing import Callable
 from pathlib import Path
 
 import numpy as np
@@ -12,13 +17,15 @@ from tts_audiobook_tool import app_support
 from tts_audiobook_tool.app_support import app_hint_util
 from tts_audiobook_tool.app_support import app_paths
 from tts_audiobook_tool.system_support.browser import get_chromium_info, launch_player_with_chromium
-from tts_audiobook_tool.app_types import SectionMarkerMode, ExportType, HighShelfEq, NormalizationType, Sound
+from tts_audiobook_tool.app_types import SectionMarkerMode, ExportType, HighShelfEq, NormalizationSpecs, NormalizationType, Sound
 from tts_audiobook_tool import ask
 from tts_audiobook_tool.model_manager import ModelManager
 from tts_audiobook_tool.project_support.project_book_util import ProjectBookUtil
 from tts_audiobook_tool.project_support.project_serialization_util import ProjectSerializationUtil
 from tts_audiobook_tool.project_support.project_text_io_util import ProjectTextIOUtil
 from tts_audiobook_tool.project_support.segment_transcript_util import SegmentTranscriptUtil
+from tts_audiobook_tool.sound.ffmpeg_util import FfmpegUtil
+from tts_audiobook_tool.sound.loudness_meter import LoudnessMeter, LoudnessStats
 from tts_audiobook_tool.sound.loudness_normalization_util import LoudnessNormalizationUtil
 from tts_audiobook_tool.sound import m4b_chapter_util
 from tts_audiobook_tool.l import L
@@ -26,6 +33,7 @@ from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.reason_pauses import ReasonPauses
 from tts_audiobook_tool.sound.lava_sr_util import LavaSrUtil
 from tts_audiobook_tool.sound.silence_util import SilenceUtil
+from tts_audiobook_tool.sound.concat_render_cache import ConcatRenderCache
 from tts_audiobook_tool.sound.sound_pipeline import SoundPipeline
 from tts_audiobook_tool.project_support.sound_segment_util import SoundSegmentUtil, get_segment_stt_info_path
 from tts_audiobook_tool.app_support.interrupts import Interrupts
@@ -101,18 +109,13 @@ class ConcatUtil:
         if not file_cut_indices:
             file_cut_indices = [0]
 
-        last_dest_path = ""
-        for i, file_cut_index in enumerate(file_cut_indices):
-
-            message = "Creating concatenated audiobook file"
-            if len(file_cut_indices) > 1:
-                message += f" {i+1} of {len(file_cut_indices)} - output file {file_cut_index+1}"
-            message += "..."
-            dash_line = "-" * len(message)
-            printt(f"{COL_ACCENT}{dash_line}")
-            printt(f"{COL_ACCENT}{message}")
-            printt()
+        num_pruned = ConcatRenderCache.prune(state.project.render_cache_path)
+        if num_pruned:
+            L.d(f"Pruned {num_pruned} stale render cache entries")
 
+        # Output files' line ranges and destination paths
+        jobs: list[tuple[int, int, int, str]] = [] # file_cut_index, index_start, index_end, stem path
+        for file_cut_index in file_cut_indices:
             if state.project.chapter_mode == SectionMarkerMode.FILES:
                 ranges = make_file_line_ranges(state.project.markers, len(state.project.phrase_groups))
                 index_start, index_end = ranges[file_cut_index]
@@ -126,25 +129,53 @@ class ConcatUtil:
                 index_start=index_start, index_end=index_end, 
                 file_cut_index=file_cut_index, num_chapters=num_chapters
             )
-            dest_stem_path = os.path.join(dest_dir, stem)
+            jobs.append((file_cut_index, index_start, index_end, os.path.join(dest_dir, stem)))
 
-            dest_path, err = ConcatUtil.make_file(
+        num_workers = min(state.prefs.export_workers, len(jobs))
+        if num_workers > 1:
+            last_dest_path, err = ConcatUtil.make_files_in_parallel(
                 state=state,
-                index_start=index_start,
-                index_end=index_end,
+                jobs=jobs,
                 bookmark_indices=bookmark_indices,
-                stem_path=dest_stem_path,
                 use_upsampler=use_upsampler,
+                num_workers=num_workers
             )
             if err:
                 ModelManager.clear_lava_sr_upsampler()
                 printt()
                 ask.ask_error(err)
                 return
-            last_dest_path = dest_path
-            
-            printt(f"{COL_ACCENT}Saved {COL_DEFAULT}{make_terminal_hyperlink(dest_path)}") 
-            printt()
+
+        else:
+            last_dest_path = ""
+            for i, (file_cut_index, index_start, index_end, dest_stem_path) in enumerate(jobs):
+
+                message = "Creating concatenated audiobook file"
+                if len(jobs) > 1:
+                    message += f" {i+1} of {len(jobs)} - output file {file_cut_index+1}"
+                message += "..."
+                dash_line = "-" * len(message)
+                printt(f"{COL_ACCENT}{dash_line}")
+                printt(f"{COL_ACCENT}{message}")
+                printt()
+
+                dest_path, err = ConcatUtil.make_file(
+                    state=state,
+                    index_start=index_start,
+                    index_end=index_end,
+                    bookmark_indices=bookmark_indices,
+                    stem_path=dest_stem_path,
+                    use_upsampler=use_upsampler,
+                )
+                if err:
+                    ModelManager.clear_lava_sr_upsampler()
+                    printt()
+                    ask.ask_error(err)
+                    return
+                last_dest_path = dest_path
+                
+                printt(f"{COL_ACCENT}Saved {COL_DEFAULT}{make_terminal_hyperlink(dest_path)}") 
+                printt()
 
         # Post-concat feedback, prompt
         
@@ -184,6 +215,75 @@ class ConcatUtil:
                 user_data_dir=app_paths.get_chromium_user_data_dir(),
             )
 
+    @staticmethod
+    def make_files_in_parallel(
+        state: State,
+        jobs: list[tuple[int, int, int, str]],
+        bookmark_indices: list[int],
+        use_upsampler: bool,
+        num_workers: int
+    ) -> tuple[str, str]:
+        """
+        Makes output files concurrently, `num_workers` at a time,
+        with each file's progress shown on a shared status line.
+
+        Uses threads: the expensive parts of making a file (ffmpeg encoding,
+        resampling, decoding) run in subprocesses or release the GIL.
+        LavaSR upsampling is serialized (see SoundPipeline.lava_sr_lock).
+
+        `jobs` items are (file_cut_index, index_start, index_end, stem path).
+        Stops starting new files on the first error.
+
+        Returns the last saved file path and error string
+        """
+        printt(f"{COL_ACCENT}Creating {len(jobs)} concatenated audiobook files {COL_DIM}({num_workers} at a time)")
+        printt()
+
+        progress = ParallelExportProgress([job[0] for job in jobs])
+        last_dest_path = ""
+        first_err = ""
+
+        Interrupts().set("concat")
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures: dict[Future, int] = {}
+            for file_cut_index, index_start, index_end, stem_path in jobs:
+                future = executor.submit(
+                    ConcatUtil.make_file,
+                    state=state,
+                    index_start=index_start,
+                    index_end=index_end,
+                    bookmark_indices=bookmark_indices,
+                    stem_path=stem_path,
+                    use_upsampler=use_upsampler,
+                    on_progress=partial(progress.update, file_cut_index),
+                )
+                futures[future] = file_cut_index
+
+            for future in as_completed(futures):
+                file_cut_index = futures[future]
+                if future.cancelled():
+                    continue
+                try:
+                    dest_path, err = future.result()
+                except Exception as e:
+                    dest_path, err = "", make_error_string(e)
+                progress.finish(file_cut_index)
+                if err:
+                    if not first_err:
+                        first_err = f"Output file {file_cut_index + 1}: {err}"
+                        for other in futures:
+                            other.cancel()
+                    continue
+                last_dest_path = dest_path
+                progress.print_line(f"{COL_ACCENT}Saved {COL_DEFAULT}{make_terminal_hyperlink(dest_path)}")
+
+        progress.clear()
+        printt()
+        if Interrupts().clear():
+            return last_dest_path, "Interrupted by user"
+        return last_dest_path, first_err
+
     @staticmethod
     def make_file(
         state: State,
@@ -192,6 +292,7 @@ class ConcatUtil:
         bookmark_indices: list[int],
         stem_path: str,
         use_upsampler: bool | None = None,
+        on_progress: Callable[[str], None] | None = None,
     ) -> tuple[str, str]:
         """
         Creates final output file, full feature flow.
@@ -202,6 +303,10 @@ class ConcatUtil:
             use_upsampler: Whether to upsample concatenated segments. None uses
                 the project's setting; an explicit bool overrides it (for
                 example, after make_files resolves upsampler availability).
+            on_progress: When set, runs in "quiet mode" for use alongside other
+                concurrent make_file calls: nothing gets printed, short status
+                strings are passed to the callback instead, and Interrupts is
+                left for the caller to manage.
         
         Prints to console along the way
         Returns successful file path, error message if any
@@ -218,30 +323,30 @@ class ConcatUtil:
                 raw_text = ""
 
         # Intermediate file paths etc
+        # When normalizing or adding chapters, segments are streamed to a lossless intermediate
+        # file while loudness is measured, and the final file is then made in a single encode
+        # (loudness gain + chapters), rather than making a full copy of the file for each of those steps.
+        # Otherwise, segments are streamed straight to the final file (and format).
         
         is_aac = (state.project.export_type == ExportType.AAC)
         should_normalize = (state.project.normalization_type != NormalizationType.DISABLED)
 
-        concat_suffix = ".m4b" if is_aac and not should_normalize else ".flac" # tricky
-        concat_path = stem_path + " [concat]" + concat_suffix
-        
-        suffix = ".m4b" if is_aac else ".flac"
-        if should_normalize:
-            norm_path = stem_path + " [norm]" + suffix
-        else:
-            norm_path = ""
         if is_aac and m4b_chapter_util.has_multiple_chapters(state.project, index_start, index_end):
-            chapter_meta_path = stem_path + " [chaptermeta]" + suffix
+            chapter_meta_path = stem_path + " [chaptermeta].txt"
         else:
             chapter_meta_path = ""
+        suffix = ".m4b" if is_aac else ".flac"
         final_path = stem_path + ".abr" + suffix
-        last_path = ""
+        needs_final_encode = should_normalize or bool(chapter_meta_path)
+        concat_path = stem_path + " [concat].flac" if needs_final_encode else final_path
 
         def delete_intermediate_files(keep_final: bool=False) -> None:
             # TODO: add delete-as-you-go logic instead
             if state.prefs.save_debug_files:
                 return
-            paths = [ concat_path, norm_path, chapter_meta_path]
+            paths = [chapter_meta_path]
+            if concat_path != final_path:
+                paths.append(concat_path)
             if not keep_final:
                 paths.append(final_path)
             for path in paths:
@@ -257,50 +362,39 @@ class ConcatUtil:
             state.project, index_start, index_end
         )
                     
-        # [1] Concatenated audio file
+        # [1] Concatenated audio file, with loudness measured along the way
 
         use_upsampler = (
             state.project.use_upsampler
             if use_upsampler is None
             else use_upsampler
         )
+        loudness_meter = LoudnessMeter(APP_SAMPLE_RATE) if should_normalize else None
+        if on_progress:
+            on_concat_progress = lambda seconds: on_progress(time_stamp(seconds, with_tenth=False))
+        else:
+            on_concat_progress = None
         result = ConcatUtil.concatenate_sound_segments(
             concat_path,
             phrases_and_paths,
-            print_progress=True,
+            print_progress=not on_progress,
+            on_progress=on_concat_progress,
+            owns_interrupts=not on_progress,
             use_break_sound_effect=state.project.use_break_sound_effect,
             high_shelf=high_shelf,
             reason_pauses=state.project.reason_pauses,
             aac_bitrate=state.prefs.aac_bitrate,
-            use_upsampler=use_upsampler
+            use_upsampler=use_upsampler,
+            render_cache_dir=state.project.render_cache_path,
+            loudness_meter=loudness_meter
         )
         if isinstance(result, str): # is error
             delete_intermediate_files()
             return "", result
         else:
             durations = result
-            last_path = concat_path
 
-        # [2] Loudness-normalized file
-        #     Ideally, this would go at the very end due to taking the most time but can't be helped
-
-        if norm_path:
-            err = LoudnessNormalizationUtil.normalize_file(
-                source_flac=last_path, 
-                specs=state.project.normalization_type.value, 
-                dest_path=norm_path,
-                aac_bitrate=state.prefs.aac_bitrate
-            )
-            if err:
-                delete_intermediate_files()
-                return "", err
-            else:
-                last_path = norm_path
-
-        # [3] Chapter (M4B) metadata
-        #     Must be done before custom metadata
-        #     Also, can't be easily combined into other save operation
-        #     Both due to ffmpeg limitations
+        # [2] Chapter (M4B) metadata file, to be muxed in by the final encode
 
         if chapter_meta_path:
             chapter_metadata = m4b_chapter_util.make_metadata(
@@ -310,14 +404,43 @@ class ConcatUtil:
                 index_start=index_start,
                 index_end=index_end,
             )
-            err = m4b_chapter_util.make_copy_with_metadata(
-                source_path=last_path, dest_path=chapter_meta_path, metadata=chapter_metadata
+            try:
+                with open(chapter_meta_path, "w", encoding="utf-8") as file:
+                    file.write(chapter_metadata)
+            except Exception as e:
+                delete_intermediate_files()
+                return "", f"Error making file with chapter metadata: {make_error_string(e)}"
+
+        # [3] Final encode - applies loudness normalization and chapter metadata in one pass
+
+        if needs_final_encode:
+            loudness_stats = None
+            if on_progress:
+                on_progress("encoding")
+            if loudness_meter:
+                loudness_stats = loudness_meter.get_stats()
+            if loudness_stats and not on_progress:
+                specs = state.project.normalization_type.value
+                printt(f"Loudness normalization (EBU R 128) {COL_DIM}({specs.label})")
+                printt(
+                    f"{COL_DIM}Measured: {loudness_stats.i:.1f} LUFS, "
+                    f"LRA {loudness_stats.lra:.1f} LU, true peak {loudness_stats.tp:.1f} dBTP"
+                )
+                printt()
+            err = ConcatUtil.encode_final_file(
+                source_flac=concat_path,
+                dest_path=final_path,
+                normalization_specs=state.project.normalization_type.value,
+                loudness_stats=loudness_stats,
+                chapter_meta_path=chapter_meta_path,
+                aac_bitrate=state.prefs.aac_bitrate,
+                show_stats=not on_progress
             )
+            if not on_progress:
+                print()
             if err:
                 delete_intermediate_files()
-                return "", f"Error making file with chapter metadata: {err}"
-            else:
-                last_path = chapter_meta_path
+                return "", err
 
         # [4] App metadata (final file)
 
@@ -354,10 +477,11 @@ class ConcatUtil:
             err = save_abr_metadata_debug_json(app_meta, debug_json_path)
             if err:
                 L.w(f"Couldn't save ABR metadata debug JSON: {err}")
+        # (Done in place to avoid yet another full copy of the file)
         if is_aac:
-            err = AppMetadata.save_to_mp4(app_meta, last_path, final_path)
+            err = AppMetadata.save_to_mp4(app_meta, final_path)
         else:
-            err = AppMetadata.save_to_flac(app_meta, last_path, final_path)
+            err = AppMetadata.save_to_flac(app_meta, final_path)
         if err:
             delete_intermediate_files()
             return "", err
@@ -421,7 +545,11 @@ class ConcatUtil:
         reason_pauses: ReasonPauses,
         print_progress: bool,
         aac_bitrate: str=AAC_BITRATE_DEFAULT,
-        use_upsampler: bool = False
+        use_upsampler: bool = False,
+        render_cache_dir: str = "",
+        loudness_meter: LoudnessMeter | None = None,
+        on_progress: Callable[[float], None] | None = None,
+        owns_interrupts: bool = True
     ) -> list[float] | str:
         """
         Concatenates a list of files to a destination file using ffmpeg streaming process.
@@ -431,6 +559,21 @@ class ConcatUtil:
             Only relevant if dest_path suffix is .m4a/.m4b; ignored otherwise. 
             Must be a valid AAC bitrate string like "128k".
 
+        :param render_cache_dir:
+            When set, rendered segments are reused from/saved to this directory,
+            so that only new or changed segments get re-rendered (see ConcatRenderCache).
+
+        :param loudness_meter:
+            When set, all streamed audio is also fed to the meter, so that
+            loudness can be normalized without having to re-read the output file.
+
+        :param on_progress:
+            Gets called with the duration concatenated so far after each segment.
+
+        :param owns_interrupts:
+            When False, Interrupts is only checked but not set or cleared
+            (for when the caller runs multiple concatenations at the same time).
+
         Returns list of float durations of each added segment to be used for app metadata .
 
         On error, returns error string
@@ -445,7 +588,8 @@ class ConcatUtil:
         to_aac_not_flac = dest_path.lower().endswith(tuple(AAC_SUFFIXES))
         process = ConcatUtil.init_ffmpeg_stream(dest_path, to_aac_not_flac, aac_bitrate)
 
-        Interrupts().set("concat")
+        if owns_interrupts:
+            Interrupts().set("concat")
 
         # Look-ahead buffer. The previous present segment is held (rendered, but
         # without its trailing pause) until the next present segment is rendered,
@@ -507,10 +651,14 @@ class ConcatUtil:
             durations[idx] = sound.duration
             duration_sum += sound.duration
             ConcatUtil.add_audio_to_ffmpeg_stream(process, sound.data)
+            if loudness_meter:
+                loudness_meter.add(sound.data)
 
             if print_progress:
                 s = f"{time_stamp(duration_sum, with_tenth=False)} {Path(path).stem[:80]} ... "
                 print("\x1b[1G" + s, end="\033[K", flush=True)
+            if on_progress:
+                on_progress(duration_sum)
 
         for i, (phrase, path, is_first_in_section) in enumerate(phrases_and_paths):
 
@@ -518,7 +666,8 @@ class ConcatUtil:
                 # durations[i] already 0.0
                 continue
             if Interrupts().did_interrupt:
-                Interrupts().clear()
+                if owns_interrupts:
+                    Interrupts().clear()
                 ConcatUtil.close_ffmpeg_stream(process)
                 delete_silently(dest_path) # TODO delete parent dir silently if empty
                 return "Interrupted by user"
@@ -529,6 +678,7 @@ class ConcatUtil:
                 is_first_in_section=is_first_in_section,
                 use_upsampler=use_upsampler,
                 add_pause=False,
+                render_cache_dir=render_cache_dir,
             )
             if isinstance(result, str): # error
                 ConcatUtil.close_ffmpeg_stream(process) # TODO clean up more and message user
@@ -537,7 +687,8 @@ class ConcatUtil:
             curr_sound = result
 
             if Interrupts().did_interrupt:
-                Interrupts().clear()
+                if owns_interrupts:
+                    Interrupts().clear()
                 ConcatUtil.close_ffmpeg_stream(process)
                 delete_silently(dest_path) # TODO delete parent dir silently if empty
                 return "Interrupted by user"
@@ -558,12 +709,63 @@ class ConcatUtil:
 
         if print_progress:
             printt()
-        printt()
+            printt()
 
-        Interrupts().clear()
+        if owns_interrupts:
+            Interrupts().clear()
         ConcatUtil.close_ffmpeg_stream(process)
         return durations
 
+    @staticmethod
+    def encode_final_file(
+        source_flac: str,
+        dest_path: str,
+        normalization_specs: NormalizationSpecs,
+        loudness_stats: LoudnessStats | None,
+        chapter_meta_path: str,
+        aac_bitrate: str=AAC_BITRATE_DEFAULT,
+        show_stats: bool=True
+    ) -> str:
+        """
+        Makes the final output file from the concatenated FLAC file in a single ffmpeg pass.
+        Dest audio codec is chosen based on dest file suffix.
+
+        :param loudness_stats:
+            Measurements of the source file (see LoudnessMeter). When set, applies
+            loudness normalization (equivalent to "pass 2" of two-pass loudnorm).
+        :param chapter_meta_path:
+            ffmpeg metadata file with M4B chapters to be muxed in, or empty string
+
+        Returns error string on fail, else empty string
+        """
+        partial_command = [
+            "-y",
+            "-hide_banner", "-loglevel", "error", "-stats" if show_stats else "-nostats",
+            "-i", source_flac
+        ]
+        if chapter_meta_path:
+            partial_command.extend([
+                "-i", chapter_meta_path,
+                "-map", "0:a",
+                "-map_chapters", "1"
+            ])
+        if loudness_stats:
+            filter_string = LoudnessNormalizationUtil.make_pass_2_filter_string(
+                loudness_stats.to_loudnorm_dict(),
+                normalization_specs.i,
+                normalization_specs.lra,
+                normalization_specs.tp
+            )
+            # Rem, loudnorm upsamples internally, so pin output sample rate
+            partial_command.extend(["-af", filter_string, "-ar", f"{APP_SAMPLE_RATE}"])
+
+        if dest_path.lower().endswith(tuple(AAC_SUFFIXES)):
+            partial_command.extend(make_ffmpeg_arguments_output_aac(aac_bitrate))
+        else:
+            partial_command.extend(FFMPEG_ARGUMENTS_OUTPUT_FLAC)
+
+        return FfmpegUtil.make_file(partial_command, dest_path, use_temp_file=True)
+
     @staticmethod
     def init_ffmpeg_stream(
             dest_path: str,
@@ -650,6 +852,49 @@ class ConcatUtil:
 
 # ---
 
+class ParallelExportProgress:
+    """
+    Single console status line for files being made concurrently,
+    eg: "[2/12 done] #3 01:02:11 | #4 00:45:20 | #5 encoding"
+    Thread-safe.
+    """
+
+    def __init__(self, file_cut_indices: list[int]) -> None:
+        self._lock = threading.Lock()
+        self._num_files = len(file_cut_indices)
+        self._num_done = 0
+        self._statuses: dict[int, str] = {}
+
+    def update(self, file_cut_index: int, status: str) -> None:
+        with self._lock:
+            self._statuses[file_cut_index] = status
+            self._print_status()
+
+    def finish(self, file_cut_index: int) -> None:
+        with self._lock:
+            self._statuses.pop(file_cut_index, None)
+            self._num_done += 1
+            self._print_status()
+
+    def print_line(self, text: str) -> None:
+        """ Prints a regular line of text above the status line """
+        with self._lock:
+            print("\x1b[1G", end="\033[K")
+            printt(text)
+            self._print_status()
+
+    def clear(self) -> None:
+        with self._lock:
+            print("\x1b[1G", end="\033[K", flush=True)
+
+    def _print_status(self) -> None:
+        items = [f"#{index + 1} {status}" for index, status in sorted(self._statuses.items())]
+        s = f"[{self._num_done}/{self._num_files} done] " + " | ".join(items)
+        s = ellipsize(s, max(40, shutil.get_terminal_size().columns - 1))
+        print("\x1b[1G" + s, end="\033[K", flush=True)
+
+# ---
+
 def make_stem(
     project: Project,
     index_start: int, 
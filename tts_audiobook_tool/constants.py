@@ -12,11 +12,14 @@ APP_USER_SUBDIR = "tts_audiobook_tool"
 APP_TEMP_SUBDIR = "tts_audiobook_tool"
 ASSETS_DIR_NAME = "assets"
 CHROME_USER_DATA_DIR_NAME = "chromium-user-data"
+VOICE_CLONE_CACHE_DIR_NAME = "voice-clone-cache"
+SERVER_AUDIO_CACHE_DIR_NAME = "server-audio-cache"
 
 PROJECT_SOUND_SEGMENTS_SUBDIR = "segments"
 PROJECT_CONCAT_SUBDIR = "combined"
 PROJECT_REALTIME_OUTPUT_SUBDIR = "realtime"
 PROJECT_CHAT_OUTPUT_SUBDIR = "chat"
+PROJECT_RENDER_CACHE_SUBDIR = "render_cache"
 PROJECT_JSON_FILE_NAME = "project.json"
 PROJECT_TEXT_FILE_NAME = "project_text.json"
 PROJECT_TEXT_SEGMENTS_FILE_NAME = PROJECT_TEXT_FILE_NAME
@@ -18,6 +18,7 @@ PROJECT_DEFAULT_CHAT_SAVE_MIC = False
 PROJECT_DEFAULT_LIMIT_SILENCE_GAPS = False
 PROJECT_DEFAULT_GEN_AUTO_CONCAT = False
 PROJECT_DEFAULT_STREAMING_CHAT = True
+PROJECT_DEFAULT_SPECULATIVE_CHAT = False
 PROJECT_DEFAULT_SEGMENTATION_STRATEGY = SegmentationStrategy.SENTENCE_PLUS
 PROJECT_DEFAULT_GENERATIVE_UPSAMPLING = False
 PROJECT_DEFAULT_HIGH_SHELF_EQ = HighShelfEq.DISABLED
@@ -27,8 +28,13 @@ PROJECT_MAX_RETRIES_MAX = 5
 PROJECT_BATCH_SIZE_DEFAULT = 1
 PROJECT_BATCH_SIZE_MAX = 99
 PROJECT_CONCURRENT_REQUESTS_MAX = 16
+SGL_OMNI_MAX_CONNECTIONS_DEFAULT = PROJECT_CONCURRENT_REQUESTS_MAX
 
 PREFS_DEFAULT_PLAY_ON_GENERATE = False
+PREFS_DEFAULT_PIPELINED_GENERATION = False
+PREFS_DEFAULT_VOICE_CLONE_DISK_CACHE = False
+PREFS_DEFAULT_EXPORT_WORKERS = 1
+PREFS_EXPORT_WORKERS_MAX = 16
 CHAT_INPUT_MODE_MIC_IMMEDIATE = "mic_immediate"
 CHAT_INPUT_MODE_MIC_ENTER = "mic_enter"
 CHAT_INPUT_MODE_TEXT = "text"
@@ -184,6 +184,8 @@ class Conversation:
                 prefs=self.prefs,
                 on_transcription=self.prompt_builder.on_transcription,
                 silence_duration_s=silence_duration_s,
+                incremental=True,
+                on_partial_transcription=self.prompt_builder.on_partial_transcription,
             )
 
         # Note, when streaming, output sound device samplerate is that of the
@@ -195,6 +197,7 @@ class Conversation:
         self.sound_stream = SoundDeviceStream(sr)
 
         self.session: ResponseSession | None = None
+        self.first_audio_latencies_ms: dict[bool, list[float]] = {}
         self.in_response = False
         self.exiting = False
         self.old_input_sigint = None
@@ -273,6 +276,7 @@ class Conversation:
             ctrl_c_requested=self.ctrl_c_requested,
             phrase_stt_enabled=self.phrase_stt_enabled,
             sound_stream=self.sound_stream,
+            first_audio_latencies_ms=self.first_audio_latencies_ms,
         )
         if user_input_sound is not None:
             self.session.user_input_sound = user_input_sound
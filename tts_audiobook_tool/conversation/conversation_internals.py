@@ -24,7 +24,7 @@ from tts_audiobook_tool.conversation.console_session import (
     KEY_LEFT,
     KEY_RIGHT,
 )
-from tts_audiobook_tool.conversation.conversation_types import ChunkingConfig, QueuedStream, UiOp
+from tts_audiobook_tool.conversation.conversation_types import ChunkingConfig, QueuedStream, SpeculativeChunk, UiOp
 from tts_audiobook_tool.app_types.force_align_util import ForceAlignUtil
 from tts_audiobook_tool.conversation.llm_session import LlmSession
 from tts_audiobook_tool.l import L
@@ -246,6 +246,9 @@ class PromptBuilder:
         self.ctrl_c_requested = ctrl_c_requested
         self.stt_immediate = stt_immediate
         self.chunk_queue: queue.Queue[tuple[str, np.ndarray | None]] = queue.Queue()
+        # Hypotheses for the utterance in progress (see RealtimeTranscriber's incremental mode)
+        self.partial_queue: queue.Queue[str] = queue.Queue()
+        self.partial_text = ""
         self.prompt_chunks: list[str] = []
         self.prompt_chunk_audios: list[np.ndarray | None] = []
         self.selected_idx: int | None = None
@@ -259,6 +262,11 @@ class PromptBuilder:
         if text:
             self.chunk_queue.put((text, np.copy(audio) if audio is not None else None))
 
+    def on_partial_transcription(self, text: str) -> None:
+        if self.mic_paused:
+            return
+        self.partial_queue.put(text)
+
     def take_finalized_mic_audio(self) -> np.ndarray | None:
         audio = self.finalized_mic_audio
         self.finalized_mic_audio = None
@@ -280,15 +288,22 @@ class PromptBuilder:
                 raise KeyboardInterrupt
 
             updated = False
+            # (Partials first, so that one superseded by a completed chunk below gets cleared)
+            partial_updated = False
+            while not self.partial_queue.empty():
+                self.partial_text = self.partial_queue.get_nowait()
+                partial_updated = True
             while not self.chunk_queue.empty():
                 chunk, audio = self.chunk_queue.get_nowait()
+                self.partial_text = ""
                 self.prompt_chunks.append(chunk)
                 self.prompt_chunk_audios.append(audio)
                 self.selected_idx = len(self.prompt_chunks) - 1
                 updated = True
 
-            if updated:
+            if updated or partial_updated:
                 self.render()
+            if updated:
                 if self.stt_immediate and self.prompt_chunks:
                     assembled = " ".join(self.prompt_chunks)
                     self.commit_finalized_prompt(assembled)
@@ -345,6 +360,9 @@ class PromptBuilder:
         self.mic_paused = True
         while not self.chunk_queue.empty():
             self.chunk_queue.get_nowait()
+        self.partial_text = ""
+        while not self.partial_queue.empty():
+            self.partial_queue.get_nowait()
 
     def render(self) -> None:
         parts: list[str] = []
@@ -353,6 +371,8 @@ class PromptBuilder:
                 parts.append(f"{COL_MEDIUM}{Ansi.ITALICS}{chunk}{Ansi.RESET}")
             else:
                 parts.append(f"{COL_DIM}{chunk}{Ansi.RESET}")
+        if self.partial_text:
+            parts.append(f"{COL_DIM}{Ansi.ITALICS}{self.partial_text}{Ansi.RESET}")
         content = " ".join(parts) if parts else f"{COL_OK}{Ansi.ITALICS}Speak into the mic... {COL_DIM}(Ctrl-C to exit){Ansi.RESET}"
         self.ui.render(f"> {content}")
 
@@ -437,14 +457,19 @@ class ConversationStreamingTts:
         interrupt_requested: threading.Event,
         response_aborted: threading.Event,
         on_segment_range: Callable[[int, int], None] | None = None,
+        speculation: SpeculativeChunk | None = None,
     ) -> tuple[tuple[int, int] | None, Sound | None, str | None]:
         """
         Stream one TTS chunk directly into the conversation output stream.
 
+        If `speculation` is given, streamed audio is held back until it is confirmed,
+        and discarded if it gets cancelled.
+
         Returns:
             ((start_sample, end_sample), saved_sound, None) on success, where the range covers
             the full streamed audio plus any appended trailing silence.
             (None, None, error_string) on failure.
+            (None, None, None) if the speculative chunk was cancelled.
         """
         info = Tts.get_info()
         if sound_stream.sample_rate != info.sample_rate:
@@ -457,20 +482,41 @@ class ConversationStreamingTts:
         stream_end: int | None = None
         speech_end: int | None = None
         saved_chunks: list[np.ndarray] = []
+        # Audio generated before the speculative chunk is confirmed, as (data, is_speech)
+        held_chunks: list[tuple[np.ndarray, bool]] = []
 
-        def append_chunk(data: np.ndarray) -> None:
+        def add_to_stream(data: np.ndarray, is_speech: bool) -> None:
             nonlocal stream_start, stream_end, speech_end
-            if interrupt_requested.is_set() or response_aborted.is_set():
-                return
             saved_chunks.append(np.copy(data))
             start, end = sound_stream.add_data(data)
             if stream_start is None:
                 stream_start = start
             stream_end = end
+            if not is_speech:
+                return
             speech_end = end
             if on_segment_range is not None and stream_start is not None and speech_end is not None:
                 on_segment_range(stream_start, speech_end)
 
+        def release_held_chunks() -> None:
+            for data, is_speech in held_chunks:
+                add_to_stream(data, is_speech)
+            held_chunks.clear()
+
+        def output(data: np.ndarray, is_speech: bool) -> None:
+            if speculation is not None and not speculation.confirmed.is_set():
+                held_chunks.append((np.copy(data), is_speech))
+                return
+            release_held_chunks()
+            add_to_stream(data, is_speech)
+
+        def append_chunk(data: np.ndarray) -> None:
+            if interrupt_requested.is_set() or response_aborted.is_set():
+                return
+            if speculation is not None and speculation.cancelled.is_set():
+                return
+            output(data, is_speech=True)
+
         def on_stream_end() -> None:
             nonlocal stream_start, stream_end
             if interrupt_requested.is_set() or response_aborted.is_set():
@@ -488,11 +534,7 @@ class ConversationStreamingTts:
                 sr=sound_stream.sample_rate,
                 dtype=np.dtype(np.float32),
             )
-            saved_chunks.append(np.copy(silence_sound.data))
-            start, end = sound_stream.add_data(silence_sound.data)
-            if stream_start is None:
-                stream_start = start
-            stream_end = end
+            output(silence_sound.data, is_speech=False)
 
         try:
             result = Tts.generate_using_project(
@@ -506,6 +548,12 @@ class ConversationStreamingTts:
             if model is not None:
                 model.clear_stream_state()
 
+        if speculation is not None and not isinstance(result, str):
+            if not speculation.wait(interrupt_requested, response_aborted):
+                Tts.clear_continuation()
+                return None, None, None
+            release_held_chunks()
+
         if isinstance(result, str):
             Tts.clear_continuation()
             return None, None, result
@@ -531,6 +579,13 @@ class ResponseSession:
 
     RESPONSE_PLACEHOLDER = "..."
 
+    # Speculative TTS: the first chunk of a response can be sent before its sentence is
+    # complete, once it ends in clause punctuation and has at least SPECULATIVE_MIN_WORDS words,
+    # or else once it has SPECULATIVE_MAX_WORDS words
+    SPECULATIVE_CLAUSE_PUNCTUATION = ",;:\u2013\u2014"
+    SPECULATIVE_MIN_WORDS = 5
+    SPECULATIVE_MAX_WORDS = 12
+
     def __init__(
         self,
         ui: Ui,
@@ -544,7 +599,12 @@ class ResponseSession:
         ctrl_c_requested: threading.Event,
         sound_stream: SoundDeviceStream,
         phrase_stt_enabled: bool = True,
+        first_audio_latencies_ms: dict[bool, list[float]] | None = None,
     ) -> None:
+        """
+        :param first_audio_latencies_ms: Time-to-first-audio of previous turns, keyed by whether
+            speculative TTS was enabled; this turn's is added to it
+        """
         self.ui = ui
         self.llm = llm
         self.prefs = state.prefs
@@ -558,6 +618,7 @@ class ResponseSession:
         self.phrase_stt_enabled = phrase_stt_enabled
         self.sound_stream: SoundDeviceStream = sound_stream
         self.user_input_sound: Sound | None = None
+        self.first_audio_latencies_ms = first_audio_latencies_ms if first_audio_latencies_ms is not None else {}
 
     def run(self, assembled: str, user_input_sound: Sound | None = None) -> None:
         # Each Enter-press/LLM response turn is its own rolling-continuation
@@ -566,7 +627,7 @@ class ResponseSession:
         Tts.clear_continuation()
 
         self.user_input_sound = user_input_sound
-        self.tts_q: queue.Queue[tuple[str, Reason] | None] = queue.Queue()
+        self.tts_q: queue.Queue[tuple[str, Reason, SpeculativeChunk | None] | None] = queue.Queue()
         self.tts_buffer = ""
         self.render_buffer = ResponseSession.RESPONSE_PLACEHOLDER
         self.spoken_segments: list[tuple[str, int, int]] = []
@@ -585,6 +646,10 @@ class ResponseSession:
         self.output_turn_tts_started_at: float | None = None
         self.output_turn_tts_mode: str | None = None
         self.output_turn_tts_preview_text: str = ""
+        self.output_turn_speculated = False
+        self.speculative = self.project.speculative_chat
+        self.speculation: SpeculativeChunk | None = None
+        self.turn_started_at = time.monotonic()
 
         self.worker = threading.Thread(target=self.tts_worker, daemon=True)
         self.worker.start()
@@ -601,13 +666,16 @@ class ResponseSession:
 
             final_text = ""
             with self.state_lock:
+                if self.speculation is not None and not self.speculation.is_resolved:
+                    # Nothing followed it
+                    self.speculation.confirmed.set()
                 if self.tts_buffer.strip():
                     final_text = self.tts_buffer
                     self.pending_sentences.append(self.tts_buffer)
                 self.tts_buffer = ""
                 self.render_buffer = ""
             if final_text:
-                self.tts_q.put((final_text, Reason.SENTENCE))
+                self.tts_q.put((final_text, Reason.SENTENCE, None))
             self.tts_q.put(None)
             self.worker.join()
             while not self.sound_stream.is_playback_complete and not self.interrupt_requested.is_set():
@@ -649,7 +717,7 @@ class ResponseSession:
             item = self.tts_q.get()
             if item is None:
                 break
-            text, reason = item
+            text, reason, speculation = item
             if self.interrupt_requested.is_set() or self.response_aborted.is_set():
                 Tts.clear_continuation()
                 continue
@@ -666,13 +734,15 @@ class ResponseSession:
                 if Tts.get_info().can_stream and self.project.streaming_chat:
                     streamed_segment_idx: int | None = None
                     first_audio_callback_registered = False
-                    self.log_tts_inference_start(mode="streaming", text=text)
+                    mode = "streaming, speculative" if speculation is not None else "streaming"
+                    self.log_tts_inference_start(mode=mode, text=text)
 
                     def on_segment_range(start: int, end: int) -> None:
                         nonlocal streamed_segment_idx, first_audio_callback_registered
                         if not first_audio_callback_registered and not self.first_audio_latency_logged:
                             first_audio_callback_registered = True
-                            self.output_turn_tts_mode = "streaming"
+                            self.output_turn_tts_mode = mode
+                            self.output_turn_speculated = speculation is not None
                             if not self.output_turn_tts_preview_text:
                                 self.output_turn_tts_preview_text = text
                             self.sound_stream.set_first_audio_output_callback(
@@ -698,6 +768,7 @@ class ResponseSession:
                             interrupt_requested=self.interrupt_requested,
                             response_aborted=self.response_aborted,
                             on_segment_range=on_segment_range,
+                            speculation=speculation,
                         )
 
                     if self.interrupt_requested.is_set() or self.response_aborted.is_set():
@@ -707,6 +778,11 @@ class ResponseSession:
                                 self.pending_sentences.pop(0)
                         continue
 
+                    if speculation is not None and speculation.cancelled.is_set():
+                        # Text was handed back to the TTS buffer by on_chunk()
+                        self.render_response()
+                        continue
+
                     if err is not None:
                         Tts.clear_continuation()
                         if not self.response_aborted.is_set():
@@ -731,7 +807,8 @@ class ResponseSession:
                     self.render_response()
                     continue
 
-                self.log_tts_inference_start(mode="non-streaming", text=text)
+                mode = "non-streaming, speculative" if speculation is not None else "non-streaming"
+                self.log_tts_inference_start(mode=mode, text=text)
                 with MuteCurrentThreadOutput(self.real_stderr, self.fd2_redirect_lock):
                     result = SoundPipeline.generate_processed_using_project(self.project, [text])
                 if self.interrupt_requested.is_set() or self.response_aborted.is_set():
@@ -779,12 +856,23 @@ class ResponseSession:
                     reason_pauses=self.project.reason_pauses,
                     use_break_sound_effect=False,
                 )
+
+                if speculation is not None and not speculation.wait(self.interrupt_requested, self.response_aborted):
+                    Tts.clear_continuation()
+                    if not speculation.cancelled.is_set():
+                        with self.state_lock:
+                            if self.pending_sentences and self.pending_sentences[0] == text:
+                                self.pending_sentences.pop(0)
+                    self.render_response()
+                    continue
+
                 self.saved_turn_sounds.append(sound)
 
                 if not self.interrupt_requested.is_set() and not self.response_aborted.is_set():
                     start, end = self.sound_stream.add_data(sound.data)
                     if not self.first_audio_latency_logged:
-                        self.output_turn_tts_mode = "non-streaming"
+                        self.output_turn_tts_mode = mode
+                        self.output_turn_speculated = speculation is not None
                         if not self.output_turn_tts_preview_text:
                             self.output_turn_tts_preview_text = text
                         self.sound_stream.set_first_audio_output_callback(
@@ -819,14 +907,26 @@ class ResponseSession:
         if self.first_audio_latency_logged or self.output_turn_tts_started_at is None:
             return
         self.first_audio_latency_logged = True
-        elapsed_ms = (time.monotonic() - self.output_turn_tts_started_at) * 1000.0
+        now = time.monotonic()
+        elapsed_ms = (now - self.output_turn_tts_started_at) * 1000.0
+        # Time to first audio as experienced by the user, including waiting on the LLM
+        turn_elapsed_ms = (now - self.turn_started_at) * 1000.0
+        latencies = self.first_audio_latencies_ms.setdefault(self.speculative, [])
+        latencies.append(turn_elapsed_ms)
         preview = re.sub(r"\s+", " ", self.output_turn_tts_preview_text).strip()
         if len(preview) > 80:
             preview = preview[:80] + "..."
         L.i(
             f"TTS first-audio latency ({self.output_turn_tts_mode or 'unknown'}): {elapsed_ms:.1f} ms | "
+            f"since request: {turn_elapsed_ms:.1f} ms | "
             f"chars={len(self.output_turn_tts_preview_text)} | text='{preview}'"
         )
+        summary = []
+        for speculative, label in ((True, "with speculation"), (False, "without speculation")):
+            values = self.first_audio_latencies_ms.get(speculative)
+            if values:
+                summary.append(f"{label}: mean {sum(values) / len(values):.1f} ms (n={len(values)})")
+        L.i(f"Time to first audio since request | {' | '.join(summary)}")
 
     def log_tts_inference_start(self, mode: str, text: str) -> None:
         preview = re.sub(r"\s+", " ", text).strip()
@@ -888,28 +988,55 @@ class ResponseSession:
         if self.interrupt_requested.is_set() or self.response_aborted.is_set():
             return
 
-        to_send: list[tuple[str, Reason]] = []
+        to_send: list[tuple[str, Reason, SpeculativeChunk | None]] = []
         use_streaming_tts = Tts.get_info().can_stream and self.project.streaming_chat
         with self.state_lock:
             if not self.llm_content_received and self.render_buffer == ResponseSession.RESPONSE_PLACEHOLDER:
                 self.render_buffer = ""
             self.llm_content_received = True
+
+            speculation = self.speculation
+            if speculation is not None and not speculation.is_resolved:
+                is_confirmed = ResponseSession.resolve_speculation(self.tts_buffer + delta)
+                if is_confirmed:
+                    speculation.confirmed.set()
+                elif is_confirmed is not None:
+                    # The prefix didn't end where assumed; take it back and carry on without it
+                    speculation.cancelled.set()
+                    if speculation.text in self.pending_sentences:
+                        self.pending_sentences.remove(speculation.text)
+                    self.tts_buffer = speculation.text + self.tts_buffer
+                    L.i(f"Speculative TTS chunk cancelled: '{speculation.text}' + '{delta}'")
+
             complete_chunks, self.tts_buffer, self.render_buffer = ResponseSession.consume_tts_delta(
                 tts_buffer=self.tts_buffer,
                 delta=delta,
                 config=self.chunking_config,
                 has_pending_sentences=bool(self.pending_sentences),
                 has_spoken_segments=bool(self.spoken_segments),
-                allow_first_chunk_latency_split=not use_streaming_tts,
+                allow_first_chunk_latency_split=not use_streaming_tts or self.speculative,
             )
             for s, reason in complete_chunks:
                 self.pending_sentences.append(s)
-                to_send.append((s, reason))
+                to_send.append((s, reason, None))
+
+            is_first_chunk = not to_send and not self.pending_sentences and not self.spoken_segments
+            if self.speculative and is_first_chunk:
+                prefix = ResponseSession.take_speculative_prefix(self.tts_buffer, self.chunking_config)
+                if prefix is not None:
+                    text, reason = prefix
+                    self.speculation = SpeculativeChunk(text)
+                    self.tts_buffer = self.tts_buffer[len(text):]
+                    if ResponseSession.resolve_speculation(self.tts_buffer):
+                        self.speculation.confirmed.set()
+                    self.pending_sentences.append(text)
+                    to_send.append((text, reason, self.speculation))
+
             if to_send:
                 self.render_buffer = ""
         self.render_response()
-        for s, reason in to_send:
-            self.tts_q.put((s, reason))
+        for item in to_send:
+            self.tts_q.put(item)
 
     def render_ticker(self) -> None:
         while not self.render_stop.wait(0.05):
@@ -1173,3 +1300,41 @@ class ResponseSession:
 
         render_buffer = ResponseSession.make_stable_chunk_preview(next_buffer, config)
         return [], next_buffer, render_buffer
+
+    @staticmethod
+    def take_speculative_prefix(tts_buffer: str, config: ChunkingConfig) -> tuple[str, Reason] | None:
+        """
+        Returns a prefix of the buffered start of the response which can be sent to TTS
+        speculatively, before the sentence it is part of is complete (see `SpeculativeChunk`),
+        paired with its Reason; or None if the buffer should keep accumulating.
+
+        A prefix ending in clause punctuation is taken as soon as the punctuation arrives,
+        so whether it really ends there is only known by what follows it (see
+        `resolve_speculation()`). A prefix cut by word count only includes words which
+        are already followed by whitespace.
+        """
+        text = tts_buffer.rstrip()
+        num_words = len(text.split())
+        if num_words >= ResponseSession.SPECULATIVE_MIN_WORDS and text[-1] in ResponseSession.SPECULATIVE_CLAUSE_PUNCTUATION:
+            reason = Reason.PHRASE
+        else:
+            if text == tts_buffer:
+                # Last word may be incomplete
+                text = re.sub(r"\S+$", "", text).rstrip()
+            if len(text.split()) < ResponseSession.SPECULATIVE_MAX_WORDS:
+                return None
+            reason = Reason.WORD
+        # Multiple sentences are left to the normal first-chunk rules
+        if len(PhraseSegmenter.string_to_sentence_strings(text, config.language_code)) != 1:
+            return None
+        return text, reason
+
+    @staticmethod
+    def resolve_speculation(remainder: str) -> bool | None:
+        """
+        Given the response text which has followed a speculative chunk so far, returns True
+        if the chunk ended at a word boundary, False if it did not, or None if not yet known.
+        """
+        if not remainder:
+            return None
+        return remainder[0].isspace()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import queue
 import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal
 
 from tts_audiobook_tool.app_types import SegmentationStrategy
@@ -15,6 +15,35 @@ class ChunkingConfig:
     strategy: SegmentationStrategy = SegmentationStrategy.SENTENCE_PLUS
 
 
+@dataclass
+class SpeculativeChunk:
+    """
+    A clause prefix of the LLM response which is sent to TTS before the LLM
+    has output the character after it, so before it is known whether the
+    prefix really ends there (eg, "1," may continue as "1,000").
+
+    The LLM thread either confirms or cancels it; the TTS worker may generate
+    the audio in the meantime, but holds it back from playback until then.
+    """
+    text: str
+    confirmed: threading.Event = field(default_factory=threading.Event)
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def is_resolved(self) -> bool:
+        return self.confirmed.is_set() or self.cancelled.is_set()
+
+    def wait(self, *stop_events: threading.Event) -> bool:
+        """
+        Blocks until the chunk is resolved or any of `stop_events` is set.
+        Returns True if confirmed.
+        """
+        while not self.confirmed.wait(0.02):
+            if self.cancelled.is_set() or any(event.is_set() for event in stop_events):
+                return False
+        return True
+
+
 @dataclass(frozen=True)
 class UiOp:
     kind: Literal["render", "println", "clear", "commit_render", "stop"]
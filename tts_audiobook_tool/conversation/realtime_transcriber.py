@@ -1,5 +1,8 @@
+from __future__ import annotations
+
 import collections
 import queue
+import re
 import signal
 from contextlib import contextmanager
 import threading
@@ -9,7 +12,7 @@ from typing import Callable, Iterator
 import numpy as np
 import sounddevice as sd
 
-from tts_audiobook_tool.app_types import Segment, Sound
+from tts_audiobook_tool.app_types import ConcreteSegment, ConcreteWord, Segment, Sound, Word
 from tts_audiobook_tool.constants import WHISPER_SAMPLERATE
 from tts_audiobook_tool.l import L
 from tts_audiobook_tool.prefs import Prefs
@@ -25,6 +28,13 @@ class RealtimeTranscriber:
     Adaptive energy-based chunking: a chunk is dispatched when energy falls back
     near the recent ambient floor for at least `silence_duration_s` seconds after
     speech, or when an utterance exceeds `max_chunk_duration_s`.
+
+    In `incremental` mode, the utterance is also transcribed every `partial_interval_s`
+    while it's still in progress (see `IncrementalTranscript`), firing
+    `on_partial_transcription` with the hypothesis so far. Then, when the chunk is
+    dispatched, only its not-yet-committed tail needs to be transcribed. Partial
+    transcriptions run on their own thread (see `PartialTranscriptionWorker`), so that
+    they don't hold up endpointing.
     """
 
     BLOCKSIZE = 1024  # frames per PortAudio callback (~64ms at 16kHz)
@@ -47,6 +57,10 @@ class RealtimeTranscriber:
         on_chunk_dispatched: Callable[[float], None] | None = None,
         debug_vad: bool = False,
         debug_vad_interval_s: float = 0.5,
+        incremental: bool = False,
+        on_partial_transcription: Callable[[str], None] | None = None,
+        partial_interval_s: float = 1.0,
+        commit_guard_s: float = 1.0,
     ):
         self.prefs = prefs
         self.on_transcription = on_transcription
@@ -64,6 +78,10 @@ class RealtimeTranscriber:
         self.debug_vad = debug_vad
         self.debug_vad_interval_s = debug_vad_interval_s
         self.on_chunk_dispatched = on_chunk_dispatched
+        self.incremental = incremental
+        self.on_partial_transcription = on_partial_transcription
+        self.partial_interval_s = partial_interval_s
+        self.commit_guard_s = commit_guard_s
 
         self._audio_queue: queue.Queue[np.ndarray | None] = queue.Queue()
         self._stop_event = threading.Event()
@@ -71,6 +89,7 @@ class RealtimeTranscriber:
         self._paused_event = threading.Event()
         self._stream: sd.InputStream | None = None
         self._worker_thread: threading.Thread | None = None
+        self._partial_worker: PartialTranscriptionWorker | None = None
 
     def start(self) -> None:
         if self._worker_thread and self._worker_thread.is_alive():
@@ -133,6 +152,10 @@ class RealtimeTranscriber:
         """
         self._paused_event.set()
         self.flush()
+        partial_worker = self._partial_worker
+        if partial_worker:
+            # Drops any pending partial transcription, and waits for one in flight
+            partial_worker.reset()
         with Stt.inference_lock:
             pass
 
@@ -166,6 +189,13 @@ class RealtimeTranscriber:
         min_noise_blocks = max(3, int(0.3 * WHISPER_SAMPLERATE / self.BLOCKSIZE))
         recent_rms: collections.deque[float] = collections.deque(maxlen=noise_window_blocks)
         last_debug_at = 0.0
+        partial_worker = PartialTranscriptionWorker(
+            IncrementalTranscript(self._transcribe, self.commit_guard_s),
+            self.on_partial_transcription,
+        ) if self.incremental else None
+        self._partial_worker = partial_worker
+        partial_interval_samples = int(self.partial_interval_s * WHISPER_SAMPLERATE)
+        last_partial_samples = 0
 
         def recent_noise_floor() -> float:
             """
@@ -195,6 +225,9 @@ class RealtimeTranscriber:
                 speech_detected = False
                 speech_peak_rms = 0.0
                 recent_rms.clear()
+                if partial_worker:
+                    partial_worker.reset()
+                last_partial_samples = 0
                 self._flush_event.clear()
                 if self._paused_event.is_set():
                     continue
@@ -266,11 +299,19 @@ class RealtimeTranscriber:
             if should_dispatch and len(buffer) > 0:
                 if self.on_chunk_dispatched:
                     self.on_chunk_dispatched(len(buffer) / WHISPER_SAMPLERATE)
-                self._transcribe_and_callback(buffer)
+                self._transcribe_and_callback(buffer, partial_worker)
                 buffer = np.array([], dtype=np.float32)
                 silence_samples = 0
                 speech_detected = False
                 speech_peak_rms = 0.0
+                last_partial_samples = 0
+            elif (
+                partial_worker
+                and speech_detected
+                and len(buffer) - last_partial_samples >= partial_interval_samples
+            ):
+                last_partial_samples = len(buffer)
+                partial_worker.submit(buffer)
             elif not speech_detected and len(buffer) >= max_samples:
                 # Drop old non-speech audio so waiting quietly before speaking
                 # does not force the next utterance to wait for the full window
@@ -285,25 +326,219 @@ class RealtimeTranscriber:
         if len(buffer) > 0 and speech_detected:
             if self.on_chunk_dispatched:
                 self.on_chunk_dispatched(len(buffer) / WHISPER_SAMPLERATE)
-            self._transcribe_and_callback(buffer)
+            self._transcribe_and_callback(buffer, partial_worker)
+
+        if partial_worker:
+            partial_worker.stop()
+            self._partial_worker = None
 
-    def _transcribe_and_callback(self, audio: np.ndarray) -> None:
+    def _transcribe_and_callback(
+            self,
+            audio: np.ndarray,
+            partial_worker: PartialTranscriptionWorker | None = None
+    ) -> None:
         try:
             prepared_sound = Transcriber.prepare_sound_for_whisper(Sound(audio, WHISPER_SAMPLERATE))
-            with Stt.inference_lock:
-                segments, _ = Stt.get_whisper().transcribe(
-                    prepared_sound.data,
-                    word_timestamps=self.word_timestamps,
-                    language=self.language,
-                )
-                segments_list = list(segments)
+            if partial_worker:
+                segments_list = partial_worker.finish(audio)
+            else:
+                with Stt.inference_lock:
+                    segments, _ = Stt.get_whisper().transcribe(
+                        prepared_sound.data,
+                        word_timestamps=self.word_timestamps,
+                        language=self.language,
+                    )
+                    segments_list = list(segments)
             if segments_list:
                 self.on_transcription(segments_list, np.copy(prepared_sound.data))
         except Exception as e:
+            if partial_worker:
+                partial_worker.reset()
             print(f"RealtimeTranscriber transcription error: {e}")
 
+    def _transcribe(self, audio: np.ndarray, initial_prompt: str) -> list[Segment]:
+        """ Transcribes a portion of an utterance, with word timestamps """
+        prepared_sound = Transcriber.prepare_sound_for_whisper(Sound(audio, WHISPER_SAMPLERATE))
+        kwargs = {"initial_prompt": initial_prompt} if initial_prompt else {}
+        with Stt.inference_lock:
+            segments, _ = Stt.get_whisper().transcribe(
+                prepared_sound.data,
+                word_timestamps=True,
+                language=self.language,
+                **kwargs,
+            )
+            return list(segments)
+
+
+class IncrementalTranscript:
+    """
+    Transcript of an utterance in progress, built up by repeatedly transcribing the
+    growing audio, following the "local agreement" policy: a word is committed once two
+    consecutive transcriptions agree on it, unless it ends within `commit_guard_s` of the
+    end of the audio (where the next word may still be cut off).
+
+    Committed words are never re-transcribed: each transcription covers only the audio
+    after the last committed word, with the committed text as the prompt for context.
+    """
+
+    def __init__(self, transcribe: Callable[[np.ndarray, str], list[Segment]], commit_guard_s: float = 1.0):
+        """
+        :param transcribe: Transcribes audio with word timestamps, given the text preceding it
+        """
+        self._transcribe = transcribe
+        self.commit_guard_s = commit_guard_s
+        self.reset()
+
+    def reset(self) -> None:
+        self._committed_words: list[Word] = []
+        # Start of the uncommitted audio
+        self._committed_samples = 0
+        # Uncommitted words of the previous transcription
+        self._tentative_words: list[Word] = []
+
+    @property
+    def committed_text(self) -> str:
+        return "".join(word.word for word in self._committed_words).strip()
+
+    def update(self, audio: np.ndarray) -> str:
+        """
+        Transcribes the uncommitted part of `audio` (the utterance so far),
+        commits what can be committed, and returns the current hypothesis for the whole utterance.
+        """
+        words = self._transcribe_uncommitted(audio)
+        commit_before = len(audio) / WHISPER_SAMPLERATE - self.commit_guard_s
+        num_agreed = 0
+        for word, previous_word in zip(words, self._tentative_words):
+            if word.end > commit_before or normalize_word(word.word) != normalize_word(previous_word.word):
+                break
+            num_agreed += 1
+        if num_agreed:
+            self._committed_words.extend(words[:num_agreed])
+            self._committed_samples = int(words[num_agreed - 1].end * WHISPER_SAMPLERATE)
+        self._tentative_words = words[num_agreed:]
+        tentative_text = "".join(word.word for word in self._tentative_words).strip()
+        return f"{self.committed_text} {tentative_text}".strip()
+
+    def finish(self, audio: np.ndarray) -> list[Segment]:
+        """
+        Transcribes the remaining uncommitted part of `audio` (the complete utterance), and resets.
+        Returns segments for the whole utterance, with timestamps relative to `audio`.
+        """
+        offset = self._committed_samples / WHISPER_SAMPLERATE
+        segments: list[Segment] = []
+        if self._committed_words:
+            segments.append(ConcreteSegment(
+                start=self._committed_words[0].start,
+                end=self._committed_words[-1].end,
+                text="".join(word.word for word in self._committed_words),
+                words=list(self._committed_words),
+            ))
+        tail_audio = audio[self._committed_samples:]
+        if len(tail_audio) > 0:
+            for segment in self._transcribe(tail_audio, self.committed_text):
+                segments.append(ConcreteSegment(
+                    start=segment.start + offset,
+                    end=segment.end + offset,
+                    text=segment.text,
+                    words=[offset_word(word, offset) for word in (segment.words or [])],
+                ))
+        L.d(f"Incremental transcript: {offset:.2f}s committed, {len(tail_audio) / WHISPER_SAMPLERATE:.2f}s tail")
+        self.reset()
+        return segments
+
+    def _transcribe_uncommitted(self, audio: np.ndarray) -> list[Word]:
+        """ Returns words of the uncommitted part of `audio`, with timestamps relative to `audio` """
+        offset = self._committed_samples / WHISPER_SAMPLERATE
+        segments = self._transcribe(audio[self._committed_samples:], self.committed_text)
+        return [offset_word(word, offset) for segment in segments for word in (segment.words or [])]
+
+
+class PartialTranscriptionWorker:
+    """
+    Runs `IncrementalTranscript.update()` on a worker thread, so that the audio
+    processing loop only has to hand over the utterance so far.
+
+    Only the latest submitted audio gets transcribed; audio still waiting when newer
+    audio arrives, or when the utterance is finished or reset, is dropped.
+    """
+
+    def __init__(self, transcript: IncrementalTranscript, on_partial_transcription: Callable[[str], None] | None):
+        self.transcript = transcript
+        self.on_partial_transcription = on_partial_transcription
+        self._condition = threading.Condition()
+        self._pending: np.ndarray | None = None
+        # Incremented when the utterance is finished or reset, invalidating pending audio
+        self._epoch = 0
+        self._is_stopped = False
+        # Held while using `transcript`
+        self._transcript_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, audio: np.ndarray) -> None:
+        """ Queues the utterance so far for partial transcription, replacing any still pending """
+        with self._condition:
+            self._pending = audio
+            self._condition.notify()
+
+    def finish(self, audio: np.ndarray) -> list[Segment]:
+        """
+        Drops pending audio, waits for any partial transcription in flight,
+        and returns `IncrementalTranscript.finish()`.
+        """
+        self._invalidate()
+        with self._transcript_lock:
+            return self.transcript.finish(audio)
+
+    def reset(self) -> None:
+        """ Drops pending audio, waits for any partial transcription in flight, and resets the transcript """
+        self._invalidate()
+        with self._transcript_lock:
+            self.transcript.reset()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._is_stopped = True
+            self._pending = None
+            self._condition.notify()
+        self._thread.join(timeout=10)
+
+    def _invalidate(self) -> None:
+        with self._condition:
+            self._pending = None
+            self._epoch += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._is_stopped:
+                    self._condition.wait()
+                if self._is_stopped or self._pending is None:
+                    return
+                audio, epoch = self._pending, self._epoch
+                self._pending = None
+
+            with self._transcript_lock:
+                if epoch != self._epoch:
+                    continue
+                try:
+                    text = self.transcript.update(audio)
+                    # Reported while holding the lock, so that it can't come after the final transcription
+                    if text and self.on_partial_transcription and epoch == self._epoch:
+                        self.on_partial_transcription(text)
+                except Exception as e:
+                    L.e(f"RealtimeTranscriber partial transcription error: {e}")
+
 # ---
 
+def normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def offset_word(word: Word, offset: float) -> Word:
+    return ConcreteWord(start=word.start + offset, end=word.end + offset, word=word.word, probability=word.probability)
+
+
 @contextmanager
 def block_sigint_during_stream_start() -> Iterator[None]:
     """
@@ -10,11 +10,15 @@ This module supports the "enhance existing audiobook" flow by:
 """
 
 from dataclasses import dataclass
+import os
+import pickle
+import queue
+import threading
 from typing import Generator, List, NamedTuple
 import ffmpeg
 import numpy as np
 import difflib
-from tts_audiobook_tool.app_types import ConcreteWord, Word
+from tts_audiobook_tool.app_types import ConcreteWord, Sound, Word
 from tts_audiobook_tool.app_support.interrupts import Interrupts
 from tts_audiobook_tool.sound.audio_meta_util import AudioMetaUtil
 from tts_audiobook_tool.stt import Stt
@@ -29,6 +33,44 @@ from tts_audiobook_tool.transcriber import Transcriber
 class AlignmentState:
     cursor: int = 0
     max_skip_words: int = 45
+    # Tokenized transcript, reused across calls made with the same word list
+    transcript_tokens: TranscriptTokens | None = None
+
+
+@dataclass
+class TranscriptTokens:
+    """
+    Transcript words, normalized once up-front into integer token ids for word-level alignment.
+
+    Words which normalize to nothing (eg, stray punctuation) are left out;
+    `word_indices` maps each token back to its index in the source word list.
+    """
+    words: List[Word]
+    texts: List[str]
+    ids: np.ndarray
+    word_indices: np.ndarray
+    vocabulary: dict[str, int]
+
+    @staticmethod
+    def make(words: List[Word]) -> TranscriptTokens:
+        vocabulary: dict[str, int] = {}
+        texts: List[str] = []
+        ids: List[int] = []
+        word_indices: List[int] = []
+        for word_index, word in enumerate(words):
+            text = normalize_text(word.word)
+            if not text:
+                continue
+            texts.append(text)
+            ids.append(vocabulary.setdefault(text, len(vocabulary)))
+            word_indices.append(word_index)
+        return TranscriptTokens(
+            words=words,
+            texts=texts,
+            ids=np.array(ids, dtype=np.int32),
+            word_indices=np.array(word_indices, dtype=np.int64),
+            vocabulary=vocabulary,
+        )
 
 
 def make_timed_phrases(
@@ -105,6 +147,11 @@ def align_phrases_with_state(
             result.append(TimedPhrase(phrase.text, 0.0, 0.0))
         return result, state, False
 
+    tokens = state.transcript_tokens
+    if tokens is None or tokens.words is not transcribed_words:
+        tokens = TranscriptTokens.make(transcribed_words)
+        state.transcript_tokens = tokens
+
     current_skip_span = 0
 
     for segment_index, segment in enumerate(phrases):
@@ -113,66 +160,27 @@ def align_phrases_with_state(
             return [], state, True
 
         text_normed = normalize_text(segment.text)
-        num_words = len(text_normed.split())
 
         if not text_normed:
             result.append(TimedPhrase(segment.text, 0.0, 0.0))
             continue
 
-        best_match: MatchInfo | None = None
-
-        trans_index_start_min = state.cursor
-        trans_index_start_max = state.cursor + state.max_skip_words
-        trans_index_start_max = min(trans_index_start_max, len(transcribed_words))
-
-        for trans_index_start in range(trans_index_start_min, trans_index_start_max):
-
-            phrase_length_min = int(num_words * 0.75) or 1
-            extra = int(num_words * 0.25)
-            extra = max(extra, 2)
-            phrase_length_max = num_words + extra
-
-            trans_index_end_min = trans_index_start + phrase_length_min
-            trans_index_end_max = trans_index_start + phrase_length_max
-            trans_index_end_max = min(trans_index_end_max, len(transcribed_words))
-
-            for trans_index_end in range(trans_index_end_min, trans_index_end_max + 1):
-
-                trans_words = transcribed_words[trans_index_start : trans_index_end]
-                if not trans_words:
-                    continue
-                trans_text_normed = " ".join(
-                    normalize_text(item.word) for item in trans_words
-                )
-                if not trans_text_normed:
-                    continue
-
-                modded_segment_text_normed = text_normed
-                modded_trans_text_normed = trans_text_normed
-
-                if segment_index > 0 and state.cursor > 0 and trans_index_start > 0:
-                    previous_segment = phrases[segment_index - 1]
-                    previous_segment_word = normalize_text(previous_segment.text).split(" ")[-1]
-                    previous_segment_word = normalize_text(previous_segment_word)
-
-                    previous_trans_word = transcribed_words[state.cursor - 1].word
-                    previous_trans_word = normalize_text(previous_trans_word)
-
-                    if previous_segment_word and previous_trans_word:
-                        modded_segment_text_normed = previous_segment_word + " " + text_normed
-                        modded_trans_text_normed = previous_trans_word + " " + trans_text_normed
-
-                matcher = difflib.SequenceMatcher(None, modded_segment_text_normed, modded_trans_text_normed)
-                score = matcher.ratio()
-
-                if not best_match or score > best_match.score:
-                    best_match = MatchInfo(
-                        trans_index_start=trans_index_start,
-                        trans_index_end=trans_index_end,
-                        trans_text=trans_text_normed,
-                        score=score
-                    )
-                    current_skip_span = trans_index_start - trans_index_start_min
+        # Words immediately preceding the cursor in source and transcript,
+        # prepended to both sides when scoring as extra context
+        anchor = ("", "")
+        if segment_index > 0 and state.cursor > 0:
+            previous_segment_word = normalize_text(phrases[segment_index - 1].text).split(" ")[-1]
+            previous_trans_word = normalize_text(transcribed_words[state.cursor - 1].word)
+            if previous_segment_word and previous_trans_word:
+                anchor = (previous_segment_word, previous_trans_word)
+
+        token_index_start_min = int(np.searchsorted(tokens.word_indices, state.cursor))
+        token_index_start_max = min(token_index_start_min + state.max_skip_words, len(tokens.ids))
+        best_match = find_best_match(
+            tokens, text_normed.split(" "), token_index_start_min, token_index_start_max, anchor
+        )
+        if best_match:
+            current_skip_span = best_match.trans_index_start - state.cursor
 
         def print_result(is_success: bool):
             printt(f"line {line_offset + segment_index + 1}")
@@ -240,74 +248,212 @@ def align_phrases_with_state(
     return result, state, False
 
 
-def transcribe_to_words(path: str) -> list[Word] | None:
+def transcribe_to_words(path: str, checkpoint_path: str="") -> tuple[list[Word] | None, str]:
     """
-    Creates a list of Word instances by transcribing the audio at the given file path
-    Returns None if interrupted
+    Creates a list of Word instances by transcribing the audio at the given file path.
+    Returns the words (or None if interrupted), and error string.
+
+    When `checkpoint_path` is given, progress gets saved there periodically and when
+    interrupted, and progress saved by a previous run gets resumed from.
+    Deleting the checkpoint file after the results have been saved is the caller's job.
     """
-    list_of_lists = _transcribe_stream_with_overlap(path)
+    list_of_lists, err = _transcribe_stream_with_overlap(path, checkpoint_path)
+    if err:
+        return None, err
     if list_of_lists is None:
-        return None
+        return None, ""
     words_list = _stitch_transcripts(list_of_lists)
-    return words_list
+    return words_list, ""
+
+
+@dataclass
+class TranscriptionCheckpoint:
+    """
+    Partial transcription of a long audio file (one words list per completed chunk)
+    """
+    chunk_duration: int
+    overlap_duration: int
+    list_of_lists: list[list[Word]]
+
+
+def load_transcription_checkpoint(checkpoint_path: str) -> list[list[Word]]:
+    """
+    Returns the per-chunk transcriptions saved at the given path, or empty list if none
+    (or if saved using different chunk settings)
+    """
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return []
+    try:
+        with open(checkpoint_path, "rb") as file:
+            checkpoint = pickle.load(file)
+    except Exception:
+        return []
+    if not isinstance(checkpoint, TranscriptionCheckpoint):
+        return []
+    if checkpoint.chunk_duration != TRANSCRIBE_CHUNK_DURATION or checkpoint.overlap_duration != TRANSCRIBE_OVERLAP_DURATION:
+        return []
+    return checkpoint.list_of_lists
+
+
+def save_transcription_checkpoint(checkpoint_path: str, list_of_lists: list[list[Word]]) -> str:
+    """
+    Saves atomically, so that an interrupted save can't clobber the previous checkpoint.
+    Returns error string on fail.
+    """
+    checkpoint = TranscriptionCheckpoint(TRANSCRIBE_CHUNK_DURATION, TRANSCRIBE_OVERLAP_DURATION, list_of_lists)
+    temp_path = checkpoint_path + ".tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            pickle.dump(checkpoint, file)
+        os.replace(temp_path, checkpoint_path)
+        return ""
+    except Exception as e:
+        delete_silently(temp_path)
+        return make_error_string(e)
 
 
-def _transcribe_stream_with_overlap(path: str) -> list[list[Word]] | None:
-    CHUNK_DURATION = 30
-    OVERLAP_DURATION = 5
+def _transcribe_stream_with_overlap(path: str, checkpoint_path: str="") -> tuple[list[list[Word]] | None, str]:
+    """
+    Transcribes the file as a series of overlapping chunks, returning one words list per chunk
+    (or None if interrupted), and error string.
+
+    Audio gets decoded ahead on a separate thread, and chunks are transcribed
+    TRANSCRIBE_BATCH_SIZE at a time (as a single batched inference call when the
+    whisper backend supports it).
+    """
+    stride = TRANSCRIBE_CHUNK_DURATION - TRANSCRIBE_OVERLAP_DURATION
 
-    list_of_lists: list[list[Word]] = []
-    time_offset = 0.0
+    list_of_lists = load_transcription_checkpoint(checkpoint_path)
+    start_time = len(list_of_lists) * stride
+    if list_of_lists:
+        printt(f"Resuming previous transcription at {duration_string(start_time)}")
+        printt()
 
     duration_str = ""
     value = AudioMetaUtil.get_audio_duration(path)
     if value:
         duration_str = duration_string(value)
 
+    chunks: queue.Queue[np.ndarray | str | None] = queue.Queue(maxsize=TRANSCRIBE_BATCH_SIZE * 2)
+    stop_event = threading.Event()
+    producer = threading.Thread(
+        target=_decode_ahead, args=(path, start_time, chunks, stop_event), daemon=True
+    )
+    producer.start()
+
     did_interrupt = False
+    err = ""
+    is_done = False
+    last_checkpoint_time = time.time()
     Interrupts().set("transcribing")
 
-    for i, chunk in enumerate(
-        _stream_audio_with_overlap(
-            file_path=path,
-            chunk_duration=CHUNK_DURATION,
-            overlap_duration=OVERLAP_DURATION
-        )
-    ):
-        if Interrupts().did_interrupt:
-            did_interrupt = True
-            break
+    try:
+        while not is_done and not err:
+
+            if Interrupts().did_interrupt:
+                did_interrupt = True
+                break
 
-        s = f"{Ansi.LINE_HOME}{duration_string(time_offset)}"
-        if duration_str:
-            s += f" / {duration_str}"
-        s += f"{Ansi.ERASE_REST_OF_LINE}"
-        print(s, end="", flush=True)
-
-        segments, _ = Stt.get_whisper().transcribe(chunk, word_timestamps=True, language=None)
-        transcribed_words = Transcriber.get_words_from_segments(segments)
-        updated_words = []
-        for word in transcribed_words:
-            updated_word = ConcreteWord(
-                start=word.start + time_offset,
-                end=word.end + time_offset,
-                word=word.word,
-                probability=word.probability
+            batch: list[np.ndarray] = []
+            while len(batch) < TRANSCRIBE_BATCH_SIZE:
+                item = chunks.get()
+                if item is None:
+                    is_done = True
+                    break
+                if isinstance(item, str):
+                    err = item
+                    break
+                batch.append(item)
+            if not batch:
+                continue
+
+            s = f"{Ansi.LINE_HOME}{duration_string(len(list_of_lists) * stride)}"
+            if duration_str:
+                s += f" / {duration_str}"
+            s += f"{Ansi.ERASE_REST_OF_LINE}"
+            print(s, end="", flush=True)
+
+            results = Transcriber.transcribe_batch(
+                [Sound(chunk, WHISPER_SAMPLERATE) for chunk in batch],
+                language_code="",
+                stt_variant=Stt.get_variant(),
+                stt_config=Stt.get_config()
             )
-            updated_words.append(updated_word)
-        list_of_lists.append(updated_words)
+            for result in results:
+                if isinstance(result, str):
+                    err = result
+                    break
+                time_offset = len(list_of_lists) * stride
+                updated_words: list[Word] = [
+                    ConcreteWord(
+                        start=word.start + time_offset,
+                        end=word.end + time_offset,
+                        word=word.word,
+                        probability=word.probability
+                    )
+                    for word in result
+                ]
+                list_of_lists.append(updated_words)
 
-        time_offset += CHUNK_DURATION - OVERLAP_DURATION
+            if checkpoint_path and time.time() - last_checkpoint_time >= TRANSCRIBE_CHECKPOINT_INTERVAL:
+                save_transcription_checkpoint(checkpoint_path, list_of_lists)
+                last_checkpoint_time = time.time()
 
-    Interrupts().clear()
+    finally:
+        stop_event.set()
+        producer.join()
+        Interrupts().clear()
 
     print()
     print()
 
-    if did_interrupt:
-        return None
-    else:
-        return list_of_lists
+    if did_interrupt or err:
+        if checkpoint_path and list_of_lists:
+            save_err = save_transcription_checkpoint(checkpoint_path, list_of_lists)
+            if not save_err:
+                printt(f"{COL_DIM}Progress saved, will resume from {duration_string(len(list_of_lists) * stride)} next time")
+                printt()
+        return None, err
+
+    return list_of_lists, ""
+
+
+def _decode_ahead(
+        path: str,
+        start_time: float,
+        chunks: queue.Queue[np.ndarray | str | None],
+        stop_event: threading.Event
+) -> None:
+    """
+    Producer thread for `_transcribe_stream_with_overlap()`.
+    Puts audio chunks into the queue, followed by None when done, or an error string.
+    """
+
+    def put(item: np.ndarray | str | None) -> bool:
+        while not stop_event.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    stream = _stream_audio_with_overlap(
+        file_path=path,
+        chunk_duration=TRANSCRIBE_CHUNK_DURATION,
+        overlap_duration=TRANSCRIBE_OVERLAP_DURATION,
+        start_time=start_time
+    )
+    try:
+        for chunk in stream:
+            if not put(chunk):
+                return
+    except Exception as e:
+        put(make_error_string(e))
+        return
+    finally:
+        stream.close()
+    put(None)
 
 
 def _stream_audio_with_overlap(
@@ -315,6 +461,7 @@ def _stream_audio_with_overlap(
     chunk_duration: int = 30,
     overlap_duration: int = 5,
     sample_rate: int = 16000,
+    start_time: float = 0.0,
 ) -> Generator[np.ndarray, None, None]:
     bytes_per_sample = 2
     chunk_stride = chunk_duration - overlap_duration
@@ -322,8 +469,9 @@ def _stream_audio_with_overlap(
     bytes_per_chunk = int(sample_rate * bytes_per_sample * chunk_duration)
     bytes_per_stride = int(sample_rate * bytes_per_sample * chunk_stride)
 
+    input_kwargs = { "ss": start_time } if start_time > 0 else {}
     process = (
-        ffmpeg.input(file_path)
+        ffmpeg.input(file_path, **input_kwargs)
         .output(
             "pipe:",
             loglevel="warning",
@@ -334,27 +482,34 @@ def _stream_audio_with_overlap(
         .run_async(pipe_stdout=True)
     )
 
-    buffer = b""
-    while True:
-        bytes_to_read = bytes_per_chunk - len(buffer)
-        raw_bytes_new = process.stdout.read(bytes_to_read)
+    try:
+        buffer = b""
+        while True:
+            bytes_to_read = bytes_per_chunk - len(buffer)
+            raw_bytes_new = process.stdout.read(bytes_to_read)
 
-        if not raw_bytes_new:
-            break
+            if not raw_bytes_new:
+                break
 
-        raw_bytes = buffer + raw_bytes_new
+            raw_bytes = buffer + raw_bytes_new
 
-        audio = np.frombuffer(raw_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+            audio = np.frombuffer(raw_bytes, dtype=np.int16).astype(np.float32) / 32768.0
 
-        yield audio
+            yield audio
 
-        if overlap_duration > 0:
-            rewind_bytes = int(sample_rate * bytes_per_sample * overlap_duration)
-            buffer = raw_bytes[-rewind_bytes:]
-        else:
-            buffer = b""
+            if overlap_duration > 0:
+                rewind_bytes = int(sample_rate * bytes_per_sample * overlap_duration)
+                buffer = raw_bytes[-rewind_bytes:]
+            else:
+                buffer = b""
+
+        process.wait()
 
-    process.wait()
+    finally:
+        # Eg, when consumer stops early
+        if process.poll() is None:
+            process.kill()
+            process.wait()
 
 
 def _stitch_transcripts(
@@ -418,6 +573,89 @@ class MatchInfo(NamedTuple):
     score: float
 
 
+def find_best_match(
+    tokens: TranscriptTokens,
+    phrase_words: List[str],
+    token_index_start_min: int,
+    token_index_start_max: int,
+    anchor: tuple[str, str] = ("", ""),
+) -> MatchInfo | None:
+    """
+    Finds the transcript span that best matches a (normalized) phrase.
+
+    Candidate spans start anywhere in [token_index_start_min, token_index_start_max)
+    and are 75% to 125% of the phrase's word count in length (minimum +2 words).
+
+    Coarse-to-fine: a word-level edit distance (insertions/deletions only, so that
+    `1 - distance / (phrase length + span length)` is difflib's ratio measured in
+    words) is computed for every candidate span at once, vectorized over start
+    positions. Only the few best spans then get scored at the character level,
+    which gives credit for near-miss words (eg, "sad" for "said") and which is
+    the score that is returned and compared against MIN_MATCH_RATIO.
+
+    Returned indices are word (not token) indices.
+    """
+    num_starts = token_index_start_max - token_index_start_min
+    num_phrase_words = len(phrase_words)
+    if num_starts <= 0 or num_phrase_words == 0:
+        return None
+
+    length_min = int(num_phrase_words * 0.75) or 1
+    length_max = num_phrase_words + max(int(num_phrase_words * 0.25), 2)
+
+    # Candidate windows, one row per start position, padded past the end of the transcript
+    starts = np.arange(token_index_start_min, token_index_start_max)
+    positions = starts[:, None] + np.arange(length_max)[None, :]
+    num_tokens = len(tokens.ids)
+    windows = np.where(positions < num_tokens, tokens.ids[np.minimum(positions, num_tokens - 1)], -1)
+
+    # dp[s, l] is the edit distance between the phrase words so far and window s's first l tokens
+    lengths = np.arange(length_max + 1)
+    dp = np.tile(lengths, (num_starts, 1))
+    row = np.empty_like(dp)
+    for i, phrase_word in enumerate(phrase_words, 1):
+        phrase_id = tokens.vocabulary.get(phrase_word, -2)
+        row[:, 0] = i
+        row[:, 1:] = np.minimum(
+            dp[:, :-1] + np.where(windows == phrase_id, 0, 2), # match, or delete + insert
+            dp[:, 1:] + 1 # skip phrase word
+        )
+        # Skip window token, ie, row[l] = min(row[l], row[l-1] + 1)
+        dp = np.minimum.accumulate(row - lengths, axis=1) + lengths
+
+    ratios = 1.0 - dp / (num_phrase_words + lengths)
+    is_valid = (lengths >= length_min)[None, :] & (starts[:, None] + lengths[None, :] <= num_tokens)
+    ratios = np.where(is_valid, ratios, -1.0).ravel()
+
+    # Character-level scoring of the best candidates, in (start, length) order
+    # so that ties resolve to the earliest start and then the shortest span
+    candidates = np.argsort(-ratios, kind="stable")[:NUM_RESCORED_CANDIDATES]
+    candidates = candidates[ratios[candidates] >= max(ratios[candidates[0]] - RESCORED_CANDIDATES_MARGIN, 0.0)]
+    candidates = np.sort(candidates)
+
+    anchor_source, anchor_trans = anchor
+    has_anchor = bool(anchor_source and anchor_trans)
+    phrase_text = " ".join(phrase_words)
+    if has_anchor:
+        phrase_text = anchor_source + " " + phrase_text
+
+    best_match: MatchInfo | None = None
+    for candidate in candidates:
+        start_offset, length = divmod(int(candidate), length_max + 1)
+        token_start = token_index_start_min + start_offset
+        trans_text = " ".join(tokens.texts[token_start : token_start + length])
+        scored_trans_text = anchor_trans + " " + trans_text if has_anchor else trans_text
+        score = difflib.SequenceMatcher(None, phrase_text, scored_trans_text).ratio()
+        if not best_match or score > best_match.score:
+            best_match = MatchInfo(
+                trans_index_start=int(tokens.word_indices[token_start]),
+                trans_index_end=int(tokens.word_indices[token_start + length - 1]) + 1,
+                trans_text=trans_text,
+                score=score
+            )
+    return best_match
+
+
 def normalize_text(text: str) -> str:
     if not text:
         return ""
@@ -456,8 +694,19 @@ def make_words_string(transcribed_words: list[Word], index: int, length: int=8)
     return s
 
 
+TRANSCRIBE_CHUNK_DURATION = 30
+TRANSCRIBE_OVERLAP_DURATION = 5
+# Number of chunks per whisper call
+TRANSCRIBE_BATCH_SIZE = 8
+# Min seconds between transcription checkpoint saves
+TRANSCRIBE_CHECKPOINT_INTERVAL = 60
+
 MIN_MATCH_RATIO = 0.7
 MAX_SKIP_WORDS_BASE = 45
 MAX_SKIP_WORDS_LIMIT = 250
+# Max number of spans per phrase which get scored at the character level,
+# and how far below the best span's word-level ratio they can be (see `find_best_match()`)
+NUM_RESCORED_CANDIDATES = 8
+RESCORED_CANDIDATES_MARGIN = 0.1
 
 DEBUG = DEV and True
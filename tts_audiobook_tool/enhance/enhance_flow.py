@@ -187,7 +187,11 @@ def make(
         # Warm up
         _ = Stt.get_whisper()
 
-        words = enhance_alignment.transcribe_to_words(str(source_audio_path))
+        checkpoint_path = _make_transcription_checkpoint_file_path(source_audio_hash)
+        words, err = enhance_alignment.transcribe_to_words(str(source_audio_path), checkpoint_path)
+        if err:
+            ask.ask_error(err)
+            return False
         if words is None: # interrupted
             printt("")
             print_feedback("Interrupted")
@@ -205,6 +209,7 @@ def make(
                 pickle.dump(words, file)
         except:
             pass # eat
+        delete_silently(checkpoint_path)
 
     # [3] "Merge" source text and transcribed text data
 
@@ -426,3 +431,9 @@ def print_discontinuity_info(timed_text_segments: list[TimedPhrase]):
 def _make_transcription_pickle_file_path(hash: str) -> str:
     file_name = f"transcription {hash}.pkl"
     return os.path.join(app_paths.get_app_user_dir(), file_name)
+
+
+def _make_transcription_checkpoint_file_path(hash: str) -> str:
+    """ Partial transcription data of an interrupted transcription """
+    file_name = f"transcription {hash}.partial.pkl"
+    return os.path.join(app_paths.get_app_user_dir(), file_name)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import queue
+import threading
+from typing import Any, Callable
+
+from tts_audiobook_tool.util import make_error_string
+
+
+@dataclass
+class PipelineItem:
+    """
+    One sub-batch's worth of work moving through the pipeline stages.
+    `results` is filled in by the validate stage and `saves` by the save stage.
+    """
+    tag: Any
+    gen_results: list
+    results: list | None = None
+    saves: list | None = None
+
+
+class GeneratePipeline:
+    """
+    Background stages for pipelined audiobook generation.
+
+    The caller runs TTS inference on its own thread and submits each
+    sub-batch's generation results. A validate worker (STT + validation) and a
+    save worker (FLAC/json writes) drain them through bounded queues, so that
+    inference of the next sub-batch overlaps with the transcription and saving
+    of the previous one. Finished items are collected by the caller, in
+    submission order, using `get_completed()`.
+
+    :param validate:
+        (tag, gen_results) -> list of results, one per item
+    :param save:
+        (tag, results) -> list of per-item (error string, saved path, stt info)
+        tuples, or None for items that have nothing to save
+    :param max_pending:
+        Max number of submitted sub-batches waiting for each stage.
+        `submit()` blocks while the validate stage's queue is full, which keeps
+        TTS inference from running arbitrarily far ahead of validation.
+    """
+
+    def __init__(
+            self,
+            validate: Callable[[Any, list], list],
+            save: Callable[[Any, list], list],
+            max_pending: int = 1
+    ) -> None:
+        self._validate = validate
+        self._save = save
+        self._validate_queue: queue.Queue[PipelineItem | None] = queue.Queue(maxsize=max_pending)
+        self._save_queue: queue.Queue[PipelineItem | None] = queue.Queue(maxsize=max_pending)
+        self._completed_queue: queue.Queue[PipelineItem] = queue.Queue()
+        self._num_in_flight = 0
+        self._threads = [
+            threading.Thread(target=self._validate_worker, daemon=True),
+            threading.Thread(target=self._save_worker, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def num_in_flight(self) -> int:
+        """ Number of submitted sub-batches not yet returned by `get_completed()` """
+        return self._num_in_flight
+
+    def submit(self, tag: Any, gen_results: list) -> None:
+        self._num_in_flight += 1
+        self._validate_queue.put(PipelineItem(tag=tag, gen_results=gen_results))
+
+    def get_completed(self, block: bool) -> list[PipelineItem]:
+        """
+        Returns the items that have made it through all stages.
+        When `block` is True and items are in flight, waits for at least one.
+        """
+        items: list[PipelineItem] = []
+        if block and self._num_in_flight > 0:
+            items.append(self._completed_queue.get())
+        while True:
+            try:
+                items.append(self._completed_queue.get_nowait())
+            except queue.Empty:
+                break
+        self._num_in_flight -= len(items)
+        return items
+
+    def close(self) -> list[PipelineItem]:
+        """
+        Lets any in-flight items finish, stops the workers,
+        and returns the items not yet collected.
+        """
+        self._validate_queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        return self.get_completed(block=False)
+
+    def _validate_worker(self) -> None:
+        while True:
+            item = self._validate_queue.get()
+            if item is None:
+                self._save_queue.put(None)
+                return
+            try:
+                item.results = self._validate(item.tag, item.gen_results)
+            except Exception as e:
+                item.results = [make_error_string(e)] * len(item.gen_results)
+            self._save_queue.put(item)
+
+    def _save_worker(self) -> None:
+        while True:
+            item = self._save_queue.get()
+            if item is None:
+                return
+            assert item.results is not None
+            try:
+                item.saves = self._save(item.tag, item.results)
+            except Exception as e:
+                item.saves = [(make_error_string(e), "", None)] * len(item.results)
+            self._completed_queue.put(item)
@@ -6,9 +6,10 @@ import time
 import numpy as np
 
 from tts_audiobook_tool import app_support, ask, text_util
-from tts_audiobook_tool.app_types import Sound, SttConfig, SttVariant, VoiceSelectMode
+from tts_audiobook_tool.app_types import Sound, SttConfig, SttVariant, VoiceSelectMode, Word
 from tts_audiobook_tool.app_support import app_hint_util, app_memory
 from tts_audiobook_tool.concat_util import ConcatUtil
+from tts_audiobook_tool.generate_pipeline import GeneratePipeline, PipelineItem
 from tts_audiobook_tool.menus.concat_menu import ConcatMenu
 from tts_audiobook_tool.menus.menu_util import MenuUtil
 from tts_audiobook_tool.model_manager import ModelManager
@@ -168,83 +169,21 @@ class GenerateUtil:
         Tts.clear_continuation()
         Tts.reset_voice_selection_index()
 
-        # Loop through the queue of rounds. Retries (re-added items) are
-        # collected and processed at the head of the queue, as their own
-        # round(s), before any further items from the main queue.
-        pending_retries: list[tuple[int, int]] = []
-        current_round: list[SubBatch] = []
-        last_voice: int | None = None
-
-        while True:
-
-            if Interrupts().did_interrupt:
-                did_interrupt = True
-                break
-
-            # Start a new round if needed (retries take priority over the queue)
-            if not current_round:
-                if pending_retries:
-                    current_round = make_retry_round(pending_retries, voice_of_index, batch_size)
-                    pending_retries = []
-                elif queue:
-                    current_round = queue.pop(0)
-                else:
-                    break
-
-            sub = current_round.pop(0)
+        def process_results(
+                sub: SubBatch,
+                results: list[ValidationResult | str | TtsModelError],
+                saves: list[tuple[str, str, SegmentTranscriptData | None] | None] | None,
+        ) -> None:
+            """
+            Prints and tallies the results of one sub-batch, saves validated
+            sounds (unless already saved by the pipeline's save stage, ie,
+            when `saves` is not None), and queues up any retries.
+            """
+            nonlocal num_errored, num_failed, num_failed_music, num_improved, num_passed
+            nonlocal consecutive_model_errors, did_abort_model_errors
 
-            # Make parallel arrays from 'sub'
             indices = [item[0] for item in sub.items]
             retry_counts = [item[1] for item in sub.items]
-            num_retries += sum(retry_count > 0 for retry_count in retry_counts)
-
-            # A rolling-continuation context is per voice sample, so do not
-            # carry it across a voice sample change mid-run.
-            if (
-                sub.voice_selection_index is not None
-                and last_voice is not None
-                and sub.voice_selection_index != last_voice
-            ):
-                Tts.clear_continuation()
-            last_voice = sub.voice_selection_index
-
-            if not showed_vram_warning:
-                b = app_memory.show_vram_memory_warning_if_necessary()
-                if b:
-                    print("\a", end="")
-                    showed_vram_warning = True
-
-            # Print item info
-            GenerateUtil.print_batch_heading(
-                indices=indices,
-                num_complete=num_passed + num_failed + num_errored,
-                num_remaining=len(sorted_indices) - (num_passed + num_failed + num_errored),
-                num_total=len(sorted_indices),
-                start_time=start_time,
-                voice_index=sub.voice_selection_index,
-            )
-
-            # Generate and validate
-            gen_start_time = time.time()
-            results = GenerateUtil.generate_and_validate_batch(
-                state=state,
-                indices=indices,
-                phrase_groups=project.phrase_groups,
-                stt_variant=stt_variant, stt_config=stt_config,
-                force_random_seed=is_regen or any(count > 0 for count in retry_counts),
-                is_realtime=False,
-                voice_selection_index=sub.voice_selection_index,
-            )
-            gen_val_sum_time += (time.time() - gen_start_time)
-
-            # Check for OOM in results and break early if detected
-            if any(GenerateUtil.is_error_result_oom(r) for r in results):
-                printt()
-                first_oom = next(GenerateUtil.get_error_result_message(r) for r in results if GenerateUtil.is_error_result_oom(r))
-                print_gen_oom_message(first_oom)
-                Tts.clear_continuation()
-                did_interrupt = True
-                break
 
             # Process and print results # TODO: separate biz n print logic
             re_adds: list[tuple[int, int]] = []
@@ -348,12 +287,6 @@ class GenerateUtil:
 
                     # Print STT info
                     if isinstance(validation_result, TranscriptResult):
-                        stt_info = SegmentTranscriptUtil.from_validation_result(
-                            project=project,
-                            phrase_group=phrase_group,
-                            index=index,
-                            validation_result=validation_result
-                        )
                         should_show_viz = (
                             isinstance(validation_result, (MusicFailResult, ExcessiveDurationResult))
                             or (isinstance(validation_result, WordErrorResult) and validation_result.num_errors > 0)
@@ -366,15 +299,10 @@ class GenerateUtil:
                     word_counts[index] = phrase_group.num_words
 
                     # Save
-                    err, saved_path = GenerateUtil.save_sound_and_timing_json(
-                        state,
-                        phrase_group,
-                        index,
-                        validation_result,
-                        is_real_time=False,
-                        voice_tag=getattr(validation_result, "voice_tag", ""),
-                        stt_info=stt_info,
-                    )
+                    save = saves[i] if saves is not None else None
+                    if save is None:
+                        save = GenerateUtil.save_validation_result(state, phrase_group, index, validation_result)
+                    err, saved_path, stt_info = save
                     if err:
                         save_line = f"{COL_ERROR}Couldn't save file: {err} {saved_path}"
                     else:
@@ -411,18 +339,12 @@ class GenerateUtil:
                 if did_abort_model_errors:
                     break
 
-            if did_abort_model_errors:
+            if not did_abort_model_errors:
+                # Print current memory usage
+                printt()
+                s = f"Memory: {COL_DIM}{text_util.strip_ansi_codes(app_support.make_memory_string())}"
+                printt(s)
                 printt()
-                GenerateUtil.print_consecutive_model_errors_message(max_consecutive_model_errors)
-                Tts.clear_continuation()
-                did_interrupt = True
-                break
-
-            # Print current memory usage
-            printt()
-            s = f"Memory: {COL_DIM}{text_util.strip_ansi_codes(app_support.make_memory_string())}"
-            printt(s)
-            printt()
 
             if re_adds:
                 # Pending retries are processed at the head of the queue,
@@ -430,6 +352,173 @@ class GenerateUtil:
                 # main queue.
                 pending_retries.extend(re_adds)
 
+        def process_completed(items: list[PipelineItem]) -> None:
+            """ Processes sub-batches that have made it through the pipeline """
+            for item in items:
+                if did_abort_model_errors:
+                    # Not reported on, but the save stage has already saved them
+                    assert item.saves is not None
+                    for (index, _), save in zip(item.tag.items, item.saves):
+                        if save is not None and not save[0]:
+                            saved_indices.add(index)
+                else:
+                    assert item.results is not None
+                    process_results(item.tag, item.results, item.saves)
+
+        # In pipelined mode, STT validation and file saving of a sub-batch run
+        # in the background while the next sub-batch is being generated.
+        # Not used with rolling continuation, where each generation depends on
+        # the validation outcome of the one before it.
+        pipeline: GeneratePipeline | None = None
+        if state.prefs.pipelined_generation and not Tts.get_class().uses_rolling_continuation(project):
+            skip_reason = Stt.should_skip(state)
+            pipeline = GeneratePipeline(
+                validate=lambda sub, gen_results: GenerateUtil.validate_batch(
+                    state=state,
+                    indices=[item[0] for item in sub.items],
+                    phrase_groups=project.phrase_groups,
+                    gen_results=gen_results,
+                    stt_variant=stt_variant, stt_config=stt_config,
+                    is_realtime=False,
+                    skip_reason=skip_reason,
+                    print_progress=False,
+                ),
+                save=lambda sub, results: [
+                    GenerateUtil.save_validation_result(state, project.phrase_groups[item[0]], item[0], result)
+                    if not isinstance(result, (str, TtsModelError)) else None
+                    for item, result in zip(sub.items, results)
+                ],
+            )
+
+        # Loop through the queue of rounds. Retries (re-added items) are
+        # collected and processed at the head of the queue, as their own
+        # round(s), before any further items from the main queue.
+        pending_retries: list[tuple[int, int]] = []
+        current_round: list[SubBatch] = []
+        last_voice: int | None = None
+        loop_start_time = time.time()
+
+        while True:
+
+            if Interrupts().did_interrupt:
+                did_interrupt = True
+                break
+
+            # Start a new round if needed (retries take priority over the queue)
+            if not current_round:
+                if pending_retries:
+                    current_round = make_retry_round(pending_retries, voice_of_index, batch_size)
+                    pending_retries = []
+                elif queue:
+                    current_round = queue.pop(0)
+                elif pipeline is not None and pipeline.num_in_flight > 0:
+                    # Wait on in-flight sub-batches, which may yield retries
+                    process_completed(pipeline.get_completed(block=True))
+                    if did_abort_model_errors:
+                        break
+                    continue
+                else:
+                    break
+
+            sub = current_round.pop(0)
+
+            # Make parallel arrays from 'sub'
+            indices = [item[0] for item in sub.items]
+            retry_counts = [item[1] for item in sub.items]
+            num_retries += sum(retry_count > 0 for retry_count in retry_counts)
+
+            # A rolling-continuation context is per voice sample, so do not
+            # carry it across a voice sample change mid-run.
+            if (
+                sub.voice_selection_index is not None
+                and last_voice is not None
+                and sub.voice_selection_index != last_voice
+            ):
+                Tts.clear_continuation()
+            last_voice = sub.voice_selection_index
+
+            if not showed_vram_warning:
+                b = app_memory.show_vram_memory_warning_if_necessary()
+                if b:
+                    print("\a", end="")
+                    showed_vram_warning = True
+
+            # Print item info
+            GenerateUtil.print_batch_heading(
+                indices=indices,
+                num_complete=num_passed + num_failed + num_errored,
+                num_remaining=len(sorted_indices) - (num_passed + num_failed + num_errored),
+                num_total=len(sorted_indices),
+                start_time=start_time,
+                voice_index=sub.voice_selection_index,
+            )
+
+            # Generate and validate
+            gen_start_time = time.time()
+            force_random_seed = is_regen or any(count > 0 for count in retry_counts)
+            if pipeline is None:
+                results = GenerateUtil.generate_and_validate_batch(
+                    state=state,
+                    indices=indices,
+                    phrase_groups=project.phrase_groups,
+                    stt_variant=stt_variant, stt_config=stt_config,
+                    force_random_seed=force_random_seed,
+                    is_realtime=False,
+                    voice_selection_index=sub.voice_selection_index,
+                )
+                gen_results = None
+                error_results = results
+            else:
+                results = None
+                gen_results = GenerateUtil.generate_batch(
+                    state=state,
+                    indices=indices,
+                    phrase_groups=project.phrase_groups,
+                    force_random_seed=force_random_seed,
+                    is_realtime=False,
+                    voice_selection_index=sub.voice_selection_index,
+                )
+                error_results = [r for r in gen_results if not isinstance(r, tuple)]
+            if pipeline is None:
+                # (In pipelined mode, validation overlaps generation, so the loop's wall time is used instead)
+                gen_val_sum_time += (time.time() - gen_start_time)
+
+            # Check for OOM in results and break early if detected
+            if any(GenerateUtil.is_error_result_oom(r) for r in error_results):
+                printt()
+                first_oom = next(GenerateUtil.get_error_result_message(r) for r in error_results if GenerateUtil.is_error_result_oom(r))
+                print_gen_oom_message(first_oom)
+                Tts.clear_continuation()
+                did_interrupt = True
+                break
+
+            if results is not None:
+                process_results(sub, results, None)
+            elif pipeline is not None and gen_results is not None:
+                # Blocks while the validation stage is still busy with
+                # earlier sub-batches
+                pipeline.submit(sub, gen_results)
+                process_completed(pipeline.get_completed(block=False))
+
+            if did_abort_model_errors:
+                break
+
+        if pipeline is not None:
+            # Finish up and report on any sub-batches still in flight
+            # (their retries, if any, are listed in the summary as not done)
+            process_completed(pipeline.close())
+            gen_val_sum_time = time.time() - loop_start_time
+
+        # Retries not done because the loop ended early
+        dropped_retry_indices = {index for index, _ in pending_retries}
+        dropped_retry_indices |= {index for sub in current_round for index, retry_count in sub.items if retry_count > 0}
+
+        if did_abort_model_errors:
+            printt()
+            GenerateUtil.print_consecutive_model_errors_message(max_consecutive_model_errors)
+            Tts.clear_continuation()
+            did_interrupt = True
+
         # Update the persisted queue once per generation run, based only on files
         # that were actually saved successfully.
         if saved_indices:
@@ -468,6 +557,9 @@ class GenerateUtil:
             warnings_string += f"Lines saved, but with excess word errors: {col}{num_failed}{COL_DEFAULT}\n"
         if num_errored:
             warnings_string += f"Lines failed to generate: {COL_ERROR}{num_errored}{COL_DEFAULT}\n"
+        if dropped_retry_indices:
+            lines_string = RangeStringUtil.make_ranges_string(dropped_retry_indices, len(project.phrase_groups))
+            warnings_string += f"Lines not retried: {COL_ERROR}{len(dropped_retry_indices)}{COL_DEFAULT} ({lines_string})\n"
         if DEV:
             warnings_string += f"Num words: {sum(word_counts.values())}\n"
             warnings_string += f"Gen/val elapsed: {duration_string(gen_val_sum_time)}\n"
@@ -498,28 +590,58 @@ class GenerateUtil:
         Returns a list of results (ValidationResult or error string).
 
         :param indices:
-            When length is 1, batch mode is disabled
+            When length is 1, batch mode is disabled. Otherwise, the generated
+            sounds are also transcribed as a batch (see Transcriber.transcribe_batch)
         :param voice_selection_index:
             When set, all items in the batch are generated with this voice
             sample (a batch must be voice-homogeneous). When None, the voice
             is resolved by the existing logic inside `generate()`.
         """
 
-        project = state.project
-        save_debug_files = state.prefs.save_debug_files
+        gen_results = GenerateUtil.generate_batch(
+            state=state,
+            indices=indices,
+            phrase_groups=phrase_groups,
+            force_random_seed=force_random_seed,
+            is_realtime=is_realtime,
+            voice_selection_index=voice_selection_index
+        )
+        return GenerateUtil.validate_batch(
+            state=state,
+            indices=indices,
+            phrase_groups=phrase_groups,
+            gen_results=gen_results,
+            stt_variant=stt_variant,
+            stt_config=stt_config,
+            is_realtime=is_realtime,
+            skip_reason=Stt.should_skip(state, is_skip_reason_buffer)
+        )
+
+    @staticmethod
+    def generate_batch(
+        state: State,
+        indices: list[int],
+        phrase_groups: list[PhraseGroup],
+        force_random_seed: bool,
+        is_realtime: bool,
+        voice_selection_index: int | None=None
+    ) -> list[tuple[Sound, list[SilenceGapTrim], float | None, float | None, float, float | None, str] | str | TtsModelError]:
+        """
+        Generation step of `generate_and_validate_batch()`.
+        Prints model output and speed info.
+        """
 
         # Set print color to dim during any model inference printouts
         print(f"{COL_DIM}", end="")
 
-        # Generate:
         gen_start_time = time.time()
         gen_results = GenerateUtil.generate(
-            project=project,
+            project=state.project,
             indices=indices,
             phrase_groups=phrase_groups,
             force_random_seed=force_random_seed,
             is_realtime=is_realtime,
-            save_debug_files=save_debug_files,
+            save_debug_files=state.prefs.save_debug_files,
             print_generation_request=True,
             voice_selection_index=voice_selection_index
         )
@@ -528,27 +650,68 @@ class GenerateUtil:
         # Print speed info
         print_speed_info(time.time() - gen_start_time, gen_results)
 
-        # Should skip or not
-        skip_reason = Stt.should_skip(state, is_skip_reason_buffer)
-        if not skip_reason:
+        return gen_results
+
+    @staticmethod
+    def validate_batch(
+        state: State,
+        indices: list[int],
+        phrase_groups: list[PhraseGroup],
+        gen_results: list[tuple[Sound, list[SilenceGapTrim], float | None, float | None, float, float | None, str] | str | TtsModelError],
+        stt_variant: SttVariant,
+        stt_config: SttConfig,
+        is_realtime: bool,
+        skip_reason: str,
+        print_progress: bool=True
+    ) -> list[ValidationResult | str | TtsModelError]:
+        """
+        Transcription/validation step of `generate_and_validate_batch()`.
+
+        :param skip_reason:
+            When non-empty, items are not transcribed and get a SkippedResult
+        :param print_progress:
+            False when running off the main thread (see GeneratePipeline)
+        """
+
+        project = state.project
+        save_debug_files = state.prefs.save_debug_files
+
+        if print_progress and not skip_reason:
             printt(f"{COL_DEFAULT}Transcribing audio...", end="") # gets overwritten
 
         val_start_time = time.time()
         results: list[ValidationResult | str | TtsModelError] = []
 
+        # Transcribe all generated sounds at once (batched when more than one)
+        transcriptions: dict[int, list[Word] | str] = {}
+        batched_positions: set[int] = set()
+        if not skip_reason:
+            sound_positions: list[int] = []
+            sounds: list[Sound] = []
+            for i, gen_result in enumerate(gen_results):
+                if isinstance(gen_result, tuple):
+                    sound_positions.append(i)
+                    sounds.append(gen_result[0])
+            items = Transcriber.transcribe_batch(sounds, project.language_code, stt_variant, stt_config)
+            transcriptions = dict(zip(sound_positions, items))
+            batched_flags = Transcriber.get_batched_flags(sounds)
+            batched_positions = {i for i, is_batched in zip(sound_positions, batched_flags) if is_batched}
+
         for i, gen_result in enumerate(gen_results):
 
             index = indices[i]
 
             if isinstance(gen_result, TtsModelError):
                 err = gen_result.message
-                printt(f"Text segment {index+1} - error: {err}")
+                if print_progress:
+                    printt(f"Text segment {index+1} - error: {err}")
                 results.append(gen_result)
                 continue
 
             if isinstance(gen_result, str):
                 err = gen_result
-                printt(f"Text segment {index+1} - error: {err}")
+                if print_progress:
+                    printt(f"Text segment {index+1} - error: {err}")
                 results.append(err)
                 continue
 
@@ -565,21 +728,27 @@ class GenerateUtil:
                 results.append((validation_result))
                 continue
 
-            # Transcribe
-            gen_result = Transcriber.transcribe_to_words(
-                sound, project.language_code, stt_variant, stt_config
-            )
-            if isinstance(gen_result, str):
-                err = gen_result
+            # Transcription
+            transcription = transcriptions[i]
+            if isinstance(transcription, str):
+                err = transcription
                 results.append(err)
                 continue
-            transcribed_words = gen_result
+            transcribed_words = transcription
 
             # Validate
             text = phrase_groups[ indices[i] ].as_flattened_phrase().text
             validation_result = Validator.validate(
                 sound, text, transcribed_words, project.language_code, strictness=project.strictness
             )
+            if validation_result.is_fail and i in batched_positions:
+                # Batched decoding has no temperature fallback, so re-check the sound
+                # the way it'd be transcribed on its own before failing it
+                transcription = Transcriber.transcribe_to_words(sound, project.language_code, stt_variant, stt_config)
+                if not isinstance(transcription, str):
+                    validation_result = Validator.validate(
+                        sound, text, transcription, project.language_code, strictness=project.strictness
+                    )
             validation_result.intra_sample_silence_trims = gap_trims
             validation_result.generated_start_trim_time = start_trim_time
             validation_result.generated_end_trim_time = end_trim_time
@@ -597,11 +766,11 @@ class GenerateUtil:
                     is_realtime=is_realtime
                 )
 
-        if not skip_reason:
-            message = f"{COL_DEFAULT}Transcribed audio in {(time.time() - val_start_time):.1f}s"
-            printt(f"{Ansi.LINE_HOME}{message}")
-
-        printt()
+        if print_progress:
+            if not skip_reason:
+                message = f"{COL_DEFAULT}Transcribed audio in {(time.time() - val_start_time):.1f}s"
+                printt(f"{Ansi.LINE_HOME}{message}")
+            printt()
 
         return results
 
@@ -777,6 +946,36 @@ class GenerateUtil:
         prompt = phrase_group.as_flattened_phrase().text
         return prompt
 
+    @staticmethod
+    def save_validation_result(
+        state: State,
+        phrase_group: PhraseGroup,
+        index: int,
+        validation_result: ValidationResult
+    ) -> tuple[str, str, SegmentTranscriptData | None]:
+        """
+        Saves the sound segment of an audiobook generation along with its STT/timing sidecar.
+        Returns error string (if any), saved file path, and the STT info (if any)
+        """
+        stt_info: SegmentTranscriptData | None = None
+        if isinstance(validation_result, TranscriptResult):
+            stt_info = SegmentTranscriptUtil.from_validation_result(
+                project=state.project,
+                phrase_group=phrase_group,
+                index=index,
+                validation_result=validation_result
+            )
+        err, saved_path = GenerateUtil.save_sound_and_timing_json(
+            state,
+            phrase_group,
+            index,
+            validation_result,
+            is_real_time=False,
+            voice_tag=getattr(validation_result, "voice_tag", ""),
+            stt_info=stt_info,
+        )
+        return err, saved_path, stt_info
+
     @staticmethod
     def save_sound_and_timing_json(
         state: State,
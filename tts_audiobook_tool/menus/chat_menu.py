@@ -51,6 +51,13 @@ class ChatMenu:
                     )
                 )
 
+            items.append(
+                MenuItem(
+                    lambda _: make_menu_label("Speculative TTS", state.project.speculative_chat, PROJECT_DEFAULT_SPECULATIVE_CHAT),
+                    lambda _, __: ChatMenu.speculative_menu(state),
+                )
+            )
+
             items.append(
                 MenuItem(
                     lambda _: make_menu_label("Save output", state.prefs.chat_save),
@@ -133,6 +140,33 @@ class ChatMenu:
             breadcrumb="Streaming",
         )
 
+    @staticmethod
+    def speculative_menu(state: State) -> None:
+
+        def on_select(value: bool) -> None:
+            state.project.speculative_chat = value
+            state.project.save()
+            print_feedback("Speculative TTS set to:", state.project.speculative_chat)
+
+        subheading = (
+            f"{COL_DIM}Starts generating speech for the beginning of a reply as soon as\n"
+            "the LLM has output its first clause, rather than its first full sentence.\n"
+            "This lowers response latency with slow LLMs, at the cost of an\n"
+            "occasional break in intonation after the first clause.\n"
+        )
+
+        MenuUtil.options_menu(
+            state=state,
+            heading_text="Speculative TTS",
+            labels=["True", "False"],
+            values=[True, False],
+            current_value=state.project.speculative_chat,
+            default_value=PROJECT_DEFAULT_SPECULATIVE_CHAT,
+            on_select=on_select,
+            subheading=subheading,
+            breadcrumb="Speculative TTS",
+        )
+
     @staticmethod
     def save_menu(state: State) -> None:
 
@@ -10,6 +10,7 @@ from tts_audiobook_tool.state import State
 from tts_audiobook_tool.system_support.gpu_caps_util import GpuCapsUtil
 from tts_audiobook_tool.tts import Tts
 from tts_audiobook_tool.tts_models.tts_model_type import TtsModelType
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 
 class OptionsMenu:
@@ -92,6 +93,23 @@ class OptionsMenu:
                     )
                 )
 
+            # Pipelined generation
+            items.append(
+                MenuItem(
+                    lambda _: make_menu_label("Pipelined generation", state.prefs.pipelined_generation, PREFS_DEFAULT_PIPELINED_GENERATION),
+                    lambda _, __: OptionsMenu.pipelined_generation_menu(state)
+                )
+            )
+
+            # Voice clone disk cache
+            if Tts.is_local_model():
+                items.append(
+                    MenuItem(
+                        lambda _: make_menu_label("TTS model - Voice clone disk cache", state.prefs.voice_clone_disk_cache, PREFS_DEFAULT_VOICE_CLONE_DISK_CACHE),
+                        lambda _, __: OptionsMenu.voice_clone_disk_cache_menu(state)
+                    )
+                )
+
             # TTS force cpu
             import torch
             from tts_audiobook_tool.app_types import DeviceType
@@ -142,6 +160,13 @@ class OptionsMenu:
                 )
             )
             
+            items.append(
+                MenuItem(
+                    lambda _: make_menu_label("Parallel export", state.prefs.export_workers, PREFS_DEFAULT_EXPORT_WORKERS),
+                    lambda _, __: OptionsMenu.export_workers_menu(state)
+                )
+            )
+
             items.append(
                 MenuItem(
                     lambda _: make_menu_label("Menu clears screen", state.prefs.menu_clears_screen, MENU_CLEARS_SCREEN_DEFAULT),
@@ -230,6 +255,56 @@ class OptionsMenu:
             on_select=on_select
         )
 
+    @staticmethod
+    def voice_clone_disk_cache_menu(state: State) -> None:
+
+        def on_select(value: bool) -> None:
+            if state.prefs.voice_clone_disk_cache != value:
+                state.prefs.voice_clone_disk_cache = value
+                state.prefs.save()
+            print_feedback(f"Set to:", str(state.prefs.voice_clone_disk_cache))
+
+        subheading = f"Saves the TTS model's prepared voice clone data (speaker embeddings, etc)\n"
+        subheading += f"to disk, so that reference audio isn't re-encoded on every app launch\n"
+        subheading += f"or on every voice change in multi-voice projects.\n"
+        subheading += f"{COL_DIM}Not supported by all models. Stored in {VoiceCloneDiskCache.get_dir()}\n"
+
+        MenuUtil.options_menu(
+            state=state,
+            heading_text="Voice clone disk cache",
+            subheading=subheading,
+            labels=["True", "False"],
+            values=[True, False],
+            current_value=state.prefs.voice_clone_disk_cache,
+            default_value=PREFS_DEFAULT_VOICE_CLONE_DISK_CACHE,
+            on_select=on_select
+        )
+
+    @staticmethod
+    def pipelined_generation_menu(state: State) -> None:
+
+        def on_select(value: bool) -> None:
+            if state.prefs.pipelined_generation != value:
+                state.prefs.pipelined_generation = value
+                state.prefs.save()
+            print_feedback(f"Set to:", str(state.prefs.pipelined_generation))
+
+        subheading = f"When generating the audiobook, runs speech-to-text validation\n"
+        subheading += f"and file saving in the background while the TTS model\n"
+        subheading += f"generates the next batch. Uses more memory.\n"
+        subheading += f"{COL_DIM}Not applied when rolling continuation is enabled.\n"
+
+        MenuUtil.options_menu(
+            state=state,
+            heading_text="Pipelined generation",
+            subheading=subheading,
+            labels=["True", "False"],
+            values=[True, False],
+            current_value=state.prefs.pipelined_generation,
+            default_value=PREFS_DEFAULT_PIPELINED_GENERATION,
+            on_select=on_select
+        )
+
     @staticmethod
     def save_debug_files_menu(state: State) -> None:
 
@@ -295,6 +370,31 @@ class OptionsMenu:
             on_select=on_select
         )
 
+    @staticmethod
+    def export_workers_menu(state: State) -> None:
+
+        def on_select(value: int) -> None:
+            if state.prefs.export_workers != value:
+                state.prefs.export_workers = value
+                state.prefs.save()
+            print_feedback(f"Set parallel export to:", str(state.prefs.export_workers))
+
+        subheading = f"Number of output files to make at the same time when\n"
+        subheading += f"exporting an audiobook as multiple files (eg, one per chapter).\n"
+        subheading += f"{COL_DIM}LavaSR upsampling still runs one file segment at a time.\n"
+
+        values = [1, 2, 4, 8, 16]
+        MenuUtil.options_menu(
+            state=state,
+            heading_text="Parallel export",
+            subheading=subheading,
+            labels=[str(value) for value in values],
+            values=values,
+            current_value=state.prefs.export_workers,
+            default_value=PREFS_DEFAULT_EXPORT_WORKERS,
+            on_select=on_select
+        )
+
     @staticmethod
     def make_sgl_omni_type_label(state: State) -> str:
         value = state.prefs.sgl_omni_type
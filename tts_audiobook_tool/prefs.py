@@ -24,6 +24,7 @@ class Prefs(Saveable):
             stt_variant: SttVariant = SttVariant.get_default(),
             stt_config: SttConfig | None = None,
             tts_force_cpu: bool = False,
+            voice_clone_disk_cache: bool = PREFS_DEFAULT_VOICE_CLONE_DISK_CACHE,
             sgl_omni_type: TtsModelType | None = None,
             sgl_omni_url: str = SGL_OMNI_URL_DEFAULT,
             aac_bitrate: str = AAC_BITRATE_DEFAULT,
@@ -41,6 +42,8 @@ class Prefs(Saveable):
             chat_save_mic: bool = PROJECT_DEFAULT_CHAT_SAVE_MIC,
             save_debug_files: bool = False,
             play_on_generate: bool = PREFS_DEFAULT_PLAY_ON_GENERATE,
+            pipelined_generation: bool = PREFS_DEFAULT_PIPELINED_GENERATION,
+            export_workers: int = PREFS_DEFAULT_EXPORT_WORKERS,
             menu_clears_screen: bool = MENU_CLEARS_SCREEN_DEFAULT,
             source_dict_keys: set[str] | None = None
     ) -> None:
@@ -49,6 +52,7 @@ class Prefs(Saveable):
         self._stt_variant = stt_variant
         self._stt_config = stt_config if stt_config else SttConfig.get_default()
         self._tts_force_cpu = tts_force_cpu
+        self._voice_clone_disk_cache = voice_clone_disk_cache
 
         # When in "sgl-omni mode", this is the active TTS type
         # When value is None, it autodetects based on server model id
@@ -72,6 +76,13 @@ class Prefs(Saveable):
         self._save_debug_files = save_debug_files
         self._play_on_generate = play_on_generate
 
+        # When True, audiobook generation overlaps TTS inference with 
+        # STT validation and file saving of the previous sub-batch
+        self._pipelined_generation = pipelined_generation
+
+        # Number of output files made concurrently when exporting multiple files
+        self._export_workers = export_workers
+
         # When True: 
         # - Menu clears screen, feedback text is always followed by a keypress prompt
         # - Menu always leads with a status text block
@@ -350,6 +361,25 @@ class Prefs(Saveable):
             play_on_generate = PREFS_DEFAULT_PLAY_ON_GENERATE
             dirty = True
 
+        # Voice clone disk cache
+        voice_clone_disk_cache = prefs_dict.get("voice_clone_disk_cache", PREFS_DEFAULT_VOICE_CLONE_DISK_CACHE)
+        if not isinstance(voice_clone_disk_cache, bool):
+            voice_clone_disk_cache = PREFS_DEFAULT_VOICE_CLONE_DISK_CACHE
+            dirty = True
+
+        # Pipelined generation
+        pipelined_generation = prefs_dict.get("pipelined_generation", PREFS_DEFAULT_PIPELINED_GENERATION)
+        if not isinstance(pipelined_generation, bool):
+            pipelined_generation = PREFS_DEFAULT_PIPELINED_GENERATION
+            dirty = True
+
+        # Export workers
+        export_workers = prefs_dict.get("export_workers", PREFS_DEFAULT_EXPORT_WORKERS)
+        if not isinstance(export_workers, int) or isinstance(export_workers, bool) \
+                or not (1 <= export_workers <= PREFS_EXPORT_WORKERS_MAX):
+            export_workers = PREFS_DEFAULT_EXPORT_WORKERS
+            dirty = True
+
         # Menu clears screen
         menu_clears_screen = prefs_dict.get("menu_clears_screen", MENU_CLEARS_SCREEN_DEFAULT)
         if not isinstance(menu_clears_screen, bool):
@@ -362,6 +392,7 @@ class Prefs(Saveable):
             stt_variant=stt_variant,
             stt_config=stt_config,
             tts_force_cpu=tts_force_cpu,
+            voice_clone_disk_cache=voice_clone_disk_cache,
             sgl_omni_type=sgl_omni_type,
             sgl_omni_url=sgl_omni_url,
             aac_bitrate=aac_bitrate,
@@ -379,6 +410,8 @@ class Prefs(Saveable):
             chat_save_mic=chat_save_mic,
             save_debug_files=save_debug_files,
             play_on_generate=play_on_generate,
+            pipelined_generation=pipelined_generation,
+            export_workers=export_workers,
             menu_clears_screen=menu_clears_screen,
             hints=hint_prefs,
             source_dict_keys=set(prefs_dict.keys())
@@ -415,6 +448,22 @@ class Prefs(Saveable):
     def play_on_generate(self, value: bool):
         self._play_on_generate = value
 
+    @property
+    def pipelined_generation(self) -> bool:
+        return self._pipelined_generation
+
+    @pipelined_generation.setter
+    def pipelined_generation(self, value: bool):
+        self._pipelined_generation = value
+
+    @property
+    def export_workers(self) -> int:
+        return self._export_workers
+
+    @export_workers.setter
+    def export_workers(self, value: int):
+        self._export_workers = value
+
     @property
     def menu_clears_screen(self) -> bool:
         return self._menu_clears_screen
@@ -467,6 +516,17 @@ class Prefs(Saveable):
         from tts_audiobook_tool.tts import Tts
         Tts.set_force_cpu(value)
 
+    @property
+    def voice_clone_disk_cache(self) -> bool:
+        return self._voice_clone_disk_cache
+
+    @voice_clone_disk_cache.setter
+    def voice_clone_disk_cache(self, value: bool) -> None:
+        self._voice_clone_disk_cache = value
+        # Sync static value
+        from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
+        VoiceCloneDiskCache.set_enabled(value)
+
     @property
     def sgl_omni_type(self) -> TtsModelType | None:
         return self._sgl_omni_type
@@ -612,6 +672,7 @@ class Prefs(Saveable):
                 "stt_variant": self._stt_variant.id,
                 "stt_config": self._stt_config.id,
                 "tts_force_cpu": self._tts_force_cpu,
+                "voice_clone_disk_cache": self._voice_clone_disk_cache,
                 "sgl_omni_type": "" if self._sgl_omni_type is None else self._sgl_omni_type.value.id,
                 "sgl_omni_url": self._sgl_omni_url,
                 "aac_bitrate": self._aac_bitrate,
@@ -629,6 +690,8 @@ class Prefs(Saveable):
                 "chat_save_mic": self._chat_save_mic,
                 "save_debug_files": self._save_debug_files,
                 "play_on_generate": self._play_on_generate,
+                "pipelined_generation": self._pipelined_generation,
+                "export_workers": self._export_workers,
                 "menu_clears_screen": self._menu_clears_screen,
             }
 
@@ -138,6 +138,7 @@ class Project(BaseModel):
     limit_silence_gaps_duration: float = PROJECT_DEFAULT_LIMIT_SILENCE_GAPS_DURATION
     gen_auto_concat: bool = PROJECT_DEFAULT_GEN_AUTO_CONCAT
     streaming_chat: bool = PROJECT_DEFAULT_STREAMING_CHAT
+    speculative_chat: bool = PROJECT_DEFAULT_SPECULATIVE_CHAT
     
     # Rem, UI nomenclature for this is "tolerance"
     strictness: Strictness = list(Strictness)[0]
@@ -365,6 +366,12 @@ class Project(BaseModel):
             return ""
         return os.path.join(self.dir_path, PROJECT_CONCAT_SUBDIR)
 
+    @property
+    def render_cache_path(self) -> str:
+        if not self.dir_path:
+            return ""
+        return os.path.join(self.dir_path, PROJECT_RENDER_CACHE_SUBDIR)
+
     @property
     def realtime_path(self) -> str:
         if not self.dir_path:
@@ -293,6 +293,7 @@ class ProjectSerializationUtil:
             d['realtime_line_range'] = None
 
         normalize_bool('streaming_chat', True, warn=True)
+        normalize_bool('speculative_chat', PROJECT_DEFAULT_SPECULATIVE_CHAT, warn=True)
         normalize_bool('limit_silence_gaps', PROJECT_DEFAULT_LIMIT_SILENCE_GAPS, warn=True)
 
         value = d.get('limit_silence_gaps_duration', None)
@@ -628,6 +629,7 @@ class ProjectSerializationUtil:
             "limit_silence_gaps_duration": project.limit_silence_gaps_duration,
             "gen_auto_concat": project.gen_auto_concat,
             "streaming_chat": project.streaming_chat,
+            "speculative_chat": project.speculative_chat,
             "strictness": project.strictness.id,
             "max_retries": project.max_retries,
             "chapter_mode": project.chapter_mode.id,
@@ -1,5 +1,7 @@
 import os
 from pathlib import Path
+import threading
+import time
 from typing import Callable, Collection
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
@@ -17,15 +19,33 @@ from tts_audiobook_tool.app_types.validation_findings import ValidationFindings
 
 class ProjectSoundSegments:
     """
-    Keeps cached catalog of the project's sound segment files
-    List gets invalidated and refreshed using directory watcher
+    Keeps cached catalog of the project's sound segment files.
+
+    The catalog is kept up to date incrementally using a directory watcher:
+    file events are queued (on the watcher's thread) and applied to the map the
+    next time it is accessed, by re-checking just the affected paths.
+    A full directory rescan happens on first access, when the project text
+    changes, when the segments directory itself appears, on `force_invalidate()`,
+    and periodically, as a fallback for missed events.
     """
 
+    # Max seconds between full rescans
+    FULL_RESCAN_INTERVAL = 60 * 5
+
     def __init__(self, project: Project):
         self.project = project # TODO: circular reference, ng
         self._sound_segments_map: dict[int, list[SoundSegment]] = {}
         self._dirty = True
         self._segments_dir: str | None = None
+        self._last_full_scan_time = 0.0
+
+        # Paths to be re-checked, from watcher events
+        self._pending_paths: set[str] = set()
+        self._lock = threading.Lock()
+
+        # Memoized segment hashes by index, valid for `_hashes_phrase_groups`
+        self._expected_hashes: dict[int, str] = {}
+        self._hashes_phrase_groups: list | None = None
 
         event_handler = DirHandler(self.on_dir_contents_change)
         self.observer = Observer()
@@ -56,7 +76,9 @@ class ProjectSoundSegments:
         if event.is_directory:
             # Disappeared (deleted or moved/renamed away)
             if event.event_type in ('deleted', 'moved') and event.src_path == self._segments_dir:
-                self._sound_segments_map = {}
+                with self._lock:
+                    self._sound_segments_map = {}
+                    self._pending_paths.clear()
                 self._dirty = False
                 return
             # Appeared (created or moved/renamed back to "segments")
@@ -73,27 +95,91 @@ class ProjectSoundSegments:
         if event.is_directory:
             # Not interested in sub-subdirectory creation etc.
             return
-        # Only handle events inside the segments/ directory
-        if not event.src_path.startswith(self._segments_dir + os.sep):
-            return
 
-        # Don't make dirty if new file is not a sound segment file (ie, debug files)
-        path = Path(event.src_path)
-        if path.suffix != ".flac":
-            return
-        if not bool(SoundSegmentUtil.make_from_file_name(event.src_path)):
-            return
+        # A move affects both the source path and the destination path
+        paths = [event.src_path]
+        dest = getattr(event, 'dest_path', None)
+        if event.event_type == 'moved' and dest:
+            paths.append(dest)
 
-        self._dirty = True
+        for path in paths:
+            # Only handle events inside the segments/ directory
+            if not path.startswith(self._segments_dir + os.sep):
+                continue
+            # Ignore files which are not sound segment files (ie, debug files)
+            if Path(path).suffix != ".flac":
+                continue
+            if not bool(SoundSegmentUtil.make_from_file_name(path)):
+                continue
+            with self._lock:
+                self._pending_paths.add(path)
         
     @property
     def sound_segments_map(self) -> dict[int, list[SoundSegment]]:
+        if self.project.phrase_groups is not self._hashes_phrase_groups:
+            # Project text has changed
+            self._expected_hashes = {}
+            self._hashes_phrase_groups = self.project.phrase_groups
+            self._dirty = True
+        if time.time() - self._last_full_scan_time > ProjectSoundSegments.FULL_RESCAN_INTERVAL:
+            self._dirty = True
+
         if self._dirty:
             printt(f"{COL_DIM_ITALICS}Project directory contents have changed. Scanning...", end="\r")
-            self._sound_segments_map = SoundSegmentUtil.make_sound_segments_map(self.project)
+            with self._lock:
+                # Any queued events are superseded by the scan
+                self._pending_paths.clear()
+            sound_segments_map = SoundSegmentUtil.make_sound_segments_map(self.project, self.get_expected_hash)
+            with self._lock:
+                self._sound_segments_map = sound_segments_map
             printt(f"{Ansi.ERASE_REST_OF_LINE}", end="\r")
             self._dirty = False
+            self._last_full_scan_time = time.time()
+        else:
+            self._apply_pending_paths()
         return self._sound_segments_map
+
+    def get_expected_hash(self, index: int) -> str:
+        """ Memoized SoundSegmentUtil.calc_segment_hash() for the project's current text """
+        segment_hash = self._expected_hashes.get(index)
+        if segment_hash is None:
+            segment_hash = SoundSegmentUtil.calc_segment_hash(index, self.project.phrase_groups[index].text)
+            self._expected_hashes[index] = segment_hash
+        return segment_hash
+
+    def _apply_pending_paths(self) -> None:
+        """
+        Updates the map for each path that has had file events since the last access,
+        based on whether the path is now a valid sound segment file.
+        """
+        with self._lock:
+            if not self._pending_paths:
+                return
+            paths = self._pending_paths
+            self._pending_paths = set()
+
+            # Copy-on-write, so that callers which are iterating over a
+            # previously returned map aren't affected
+            sound_segments_map = dict(self._sound_segments_map)
+
+            for path in paths:
+                file_name = Path(path).name
+                sound_segment = SoundSegmentUtil.make_from_path(Path(path), self.project, self.get_expected_hash)
+
+                # Remove any existing entry for the file name
+                parsed = SoundSegmentUtil.make_from_file_name(file_name)
+                if parsed is not None and parsed.idx in sound_segments_map:
+                    items = [item for item in sound_segments_map[parsed.idx] if item.file_name != file_name]
+                    if items:
+                        sound_segments_map[parsed.idx] = items
+                    else:
+                        del sound_segments_map[parsed.idx]
+
+                if sound_segment is not None:
+                    items = sound_segments_map.get(sound_segment.idx, [])
+                    sound_segments_map[sound_segment.idx] = items + [sound_segment]
+
+            self._sound_segments_map = sound_segments_map
     
     def get_filenames_for(self, index: int) -> list[str]:
         sound_segments = self.sound_segments_map.get(index, [])
@@ -269,6 +355,6 @@ class DirHandler(FileSystemEventHandler):
         self.callback(event)
 
     def on_modified(self, event):
-        # No need to call back here for our use case atm
-        # FYI, just 'touching' file modifies file
-        pass
+        # Segment files get created empty and then written to, so a file's
+        # validity (non-zero size) can change after its 'created' event
+        self.callback(event)
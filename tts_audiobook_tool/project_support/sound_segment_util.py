@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
+from typing import Callable
 from tts_audiobook_tool.app_support import app_hashing
 from tts_audiobook_tool.app_types import SoundSegment
 from tts_audiobook_tool.constants import *
@@ -70,8 +71,16 @@ class SoundSegmentUtil:
         )
 
     @staticmethod
-    def make_sound_segments_map(project: Project) -> dict[int, list[SoundSegment]]:
+    def make_sound_segments_map(
+        project: Project,
+        get_expected_hash: Callable[[int], str] | None = None
+    ) -> dict[int, list[SoundSegment]]:
         """
+        Scans the project's sound segments directory.
+
+        :param get_expected_hash:
+            Returns the segment hash for a given index (for memoization);
+            uses `calc_segment_hash()` when None
         """
         if not project.dir_path:
             return {}
@@ -82,24 +91,10 @@ class SoundSegmentUtil:
 
         for path in Path(project.sound_segments_path).iterdir():
 
-            if not path.is_file():
-                continue
-            if os.path.getsize(path) == 0:
-                continue
-            if path.suffix.lower() != ".flac":
-                continue
-
-            sound_segment = SoundSegmentUtil.make_from_file_name(path.name)
+            sound_segment = SoundSegmentUtil.make_from_path(path, project, get_expected_hash)
             if sound_segment is None:
                 continue
             index = sound_segment.idx
-            if index >= len(project.phrase_groups):
-                continue
-
-            phrase_group = project.phrase_groups[sound_segment.idx]
-            segment_hash = SoundSegmentUtil.calc_segment_hash(index, phrase_group.text)
-            if sound_segment.hash != segment_hash:
-                continue
 
             if not map.get(index, []):
                 map[sound_segment.idx] = []
@@ -107,6 +102,40 @@ class SoundSegmentUtil:
 
         return map
 
+    @staticmethod
+    def make_from_path(
+        path: Path,
+        project: Project,
+        get_expected_hash: Callable[[int], str] | None = None
+    ) -> SoundSegment | None:
+        """
+        Returns SoundSegment if the file at `path` is an existing, non-empty
+        sound segment file which belongs to the project's current text, else None.
+        """
+        if path.suffix.lower() != ".flac":
+            return None
+        try:
+            if not path.is_file() or path.stat().st_size == 0:
+                return None
+        except OSError:
+            return None
+
+        sound_segment = SoundSegmentUtil.make_from_file_name(path.name)
+        if sound_segment is None:
+            return None
+        index = sound_segment.idx
+        if index >= len(project.phrase_groups):
+            return None
+
+        if get_expected_hash:
+            segment_hash = get_expected_hash(index)
+        else:
+            segment_hash = SoundSegmentUtil.calc_segment_hash(index, project.phrase_groups[index].text)
+        if sound_segment.hash != segment_hash:
+            return None
+
+        return sound_segment
+
     @staticmethod
     def make_file_name(
         index: int,
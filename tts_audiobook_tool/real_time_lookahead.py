@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import json
+
+from tts_audiobook_tool.app_types.phrase import PhraseGroup
+from tts_audiobook_tool.constants_config import REAL_TIME_BUFFER_MAX_SECONDS
+from tts_audiobook_tool.l import L
+
+# Number of recent generation attempts the timing measurements are based on
+WINDOW_SIZE = 16
+
+# Assumed duration of a generate-and-validate attempt, before anything has been measured
+DEFAULT_SECONDS_PER_RETRY = 60.0
+
+# Failure rate assumed for segment lengths with no validated attempts yet,
+# and how many attempts' worth of weight that assumption carries
+DEFAULT_FAILURE_RATE = 0.2
+FAILURE_RATE_PRIOR_WEIGHT = 2.0
+
+# Segments are grouped by word count in buckets of this size for failure rate tracking
+FAILURE_RATE_BUCKET_NUM_WORDS = 10
+
+# Segment lengths which fail validation at least this often aren't worth spending runway on retrying
+MAX_RETRY_FAILURE_RATE = 0.9
+
+# Segments shorter than this are never split
+SPLIT_MIN_NUM_WORDS = 16
+
+# Lookahead is kept at some multiple of the worst-case generation time of the next segment
+# (ie, all retries used up), to absorb variance in generation speed
+LOOKAHEAD_SAFETY_FACTOR = 2.0
+
+LOOKAHEAD_MIN_SECONDS = 30.0
+
+
+@dataclass
+class _AttemptSample:
+    num_words: int
+    generation_seconds: float
+    stt_seconds: float | None
+    audio_seconds: float
+
+
+class RealTimeLookahead:
+    """
+    Controller for real-time playback's generate-ahead loop.
+
+    Keeps rolling measurements of generation and speech-to-text time per word, and the
+    validation failure rate per segment length, and uses them to decide, given the amount
+    of buffered audio, whether to validate a segment, whether to retry it or accept it as-is
+    after a failed validation, whether to split it to get audio out sooner, and how far ahead
+    of playback to generate.
+
+    Decisions and predicted-vs-actual timings are logged (as JSON, prefixed by `LOG_PREFIX`)
+    so that the policy can be evaluated offline.
+    """
+
+    LOG_PREFIX = "Real-time lookahead:"
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self._samples: deque[_AttemptSample] = deque(maxlen=window_size)
+        # Word count bucket -> (number of validated attempts, number of those that failed)
+        self._validation_counts: dict[int, tuple[int, int]] = {}
+
+    def add_attempt(
+            self,
+            num_words: int,
+            generation_seconds: float,
+            stt_seconds: float | None,
+            audio_seconds: float,
+            is_fail: bool | None
+    ) -> None:
+        """
+        Records a generation attempt.
+
+        :param stt_seconds: None if the attempt wasn't validated
+        :param is_fail: None if the attempt wasn't validated
+        """
+        if num_words <= 0:
+            return
+        self._log(
+            "attempt",
+            num_words=num_words,
+            predicted_generation_seconds=self.estimate_generation_seconds(num_words),
+            generation_seconds=generation_seconds,
+            predicted_stt_seconds=self.estimate_stt_seconds(num_words) if stt_seconds is not None else None,
+            stt_seconds=stt_seconds,
+            audio_seconds=audio_seconds,
+            is_fail=is_fail,
+        )
+        self._samples.append(_AttemptSample(num_words, generation_seconds, stt_seconds, audio_seconds))
+        if is_fail is not None:
+            bucket = self._get_bucket(num_words)
+            num_attempts, num_fails = self._validation_counts.get(bucket, (0, 0))
+            self._validation_counts[bucket] = (num_attempts + 1, num_fails + int(is_fail))
+
+    @property
+    def rtf(self) -> float | None:
+        """ Real-time factor (generation and validation time over audio duration) of recent attempts, or None if unknown """
+        audio_seconds = sum(sample.audio_seconds for sample in self._samples)
+        if audio_seconds <= 0:
+            return None
+        seconds = sum(sample.generation_seconds + (sample.stt_seconds or 0.0) for sample in self._samples)
+        return seconds / audio_seconds
+
+    def estimate_generation_seconds(self, num_words: int) -> float | None:
+        """ Estimated generation time of a segment of `num_words`, or None if unknown """
+        num_sample_words = sum(sample.num_words for sample in self._samples)
+        if num_sample_words <= 0:
+            return None
+        return sum(sample.generation_seconds for sample in self._samples) / num_sample_words * num_words
+
+    def estimate_stt_seconds(self, num_words: int) -> float | None:
+        """ Estimated speech-to-text time of a segment of `num_words`, or None if unknown """
+        samples = [sample for sample in self._samples if sample.stt_seconds is not None]
+        num_sample_words = sum(sample.num_words for sample in samples)
+        if num_sample_words <= 0:
+            return None
+        return sum(sample.stt_seconds or 0.0 for sample in samples) / num_sample_words * num_words
+
+    def estimate_attempt_seconds(self, num_words: int) -> float | None:
+        """ Estimated time of a single generate-and-validate attempt for a segment of `num_words`, or None if unknown """
+        generation_seconds = self.estimate_generation_seconds(num_words)
+        if generation_seconds is None:
+            return None
+        return generation_seconds + (self.estimate_stt_seconds(num_words) or 0.0)
+
+    def get_failure_rate(self, num_words: int) -> float:
+        """ Validation failure rate of segments of about `num_words`, smoothed towards `DEFAULT_FAILURE_RATE` """
+        num_attempts, num_fails = self._validation_counts.get(self._get_bucket(num_words), (0, 0))
+        prior = DEFAULT_FAILURE_RATE * FAILURE_RATE_PRIOR_WEIGHT
+        return (num_fails + prior) / (num_attempts + FAILURE_RATE_PRIOR_WEIGHT)
+
+    def should_validate(self, buffer_seconds: float, num_words: int) -> bool:
+        """
+        Returns True if `buffer_seconds` of buffered audio should outlast generating
+        and validating the next segment without playback running dry.
+        """
+        attempt_seconds = self._get_attempt_seconds_or_default(num_words)
+        result = buffer_seconds > 0 and buffer_seconds >= attempt_seconds
+        self._log(
+            "validate" if result else "skip_validation",
+            num_words=num_words,
+            buffer_seconds=buffer_seconds,
+            predicted_attempt_seconds=attempt_seconds,
+        )
+        return result
+
+    def should_retry(self, buffer_seconds: float, num_words: int) -> bool:
+        """
+        Returns True if a segment which failed validation should be retried, or False
+        if it should be accepted as-is, either because a retry would likely let playback
+        run dry or because one is unlikely to pass.
+        """
+        attempt_seconds = self._get_attempt_seconds_or_default(num_words)
+        failure_rate = self.get_failure_rate(num_words)
+        result = buffer_seconds >= attempt_seconds and failure_rate < MAX_RETRY_FAILURE_RATE
+        self._log(
+            "retry" if result else "accept",
+            num_words=num_words,
+            buffer_seconds=buffer_seconds,
+            predicted_attempt_seconds=attempt_seconds,
+            failure_rate=failure_rate,
+        )
+        return result
+
+    def should_split(self, buffer_seconds: float, num_words: int) -> bool:
+        """
+        Returns True if the next segment should be generated in parts, because the buffer
+        is expected to run dry before the whole segment could be generated.
+        """
+        if num_words < SPLIT_MIN_NUM_WORDS:
+            return False
+        generation_seconds = self.estimate_generation_seconds(num_words)
+        if generation_seconds is None or generation_seconds <= buffer_seconds:
+            return False
+        self._log(
+            "split",
+            num_words=num_words,
+            buffer_seconds=buffer_seconds,
+            predicted_generation_seconds=generation_seconds,
+        )
+        return True
+
+    def get_target_seconds(self, num_words: int, max_retries: int) -> float:
+        """
+        Returns how much buffered audio to generate ahead of playback before generating the next segment.
+        """
+        attempt_seconds = self.estimate_attempt_seconds(num_words)
+        if attempt_seconds is None:
+            return REAL_TIME_BUFFER_MAX_SECONDS
+        seconds = attempt_seconds * (1 + max_retries) * LOOKAHEAD_SAFETY_FACTOR
+        return min(max(seconds, LOOKAHEAD_MIN_SECONDS), REAL_TIME_BUFFER_MAX_SECONDS)
+
+    @staticmethod
+    def split_phrase_group(phrase_group: PhraseGroup) -> list[PhraseGroup]:
+        """
+        Splits the phrase group in two at the phrase boundary closest to its middle word.
+        Returns a one-item list if it only has one phrase.
+        """
+        phrases = phrase_group.phrases
+        if len(phrases) < 2:
+            return [phrase_group]
+        half = phrase_group.num_words / 2
+        num_words = 0
+        best_index = 1
+        best_distance = float("inf")
+        for i, phrase in enumerate(phrases[:-1]):
+            num_words += phrase.num_words
+            distance = abs(num_words - half)
+            if distance < best_distance:
+                best_index = i + 1
+                best_distance = distance
+        return [
+            PhraseGroup(phrases[:best_index], voice_index=phrase_group.voice_index),
+            PhraseGroup(phrases[best_index:], voice_index=phrase_group.voice_index),
+        ]
+
+    def _get_attempt_seconds_or_default(self, num_words: int) -> float:
+        attempt_seconds = self.estimate_attempt_seconds(num_words)
+        return attempt_seconds if attempt_seconds is not None else DEFAULT_SECONDS_PER_RETRY
+
+    @staticmethod
+    def _get_bucket(num_words: int) -> int:
+        return num_words // FAILURE_RATE_BUCKET_NUM_WORDS
+
+    @staticmethod
+    def _log(event: str, **values) -> None:
+        values = {key: round(value, 3) if isinstance(value, float) else value for key, value in values.items()}
+        L.i(f"{RealTimeLookahead.LOG_PREFIX} {json.dumps({'event': event, **values})}")
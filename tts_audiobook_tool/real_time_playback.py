@@ -2,17 +2,20 @@
 Coordinates and drives TTS playback in "real time".
 Manages output buffer growth, validate-and-retry handling,
 intra-segment pauses, interruption/shutdown behavior.
+Generation runs on a background thread, ahead of playback (see `RealTimeLookahead`).
 
 Similar to `GenerateUtil.generate_files()` but outputs to sound device instead of to files.
 
 Is blocking.
 """
 
+import threading
 import time
+from typing import Callable
 
 import numpy as np
 from tts_audiobook_tool import text_util
-from tts_audiobook_tool.app_types import Sound, SttVariant
+from tts_audiobook_tool.app_types import Sound, SttVariant, VoiceSelectMode
 from tts_audiobook_tool import ask
 from tts_audiobook_tool.generate_util import GenerateUtil, TtsModelError
 from tts_audiobook_tool import app_support
@@ -21,18 +24,21 @@ from tts_audiobook_tool.app_support.interrupts import Interrupts
 from tts_audiobook_tool.model_manager import ModelManager
 from tts_audiobook_tool import readiness
 from tts_audiobook_tool.project_support.project_book_util import ProjectBookUtil
+from tts_audiobook_tool.project_support.project_voice_util import ProjectVoiceUtil
+from tts_audiobook_tool.real_time_lookahead import RealTimeLookahead
 from tts_audiobook_tool.sound.sound_pipeline import SoundPipeline
 from tts_audiobook_tool.state import State
+from tts_audiobook_tool.stt import Stt
 from tts_audiobook_tool.tts import Tts
 from tts_audiobook_tool.sound.sound_device_stream import SoundDeviceStream
-from tts_audiobook_tool.sound.sound_file_util import SoundFileUtil
+from tts_audiobook_tool.sound.sound_util import SoundUtil
 from tts_audiobook_tool.app_types.phrase import PhraseGroup, Reason
 from tts_audiobook_tool.constants_config import *
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.l import L
 from tts_audiobook_tool.menus.menu_util import MenuUtil
 from tts_audiobook_tool.util import *
-from tts_audiobook_tool.app_types.validation_result import ValidationResult
+from tts_audiobook_tool.app_types.validation_result import SkippedResult, ValidationResult
 
 def start(
         state: State,
@@ -82,13 +88,87 @@ def start(
     Tts.clear_continuation()
     Tts.reset_voice_selection_index()
 
-    # Outer loop
+    # Start the stream up front; it plays silence until the lookahead thread adds audio
+    stream = SoundDeviceStream()
+    if not stream.start():
+        # Abort. Stream is in a not-started state, so no shut_down() is needed;
+        # skip the buffer-drain prompt.
+        Tts.clear_continuation()
+        s = "Aborting real-time playback: sound output stream failed to start"
+        print_feedback(s, is_error=True)
+        return
 
+    # Generation runs on a separate thread, ahead of playback, so that playback only
+    # stalls if the buffer actually runs dry. The main thread just relays Ctrl-C.
     Interrupts().set("generating")
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=generate_ahead,
+        args=(state, phrase_groups, line_range, stream, stop_event, showed_vram_warning),
+        daemon=True
+    )
+    thread.start()
+    while thread.is_alive():
+        thread.join(INTERRUPTIBLE_SLEEP_POLL_SECONDS)
+        if Interrupts().did_interrupt:
+            stop_event.set()
+
+    # Finished
+    Interrupts().clear()
+
+    should_prompt_before_shutdown = stream.buffer_duration > 0
+    if should_prompt_before_shutdown:
+        # Prompt allows buffer to play until enter pressed
+        printt()
+        ask.ask_enter_to_continue()
+    stream.shut_down()
+
+    # Do not let rolling continuation state leak into the next realtime run.
+    Tts.clear_continuation()
+
+    if not should_prompt_before_shutdown:
+        printt()
+        ask.ask_enter_to_continue()
+
+    printt()
+
+
+def generate_ahead(
+        state: State,
+        phrase_groups: list[PhraseGroup],
+        line_range: tuple[int, int],
+        stream: SoundDeviceStream,
+        stop_event: threading.Event,
+        showed_vram_warning: bool
+) -> None:
+    """
+    Generates the segments in `line_range` (one-indexed) in order, adding them to the stream.
+    Keeps up to `RealTimeLookahead.get_target_seconds()` of audio buffered ahead of playback.
+
+    Runs on a background thread. Returns when done, or when interrupted (including
+    by `stop_event`), or on too many model errors.
+    """
+    try:
+        _generate_ahead(state, phrase_groups, line_range, stream, stop_event, showed_vram_warning)
+    except Exception as e:
+        L.e(f"Real-time generation failed: {make_error_string(e)}")
+        printt(f"{COL_ERROR}Real-time generation failed: {make_error_string(e)}")
+        Tts.clear_continuation()
+
+
+def _generate_ahead(
+        state: State,
+        phrase_groups: list[PhraseGroup],
+        line_range: tuple[int, int],
+        stream: SoundDeviceStream,
+        stop_event: threading.Event,
+        showed_vram_warning: bool
+) -> None:
+
     did_interrupt = False
-    stream = None
     consecutive_model_errors = 0
     max_consecutive_model_errors = 5
+    lookahead = RealTimeLookahead()
 
     start_index, end_index = line_range
     start_index -= 1
@@ -102,11 +182,22 @@ def start(
 
     for index in range(start_index, end_index + 1):
 
+        phrase_group = phrase_groups[index]
+        phrase = phrase_group.as_flattened_phrase()
+        max_retries = state.project.max_retries
+
+        # Wait if necessary, so as not to generate further ahead of playback than needed
+        target_seconds = lookahead.get_target_seconds(phrase_group.num_words, max_retries)
+        if stream.buffer_duration > target_seconds:
+            excess = stream.buffer_duration - target_seconds
+            printt(f"{COL_DIM_ITALICS}Waiting for buffer to drain ({excess:.1f}s) ...")
+            did_interrupt = wait_for_buffer_interruptibly(stream, target_seconds, stop_event)
+
         # Pick up any Ctrl-C pressed during the previous iteration's
-        # inter-segment gap (sound prep, buffer print, throttle sleep);
+        # inter-segment gap (sound prep, buffer print, throttle wait);
         # generate_full_flow()'s set("generating") would otherwise reset the
         # pending flag and silently swallow the interrupt.
-        did_interrupt = did_interrupt or Interrupts().did_interrupt
+        did_interrupt = did_interrupt or Interrupts().did_interrupt or stop_event.is_set()
         if did_interrupt:
             Tts.clear_continuation()
             break
@@ -117,9 +208,6 @@ def start(
                 print("\a", end="")
                 showed_vram_warning = True
 
-        phrase_group = phrase_groups[index]
-        phrase = phrase_group.as_flattened_phrase()
-
         printt()
         GenerateUtil.print_batch_heading(
             indices=[index],
@@ -131,166 +219,160 @@ def start(
         printt(f"{COL_DIM_ITALICS}{phrase_group.presentable_text}")
         printt()
 
-        # TODO: make dynamic - if "estimated gen time" < buffer duration x ~2 x max_retries...
-        has_runway = (stream is not None and stream.buffer_duration >= (REQUIRED_SECONDS_PER_RETRY * state.project.max_retries))
-
-        sound_opt, did_interrupt, consecutive_model_errors = generate_full_flow(
-            state,
-            phrase_groups,
-            index,
-            has_runway=has_runway,
-            consecutive_model_errors=consecutive_model_errors,
-            max_consecutive_model_errors=max_consecutive_model_errors,
-        )
-        if not did_interrupt:
-            # generate_full_flow() clears Interrupts at the end, so re-arm
-            # Ctrl-C handling for the outer realtime loop and buffer-throttle sleep.
-            Interrupts().set("generating")
-        if did_interrupt:
-            # Interrupt during generation takes priority even if this segment
-            # still produced a sound; break before the throttle sleep so the
-            # flag cannot be clobbered (generate_full_flow() already cleared
-            # the Interrupts state).
-            Tts.clear_continuation()
-            break
-        if not sound_opt:
-            printt(f"{COL_ERROR}Couldn't generate sound{COL_DIM}, continuing to next segment")
-            printt()
-            continue
-        else:
-            sound = sound_opt
-
-        original_duration = sound.duration
-        sound = SoundPipeline.prepare_generated_sound_for_playback(
-            sound=sound,
-            high_shelf=state.project.get_high_shelf(),
-            limit_silence_gaps=state.project.limit_silence_gaps,
-            limit_silence_gaps_duration=state.project.limit_silence_gaps_duration,
+        # Generate in parts if the buffer would otherwise run dry before the whole segment is ready.
+        # (Not when saving, since saved files correspond to whole segments, nor when auto-advancing
+        # through multiple voices, since each generation advances the voice)
+        parts: list[list[PhraseGroup]] = [phrase_groups]
+        can_split = not state.project.realtime_save and not (
+            state.project.voice_select_mode == VoiceSelectMode.AUTO_ADVANCE
+            and len(ProjectVoiceUtil.get_voice_values(state.project, Tts.get_type())) > 1
         )
-
-        if sound.data.size > 0 and abs(sound.duration - original_duration) > 0.01:
-            trimmed_ms = (original_duration - sound.duration) * 1000
-            L.d(f"Trimmed: Duration {original_duration:.3f}s -> {sound.duration:.3f}s (trimmed {trimmed_ms:.0f}ms)")
-
-        # Add appended sound
-        if index == end_index:
-            appended_sound = None
-        else:
-            is_first_in_section = index in section_start_indices
-            use_sound_effect = SoundPipeline.should_append_break_sound_effect(
-                phrase.reason,
-                use_break_sound_effect=state.project.use_break_sound_effect,
-                is_first_in_section=is_first_in_section,
+        if can_split and lookahead.should_split(stream.buffer_duration, phrase_group.num_words):
+            split_groups = RealTimeLookahead.split_phrase_group(phrase_group)
+            if len(split_groups) > 1:
+                printt(f"{COL_DIM_ITALICS}Generating in {len(split_groups)} parts to keep the buffer from running dry")
+                printt()
+                # Each part goes in place of the segment's phrase group,
+                # so that printed line numbers and file names still use the segment's index
+                parts = []
+                for split_group in split_groups:
+                    part_groups = list(phrase_groups)
+                    part_groups[index] = split_group
+                    parts.append(part_groups)
+
+        for part_index, part_groups in enumerate(parts):
+
+            is_last_part = part_index == len(parts) - 1
+            if part_index > 0:
+                did_interrupt = did_interrupt or Interrupts().did_interrupt or stop_event.is_set()
+                if did_interrupt:
+                    break
+
+            sound_opt, did_interrupt, consecutive_model_errors = generate_full_flow(
+                state,
+                part_groups,
+                index,
+                lookahead=lookahead,
+                get_buffer_seconds=lambda: stream.buffer_duration,
+                consecutive_model_errors=consecutive_model_errors,
+                max_consecutive_model_errors=max_consecutive_model_errors,
             )
-            if use_sound_effect:
-                if phrase.reason == Reason.SECTION_BREAK:
-                    path = SECTION_BREAK_SOUND_EFFECT_PATH
-                else:
-                    path = SPACE_BREAK_SOUND_EFFECT_PATH
-                result = SoundFileUtil.load(path, sound.sr)
-                if isinstance(result, str):
-                    printt(f"{COL_ERROR}Error loading sound effect: {path}")
-                    appended_sound = None
-                else:
-                    appended_sound = result.data
+            if not did_interrupt:
+                # generate_full_flow() clears Interrupts at the end, so re-arm
+                # Ctrl-C handling for the rest of the run.
+                Interrupts().set("generating")
+            did_interrupt = did_interrupt or stop_event.is_set()
+            if did_interrupt:
+                # Interrupt during generation takes priority even if this segment
+                # still produced a sound (generate_full_flow() already cleared
+                # the Interrupts state).
+                break
+            if not sound_opt:
+                printt(f"{COL_ERROR}Couldn't generate sound{COL_DIM}, continuing to next segment")
+                printt()
+                continue
             else:
-                silence_duration = state.project.reason_pauses.get_pause_for(phrase.reason)
+                sound = sound_opt
+
+            original_duration = sound.duration
+            sound = SoundPipeline.prepare_generated_sound_for_playback(
+                sound=sound,
+                high_shelf=state.project.get_high_shelf(),
+                limit_silence_gaps=state.project.limit_silence_gaps,
+                limit_silence_gaps_duration=state.project.limit_silence_gaps_duration,
+            )
+
+            if sound.data.size > 0 and abs(sound.duration - original_duration) > 0.01:
+                trimmed_ms = (original_duration - sound.duration) * 1000
+                L.d(f"Trimmed: Duration {original_duration:.3f}s -> {sound.duration:.3f}s (trimmed {trimmed_ms:.0f}ms)")
+
+            # Add appended sound
+            if not is_last_part:
+                # Pause in place of the one the model would have generated between the parts' phrases
+                silence_duration = state.project.reason_pauses.get_pause_for(part_groups[index].last_reason)
                 appended_sound = np.zeros(int(sound.sr * silence_duration), dtype=sound.data.dtype)
+            elif index == end_index:
+                appended_sound = None
+            else:
+                is_first_in_section = index in section_start_indices
+                use_sound_effect = SoundPipeline.should_append_break_sound_effect(
+                    phrase.reason,
+                    use_break_sound_effect=state.project.use_break_sound_effect,
+                    is_first_in_section=is_first_in_section,
+                )
+                if use_sound_effect:
+                    if phrase.reason == Reason.SECTION_BREAK:
+                        path = SECTION_BREAK_SOUND_EFFECT_PATH
+                    else:
+                        path = SPACE_BREAK_SOUND_EFFECT_PATH
+                    result = SoundUtil.load_effect_sound(path, sound.sr)
+                    if isinstance(result, str):
+                        printt(f"{COL_ERROR}Error loading sound effect: {path}")
+                        appended_sound = None
+                    else:
+                        appended_sound = result.data
+                else:
+                    silence_duration = state.project.reason_pauses.get_pause_for(phrase.reason)
+                    appended_sound = np.zeros(int(sound.sr * silence_duration), dtype=sound.data.dtype)
+
+            # Add sound to the stream
+            stream.add_data(sound.data)
+            if appended_sound is not None:
+                # Add page-turn sound
+                stream.add_data(appended_sound)
+
+            full_duration = sound.duration
+            if appended_sound is not None:
+                full_duration += len(appended_sound) / sound.sr
+
+            # Print buffer duration
+            value = stream.buffer_duration - full_duration
+            if value <= 0.0:
+                value = +0.0
+            s = f"{COL_ERROR}" if value < 0.1 else f"{COL_OK}"
+            s += f"{duration_string(value, include_tenth=True)}"
+            rtf = lookahead.rtf
+            if rtf is not None:
+                s += f" {COL_DIM}(real-time factor: {rtf:.2f})"
+            printt(f"Buffer duration: {s}")
 
-        # Start stream lazy
-        if not stream:
-            stream = SoundDeviceStream()
-            if not stream.start():
-                # Abort. Stream is in a not-started state, so no shut_down() is needed; 
-                # skip the buffer-drain prompt.
-                Tts.clear_continuation()
-                Interrupts().clear()
-                s = "Aborting real-time playback: sound output stream failed to start"
-                print_feedback(s, is_error=True)
-                return
-
-        # Add sound to the stream
-        stream.add_data(sound.data)
-        if appended_sound is not None:
-            # Add page-turn sound
-            stream.add_data(appended_sound)
-
-        full_duration = sound.duration
-        if appended_sound is not None:
-            full_duration += len(appended_sound) / sound.sr
-
-        # Print buffer duration
-        value = stream.buffer_duration - full_duration
-        if value <= 0.0:
-            value = +0.0
-        s = f"{COL_ERROR}" if value < 0.1 else f"{COL_OK}"
-        s += f"{duration_string(value, include_tenth=True)}"
-        printt(f"Buffer duration: {s}")
-
-        # Pick up an interrupt pressed during sound prep or the buffer print
-        # so we stop before throttling playback further.
-        did_interrupt = did_interrupt or Interrupts().did_interrupt
         if did_interrupt:
             Tts.clear_continuation()
             break
 
-        # Sleep if necessary to prevent growing buffer beyond threshold
-        if stream.buffer_duration > REAL_TIME_BUFFER_MAX_SECONDS and full_duration > 0.0:
-            printt(f"{COL_DIM_ITALICS}Sleeping for {full_duration:.1f}s ...")
-            did_interrupt = did_interrupt or sleep_interruptibly(full_duration)
-            if did_interrupt:
-                break
-
-    # Finished
-    Interrupts().clear()
-
-    should_prompt_before_shutdown = stream and stream.buffer_duration > 0
-    if should_prompt_before_shutdown:
-        # Prompt allows buffer to play until enter pressed
-        printt()
-        ask.ask_enter_to_continue()
-    if stream:
-        stream.shut_down()
-
-    # Do not let rolling continuation state leak into the next realtime run.
-    Tts.clear_continuation()
-
-    if not should_prompt_before_shutdown:
-        printt()
-        ask.ask_enter_to_continue()
 
-    printt()
-
-
-def sleep_interruptibly(duration_s: float) -> bool:
+def wait_for_buffer_interruptibly(
+        stream: SoundDeviceStream,
+        max_seconds: float,
+        stop_event: threading.Event
+) -> bool:
     """
-    Sleeps in short increments so Ctrl-C can stop realtime playback even
-    while we're throttling to let the audio buffer drain.
+    Waits until the stream's buffer has drained to `max_seconds`, returning as soon as
+    it has, while checking in short increments so Ctrl-C can stop realtime playback
+    even while we're throttling.
 
     Returns True if interrupted.
     """
-    deadline = time.time() + max(0.0, duration_s)
     while True:
-        if Interrupts().did_interrupt:
+        if Interrupts().did_interrupt or stop_event.is_set():
             return True
-
-        remaining = deadline - time.time()
-        if remaining <= 0.0:
+        if stream.wait_until_buffer_duration(max_seconds, timeout=INTERRUPTIBLE_SLEEP_POLL_SECONDS):
             return False
 
-        time.sleep(min(INTERRUPTIBLE_SLEEP_POLL_SECONDS, remaining))
-
 
 def generate_full_flow(
         state: State,
         phrase_groups: list[PhraseGroup],
         index: int,
-        has_runway: bool,
+        lookahead: RealTimeLookahead,
+        get_buffer_seconds: Callable[[], float],
         consecutive_model_errors: int = 0,
         max_consecutive_model_errors: int = 5,
 ) -> tuple[Sound | None, bool, int]:
     """
     Similar to `GenerateUtil.generate_full_flow()` but simpler control flow.
+    Whether to validate, and whether to retry after a failed attempt, is decided by `lookahead`,
+    given the amount of buffered audio at that point.
     Returns tuple: (Sound or None if problem, did_interrupt, consecutive_model_errors)
     """
 
@@ -298,24 +380,52 @@ def generate_full_flow(
 
     project = state.project
     phrase_group = phrase_groups[index]
+    num_words = phrase_group.num_words
     did_interrupt = False
 
     gen_result: ValidationResult | str = ""
-    num_attempts = 1 + project.max_retries if has_runway else 1
+    should_validate = lookahead.should_validate(get_buffer_seconds(), num_words)
 
-    for attempt in range(num_attempts):
+    for attempt in range(1 + project.max_retries if should_validate else 1):
 
-        results = GenerateUtil.generate_and_validate_batch(
+        if attempt > 0 and not lookahead.should_retry(get_buffer_seconds(), num_words):
+            printt(f"{COL_DIM_ITALICS}Skipping retry (not enough buffered audio, or unlikely to pass)")
+            printt()
+            break
+
+        start_time = time.monotonic()
+        gen_results = GenerateUtil.generate_batch(
+            state=state,
+            indices=[index],
+            phrase_groups=phrase_groups,
+            force_random_seed=(attempt > 0),
+            is_realtime=True
+        )
+        generation_seconds = time.monotonic() - start_time
+
+        start_time = time.monotonic()
+        results = GenerateUtil.validate_batch(
             state=state,
             indices=[index],
             phrase_groups=phrase_groups,
+            gen_results=gen_results,
             stt_variant=state.prefs.stt_variant,
             stt_config=state.prefs.stt_config,
-            force_random_seed=(attempt > 0),
             is_realtime=True,
-            is_skip_reason_buffer=not has_runway
+            skip_reason=Stt.should_skip(state, not should_validate)
         )
+        stt_seconds = time.monotonic() - start_time
+
         result = results[0]
+        if isinstance(result, ValidationResult):
+            is_validated = not isinstance(result, SkippedResult)
+            lookahead.add_attempt(
+                num_words,
+                generation_seconds=generation_seconds,
+                stt_seconds=stt_seconds if is_validated else None,
+                audio_seconds=result.sound.duration,
+                is_fail=result.is_fail if is_validated else None,
+            )
         if isinstance(result, TtsModelError):
             consecutive_model_errors += 1
             gen_result = result.message
@@ -386,4 +496,3 @@ def generate_full_flow(
 # ---
 
 INTERRUPTIBLE_SLEEP_POLL_SECONDS = 0.1
-REQUIRED_SECONDS_PER_RETRY = 60.0
@@ -1,15 +1,17 @@
 from dataclasses import dataclass
 import threading
+import time
 from collections import deque
 from typing import Callable
 
 import numpy as np
-import sounddevice as sd
 
 from tts_audiobook_tool.app_types import Sound
 
 SAMPLE_RATE = 48000
 BLOCKSIZE = 4096 # ~85ms latency
+# Headless mode: how far the software clock may fall behind before it stops trying to catch up
+CLOCK_MAX_LAG_SECONDS = 1.0
 
 
 @dataclass
@@ -25,32 +27,81 @@ class AudioStream:
     mixed to mono, and queued in an internal deque. The OutputStream callback drains
     the deque block-by-block on a background audio thread.
 
+    In headless mode, there is no OutputStream (and sounddevice is not required).
+    The deque is instead drained by a background thread paced by the system clock,
+    so that the playback listener still receives audio in real time.
+
     Supports:
     - Muting without stopping the stream (set_is_mute)
     - A playback listener hook for tapping the live PCM output (e.g. HTTP streaming)
-    - Querying remaining buffered duration (get_seconds_left)
+    - Querying remaining buffered duration (get_seconds_left), and waiting for it
+      to drain (wait_until_seconds_left)
     - Flushing the buffer mid-stream (clear)
     """
 
-    def __init__(self):
+    def __init__(self, headless: bool = False):
         self._data_buffer: deque[AudioBufferItem] = deque()
         self._lock = threading.Lock()
+        # Notified by the callback when the buffer has drained to a waiting producer's level
+        self._drained_condition = threading.Condition(self._lock)
+        # Buffered sample count at which to wake `wait_until_seconds_left()` callers (-1 = none waiting).
+        # With several waiters, the highest of their levels; the others then wait again
+        self._drain_target_samples = -1
         self._playback_listener: Callable[[np.ndarray, int], None] | None = None
         self._first_audio_output_callback: Callable[[], None] | None = None
         self._first_audio_output_sample_index: int | None = None
+        # Their difference is the number of samples in the buffer
         self._total_samples_enqueued = 0
         self._total_samples_played = 0
         self._currently_playing = ""
         self._is_mute: bool = False
-        self._stream = sd.OutputStream(
-            samplerate=SAMPLE_RATE,
-            channels=1,
-            dtype="float32",
-            blocksize=BLOCKSIZE,
-            latency="high", # extra tolerance to protect against 'cpu starvation'
-            callback=self._callback,
-        )
-        self._stream.start()
+        self._headless = headless
+        self._is_closed = threading.Event()
+        if headless:
+            self._stream = None
+            threading.Thread(target=self._clock_worker, daemon=True).start()
+        else:
+            import sounddevice as sd
+            self._stream = sd.OutputStream(
+                samplerate=SAMPLE_RATE,
+                channels=1,
+                dtype="float32",
+                blocksize=BLOCKSIZE,
+                latency="high", # extra tolerance to protect against 'cpu starvation'
+                callback=self._callback,
+            )
+            self._stream.start()
+
+    @property
+    def headless(self) -> bool:
+        return self._headless
+
+    def close(self) -> None:
+        """ Stops output """
+        self._is_closed.set()
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def _clock_worker(self) -> None:
+        """
+        Headless mode's stand-in for the OutputStream: "plays" one block per block duration.
+        Blocks are scheduled against the start time rather than the previous block,
+        so timing errors don't accumulate. If the thread falls far behind (eg, system was
+        suspended), the schedule is reset rather than playing out the backlog all at once.
+        """
+        block_duration = BLOCKSIZE / SAMPLE_RATE
+        outdata = np.zeros((BLOCKSIZE, 1), dtype=np.float32)
+        next_time = time.monotonic()
+        while not self._is_closed.is_set():
+            self._callback(outdata, BLOCKSIZE, None, None)
+            next_time += block_duration
+            delay = next_time - time.monotonic()
+            if delay < -CLOCK_MAX_LAG_SECONDS:
+                next_time = time.monotonic()
+            elif delay > 0:
+                self._is_closed.wait(delay)
 
     def set_playback_listener(self, listener: Callable[[np.ndarray, int], None]) -> None:
         """Register a callable invoked with (pcm_block, sample_rate) for each played block."""
@@ -92,6 +143,9 @@ class AudioStream:
                     self._first_audio_output_callback = None
                     self._first_audio_output_sample_index = None
                 self._total_samples_played = chunk_end
+                if 0 <= self._drain_target_samples and self._get_num_samples_buffered() <= self._drain_target_samples:
+                    self._drain_target_samples = -1
+                    self._drained_condition.notify_all()
         # Notify HTTP feed outside the lock — copy the slice of outdata that was filled.
         # Do this before zeroing outdata so the HTTP stream always receives real audio.
         if write_pos > 0 and self._playback_listener is not None:
@@ -137,7 +191,28 @@ class AudioStream:
 
     def get_seconds_left(self) -> float:
         with self._lock:
-            return sum(len(item.data) for item in self._data_buffer) / SAMPLE_RATE
+            return self._get_num_samples_buffered() / SAMPLE_RATE
+
+    def _get_num_samples_buffered(self) -> int:
+        """ Caller must hold the lock """
+        return self._total_samples_enqueued - self._total_samples_played
+
+    def wait_until_seconds_left(self, max_seconds: float, timeout: float | None = None) -> bool:
+        """
+        Blocks until no more than `max_seconds` of audio remains in the buffer
+        (ie, returns as soon as playback has drained it that far).
+        Returns False on timeout.
+        """
+        max_samples = int(max_seconds * SAMPLE_RATE)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._drained_condition:
+            while self._get_num_samples_buffered() > max_samples:
+                self._drain_target_samples = max(self._drain_target_samples, max_samples)
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._drained_condition.wait(remaining)
+            return True
 
     def clear(self):
         with self._lock:
@@ -147,3 +222,5 @@ class AudioStream:
             self._first_audio_output_sample_index = None
             self._total_samples_enqueued = 0
             self._total_samples_played = 0
+            self._drain_target_samples = -1
+            self._drained_condition.notify_all()
@@ -1,3 +1,5 @@
+from collections import deque
+from dataclasses import dataclass
 import io
 import json
 import queue
@@ -8,23 +10,97 @@ import time
 import numpy as np
 import soundfile as sf
 
-_QUEUE_MAXSIZE = 20
+# Default for how far behind (seconds of audio) a client may fall before being dropped
+DEFAULT_MAX_LAG_SECONDS = 20.0
+# A client is reported as "lagging" when behind by more than this fraction of the max lag
+_LAGGING_FRACTION = 0.5
 # Accumulate this many played samples before encoding a WAV frame (~0.5 s at 48 kHz).
 # Smaller = lower latency to HTTP clients; larger = fewer encode calls.
 _ENCODE_BLOCK_SAMPLES = 24000
 
+# Stream encoding name -> soundfile (format, subtype)
+# Each frame's payload is a complete file, decodable on its own (eg, by `decodeAudioData()`)
+ENCODINGS: dict[str, tuple[str, str]] = {
+    "float32": ("WAV", "FLOAT"),
+    "pcm16": ("WAV", "PCM_16"),
+    "flac": ("FLAC", "PCM_16"),
+    "opus": ("OGG", "OPUS"),
+}
+DEFAULT_ENCODING = "float32"
 
-def _encode_pcm(data: np.ndarray, sr: int) -> bytes:
+# Accept header media type -> stream encoding
+_ACCEPT_ENCODINGS: dict[str, str] = {
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "audio/flac": "flac",
+    "audio/l16": "pcm16",
+    "audio/wav": "float32",
+}
+
+
+def _encode_pcm(data: np.ndarray, sr: int, encoding: str = DEFAULT_ENCODING) -> bytes:
+    file_format, subtype = ENCODINGS[encoding]
+    if subtype != "FLOAT":
+        data = np.clip(data, -1.0, 1.0)
     buf = io.BytesIO()
-    sf.write(buf, data, sr, format='WAV', subtype='FLOAT')
+    sf.write(buf, data, sr, format=file_format, subtype=subtype)
     return buf.getvalue()
 
 
+def get_encoding(query_value: str = "", accept: str = "") -> str:
+    """
+    Resolves a client's stream encoding from the `encoding` query parameter, else from the
+    Accept header (first supported media type), else the default.
+    Returns empty string if the query parameter value is not a supported encoding.
+    """
+    if query_value:
+        query_value = query_value.strip().lower()
+        return query_value if query_value in ENCODINGS else ""
+    for item in accept.split(","):
+        media_type = item.split(";")[0].strip().lower()
+        if media_type in _ACCEPT_ENCODINGS:
+            return _ACCEPT_ENCODINGS[media_type]
+    return DEFAULT_ENCODING
+
+
+@dataclass
+class _Block:
+    sequence: int
+    duration: float
+    # Encoding -> frame
+    frames: dict[str, bytes]
+
+
+class StreamClient:
+    """ A connected HTTP stream client's read position in the shared block buffer """
+
+    def __init__(self, encoding: str, cursor: int):
+        self.encoding = encoding
+        # Sequence number of the next block to send
+        self.cursor = cursor
+        # Set when the client has been dropped for falling too far behind
+        self.drop_reason = ""
+
+
 class AudioStreamHttp:
+    """
+    Encodes played audio into frames and fans them out to HTTP stream clients.
+
+    Encoded blocks are kept in a single shared buffer, and each client reads from it
+    at its own pace using a cursor, so a client which is briefly slow to consume
+    (eg, network hiccup) catches up without losing audio. The buffer retains
+    `max_lag_seconds` worth of audio; a client which falls further behind than that
+    is dropped (see `StreamClient.drop_reason`).
+    """
 
-    def __init__(self):
+    def __init__(self, max_lag_seconds: float = DEFAULT_MAX_LAG_SECONDS):
+        self._max_lag_seconds = max_lag_seconds
         self._lock = threading.Lock()
-        self._clients: list[queue.Queue] = []
+        self._condition = threading.Condition(self._lock)
+        self._clients: list[StreamClient] = []
+        self._blocks: deque[_Block] = deque()
+        self._buffered_duration = 0.0
+        self._num_dropped_clients = 0
         self._pcm_queue: queue.SimpleQueue = queue.SimpleQueue()
         self._accumulator = np.empty(0, dtype=np.float32)
         self._accum_sr: int = 48000
@@ -60,47 +136,97 @@ class AudioStreamHttp:
     def _flush(self) -> None:
         if len(self._accumulator) == 0:
             return
-        wav_bytes = _encode_pcm(self._accumulator, self._accum_sr)
-        sample_count = len(self._accumulator)
+        # Reserve the sequence number together with the snapshot of encodings in use,
+        # so that clients connecting from here on start at the following block
+        with self._lock:
+            sequence = self._sequence
+            self._sequence += 1
+            encodings = sorted({client.encoding for client in self._clients})
+        timeline_start_sample = self._timeline_sample_index
+        data = self._accumulator
+        self._timeline_sample_index += len(data)
+        self._accumulator = np.empty(0, dtype=np.float32)
+        if not encodings:
+            return
+
+        # Each encoding in use is encoded once per block, and shared by its clients
+        frames = {
+            encoding: self._make_frame(data, encoding, sequence, timeline_start_sample)
+            for encoding in encodings
+        }
+        block = _Block(sequence=sequence, duration=len(data) / self._accum_sr, frames=frames)
+        with self._condition:
+            self._blocks.append(block)
+            self._buffered_duration += block.duration
+            while len(self._blocks) > 1 and self._buffered_duration > self._max_lag_seconds:
+                self._buffered_duration -= self._blocks.popleft().duration
+            self._condition.notify_all()
+
+    def _make_frame(self, data: np.ndarray, encoding: str, sequence: int, timeline_start_sample: int) -> bytes:
+        payload = _encode_pcm(data, self._accum_sr, encoding)
         header = {
             "type": "audio",
-            "sequence": self._sequence,
+            "sequence": sequence,
             "sampleRate": self._accum_sr,
-            "timelineStartSample": self._timeline_sample_index,
-            "sampleCount": sample_count,
+            "timelineStartSample": timeline_start_sample,
+            "sampleCount": len(data),
             "serverTime": time.time(),
+            "encoding": encoding,
         }
-        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
-        body = struct.pack('>I', len(header_bytes)) + header_bytes + wav_bytes
-        encoded = struct.pack('>I', len(body)) + body
-        self._sequence += 1
-        self._timeline_sample_index += sample_count
-        self._accumulator = np.empty(0, dtype=np.float32)
-        with self._lock:
-            snapshot = list(self._clients)
-        for q in snapshot:
-            try:
-                q.put_nowait(encoded)
-            except queue.Full:
-                pass
+        return make_message_frame(header, payload)
 
     # ── client management ──────────────────────────────────────────────────
 
-    def connect(self) -> queue.Queue:
-        q: queue.Queue = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+    def connect(self, encoding: str = DEFAULT_ENCODING) -> StreamClient:
+        """ :param encoding: One of ENCODINGS (see `get_encoding()`) """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding}")
         with self._lock:
-            self._clients.append(q)
-        return q
+            client = StreamClient(encoding, self._sequence)
+            self._clients.append(client)
+        return client
 
-    def disconnect(self, q: queue.Queue) -> None:
+    def disconnect(self, client: StreamClient) -> None:
         with self._lock:
             try:
-                self._clients.remove(q)
+                self._clients.remove(client)
             except ValueError:
                 pass
 
+    def read(self, client: StreamClient, timeout: float) -> bytes | None:
+        """
+        Returns the client's next frame, waiting up to `timeout` seconds for one.
+        Returns None on timeout, or if the client has been dropped for falling
+        too far behind (in which case `client.drop_reason` is set).
+        """
+        with self._condition:
+            deadline = time.monotonic() + timeout
+            while True:
+                if client.drop_reason:
+                    return None
+                if self._blocks:
+                    first_sequence = self._blocks[0].sequence
+                    if client.cursor < first_sequence:
+                        client.drop_reason = (
+                            f"Client fell more than {self._max_lag_seconds:g}s behind the live stream"
+                        )
+                        self._num_dropped_clients += 1
+                        return None
+                    index = client.cursor - first_sequence
+                    if index < len(self._blocks):
+                        block = self._blocks[index]
+                        client.cursor = block.sequence + 1
+                        frame = block.frames.get(client.encoding)
+                        if frame is not None:
+                            return frame
+                        continue # block predates client's encoding being in use
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
     def clear(self) -> None:
-        """Drain in-flight PCM and all client queues so server clear() takes effect promptly."""
+        """Drain in-flight PCM and buffered blocks so server clear() takes effect promptly."""
         # Drain the PCM queue so the encode worker stops accumulating
         while True:
             try:
@@ -108,16 +234,42 @@ class AudioStreamHttp:
             except queue.Empty:
                 break
         self._accumulator = np.empty(0, dtype=np.float32)
-        # Drain each client's delivery queue
-        with self._lock:
-            snapshot = list(self._clients)
-        for q in snapshot:
-            while True:
-                try:
-                    q.get_nowait()
-                except queue.Empty:
-                    break
+        # Skip every client past anything not yet sent
+        with self._condition:
+            self._blocks.clear()
+            self._buffered_duration = 0.0
+            for client in self._clients:
+                client.cursor = self._sequence
+            self._condition.notify_all()
 
     def client_count(self) -> int:
         with self._lock:
             return len(self._clients)
+
+    def get_metrics(self) -> dict:
+        """
+        Returns
+            lagging_clients: clients more than halfway to the max lag
+            dropped_clients: total clients dropped for exceeding the max lag
+            max_lag: the furthest-behind client's lag, in seconds of audio
+        """
+        with self._lock:
+            lags = [self._get_lag(client) for client in self._clients]
+            return {
+                "lagging_clients": sum(1 for lag in lags if lag > self._max_lag_seconds * _LAGGING_FRACTION),
+                "dropped_clients": self._num_dropped_clients,
+                "max_lag": round(max(lags, default=0.0), 3),
+            }
+
+    def _get_lag(self, client: StreamClient) -> float:
+        """ Seconds of buffered audio the client has yet to read. Caller must hold the lock. """
+        if client.drop_reason or not self._blocks:
+            return 0.0
+        return sum(block.duration for block in self._blocks if block.sequence >= client.cursor)
+
+
+def make_message_frame(header: dict, payload: bytes = b"") -> bytes:
+    """ Length-prefixed envelope: message length, JSON header length, JSON header, payload """
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    body = struct.pack('>I', len(header_bytes)) + header_bytes + payload
+    return struct.pack('>I', len(body)) + body
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+import re
+import threading
+
+import numpy as np
+
+from tts_audiobook_tool.app_support import app_hashing
+from tts_audiobook_tool.app_types import Sound
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.util import *
+
+# Default memory budget
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Default on-disk tier budget
+DEFAULT_MAX_DISK_BYTES = 2 * 1024 * 1024 * 1024
+
+
+class PhraseAudioCache:
+    """
+    LRU cache of the server's generated phrase audio, so that repeated prompts
+    (UI phrases, headings, system messages, etc) are served without re-running inference.
+
+    Entries are keyed by `make_key()`, and hold the generated sound after the app's standard
+    post-processing (see `SoundPipeline.apply_generate_post_processing()`), before any
+    playback-specific treatment.
+
+    Entries are held in memory up to `max_bytes`. If `dir_path` is given, entries are also
+    written there as npz files (up to `max_disk_bytes`), which persist across server runs;
+    entries evicted from memory are then re-loaded from disk on demand.
+    """
+
+    def __init__(
+            self,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            dir_path: str = "",
+            max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES
+    ):
+        self._max_bytes = max_bytes
+        self._dir_path = dir_path
+        self._max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Sound] = OrderedDict()
+        self._num_bytes = 0
+        self._num_hits = 0
+        self._num_disk_hits = 0
+        self._num_misses = 0
+        self._num_evictions = 0
+        self._num_disk_evictions = 0
+        self._num_disk_bytes = 0
+        # (path, mtime, size) -> file hash
+        self._file_hashes: dict[tuple[str, int, int], str] = {}
+        if self._dir_path:
+            os.makedirs(self._dir_path, exist_ok=True)
+            self._num_disk_bytes = sum(size for _, _, size in self._scan_disk_entries())
+
+    @staticmethod
+    def make_key(text: str, model_type_id: str, voice_hash: str, params_hash: str) -> str:
+        """
+        :param text: Prompt text; whitespace differences are ignored
+        :param voice_hash: Identifies the voice clone (see `make_voice_hash()`)
+        :param params_hash: Identifies everything else that affects generation
+            (model settings, sampling parameters, seed, text substitutions, etc)
+        """
+        text = re.sub(r"\s+", " ", text).strip()
+        return app_hashing.calc_hash_string(f"{model_type_id}|{voice_hash}|{params_hash}|{text}")
+
+    def make_voice_hash(self, voice_path: str, voice_value: str = "") -> str:
+        """
+        Returns hash of the voice clone file's contents (memoized by modification time),
+        or else of `voice_value` (eg, the name of a predefined voice).
+        """
+        try:
+            stat = os.stat(voice_path) if voice_path else None
+        except OSError:
+            stat = None
+        if stat is None:
+            return app_hashing.calc_hash_string(voice_value)
+        memo_key = (voice_path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            file_hash = self._file_hashes.get(memo_key)
+        if file_hash is None:
+            file_hash, err = app_hashing.calc_hash_file(voice_path)
+            if err:
+                return app_hashing.calc_hash_string(voice_value)
+            with self._lock:
+                self._file_hashes[memo_key] = file_hash
+        return file_hash
+
+    def get(self, key: str) -> Sound | None:
+        with self._lock:
+            sound = self._entries.get(key)
+            if sound is not None:
+                self._entries.move_to_end(key)
+                self._num_hits += 1
+                return sound
+
+        sound = self._load_from_disk(key) if self._dir_path else None
+        with self._lock:
+            if sound is None:
+                self._num_misses += 1
+                return None
+            self._num_hits += 1
+            self._num_disk_hits += 1
+            self._add_to_memory(key, sound)
+        return sound
+
+    def put(self, key: str, sound: Sound) -> None:
+        if sound.data.size == 0:
+            return
+        with self._lock:
+            self._add_to_memory(key, sound)
+        if self._dir_path:
+            self._save_to_disk(key, sound)
+
+    def _add_to_memory(self, key: str, sound: Sound) -> None:
+        """ Caller must hold the lock """
+        if sound.data.nbytes > self._max_bytes:
+            return
+        old_sound = self._entries.pop(key, None)
+        if old_sound is not None:
+            self._num_bytes -= old_sound.data.nbytes
+        self._entries[key] = sound
+        self._num_bytes += sound.data.nbytes
+        while self._num_bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._num_bytes -= evicted.data.nbytes
+            self._num_evictions += 1
+
+    def _get_disk_path(self, key: str) -> str:
+        return os.path.join(self._dir_path, f"{key}.npz")
+
+    def _load_from_disk(self, key: str) -> Sound | None:
+        path = self._get_disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                sound = Sound(npz["data"], int(npz["sr"]))
+        except Exception as e:
+            L.w(f"Couldn't read phrase audio cache entry {path}: {make_error_string(e)}")
+            delete_silently(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return sound
+
+    def _save_to_disk(self, key: str, sound: Sound) -> None:
+        path = self._get_disk_path(key)
+        if os.path.exists(path):
+            return
+        temp_path = path + f".{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                np.savez(f, data=sound.data, sr=np.array(sound.sr))
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            L.w(f"Couldn't write phrase audio cache entry {path}: {make_error_string(e)}")
+            delete_silently(temp_path)
+            return
+        with self._lock:
+            self._num_disk_bytes += size
+            if self._num_disk_bytes <= self._max_disk_bytes:
+                return
+            # Evict least recently used files (entries are touched when read)
+            for entry_path, _, entry_size in sorted(self._scan_disk_entries(), key=lambda item: item[1]):
+                if self._num_disk_bytes <= self._max_disk_bytes:
+                    break
+                if entry_path == path:
+                    continue
+                delete_silently(entry_path)
+                self._num_disk_bytes -= entry_size
+                self._num_disk_evictions += 1
+
+    def _scan_disk_entries(self) -> list[tuple[str, float, int]]:
+        """ Returns path, modification time and size of each on-disk entry """
+        result: list[tuple[str, float, int]] = []
+        for entry in os.scandir(self._dir_path):
+            if not entry.is_file() or not entry.name.endswith(".npz"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            result.append((entry.path, stat.st_mtime, stat.st_size))
+        return result
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            num_lookups = self._num_hits + self._num_misses
+            return {
+                "hits": self._num_hits,
+                "disk_hits": self._num_disk_hits,
+                "misses": self._num_misses,
+                "hit_rate": round(self._num_hits / num_lookups, 3) if num_lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._num_bytes,
+                "evictions": self._num_evictions,
+                "disk_bytes": self._num_disk_bytes if self._dir_path else 0,
+                "disk_evictions": self._num_disk_evictions,
+            }
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Request value -> priority
+PRIORITIES = {
+    "high": PRIORITY_HIGH,
+    "normal": PRIORITY_NORMAL,
+    "low": PRIORITY_LOW,
+}
+
+# How often a blocked `get_batch()` re-checks for expired jobs
+EXPIRY_CHECK_INTERVAL = 1.0
+
+
+@dataclass
+class ScheduledJob:
+    payload: Any
+    client_id: str
+    priority: int
+    # Whether the job may be coalesced with others into one TTS call
+    batchable: bool
+    enqueued_at: float
+    # Monotonic time by which the job must have been dispatched (0 = no deadline)
+    deadline: float = 0.0
+    # Playback order, assigned on dispatch
+    ticket: int = -1
+    dispatched_at: float = 0.0
+    epoch: int = 0
+    is_finished: bool = False
+
+
+@dataclass
+class _PriorityStats:
+    num_dispatched: int = 0
+    num_completed: int = 0
+    num_expired: int = 0
+    total_wait: float = 0.0
+    total_service: float = 0.0
+
+
+class PromptScheduler:
+    """
+    Queue of server prompt segments, consumed by a pool of worker threads.
+
+    - Jobs are dispatched highest-priority first (lowest number), and within a priority,
+      round-robin across clients, so one client's long prompt can't starve another's.
+    - Consecutive batchable jobs of the same priority are coalesced into batches of up to
+      the requested size, to be generated using a single TTS call.
+    - Jobs not dispatched by their deadline are discarded.
+    - Each dispatched job is given a playback "ticket". Since workers finish in any order,
+      a worker must `wait_for_turn()` before outputting a job's audio, and then `finish()`
+      it, which passes the turn to the next ticket.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # Priority -> client id -> that client's jobs, in order of service (round-robin)
+        self._queues: dict[int, OrderedDict[str, deque[ScheduledJob]]] = {}
+        self._stats: dict[int, _PriorityStats] = {}
+        self._next_ticket = 0
+        self._current_turn = 0
+        self._finished_tickets: set[int] = set()
+        # Incremented by `clear()`; jobs from earlier epochs no longer get turns
+        self._epoch = 0
+
+    def put(
+            self,
+            payload: Any,
+            client_id: str = "",
+            priority: int = PRIORITY_NORMAL,
+            batchable: bool = True,
+            deadline_seconds: float = 0.0
+    ) -> None:
+        """
+        :param deadline_seconds: Discard the job if not dispatched within this many seconds (0 = never)
+        """
+        now = time.monotonic()
+        job = ScheduledJob(
+            payload=payload,
+            client_id=client_id,
+            priority=priority,
+            batchable=batchable,
+            enqueued_at=now,
+            deadline=now + deadline_seconds if deadline_seconds > 0 else 0.0,
+        )
+        with self._condition:
+            job.epoch = self._epoch
+            clients = self._queues.setdefault(priority, OrderedDict())
+            clients.setdefault(client_id, deque()).append(job)
+            self._condition.notify()
+
+    def get_batch(self, max_size: int = 1, timeout: float | None = None) -> list[ScheduledJob]:
+        """
+        Blocks until a job is available, and returns it, possibly coalesced with further
+        batchable jobs (all of the same priority), in playback order.
+        Returns empty list on timeout.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            while True:
+                jobs = self._take_batch(max(1, max_size))
+                if jobs:
+                    return jobs
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._condition.wait(remaining if remaining is not None else EXPIRY_CHECK_INTERVAL)
+
+    def _take_batch(self, max_size: int) -> list[ScheduledJob]:
+        """ Caller must hold the lock """
+        now = time.monotonic()
+        self._discard_expired(now)
+        for priority in sorted(self._queues):
+            clients = self._queues[priority]
+            jobs: list[ScheduledJob] = []
+            while clients and len(jobs) < max_size:
+                client_id, client_jobs = next(iter(clients.items()))
+                job = client_jobs[0]
+                if jobs and not job.batchable:
+                    break
+                client_jobs.popleft()
+                if client_jobs:
+                    clients.move_to_end(client_id)
+                else:
+                    del clients[client_id]
+                jobs.append(job)
+                if not job.batchable:
+                    break
+            if not jobs:
+                continue
+            stats = self._stats.setdefault(priority, _PriorityStats())
+            for job in jobs:
+                job.ticket = self._next_ticket
+                self._next_ticket += 1
+                job.dispatched_at = now
+                stats.num_dispatched += 1
+                stats.total_wait += now - job.enqueued_at
+            return jobs
+        return []
+
+    def _discard_expired(self, now: float) -> None:
+        """ Caller must hold the lock """
+        for priority, clients in self._queues.items():
+            for client_id in list(clients):
+                client_jobs = clients[client_id]
+                kept = deque(job for job in client_jobs if not job.deadline or job.deadline > now)
+                num_expired = len(client_jobs) - len(kept)
+                if not num_expired:
+                    continue
+                self._stats.setdefault(priority, _PriorityStats()).num_expired += num_expired
+                if kept:
+                    clients[client_id] = kept
+                else:
+                    del clients[client_id]
+
+    def wait_for_turn(self, job: ScheduledJob) -> bool:
+        """
+        Blocks until all jobs dispatched before this one have finished.
+        Returns False if the scheduler was cleared in the meantime, in which case
+        the job's output should be discarded.
+        """
+        with self._condition:
+            while job.epoch == self._epoch and self._current_turn != job.ticket:
+                self._condition.wait()
+            return job.epoch == self._epoch
+
+    def finish(self, job: ScheduledJob) -> None:
+        """ Marks the job as done (whether or not it succeeded), passing on the turn. Idempotent. """
+        with self._condition:
+            if job.is_finished:
+                return
+            job.is_finished = True
+            stats = self._stats.setdefault(job.priority, _PriorityStats())
+            stats.num_completed += 1
+            stats.total_service += time.monotonic() - job.dispatched_at
+            if job.epoch != self._epoch:
+                return
+            self._finished_tickets.add(job.ticket)
+            while self._current_turn in self._finished_tickets:
+                self._finished_tickets.remove(self._current_turn)
+                self._current_turn += 1
+            self._condition.notify_all()
+
+    def clear(self) -> None:
+        """ Discards all queued jobs. Dispatched jobs lose their turns (see `wait_for_turn()`). """
+        with self._condition:
+            self._queues.clear()
+            self._epoch += 1
+            self._current_turn = self._next_ticket
+            self._finished_tickets.clear()
+            self._condition.notify_all()
+
+    def qsize(self) -> int:
+        with self._condition:
+            return sum(len(jobs) for clients in self._queues.values() for jobs in clients.values())
+
+    def get_metrics(self) -> dict[str, dict]:
+        """
+        Returns, per priority name:
+            queued: number of jobs waiting
+            dispatched, completed, expired: totals
+            mean_wait: average seconds from queued to dispatched
+            mean_service: average seconds from dispatched to finished (incl. waiting for playback turn)
+        """
+        with self._condition:
+            metrics: dict[str, dict] = {}
+            for name, priority in PRIORITIES.items():
+                stats = self._stats.get(priority, _PriorityStats())
+                clients = self._queues.get(priority, {})
+                metrics[name] = {
+                    "queued": sum(len(jobs) for jobs in clients.values()),
+                    "dispatched": stats.num_dispatched,
+                    "completed": stats.num_completed,
+                    "expired": stats.num_expired,
+                    "mean_wait": round(stats.total_wait / stats.num_dispatched, 3) if stats.num_dispatched else 0.0,
+                    "mean_service": round(stats.total_service / stats.num_completed, 3) if stats.num_completed else 0.0,
+                }
+            return metrics
@@ -1,20 +1,20 @@
+import contextlib
 from dataclasses import dataclass
 import os
 import re
 import json
 import pathlib
 import itertools
-import queue
 import sys
 import threading
 import time
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
 import numpy as np
 
 from tts_audiobook_tool import text_util
-from tts_audiobook_tool.app_support import app_hint_util
+from tts_audiobook_tool.app_support import app_hashing, app_hint_util
 from tts_audiobook_tool.app_support.sgl_omni_util import SglOmniUtil
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.sound.sound_pipeline import SoundPipeline
@@ -24,14 +24,20 @@ _HERE = pathlib.Path(__file__).parent
 _DEMOS_DIR = _HERE / "demos"
 _DEMOS_DIR_RESOLVED = _DEMOS_DIR.resolve()
 
+from tts_audiobook_tool.app_types import Sound
 from tts_audiobook_tool.app_types.phrase import Phrase, PhraseGroup, Reason
 from tts_audiobook_tool.text_ops.phrase_grouper import PhraseGrouper
 from tts_audiobook_tool.prefs import Prefs
 from tts_audiobook_tool.project_support.project_load_util import ProjectLoadUtil
+from tts_audiobook_tool.project_support.project_serialization_util import ProjectSerializationUtil
+from tts_audiobook_tool.project_support.project_voice_util import ProjectVoiceUtil
 from tts_audiobook_tool.l import L
 from tts_audiobook_tool.server.audio_stream import AudioStream
-from tts_audiobook_tool.server.audio_stream_http import AudioStreamHttp
+from tts_audiobook_tool.server.audio_stream_http import ENCODINGS, AudioStreamHttp, get_encoding, make_message_frame
+from tts_audiobook_tool.server.phrase_audio_cache import PhraseAudioCache
+from tts_audiobook_tool.server.prompt_scheduler import PRIORITIES, PromptScheduler, ScheduledJob
 from tts_audiobook_tool.tts import Tts
+from tts_audiobook_tool.tts_models.tts_model_type import TtsBackendKind
 
 
 @dataclass
@@ -39,12 +45,30 @@ class PromptItem:
     phrase_group: PhraseGroup
     can_eager: bool
     use_tts_streaming: bool
-    is_prompt_start: bool = False
+    # Identifies the /prompt request the segment came from
+    prompt_id: int
+    generation_id: int
 
 
 class Server:
 
-    def __init__(self, project_dir: str = ""):
+    def __init__(
+            self,
+            project_dir: str = "",
+            headless: bool = False,
+            num_workers: int = 1,
+            audio_cache_mb: int = 0,
+            audio_cache_dir: str = ""
+    ):
+        """
+        :param headless: Don't use the sound device. Audio is only output to `/stream`
+            clients, paced by a software clock (see `AudioStream`).
+        :param num_workers: Number of prompt segments that can be in flight at once
+            (see `PromptScheduler`). Only useful beyond 1 for SGL-Omni models, which can
+            serve concurrent requests; local model inference is always serialized.
+        :param audio_cache_mb: Memory budget of the phrase audio cache (0 = no cache)
+        :param audio_cache_dir: Enables the phrase audio cache's on-disk tier, at this location
+        """
         
         # Load current project
         # (project_dir, if non-empty, is a --project CLI override validated at startup)
@@ -74,24 +98,33 @@ class Server:
             printt("Exiting")
             exit(0)
 
-        # PriorityQueue allows for inserting items at front
-        self._queue: queue.PriorityQueue[tuple[int, int, PromptItem]] = queue.PriorityQueue()
-
-        self._queue_counter = itertools.count()
-        self._prompt_currently_inferencing = ""
+        self._scheduler = PromptScheduler()
+        self._num_workers = max(1, num_workers)
+        self._prompt_counter = itertools.count()
+        self._last_prompt_id = -1
+        # Scheduler ticket -> prompt text, for the segments currently being inferenced
+        self._prompts_currently_inferencing: dict[int, str] = {}
         self._generation_id = 0
+        self._tts_lock = threading.Lock()
+
+        self._audio_cache: PhraseAudioCache | None = None
+        if audio_cache_mb > 0:
+            self._audio_cache = PhraseAudioCache(max_bytes=audio_cache_mb * 1024 * 1024, dir_path=audio_cache_dir)
 
-        self._audio_stream = AudioStream()
+        self._audio_stream = AudioStream(headless=headless)
         self._audio_http_stream = AudioStreamHttp()
         self._audio_stream.set_playback_listener(self._audio_http_stream.on_audio_played)
 
         self._is_initializing = True
-        self._local_audio_enabled = True
+        self._local_audio_enabled = not headless
         self._tts_streaming_enabled = Tts.get_info().can_stream
         self._tts_ready = threading.Event()
 
-        self._worker_thread = threading.Thread(target=self._worker, daemon=True)
-        self._worker_thread.start()
+        self._worker_threads = [
+            threading.Thread(target=self._worker, daemon=True) for _ in range(self._num_workers)
+        ]
+        for thread in self._worker_threads:
+            thread.start()
 
     def run(self, host: str = "127.0.0.1", port: int = 5001):
         Tts.reset_voice_selection_index()
@@ -108,7 +141,10 @@ class Server:
                         _server.prompt(
                             data.get("prompt", ""), 
                             should_segment=data.get("should_segment", True),
-                            can_eager=data.get("eager_first_segment", False)
+                            can_eager=data.get("eager_first_segment", False),
+                            client_id=str(data.get("client_id") or self.client_address[0]),
+                            priority=str(data.get("priority") or "normal"),
+                            deadline=float(data.get("deadline", 0) or 0),
                         )
                     )
                 elif self.path == "/clear":
@@ -148,34 +184,45 @@ class Server:
                     self.end_headers()
                     self.wfile.write(body)
                 elif parsed.path == "/stream":
-                    q = _server._audio_http_stream.connect()
+                    query_encoding = parse_qs(parsed.query).get("encoding", [""])[0]
+                    encoding = get_encoding(query_encoding, self.headers.get("Accept", ""))
+                    if not encoding:
+                        self.send_error(400, f"Unsupported encoding (supported: {', '.join(ENCODINGS)})")
+                        return
+                    client = _server._audio_http_stream.connect(encoding)
                     self.send_response(200)
                     self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("X-Audio-Encoding", encoding)
                     self.send_header("Transfer-Encoding", "chunked")
                     self.send_header("Cache-Control", "no-cache")
                     self.send_header("X-Accel-Buffering", "no")
                     self.end_headers()
+
+                    def write_chunk(chunk: bytes) -> None:
+                        self.wfile.write(f"{len(chunk):x}\r\n".encode())
+                        self.wfile.write(chunk)
+                        self.wfile.write(b"\r\n")
+                        self.wfile.flush()
+
                     try:
                         while True:
-                            try:
-                                chunk = q.get(timeout=5)
-                            except queue.Empty:
+                            chunk = _server._audio_http_stream.read(client, timeout=5)
+                            if client.drop_reason:
+                                # Client can't keep up; tell it why before closing
+                                printt(f"{COL_DIM}Stream client dropped: {client.drop_reason}")
+                                write_chunk(make_message_frame({"type": "dropped", "reason": client.drop_reason}))
+                                write_chunk(b"")
+                                break
+                            if chunk is None:
                                 # Heartbeat: 0-length app frame so we detect a dead connection.
                                 # Client skips frames with msgLen == 0.
-                                heartbeat = b'\x00\x00\x00\x00'
-                                self.wfile.write(f"{len(heartbeat):x}\r\n".encode())
-                                self.wfile.write(heartbeat)
-                                self.wfile.write(b"\r\n")
-                                self.wfile.flush()
+                                write_chunk(b'\x00\x00\x00\x00')
                                 continue
-                            self.wfile.write(f"{len(chunk):x}\r\n".encode())
-                            self.wfile.write(chunk)
-                            self.wfile.write(b"\r\n")
-                            self.wfile.flush()
+                            write_chunk(chunk)
                     except (BrokenPipeError, ConnectionResetError, OSError):
                         pass
                     finally:
-                        _server._audio_http_stream.disconnect(q)
+                        _server._audio_http_stream.disconnect(client)
                 elif parsed.path == "/":
                     body = (_DEMOS_DIR / API_DEMO_HTML_FILE_NAME).read_bytes()
                     self.send_response(200)
@@ -226,6 +273,8 @@ class Server:
             demo_url_3 = f"{base_url}/demos/{COMBINATION_DEMO_HTML_FILE_NAME}"
 
             printt(f"{COL_ACCENT}Server listening on {text_util.make_terminal_hyperlink(base_url)}")
+            if self._audio_stream.headless:
+                printt(f"{COL_DIM_ITALICS}Headless mode: audio is output to {base_url}/stream only")
             printt()
             printt("Demo pages:")
             printt(f"- API demo: {text_util.make_terminal_hyperlink(demo_url_1)}")
@@ -239,20 +288,35 @@ class Server:
             httpd.serve_forever()
 
     def status(self) -> dict:
+        stream_metrics = self._audio_http_stream.get_metrics()
+        # The earliest-dispatched segment being inferenced (ie, the next to be heard)
+        inferencing = dict(self._prompts_currently_inferencing)
         return {
             "status": "initializing" if self._is_initializing else "ready",
             "tts_model": Tts.get_type().value.ui["proper_name"],
-            "inferencing": self._prompt_currently_inferencing,
+            "inferencing": inferencing[min(inferencing)] if inferencing else "",
             "playing": self._audio_stream.get_currently_playing(),
             "audio_buffer": self._audio_stream.get_seconds_left(),
-            "num_queued": self._queue.qsize(),
+            "num_queued": self._scheduler.qsize(),
+            "workers": self._num_workers,
+            "queue": self._scheduler.get_metrics(),
+            "audio_cache": self._audio_cache.get_metrics() if self._audio_cache else None,
             "stream_clients": self._audio_http_stream.client_count(),
+            "stream_lagging_clients": stream_metrics["lagging_clients"],
+            "stream_dropped_clients": stream_metrics["dropped_clients"],
+            "stream_max_lag": stream_metrics["max_lag"],
             "local_audio": self._local_audio_enabled,
+            "headless": self._audio_stream.headless,
             "tts_streaming": self._tts_streaming_enabled,
             "tts_streaming_supported": Tts.get_info().can_stream,
         }
 
     def local_audio(self, enabled: bool) -> dict:
+        if self._audio_stream.headless:
+            response: dict[str, bool | str] = {"local_audio": False}
+            if enabled:
+                response["warning"] = "Server is running in headless mode; local audio is not available."
+            return response
         self._local_audio_enabled = enabled
         self._audio_stream.set_is_mute(not enabled)
         return {"local_audio": self._local_audio_enabled}
@@ -271,43 +335,61 @@ class Server:
         return response
 
 
-    def prompt(self, prompt: str, should_segment: bool = True, can_eager: bool = False) -> dict:
+    def prompt(
+            self,
+            prompt: str,
+            should_segment: bool = True,
+            can_eager: bool = False,
+            client_id: str = "",
+            priority: str = "normal",
+            deadline: float = 0.0
+    ) -> dict:
         """
         Queues text prompt for TTS inference
+
+        :param client_id: Segments are scheduled round-robin across clients of the same priority
+        :param priority: One of PRIORITIES
+        :param deadline: Segments not yet started this many seconds from now get discarded (0 = none)
         """
         prompt = prompt.strip()
         if not prompt:
             return {"error": "Empty prompt"}
+        if priority not in PRIORITIES:
+            return {"error": f"Unsupported priority (supported: {', '.join(PRIORITIES)})"}
 
         # Used for convenience response output feedback
         prompt_texts = []
         use_tts_streaming = self._tts_streaming_enabled and Tts.get_info().can_stream
+        prompt_id = next(self._prompt_counter)
 
         if should_segment:
             phrase_groups = PhraseGrouper.text_to_groups(prompt, self._project.max_words, self._project.segmentation_strategy, self._project.language_code)
-            for i, phrase_group in enumerate(phrase_groups):
-                prompt_texts.append(phrase_group.text)
-                self._queue.put((1, next(self._queue_counter), PromptItem(phrase_group, can_eager, use_tts_streaming, is_prompt_start=(i == 0))))
         else:
-            phrase_group = PhraseGroup( [Phrase(text=prompt, reason=Reason.UNDEFINED)] )
-            prompt_texts.append(prompt)
-            self._queue.put((1, next(self._queue_counter), PromptItem(phrase_group, False, use_tts_streaming, is_prompt_start=True)))
-       
+            phrase_groups = [PhraseGroup( [Phrase(text=prompt, reason=Reason.UNDEFINED)] )]
+            can_eager = False
+        for phrase_group in phrase_groups:
+            prompt_texts.append(phrase_group.text)
+            item = PromptItem(phrase_group, can_eager, use_tts_streaming, prompt_id, self._generation_id)
+            self._scheduler.put(
+                item,
+                client_id=client_id,
+                priority=PRIORITIES[priority],
+                # Streaming output and eager splitting both depend on the state of the audio buffer
+                # at the time of playback, so those are not generated ahead as part of a batch
+                batchable=not use_tts_streaming and not can_eager,
+                deadline_seconds=deadline,
+            )
+
         return {
             "input": prompt,
             "prompts": prompt_texts,
-            "queue_length": self._queue.qsize(),
+            "queue_length": self._scheduler.qsize(),
         }
 
     def clear(self) -> dict:
         self._generation_id += 1
+        self._scheduler.clear()
         Tts.clear_continuation()
-        while not self._queue.empty():
-            try:
-                self._queue.get_nowait()
-                self._queue.task_done()
-            except queue.Empty:
-                break
         self._audio_stream.clear()
         self._audio_http_stream.clear()
         return {}
@@ -320,9 +402,13 @@ class Server:
     ) -> bool:
         info = Tts.get_info()
         stream_started_at = time.monotonic()
-        self.log_tts_inference_start(mode="streaming", text=prompt_text)
+        voice_selection_index = Tts.get_next_voice_selection_index()
+        cache_key = self.get_audio_cache_key(prompt_text, voice_selection_index, is_streamed=True)
+        cached_sound = self._audio_cache.get(cache_key) if self._audio_cache and cache_key else None
+        self.log_tts_inference_start(mode="streaming" if cached_sound is None else "cached", text=prompt_text)
         first_audio_callback_registered = False
         streamed_audio_sample_count = 0
+        streamed_chunks: list[np.ndarray] = []
 
         def log_first_audio_latency() -> None:
             self.log_tts_first_audio_latency(
@@ -337,6 +423,8 @@ class Server:
                 return
             start, end = self._audio_stream.append_data(data, info.sample_rate, prompt_text)
             streamed_audio_sample_count += end - start
+            if cache_key:
+                streamed_chunks.append(data)
             if not first_audio_callback_registered:
                 first_audio_callback_registered = True
                 self._audio_stream.set_first_audio_output_callback(start, log_first_audio_latency)
@@ -355,14 +443,23 @@ class Server:
             start, end = self._audio_stream.append_data(silence, info.sample_rate, prompt_text)
             streamed_audio_sample_count += end - start
 
+        if cached_sound is not None:
+            # Served immediately, in one piece (and as streamed, see get_audio_cache_key())
+            on_stream_chunk(cached_sound.data)
+            on_stream_end()
+            Tts.clear_continuation_if_reason(phrase_group.last_reason)
+            return streamed_audio_sample_count > 0
+
         try:
-            result = Tts.generate_using_project(
-                self._project,
-                [prompt_text],
-                force_random_seed=False,
-                on_stream_chunk=on_stream_chunk,
-                on_stream_end=on_stream_end,
-            )
+            with self._get_tts_lock():
+                result = Tts.generate_using_project(
+                    self._project,
+                    [prompt_text],
+                    force_random_seed=False,
+                    on_stream_chunk=on_stream_chunk,
+                    on_stream_end=on_stream_end,
+                    voice_selection_index=voice_selection_index,
+                )
         finally:
             model = Tts.get_instance_if_exists()
             if model is not None:
@@ -379,28 +476,82 @@ class Server:
             printt("* No streamed audio output")
             Tts.clear_continuation()
             return False
+        if self._audio_cache and cache_key and streamed_chunks:
+            sound = Sound(np.concatenate(streamed_chunks).astype(np.float32, copy=False), info.sample_rate)
+            self._audio_cache.put(cache_key, sound)
         Tts.clear_continuation_if_reason(phrase_group.last_reason)
         return True
 
     def generate_non_streaming_output(
         self,
-        prompt_text: str,
-        phrase_group: PhraseGroup,
-        generation_id: int,
+        prompt_texts: list[str],
+        phrase_groups: list[PhraseGroup],
+        jobs: list[ScheduledJob],
     ) -> bool:
+        """
+        Generates the prompts using a single TTS call, and outputs the resulting sounds
+        as each job's playback turn comes up. Jobs whose item failed to generate
+        output nothing, but still pass on their playback turn.
+        """
         started_at = time.monotonic()
-        self.log_tts_inference_start(mode="non-streaming", text=prompt_text)
-        result = SoundPipeline.generate_processed_using_project(
-            self._project,
-            [prompt_text],
-            force_random_seed=False,
-        )
-        if isinstance(result, str):
-            printt(f"* TTS error: {result}")
-            Tts.clear_continuation()
-            return False
-        sound = result[0]
+        voice_selection_index = Tts.get_next_voice_selection_index()
+
+        # Cache hits are output as-is; only the rest get generated
+        params_hash = self.make_audio_cache_params_hash(is_streamed=False)
+        cache_keys = [
+            self.get_audio_cache_key(prompt_text, voice_selection_index, is_streamed=False, params_hash=params_hash)
+            for prompt_text in prompt_texts
+        ]
+        sounds: list[Sound | None] = [
+            self._audio_cache.get(cache_key) if self._audio_cache and cache_key else None
+            for cache_key in cache_keys
+        ]
+        miss_indices = [i for i, sound in enumerate(sounds) if sound is None]
+        for i, prompt_text in enumerate(prompt_texts):
+            self.log_tts_inference_start(mode="non-streaming" if i in miss_indices else "cached", text=prompt_text)
+
+        if miss_indices:
+            with self._get_tts_lock():
+                result = SoundPipeline.generate_processed_items_using_project(
+                    self._project,
+                    [prompt_texts[i] for i in miss_indices],
+                    force_random_seed=False,
+                    voice_selection_index=voice_selection_index,
+                )
+            if isinstance(result, str):
+                printt(f"* TTS error: {result}")
+                Tts.clear_continuation()
+                return False
+            did_fail = False
+            for i, item in zip(miss_indices, result):
+                if isinstance(item, str):
+                    printt(f"* TTS error: {item}")
+                    did_fail = True
+                    continue
+                sounds[i] = item
+                if self._audio_cache and cache_keys[i]:
+                    self._audio_cache.put(cache_keys[i], item)
+            if did_fail:
+                Tts.clear_continuation()
+
+        did_output = False
+        for sound, prompt_text, phrase_group, job in zip(sounds, prompt_texts, phrase_groups, jobs):
+            if sound is not None:
+                did_output |= self.output_sound(sound, prompt_text, phrase_group, job, started_at)
+            if len(jobs) > 1:
+                # Pass the playback turn on to the next job in the batch
+                self._scheduler.finish(job)
+        return did_output
 
+    def output_sound(
+        self,
+        sound: Sound,
+        prompt_text: str,
+        phrase_group: PhraseGroup,
+        job: ScheduledJob,
+        started_at: float,
+    ) -> bool:
+        generation_id = job.payload.generation_id
         if self._generation_id != generation_id:
             Tts.clear_continuation()
             return False
@@ -425,7 +576,8 @@ class Server:
                 use_break_sound_effect=False,
             )
 
-        if self._generation_id != generation_id:
+        # Output must follow the order in which segments were dispatched
+        if not self._scheduler.wait_for_turn(job) or self._generation_id != generation_id:
             Tts.clear_continuation()
             return False
 
@@ -459,62 +611,138 @@ class Server:
         )
 
     def _worker(self):
-        """Background thread: pulls prompts from the queue and runs TTS inference."""
+        """
+        Background thread (one of `num_workers`): pulls prompt segments from the scheduler
+        and runs TTS inference.
+        """
 
-        while True:
-            
-            _, _, prompt_item = self._queue.get()
-            self._tts_ready.wait()
+        self._tts_ready.wait()
 
-            generation_id = self._generation_id
+        while True:
 
             # Prevent audio buffer from growing past buffer-max-seconds
-            while self._audio_stream.get_seconds_left() > BUFFER_MAX_SECONDS:
-                if self._generation_id != generation_id:
-                    Tts.clear_continuation()
-                    break
-                time.sleep(1.0)
+            # (resumes as soon as playback drains it that far, or on clear())
+            self._audio_stream.wait_until_seconds_left(BUFFER_MAX_SECONDS)
 
-            # Discard if clear() was called while we were waiting
-            if self._generation_id != generation_id:
-                Tts.clear_continuation()
-                self._queue.task_done()
-                continue
+            jobs = self._scheduler.get_batch(self._get_max_batch_size())
+            for job in jobs:
+                self._prompts_currently_inferencing[job.ticket] = job.payload.phrase_group.text
 
-            phrase_group = prompt_item.phrase_group
-
-            if prompt_item.is_prompt_start:
+            try:
+                if len(jobs) > 1:
+                    self.generate_non_streaming_output(
+                        [job.payload.phrase_group.text for job in jobs],
+                        [job.payload.phrase_group for job in jobs],
+                        jobs,
+                    )
+                else:
+                    self._process_job(jobs[0])
+            finally:
+                for job in jobs:
+                    self._prompts_currently_inferencing.pop(job.ticket, None)
+                    self._scheduler.finish(job)
+
+    def _process_job(self, job: ScheduledJob) -> None:
+        prompt_item: PromptItem = job.payload
+        generation_id = prompt_item.generation_id
+
+        # Streamed audio is output as it's generated, and rolling continuation depends on
+        # the previous segment, so those are generated in turn. Otherwise, the segment is
+        # generated right away and only waits for its turn to be output.
+        generate_in_turn = (
+            (prompt_item.use_tts_streaming and Tts.get_info().can_stream)
+            or Tts.get_class().uses_rolling_continuation(self._project)
+        )
+        if generate_in_turn:
+            if not self._scheduler.wait_for_turn(job):
+                return
+            if prompt_item.prompt_id != self._last_prompt_id:
                 # Each /prompt request is a top-level generation run. Keep
                 # rolling continuation within segmented chunks from this prompt,
-                # but never inherit context from earlier requests.
+                # but never inherit context from other requests.
                 Tts.clear_continuation()
+                self._last_prompt_id = prompt_item.prompt_id
+
+        phrases = prompt_item.phrase_group.phrases
+        while phrases:
+
+            # Discard if clear() was called in the meantime
+            if self._generation_id != generation_id:
+                Tts.clear_continuation()
+                return
 
             if (
                 not prompt_item.use_tts_streaming
                 and self._audio_stream.get_seconds_left() < EAGER_THRESHOLD
                 and prompt_item.can_eager
-                and len(phrase_group.phrases) > 1
+                and len(phrases) > 1
             ):
-                # Extract first phrase
-                prompt_text = phrase_group.phrases[0].text
-                # And put remainder back in the "queue", at the front
-                remainder = PhraseGroup(phrase_group.phrases[1:])
-                self._queue.put((0, next(self._queue_counter), PromptItem(remainder, True, prompt_item.use_tts_streaming)))
+                # Generate the first phrase on its own, followed by the remainder (which may
+                # get split again), all while keeping this segment's playback turn
+                phrase_group = PhraseGroup(phrases[:1])
+                phrases = phrases[1:]
+            else:
+                phrase_group = PhraseGroup(phrases)
+                phrases = []
+            prompt_text = phrase_group.text
 
+            if prompt_item.use_tts_streaming and Tts.get_info().can_stream:
+                ok = self.generate_streaming_output(prompt_text, phrase_group, generation_id)
             else:
-                prompt_text = prompt_item.phrase_group.text
-            
-            self._prompt_currently_inferencing = prompt_text
+                ok = self.generate_non_streaming_output([prompt_text], [phrase_group], [job])
+            if not ok:
+                return
 
-            try:
-                if prompt_item.use_tts_streaming and Tts.get_info().can_stream:
-                    self.generate_streaming_output(prompt_text, phrase_group, generation_id)
-                else:
-                    self.generate_non_streaming_output(prompt_text, phrase_group, generation_id)
+    def get_audio_cache_key(
+        self,
+        prompt_text: str,
+        voice_selection_index: int,
+        is_streamed: bool,
+        params_hash: str = "",
+    ) -> str:
+        """
+        Returns phrase audio cache key for the prompt generated using the given voice,
+        or empty string if the generation is not cacheable.
 
-            finally:
-                self._prompt_currently_inferencing = ""
-                self._queue.task_done()
+        Streamed and non-streamed generations are cached separately, because streamed audio
+        is output (and so cached) as-is, whereas non-streamed audio gets post-processed first.
+        A cache hit thus replays the same audio as the generation it came from would have.
+
+        :param params_hash: See `make_audio_cache_params_hash()` (made if empty)
+        """
+        if not self._audio_cache:
+            return ""
+        if Tts.get_class().uses_rolling_continuation(self._project):
+            # Output depends on the preceding generation
+            return ""
+        tts_type = Tts.get_type()
+        voice_value = ProjectVoiceUtil.current_voice_value(self._project, tts_type, voice_selection_index)
+        voice_path = os.path.join(self._project.dir_path, voice_value) if voice_value else ""
+        voice_hash = self._audio_cache.make_voice_hash(voice_path, voice_value)
+        params_hash = params_hash or self.make_audio_cache_params_hash(is_streamed)
+        return PhraseAudioCache.make_key(prompt_text, tts_type.value.id, voice_hash, params_hash)
+
+    def make_audio_cache_params_hash(self, is_streamed: bool) -> str:
+        """
+        Cached audio is only valid for the same project settings (which are hashed at request time,
+        so that changed settings don't return stale audio) and output mode
+        """
+        project_settings = ProjectSerializationUtil.to_project_json_dict(self._project)
+        project_settings.pop("dir_path", None)
+        project_settings["is_streamed"] = is_streamed
+        return app_hashing.calc_hash_string(json.dumps(project_settings, sort_keys=True, default=str))
+
+    def _get_tts_lock(self) -> contextlib.AbstractContextManager:
+        """ Concurrent TTS calls are only safe (and useful) when the model is served externally """
+        if Tts.get_info().backend_kind == TtsBackendKind.SGL_OMNI:
+            return contextlib.nullcontext()
+        return self._tts_lock
+
+    def _get_max_batch_size(self) -> int:
+        """ Number of queued segments that can be coalesced into one TTS call """
+        if not Tts.get_info().can_batch or Tts.get_class().uses_rolling_continuation(self._project):
+            return 1
+        return ProjectVoiceUtil.get_batch_size(self._project)
 
 
 # TODO: Make configurable maybe:
@@ -0,0 +1,123 @@
+import os
+import time
+
+import numpy as np
+import soundfile
+
+from tts_audiobook_tool.app_support import app_hashing
+from tts_audiobook_tool.app_types import HighShelfEq, Sound
+from tts_audiobook_tool.constants import *
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.util import *
+
+
+class ConcatRenderCache:
+    """
+    Content-addressed on-disk cache of concat-rendered sound segments
+    (ie, the output of the upsample -> resample -> high shelf steps).
+
+    Entries are keyed by the hash of the segment file's contents plus the render
+    parameters, so a segment only gets re-rendered when its file changes or the
+    project's render settings change. Entries are stored as 24-bit FLAC at
+    APP_SAMPLE_RATE, which is lossless relative to the 16-bit concat stream.
+
+    Entries are touched on every hit and pruned by age, so entries belonging to
+    regenerated/deleted segments or old settings eventually get cleaned up.
+    """
+
+    # Bump when render steps change in a way that invalidates existing entries
+    VERSION = 1
+
+    # Entries not used for this long get deleted by `prune()`
+    MAX_AGE_SECONDS = 60 * 60 * 24 * 14
+
+    @staticmethod
+    def make_params_key(use_upsampler: bool, high_shelf: HighShelfEq) -> str:
+        """
+        Hash of everything besides the source file that affects the rendered output
+        """
+        params = [
+            f"v{ConcatRenderCache.VERSION}",
+            f"sr{APP_SAMPLE_RATE}",
+            "lavasr" if use_upsampler else "nolavasr",
+            f"shelf{high_shelf.strength}_{high_shelf.boost_start_hz}_{high_shelf.q_like}",
+        ]
+        return app_hashing.calc_hash_string("|".join(params))
+
+    @staticmethod
+    def get_entry_path(
+        cache_dir: str,
+        source_path: str,
+        use_upsampler: bool,
+        high_shelf: HighShelfEq
+    ) -> tuple[str, str]:
+        """
+        Returns cache entry path for the given segment file and render params, and error string.
+        The entry may or may not exist.
+        """
+        source_hash, err = app_hashing.calc_hash_file(source_path)
+        if err:
+            return "", err
+        params_key = ConcatRenderCache.make_params_key(use_upsampler, high_shelf)
+        return os.path.join(cache_dir, f"{source_hash}_{params_key}.flac"), ""
+
+    @staticmethod
+    def load(entry_path: str) -> Sound | None:
+        """
+        Returns cached sound, or None if not cached (or if unreadable).
+        Marks the entry as recently used.
+        """
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            data, sr = soundfile.read(entry_path, dtype="float32", always_2d=False)
+        except Exception as e:
+            L.w(f"Couldn't read render cache entry {entry_path}: {make_error_string(e)}")
+            delete_silently(entry_path)
+            return None
+        if sr != APP_SAMPLE_RATE or data.ndim != 1:
+            delete_silently(entry_path)
+            return None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return Sound(np.asarray(data, dtype=np.float32), int(sr))
+
+    @staticmethod
+    def save(sound: Sound, entry_path: str) -> str:
+        """
+        Writes entry atomically (so that an interrupted concat can't leave a truncated entry).
+        Returns error string on fail.
+        """
+        temp_path = entry_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            soundfile.write(temp_path, sound.data, sound.sr, format="FLAC", subtype="PCM_24")
+            os.replace(temp_path, entry_path)
+            return ""
+        except Exception as e:
+            delete_silently(temp_path)
+            return make_error_string(e)
+
+    @staticmethod
+    def prune(cache_dir: str, max_age_seconds: float = MAX_AGE_SECONDS) -> int:
+        """
+        Deletes entries which haven't been used within `max_age_seconds`,
+        along with any leftover temp files. Returns number of files deleted.
+        """
+        if not cache_dir or not os.path.isdir(cache_dir):
+            return 0
+        cutoff = time.time() - max_age_seconds
+        num_deleted = 0
+        for entry in os.scandir(cache_dir):
+            if not entry.is_file():
+                continue
+            try:
+                is_stale = entry.name.endswith(".tmp") or entry.stat().st_mtime < cutoff
+            except OSError:
+                continue
+            if is_stale:
+                delete_silently(entry.path)
+                num_deleted += 1
+        return num_deleted
@@ -0,0 +1,237 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import math
+
+import numpy as np
+from numpy import ndarray
+from scipy import signal
+
+
+@dataclass
+class LoudnessStats:
+    """
+    Loudness measurements of a whole stream, in the same terms as ffmpeg's `loudnorm` "pass 1" output
+
+    i - integrated loudness (LUFS)
+    lra - loudness range (LU)
+    tp - true peak (dBTP)
+    thresh - relative gating threshold used for integrated loudness (LUFS)
+    """
+    i: float
+    lra: float
+    tp: float
+    thresh: float
+
+    def to_loudnorm_dict(self) -> dict:
+        """
+        Returns stats in the shape of ffmpeg loudnorm's pass 1 json output
+        (see LoudnessNormalizationUtil.get_loudness_json())
+        """
+        return {
+            "input_i": f"{self.i:.2f}",
+            "input_tp": f"{self.tp:.2f}",
+            "input_lra": f"{self.lra:.2f}",
+            "input_thresh": f"{self.thresh:.2f}",
+            "target_offset": "0.00",
+        }
+
+
+class LoudnessMeter:
+    """
+    Incremental ITU-R BS.1770 / EBU R128 loudness meter (mono).
+
+    Audio is fed in arbitrary-sized chunks using `add()` while it is being
+    streamed elsewhere, so that the whole file never needs to be decoded again
+    just to be measured. Memory use is one float per 100ms of audio.
+
+    - Integrated loudness: K-weighted 400ms blocks (75% overlap), with
+      absolute (-70 LUFS) and relative (-10 LU) gating
+    - Loudness range (EBU Tech 3342): 3s short-term blocks at 1s intervals, with
+      absolute (-70 LUFS) and relative (-20 LU) gating, 10th to 95th percentile
+    - True peak: 4x oversampled sample peak (at 48kHz)
+    """
+
+    ABSOLUTE_GATE_LUFS = -70.0
+    INTEGRATED_RELATIVE_GATE_LU = -10.0
+    LRA_RELATIVE_GATE_LU = -20.0
+
+    # Loudness reported when there's nothing measurable (ie, silence)
+    FLOOR = -99.0
+
+    _SUBBLOCKS_PER_MOMENTARY_BLOCK = 4 # 400ms
+    _SUBBLOCKS_PER_SHORT_TERM_BLOCK = 30 # 3s
+    _SUBBLOCKS_PER_SHORT_TERM_HOP = 10 # 1s
+
+    # Number of input samples used as context on either side of a chunk when oversampling
+    _TRUE_PEAK_CONTEXT = 16
+
+    def __init__(self, sr: int) -> None:
+        self.sr = sr
+        self._sos = LoudnessMeter.make_k_weighting_sos(sr)
+        self._zi = np.zeros((self._sos.shape[0], 2))
+        self._subblock_length = max(1, sr // 10)
+        self._partial_sum = 0.0
+        self._partial_count = 0
+        self._subblock_energies: list[ndarray] = []
+        self._true_peak_factor = 4 if sr < 96000 else 2
+        self._true_peak_tail = np.zeros(LoudnessMeter._TRUE_PEAK_CONTEXT * 2, dtype=np.float64)
+        self._peak = 0.0
+        self._num_samples = 0
+
+    @property
+    def duration(self) -> float:
+        return self._num_samples / self.sr
+
+    def add(self, data: ndarray) -> None:
+        """
+        Adds a chunk of (mono, float) audio to the measurement
+        """
+        if data.size == 0:
+            return
+        data = np.asarray(data, dtype=np.float64).reshape(-1)
+        self._num_samples += data.size
+
+        # K-weighted mean square energy per 100ms subblock
+        weighted, self._zi = signal.sosfilt(self._sos, data, zi=self._zi)
+        squared = weighted * weighted
+        position = 0
+        if self._partial_count > 0:
+            needed = self._subblock_length - self._partial_count
+            head = squared[:needed]
+            self._partial_sum += float(head.sum())
+            self._partial_count += head.size
+            position = head.size
+            if self._partial_count == self._subblock_length:
+                self._subblock_energies.append(np.array([self._partial_sum / self._subblock_length]))
+                self._partial_sum = 0.0
+                self._partial_count = 0
+        num_whole = (squared.size - position) // self._subblock_length
+        if num_whole > 0:
+            end = position + num_whole * self._subblock_length
+            energies = squared[position:end].reshape(num_whole, self._subblock_length).mean(axis=1)
+            self._subblock_energies.append(energies)
+            position = end
+        if position < squared.size:
+            rest = squared[position:]
+            self._partial_sum += float(rest.sum())
+            self._partial_count += rest.size
+
+        self._add_to_true_peak(data)
+
+    def get_stats(self) -> LoudnessStats:
+        """
+        Returns measurements for everything added so far
+        """
+        energies = self._get_subblock_energies()
+
+        i, thresh = LoudnessMeter._calc_gated_loudness(
+            LoudnessMeter._moving_mean(energies, LoudnessMeter._SUBBLOCKS_PER_MOMENTARY_BLOCK, 1),
+            LoudnessMeter.INTEGRATED_RELATIVE_GATE_LU
+        )
+
+        short_term = LoudnessMeter._moving_mean(
+            energies, LoudnessMeter._SUBBLOCKS_PER_SHORT_TERM_BLOCK, LoudnessMeter._SUBBLOCKS_PER_SHORT_TERM_HOP
+        )
+        lra = LoudnessMeter._calc_loudness_range(short_term)
+
+        peak = max(self._peak, self._get_final_true_peak())
+        tp = 20 * math.log10(peak) if peak > 0 else LoudnessMeter.FLOOR
+        return LoudnessStats(i=i, lra=lra, tp=max(tp, LoudnessMeter.FLOOR), thresh=thresh)
+
+    # ---
+
+    def _get_subblock_energies(self) -> ndarray:
+        if not self._subblock_energies:
+            return np.zeros(0)
+        if len(self._subblock_energies) > 1:
+            self._subblock_energies = [np.concatenate(self._subblock_energies)]
+        return self._subblock_energies[0]
+
+    def _add_to_true_peak(self, data: ndarray) -> None:
+        # Each chunk is oversampled together with some context from the previous
+        # chunk, and only the part that is far enough away from both edges to be
+        # unaffected by the resampling filter's zero-padding gets measured.
+        # The remainder is measured with the next chunk.
+        context = LoudnessMeter._TRUE_PEAK_CONTEXT
+        buffer = np.concatenate([self._true_peak_tail, data])
+        self._peak = max(self._peak, self._measure_true_peak(buffer, context, buffer.size - context))
+        self._true_peak_tail = buffer[-context * 2:]
+
+    def _get_final_true_peak(self) -> float:
+        context = LoudnessMeter._TRUE_PEAK_CONTEXT
+        buffer = np.concatenate([self._true_peak_tail, np.zeros(context)])
+        return self._measure_true_peak(buffer, context, buffer.size - context)
+
+    def _measure_true_peak(self, buffer: ndarray, start: int, end: int) -> float:
+        if end <= start:
+            return 0.0
+        factor = self._true_peak_factor
+        oversampled = signal.resample_poly(buffer, factor, 1)
+        return float(np.max(np.abs(oversampled[start * factor:end * factor])))
+
+    @staticmethod
+    def _moving_mean(values: ndarray, length: int, hop: int) -> ndarray:
+        """ Mean of each `length`-long window of `values`, at `hop` intervals (complete windows only) """
+        if values.size < length:
+            return np.zeros(0)
+        sums = np.concatenate([[0.0], np.cumsum(values)])
+        starts = np.arange(0, values.size - length + 1, hop)
+        return (sums[starts + length] - sums[starts]) / length
+
+    @staticmethod
+    def _calc_gated_loudness(block_energies: ndarray, relative_gate_lu: float) -> tuple[float, float]:
+        """ Returns gated loudness and the relative gating threshold """
+        gated = block_energies[block_energies > energy_from_loudness(LoudnessMeter.ABSOLUTE_GATE_LUFS)]
+        if gated.size == 0:
+            return LoudnessMeter.FLOOR, LoudnessMeter.ABSOLUTE_GATE_LUFS
+        relative_threshold = float(gated.mean()) * 10 ** (relative_gate_lu / 10)
+        gated = gated[gated >= relative_threshold]
+        return loudness_from_energy(float(gated.mean())), loudness_from_energy(relative_threshold)
+
+    @staticmethod
+    def _calc_loudness_range(short_term_energies: ndarray) -> float:
+        gated = short_term_energies[short_term_energies > energy_from_loudness(LoudnessMeter.ABSOLUTE_GATE_LUFS)]
+        if gated.size == 0:
+            return 0.0
+        relative_threshold = float(gated.mean()) * 10 ** (LoudnessMeter.LRA_RELATIVE_GATE_LU / 10)
+        gated = np.sort(gated[gated >= relative_threshold])
+        low = gated[int((gated.size - 1) * 0.10 + 0.5)]
+        high = gated[int((gated.size - 1) * 0.95 + 0.5)]
+        return loudness_from_energy(float(high)) - loudness_from_energy(float(low))
+
+    @staticmethod
+    def make_k_weighting_sos(sr: int) -> ndarray:
+        """
+        BS.1770 K-weighting filter (high shelf "head" filter + RLB high pass)
+        as second-order sections, for any sample rate
+        """
+        # Stage 1 - high shelf
+        f0 = 1681.974450955533
+        gain_db = 3.999843853973347
+        q = 0.7071752369554196
+        k = math.tan(math.pi * f0 / sr)
+        vh = 10 ** (gain_db / 20)
+        vb = vh ** 0.4996667741545416
+        a0 = 1 + k / q + k * k
+        shelf_b = [(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0]
+        shelf_a = [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+        # Stage 2 - high pass
+        f0 = 38.13547087602444
+        q = 0.5003270373238773
+        k = math.tan(math.pi * f0 / sr)
+        a0 = 1 + k / q + k * k
+        high_pass_b = [1.0, -2.0, 1.0]
+        high_pass_a = [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+        return np.array([shelf_b + shelf_a, high_pass_b + high_pass_a])
+
+# ---
+
+def loudness_from_energy(energy: float) -> float:
+    if energy <= 0:
+        return LoudnessMeter.FLOOR
+    return max(-0.691 + 10 * math.log10(energy), LoudnessMeter.FLOOR)
+
+def energy_from_loudness(loudness: float) -> float:
+    return 10 ** ((loudness + 0.691) / 10)
@@ -168,28 +168,8 @@ class LoudnessNormalizationUtil:
             if key not in loudness_stats:
                 return f"Error: Missing key '{key}' in loudness_stats dictionary."
 
-        # Extract measured values from the stats dictionary
-        # FFmpeg expects these as strings in the filter, which they already are from JSON
-        measured_i = loudness_stats["input_i"]
-        measured_lra = loudness_stats["input_lra"]
-        measured_tp = loudness_stats["input_tp"]
-        measured_thresh = loudness_stats["input_thresh"]
-        offset = loudness_stats["target_offset"] # This is the 'target_offset' from JSON
-
-        # Construct the -af loudnorm filter string
-        # Note: FFmpeg filter options are typically strings, so the values
-        # from loudness_stats (which are strings from JSON) are fine.
-        # The target values are floats, but f-string formatting will convert them.
-        filter_string = (
-            f"loudnorm="
-            f"I={target_i}:"
-            f"LRA={target_lra}:"
-            f"TP={target_tp}:"
-            f"measured_I={measured_i}:"
-            f"measured_LRA={measured_lra}:"
-            f"measured_TP={measured_tp}:"
-            f"measured_thresh={measured_thresh}:"
-            f"offset={offset}"
+        filter_string = LoudnessNormalizationUtil.make_pass_2_filter_string(
+            loudness_stats, target_i, target_lra, target_tp
         )
 
         partial_command = [
@@ -226,3 +206,38 @@ class LoudnessNormalizationUtil:
                     return err
 
         return "" # success
+
+    @staticmethod
+    def make_pass_2_filter_string(
+        loudness_stats: dict,
+        target_i: float,
+        target_lra: float,
+        target_tp: float
+    ) -> str:
+        """
+        Returns the ffmpeg loudnorm filter string for the second pass,
+        using the measurements from the first pass (see `get_loudness_json()`, `LoudnessStats`)
+        """
+        # Extract measured values from the stats dictionary
+        # FFmpeg expects these as strings in the filter, which they already are from JSON
+        measured_i = loudness_stats["input_i"]
+        measured_lra = loudness_stats["input_lra"]
+        measured_tp = loudness_stats["input_tp"]
+        measured_thresh = loudness_stats["input_thresh"]
+        offset = loudness_stats["target_offset"] # This is the 'target_offset' from JSON
+
+        # Construct the -af loudnorm filter string
+        # Note: FFmpeg filter options are typically strings, so the values
+        # from loudness_stats (which are strings from JSON) are fine.
+        # The target values are floats, but f-string formatting will convert them.
+        return (
+            f"loudnorm="
+            f"I={target_i}:"
+            f"LRA={target_lra}:"
+            f"TP={target_tp}:"
+            f"measured_I={measured_i}:"
+            f"measured_LRA={measured_lra}:"
+            f"measured_TP={measured_tp}:"
+            f"measured_thresh={measured_thresh}:"
+            f"offset={offset}"
+        )
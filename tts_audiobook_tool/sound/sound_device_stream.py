@@ -3,6 +3,7 @@ from contextlib import contextmanager
 import numpy as np
 import sounddevice as sd
 import threading
+import time
 from numpy import ndarray
 from typing import Callable, Iterator, Optional
 from tts_audiobook_tool.util import *
@@ -70,6 +71,11 @@ class SoundDeviceStream:
         self.lock = threading.Lock()
         self._stop_requested = threading.Event()
 
+        # Notified by the callback once the buffer has drained to the level a producer is
+        # waiting for (see wait_until_buffer_duration())
+        self._drained_condition = threading.Condition(self.lock)
+        self._drain_target_samples = -1
+
         # The sounddevice stream object. It's None until start() is called.
         self.stream: Optional[sd.OutputStream] = None
 
@@ -131,6 +137,10 @@ class SoundDeviceStream:
                     self.first_audio_output_callback = None
                     self.first_audio_output_sample_index = None
 
+            if 0 <= self._drain_target_samples and len(self.buffer) <= self._drain_target_samples:
+                self._drain_target_samples = -1
+                self._drained_condition.notify_all()
+
         if first_audio_output_callback is not None:
             try:
                 first_audio_output_callback()
@@ -231,6 +241,8 @@ class SoundDeviceStream:
             self.last_audio_dac_end = 0.0
             self.first_audio_output_callback = None
             self.first_audio_output_sample_index = None
+            self._drain_target_samples = -1
+            self._drained_condition.notify_all()
 
     def set_first_audio_output_callback(self, sample_index: int, callback: Callable[[], None] | None) -> None:
         with self.lock:
@@ -267,6 +279,24 @@ class SoundDeviceStream:
             # Duration = number of samples / sample rate
             return len(self.buffer) / self.sample_rate
 
+    def wait_until_buffer_duration(self, max_seconds: float, timeout: float | None = None) -> bool:
+        """
+        Blocks until the buffer holds no more than `max_seconds` of audio
+        (ie, returns as soon as playback has drained it that far).
+        Returns False on timeout.
+        """
+        max_samples = int(max_seconds * self.sample_rate)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._drained_condition:
+            while len(self.buffer) > max_samples:
+                # With several waiters, wake on the highest of their levels; the others then wait again
+                self._drain_target_samples = max(self._drain_target_samples, max_samples)
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._drained_condition.wait(remaining)
+            return True
+
     @property
     def play_position_samples(self) -> int:
         """
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import threading
 from typing import TYPE_CHECKING
 
 from tts_audiobook_tool.app_types import HighShelfEq, Sound
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.constants_config import *
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.sound.concat_render_cache import ConcatRenderCache
 from tts_audiobook_tool.sound.sound_extra_util import SoundExtraUtil
 from tts_audiobook_tool.sound.sound_file_util import SoundFileUtil
 from tts_audiobook_tool.sound.sound_util import SoundUtil
@@ -18,6 +21,11 @@ if TYPE_CHECKING:
 
 
 class SoundPipeline:
+
+    # Serializes LavaSR upsampling (one model instance/worker process,
+    # shared by concurrent exports; see ConcatUtil.make_files)
+    lava_sr_lock = threading.Lock()
+
     @staticmethod
     def apply_generate_post_processing(sound: Sound) -> Sound:
         """
@@ -56,22 +64,54 @@ class SoundPipeline:
         project: Project,
         prompts: list[str],
         force_random_seed: bool = False,
+        voice_selection_index: int | None = None,
     ) -> list[Sound] | str:
         """
         Non-streaming TTS generation paired with app-standard generated-sound
         post-processing.
 
         Returns processed sounds, including zero-length sounds for fully silent
-        outputs. Callers decide how to report silence.
+        outputs, or the first error. Callers decide how to report silence.
+        """
+        result = SoundPipeline.generate_processed_items_using_project(
+            project, prompts, force_random_seed, voice_selection_index
+        )
+        if isinstance(result, str):
+            return result
+        sounds: list[Sound] = []
+        for item in result:
+            if isinstance(item, str):
+                return item
+            sounds.append(item)
+        return sounds
+
+    @staticmethod
+    def generate_processed_items_using_project(
+        project: Project,
+        prompts: list[str],
+        force_random_seed: bool = False,
+        voice_selection_index: int | None = None,
+    ) -> list[Sound | str] | str:
+        """
+        Like `generate_processed_using_project()`, but returns a result per prompt
+        (processed sound or error string), so that one failed item doesn't fail the rest.
+        Returns an error string if the generation call as a whole failed.
         """
         from tts_audiobook_tool.tts import Tts
 
-        result = Tts.generate_using_project(project, prompts, force_random_seed)
+        result = Tts.generate_using_project(
+            project, prompts, force_random_seed, voice_selection_index=voice_selection_index
+        )
         if isinstance(result, str):
             return result
 
-        sounds = [result] if isinstance(result, Sound) else result
-        return [SoundPipeline.apply_generate_post_processing(sound) for sound in sounds]
+        items = [result] if isinstance(result, Sound) else result
+        if len(items) != len(prompts):
+            return f"Expected {len(prompts)} generated sounds, got {len(items)}"
+        return [
+            item if isinstance(item, str) else SoundPipeline.apply_generate_post_processing(item)
+            for item in items
+        ]
 
     @staticmethod
     def make_concat_rendered_sound_segment(
@@ -83,6 +123,7 @@ class SoundPipeline:
         is_first_in_section: bool = False,
         use_upsampler: bool = False,
         add_pause: bool = True,
+        render_cache_dir: str = "",
     ) -> Sound | str:
         """
         Loads a saved segment file and applies concat/export rendering steps:
@@ -97,23 +138,30 @@ class SoundPipeline:
         `append_pause_or_section_effect`). This is used by the concat flow so
         that the pause duration can be adjusted based on pseudo-silence measured
         across adjacent segments.
-        """
 
-        result = SoundFileUtil.load(path)
-        if isinstance(result, str):
-            return result
+        When `render_cache_dir` is set, the rendered sound (before the pause)
+        is reused from/saved to the project's render cache (see ConcatRenderCache).
+        """
 
-        sound = result
+        cache_entry_path = ""
+        sound = None
+        if render_cache_dir:
+            cache_entry_path, err = ConcatRenderCache.get_entry_path(
+                render_cache_dir, path, use_upsampler, high_shelf
+            )
+            if err:
+                return err
+            sound = ConcatRenderCache.load(cache_entry_path)
 
-        if use_upsampler:
-            result = SoundPipeline.apply_lava_sr_upsampling(sound)
+        if sound is None:
+            result = SoundPipeline.render_sound_segment(path, high_shelf, use_upsampler)
             if isinstance(result, str):
                 return result
             sound = result
-
-        sound = SoundPipeline.resample_for_app(sound)
-
-        sound = SoundPipeline.apply_high_shelf(sound, high_shelf)
+            if cache_entry_path:
+                err = ConcatRenderCache.save(sound, cache_entry_path)
+                if err:
+                    L.w(f"Couldn't save render cache entry {cache_entry_path}: {err}")
 
         if add_pause:
             sound = SoundPipeline.append_pause_or_section_effect(
@@ -125,6 +173,28 @@ class SoundPipeline:
             )
         return sound
 
+    @staticmethod
+    def render_sound_segment(path: str, high_shelf: HighShelfEq, use_upsampler: bool) -> Sound | str:
+        """
+        Loads a saved segment file and applies upsampler (optional), resampling to 48k,
+        and high shelf filter (optional)
+        """
+        result = SoundFileUtil.load(path)
+        if isinstance(result, str):
+            return result
+
+        sound = result
+
+        if use_upsampler:
+            result = SoundPipeline.apply_lava_sr_upsampling(sound)
+            if isinstance(result, str):
+                return result
+            sound = result
+
+        sound = SoundPipeline.resample_for_app(sound)
+
+        return SoundPipeline.apply_high_shelf(sound, high_shelf)
+
     @staticmethod
     def prepare_generated_sound_for_playback(
         sound: Sound,
@@ -218,10 +288,11 @@ class SoundPipeline:
     def apply_lava_sr_upsampling(sound: Sound) -> Sound | str:
         from tts_audiobook_tool.model_manager import ModelManager
 
-        upsampler = ModelManager.get_lava_sr_upsampler()
-        if upsampler is None:
-            return "LavaSR v2 upsampler is not installed"
-        result = upsampler.process(sound, denoise=False)
+        with SoundPipeline.lava_sr_lock:
+            upsampler = ModelManager.get_lava_sr_upsampler()
+            if upsampler is None:
+                return "LavaSR v2 upsampler is not installed"
+            result = upsampler.process(sound, denoise=False)
         if isinstance(result, str):
             return result
         return result
@@ -1,5 +1,7 @@
 import base64
+from collections import OrderedDict
 import mimetypes
+import threading
 import librosa
 import numpy as np
 from numpy import ndarray
@@ -14,6 +16,14 @@ class SoundUtil:
     "Core" sound utility functions
     """
 
+    # Key is (absolute path, mtime, size)
+    _data_uri_cache: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+    _data_uri_cache_lock = threading.Lock()
+
+    # Key is (absolute path, mtime, sample rate)
+    _effect_sound_cache: OrderedDict[tuple[str, int, int], Sound] = OrderedDict()
+    _effect_sound_cache_lock = threading.Lock()
+
     @staticmethod
     def resample_if_necessary(sound: Sound, target_sr: int) -> Sound:
         """
@@ -124,19 +134,71 @@ class SoundUtil:
         On error, prints feedback and simply returns the base_sound.
         """
 
-        load_result = SoundFileUtil.load(appended_sound_path)
+        load_result = SoundUtil.load_effect_sound(appended_sound_path, base_sound.sr)
         if isinstance(load_result, str):
             printt(f"Couldn't load sound {appended_sound_path} {load_result}")
             return base_sound
 
         appended_sound = load_result
-        appended_sound = SoundUtil.resample_if_necessary(appended_sound, base_sound.sr)
 
         new_data = numpy.concatenate((base_sound.data, appended_sound.data))
         return Sound(new_data, base_sound.sr)
 
+    @staticmethod
+    def load_effect_sound(path: str, target_sr: int) -> Sound | str:
+        """
+        Loads a short, frequently used sound file (eg, page-turn effect), resampled to `target_sr`.
+
+        Results are kept in memory, keyed by the file's path, mtime and the sample rate,
+        so that only the first use pays for decoding and resampling.
+        The returned sound's data is shared, and so is read-only.
+
+        Returns error string on fail.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            return make_error_string(e)
+        key = (os.path.abspath(path), stat.st_mtime_ns, target_sr)
+        with SoundUtil._effect_sound_cache_lock:
+            sound = SoundUtil._effect_sound_cache.get(key)
+            if sound is not None:
+                SoundUtil._effect_sound_cache.move_to_end(key)
+                return sound
+
+        result = SoundFileUtil.load(path, target_sr)
+        if isinstance(result, str):
+            return result
+        sound = Sound(np.ascontiguousarray(result.data, dtype=np.float32), result.sr)
+        sound.data.flags.writeable = False
+
+        with SoundUtil._effect_sound_cache_lock:
+            cache = SoundUtil._effect_sound_cache
+            # Drop entries for previous versions of the same file
+            for stale_key in [item for item in cache if item[0] == key[0] and item[1] != key[1]]:
+                del cache[stale_key]
+            cache[key] = sound
+            while len(cache) > EFFECT_SOUND_CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
+
+        return sound
+
     @staticmethod
     def make_audio_data_uri(sound_file_path: str) -> str:
+        """
+        Returns the sound file's contents as a base64 data URI.
+
+        Server-backed TTS models send the voice clone reference file with every request,
+        so results are kept in memory, keyed by the file's path, mtime and size.
+        """
+        stat = os.stat(sound_file_path)
+        key = (os.path.abspath(sound_file_path), stat.st_mtime_ns, stat.st_size)
+        with SoundUtil._data_uri_cache_lock:
+            data_uri = SoundUtil._data_uri_cache.get(key)
+            if data_uri is not None:
+                SoundUtil._data_uri_cache.move_to_end(key)
+                return data_uri
+
         mime_type, _ = mimetypes.guess_type(sound_file_path)
         if not mime_type:
             mime_type = "audio/wav"
@@ -144,6 +206,23 @@ class SoundUtil:
         with open(sound_file_path, "rb") as sound_file:
             encoded_audio = base64.b64encode(sound_file.read()).decode("ascii")
 
-        return f"data:{mime_type};base64,{encoded_audio}"
+        data_uri = f"data:{mime_type};base64,{encoded_audio}"
+
+        with SoundUtil._data_uri_cache_lock:
+            cache = SoundUtil._data_uri_cache
+            # Drop entries for previous versions of the same file
+            for stale_key in [item for item in cache if item[0] == key[0]]:
+                del cache[stale_key]
+            cache[key] = data_uri
+            while len(cache) > DATA_URI_CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
+
+        return data_uri
+
+# ---
 
+# Max number of sound files kept in memory by `SoundUtil.make_audio_data_uri()`
+DATA_URI_CACHE_MAX_ENTRIES = 8
 
+# Max number of sounds kept in memory by `SoundUtil.load_effect_sound()`
+EFFECT_SOUND_CACHE_MAX_ENTRIES = 8
@@ -37,12 +37,22 @@ class Start:
         _parser.add_argument("--host", type=str, default="127.0.0.1")
         _parser.add_argument("--port", type=int, default=5001)
         _parser.add_argument("--project", type=str, default="")
+        _parser.add_argument("--headless", action="store_true")
+        _parser.add_argument("--workers", type=int, default=1)
+        _parser.add_argument("--audio-cache-mb", type=int, default=0)
+        _parser.add_argument("--audio-cache-disk", action="store_true")
+        _parser.add_argument("--sgl-omni-connections", type=int, default=SGL_OMNI_MAX_CONNECTIONS_DEFAULT)
         _args = _parser.parse_args()
 
         self.is_server: bool = _args.server
         self.server_host: str = _args.host
         self.server_port: int = _args.port
         self.project_path: str = _args.project
+        self.is_headless: bool = _args.headless
+        self.server_workers: int = _args.workers
+        self.server_audio_cache_mb: int = _args.audio_cache_mb
+        self.server_audio_cache_disk: bool = _args.audio_cache_disk
+        self.sgl_omni_connections: int = _args.sgl_omni_connections
 
     def apply_project_override(self) -> None:
         """
@@ -274,11 +284,21 @@ class Start:
             printt(f"{Ansi.CLEAR_SCREEN_AND_SCROLLBACK}### DEV ###")
 
     def start_app_or_server(self) -> None:
+        from tts_audiobook_tool.app_support.sgl_omni_util import SglOmniUtil
+        SglOmniUtil.set_max_connections(self.sgl_omni_connections)
+
         # Start
         printt()
         if self.is_server:
             from tts_audiobook_tool.server.server import Server
-            Server(project_dir=self.project_path).run(host=self.server_host, port=self.server_port)
+            from tts_audiobook_tool.app_support import app_paths
+            Server(
+                project_dir=self.project_path,
+                headless=self.is_headless,
+                num_workers=self.server_workers,
+                audio_cache_mb=self.server_audio_cache_mb,
+                audio_cache_dir=app_paths.get_server_audio_cache_dir() if self.server_audio_cache_disk else "",
+            ).run(host=self.server_host, port=self.server_port)
         else:
             from tts_audiobook_tool.app import App
             _ = App()
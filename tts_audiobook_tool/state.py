@@ -9,6 +9,7 @@ from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.project_support.project_load_util import ProjectLoadUtil
 from tts_audiobook_tool.stt import Stt
 from tts_audiobook_tool.tts_models.tts_model_type import TtsModelType
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.text_ops.whitelist import Whitelist
@@ -23,15 +24,21 @@ class State:
     _project: Project
 
 
-    def __init__(self):
+    def __init__(self, prefs: Prefs | None = None, project: Project | None = None):
+        """
+        Loads the user's prefs and last-opened project, unless they are passed in
+        (eg, for running headless)
+        """
 
-        self.prefs = Prefs.load()
+        self.prefs = prefs if prefs is not None else Prefs.load()
 
         self.real_time = RealTimeMenuState()
 
         self._project = None # type: ignore
 
-        if not self.prefs.project_dir:
+        if project is not None:
+            self.project = project
+        elif not self.prefs.project_dir:
             self.project = Project(dir_path="")
         else:
             result = ProjectLoadUtil.load_using_dir_path(self.prefs.project_dir)
@@ -73,6 +80,9 @@ class State:
         Stt.set_variant(self.prefs.stt_variant)
         Stt.set_config(self.prefs.stt_config)
         Tts.set_force_cpu(self.prefs.tts_force_cpu)
+        VoiceCloneDiskCache.set_enabled(self.prefs.voice_clone_disk_cache)
+        if self.prefs.voice_clone_disk_cache:
+            VoiceCloneDiskCache.prune()
         SglOmniUtil.set_base_url(self.prefs.sgl_omni_url)
         Tts.set_sgl_omni_type(self.prefs.sgl_omni_type)
 
@@ -30,6 +30,8 @@ class MlxWhisperAdapter:
     Small adapter that exposes a faster-whisper-like surface over mlx-whisper.
     """
 
+    supports_clip_batching = False
+
     MODEL_MAP = {
         SttVariant.LARGE_V3.id: "mlx-community/whisper-large-v3-mlx",
         SttVariant.LARGE_V3_TURBO.id: "mlx-community/whisper-large-v3-turbo",
@@ -88,6 +90,8 @@ class FasterWhisperAdapter:
     faster-whisper's WhisperModel.
     """
 
+    supports_clip_batching = True
+
     def __init__(self, model: str, device: str, compute_type: str, cpu_threads: int):
         from faster_whisper import WhisperModel
 
@@ -97,6 +101,7 @@ class FasterWhisperAdapter:
             compute_type=compute_type,
             cpu_threads=cpu_threads,
         )
+        self._batched_pipeline: Any = None
 
     @property
     def supported_languages(self) -> Sequence[str]:
@@ -117,6 +122,31 @@ class FasterWhisperAdapter:
             **kwargs,
         )
 
+    def transcribe_clips(
+        self,
+        audio: Any,
+        clip_timestamps: list[dict[str, float]],
+        *,
+        word_timestamps: bool = False,
+        language: str | None = None,
+    ) -> Any:
+        """
+        Transcribes each clip of `audio` (start/end times in seconds, each
+        clip at most 30s) as one item of a single batched inference pass,
+        using faster-whisper's BatchedInferencePipeline.
+        Returned segment and word timestamps are relative to `audio`.
+        """
+        if self._batched_pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched_pipeline = BatchedInferencePipeline(model=self._model)
+        return self._batched_pipeline.transcribe(
+            audio,
+            word_timestamps=word_timestamps,
+            language=language,
+            clip_timestamps=clip_timestamps,
+            batch_size=len(clip_timestamps),
+        )
+
 
 class Stt:
     """
@@ -124,6 +154,7 @@ class Stt:
     """
 
     _whisper: WhisperBackend | None = None
+    _installed_backend: WhisperBackend | None = None
     _variant = SttVariant.get_default()
     _config = SttConfig.CUDA_FLOAT16
 
@@ -171,6 +202,9 @@ class Stt:
         if Stt._variant == SttVariant.DISABLED:
             raise ValueError(f"Bad variant: {Stt._variant}")
 
+        if Stt._installed_backend is not None:
+            return Stt._installed_backend
+
         if Stt._whisper is None:
 
             model = Stt._variant.id
@@ -209,6 +243,25 @@ class Stt:
         assert Stt._whisper is not None
         return cast(WhisperBackend, Stt._whisper)
 
+    @staticmethod
+    def _install_backend(backend: WhisperBackend | None) -> None:
+        """
+        Internal, for benchmarks and tests.
+
+        Makes `backend` the whisper backend in place of the lazily-initialized one,
+        regardless of STT variant and config (eg, a stand-in).
+        The installed backend is not cleared by `clear_stt_model()`. Pass None to uninstall.
+        """
+        Stt._installed_backend = backend
+
+    @staticmethod
+    def supports_clip_batching() -> bool:
+        """
+        Can the whisper backend transcribe multiple clips in one batched call
+        (see FasterWhisperAdapter.transcribe_clips)
+        """
+        return bool(getattr(Stt.get_whisper(), "supports_clip_batching", False))
+
     @staticmethod
     def eager_warm_up_for_inference() -> None:
         """
@@ -249,7 +302,7 @@ class Stt:
 
     @staticmethod
     def has_instance() -> bool:
-        return Stt._whisper is not None
+        return Stt._whisper is not None or Stt._installed_backend is not None
 
     @staticmethod
     def clear_stt_model() -> None:
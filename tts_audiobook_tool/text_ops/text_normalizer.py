@@ -77,15 +77,19 @@ class TextNormalizer:
 
     @staticmethod
     def sounds_the_same_en(source_word: str, transcript_word: str) -> bool:
+        return TextNormalizer.get_phonetic_code_en(transcript_word) == TextNormalizer.get_phonetic_code_en(source_word)
+
+    @staticmethod
+    def get_phonetic_code_en(word: str) -> str:
+        """
+        Two words "sound the same" when their phonetic codes are equal (see `sounds_the_same_en()`)
+        """
         from metaphone import doublemetaphone # is en only 
 
         # doublemetaphone returns a tuple: (Primary Code, Secondary Code)
         # Example: doublemetaphone("Schmidt") -> ('XMT', 'SMT')
-        source_codes = doublemetaphone(source_word)
-        transcript_codes = doublemetaphone(transcript_word)
-
-        # Only checking the primary codes; considering secondary code is too permissive for our use case
-        return transcript_codes[0] == source_codes[0]
+        # Only using the primary code; considering secondary code is too permissive for our use case
+        return doublemetaphone(word)[0]
 
 # ---
 
@@ -1,9 +1,10 @@
-from typing import Iterable, TYPE_CHECKING # type: ignore
+from bisect import bisect_right
+from typing import Any, Iterable, TYPE_CHECKING # type: ignore
 
 import librosa
 import numpy as np
 
-from tts_audiobook_tool.app_types import Segment, Sound, SttConfig, SttVariant, Word
+from tts_audiobook_tool.app_types import ConcreteWord, Segment, Sound, SttConfig, SttVariant, Word
 from tts_audiobook_tool.constants import WHISPER_SAMPLERATE
 from tts_audiobook_tool.sound.sound_util import SoundUtil
 from tts_audiobook_tool.stt import Stt
@@ -60,6 +61,115 @@ class Transcriber:
         words = Transcriber.get_words_from_segments(segments)
         return words
 
+    @staticmethod
+    def transcribe_batch(
+            sounds: list[Sound],
+            language_code: str,
+            stt_variant: SttVariant = SttVariant.LARGE_V3,
+            stt_config: SttConfig = SttConfig.CUDA_FLOAT16,
+    ) -> list[list[Word] | str]:
+        """
+        Batched version of `transcribe_to_words()`.
+        Returns a parallel list of Words lists or error strings.
+
+        The sounds are packed end-to-end into a single buffer which gets
+        transcribed in one batched inference call, with one clip per sound.
+        Falls back to per-item transcription for single items, sounds which
+        are too long to fit a whisper window, or when the backend doesn't
+        support batching (see `get_batched_flags()`).
+
+        Note, batched decoding differs from `transcribe_to_words()`: it only uses
+        the first sampling temperature (there is no temperature fallback), and
+        decodes without timestamp tokens. So the transcript of a given sound can
+        depend on whether it was batched. Callers for which that matters should
+        re-transcribe items individually as needed (see `GenerateUtil.validate_batch()`).
+        """
+        if len(sounds) <= 1:
+            return [
+                Transcriber.transcribe_to_words(sound, language_code, stt_variant, stt_config)
+                for sound in sounds
+            ]
+
+        Stt.set_variant(stt_variant)
+        Stt.set_config(stt_config)
+
+        results: list[list[Word] | str] = [""] * len(sounds)
+
+        # Split into batchable and non-batchable items
+        batch_indices: list[int] = []
+        batch_datas: list[np.ndarray] = []
+        for i, (sound, is_batched) in enumerate(zip(sounds, Transcriber.get_batched_flags(sounds))):
+            if is_batched:
+                batch_indices.append(i)
+                batch_datas.append(Transcriber.prepare_sound_for_whisper(sound).data.astype(np.float32))
+            else:
+                results[i] = Transcriber.transcribe_to_words(sound, language_code, stt_variant, stt_config)
+
+        if not batch_indices:
+            return results
+
+        # Pack
+        offsets: list[float] = []
+        clip_timestamps: list[dict[str, float]] = []
+        position = 0
+        for data in batch_datas:
+            start = position / WHISPER_SAMPLERATE
+            end = (position + len(data)) / WHISPER_SAMPLERATE
+            offsets.append(start)
+            clip_timestamps.append({ "start": start, "end": end })
+            position += len(data)
+        packed = np.concatenate(batch_datas)
+
+        whisper: Any = Stt.get_whisper()
+        if language_code and language_code not in whisper.supported_languages:
+            # Silently remove language code rather than triggering an exception
+            language_code = ""
+
+        try:
+            with Stt.inference_lock:
+                segments, _ = whisper.transcribe_clips(
+                    packed, clip_timestamps, word_timestamps=True, language=language_code or None
+                )
+                segments = list(segments)
+        except Exception as e:
+            error_string = make_error_string(e)
+            for i in batch_indices:
+                results[i] = error_string
+            return results
+
+        # Unpack segments' words into their respective items,
+        # making timestamps relative to the item's sound
+        words_lists: list[list[Word]] = [[] for _ in batch_indices]
+        for segment in segments:
+            if not segment.words:
+                continue
+            item_index = max(bisect_right(offsets, segment.start + 0.001) - 1, 0)
+            offset = offsets[item_index]
+            for word in segment.words:
+                words_lists[item_index].append(
+                    ConcreteWord(
+                        start=max(word.start - offset, 0.0),
+                        end=max(word.end - offset, 0.0),
+                        word=word.word,
+                        probability=word.probability
+                    )
+                )
+        for item_index, i in enumerate(batch_indices):
+            results[i] = words_lists[item_index]
+
+        return results
+
+    @staticmethod
+    def get_batched_flags(sounds: list[Sound]) -> list[bool]:
+        """
+        Returns which of `sounds` `transcribe_batch()` transcribes using batched decoding
+        (as opposed to falling back to `transcribe_to_words()`).
+        Expects the STT variant and config to be set already.
+        """
+        if len(sounds) <= 1 or not Stt.supports_clip_batching():
+            return [False] * len(sounds)
+        return [sound.duration <= WHISPER_MAX_CLIP_DURATION for sound in sounds]
+
     # ---
 
     @staticmethod
@@ -129,4 +239,10 @@ class Transcriber:
         data = np.clip(data, -1.0, 1.0)
         data = librosa.resample(data, orig_sr=sound.sr, target_sr=WHISPER_SAMPLERATE)
         return Sound(data, WHISPER_SAMPLERATE)
-    
+
+# ---
+
+# Max duration of a sound that can be transcribed as a single clip in a batch
+# (whisper's input window length)
+WHISPER_MAX_CLIP_DURATION = 30.0
+
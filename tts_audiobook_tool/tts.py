@@ -72,6 +72,10 @@ class Tts:
     _vibevoice: VibeVoiceBaseModel | None = None
     _zonos2_server: Zonos2ServerBaseModel | None = None
 
+    # See _install_model()
+    _installed_model: TtsBaseModel | None = None
+    _type_before_install: TtsModelType | None = None
+
     _sgl_omni_type: TtsModelType | None = None
 
     # Process-level backend mode (LOCAL or SGL_OMNI), probed once at
@@ -321,6 +325,8 @@ class Tts:
         """
         Gets the current tts model's class, used for accessing static methods.
         """
+        if Tts._installed_model is not None:
+            return type(Tts._installed_model)
         entry = Tts._model_registry_entry(Tts._type)
         if entry is None or entry[0] is None:
             raise Exception(f"Not implemented: {Tts._type}")
@@ -332,6 +338,8 @@ class Tts:
 
     @staticmethod
     def instance_exists() -> bool:
+        if Tts._installed_model is not None:
+            return True
         items = [
             Tts._chatterbox,
             Tts._fish_s1,
@@ -360,6 +368,8 @@ class Tts:
     @staticmethod
     def get_instance() -> TtsBaseModel:
         # Returns existing or newly instantiated instance
+        if Tts._installed_model is not None:
+            return Tts._installed_model
         entry = Tts._model_registry_entry(Tts._type)
         if entry is None or entry[1] is None:
             raise Exception(f"Lookup failed for {Tts._type}")
@@ -437,6 +447,8 @@ class Tts:
     @staticmethod
     def get_instance_if_exists() -> TtsBaseModel | None:
         # Returns instance only if it already exists, else none
+        if Tts._installed_model is not None:
+            return Tts._installed_model
         entry = Tts._model_registry_entry(Tts._type)
         if entry is None or not entry[2]:
             return None
@@ -663,7 +675,7 @@ class Tts:
     @staticmethod
     def clear_tts_model() -> None:
         model = Tts.get_instance_if_exists()
-        if model:
+        if model and model is not Tts._installed_model:
             model.clear_voice_clone_cache()
             model.kill()
             # Null out all instance attributes, not just the current
@@ -672,6 +684,32 @@ class Tts:
                 setattr(Tts, entry[2], None)
         app_memory.gc_ram_vram()
 
+    @staticmethod
+    def _install_model(model: TtsBaseModel | None) -> None:
+        """
+        Internal, for benchmarks and tests.
+
+        Makes `model` the active TTS model instance in place of the model registry's
+        (eg, a stand-in model), and sets the model type to the one
+        matching its INFO. The installed model is not killed by `clear_tts_model()`.
+        Passing None uninstalls it and restores the previous model type.
+        """
+        if model is not None:
+            if Tts._installed_model is None:
+                Tts._type_before_install = getattr(Tts, "_type", None)
+            Tts._installed_model = model
+            Tts._type = next(item for item in TtsModelType if item.value is model.INFO)
+            return
+
+        if Tts._installed_model is None:
+            return
+        Tts._installed_model = None
+        if Tts._type_before_install is None:
+            del Tts._type
+        else:
+            Tts._type = Tts._type_before_install
+        Tts._type_before_install = None
+
     @staticmethod
     def get_available_device_types() -> list[DeviceType]:
         """Gets available torch device types in preferred inference order."""
@@ -1,6 +1,14 @@
+from __future__ import annotations
+
 from tts_audiobook_tool.tts_models.tts_base_model import TtsBaseModel
 from tts_audiobook_tool.tts_models.tts_model_type import TtsModelType
 
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from tts_audiobook_tool.project import Project
+else:
+    Project = object
+
 
 class FishS2BaseModel(TtsBaseModel):
 
@@ -20,3 +28,7 @@ class FishS2BaseModel(TtsBaseModel):
 
     def clear_voice_clone(self) -> None:
         ...
+
+    @classmethod
+    def uses_rolling_continuation(cls, project: Project) -> bool:
+        return project.fish_s2_rolling_cont > 0
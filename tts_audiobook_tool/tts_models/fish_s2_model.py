@@ -2,6 +2,7 @@ import importlib
 from pathlib import Path
 import random
 import sys
+import numpy as np
 import torch
 import torchaudio
 import huggingface_hub
@@ -12,6 +13,7 @@ from tts_audiobook_tool.app_types import DeviceType, Sound, StreamChunkCallback,
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.tts_models.fish_s2_base_model import FishS2BaseModel
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 from tts_audiobook_tool.project_support.project_voice_util import ProjectVoiceUtil
 
@@ -47,6 +49,7 @@ class FishS2Model(FishS2BaseModel):
     # Prompt tokens are tiny (a few KB of int codes) and are CPU-cloned, so
     # several voices can be retained at once.
     SUPPORTS_MULTIPLE_VOICE_CLONES = True
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
 
     def __init__(self, device: DeviceType, compile_enabled: bool):
 
@@ -147,6 +150,18 @@ class FishS2Model(FishS2BaseModel):
             prompt_tokens=prompt_tokens.detach().cpu().clone(),
         )
 
+    def _voice_clone_to_arrays(self, value: VoiceClone) -> dict[str, np.ndarray]:
+        return VoiceCloneDiskCache.tensors_to_arrays({"prompt_tokens": value.prompt_tokens})
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, np.ndarray], source_path: str, transcript: str) -> VoiceClone:
+        tensors = VoiceCloneDiskCache.arrays_to_tensors(arrays)
+        return VoiceClone(
+            source_path=source_path,
+            transcribed_text=transcript,
+            audios=None,
+            prompt_tokens=tensors["prompt_tokens"],
+        )
+
     def clear_voice_clone(self) -> None:
         if self._voice_info is not None:
             self.clear_continuation()
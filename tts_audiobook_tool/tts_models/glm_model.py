@@ -2,6 +2,7 @@ import logging
 import os
 import random
 from typing import Any
+import numpy as np
 import torch
 
 from glm_tts.cosyvoice.cli.frontend import TTSFrontEnd, SpeechTokenizer, TextFrontEnd # type: ignore
@@ -17,6 +18,7 @@ from tts_audiobook_tool.app_types import DeviceType, Sound, StreamChunkCallback,
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.tts_models.glm_base_model import GlmBaseModel
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import make_error_string, printt
 from tts_audiobook_tool.project_support.project_voice_util import ProjectVoiceUtil
 
@@ -48,6 +50,7 @@ class GlmModel(GlmBaseModel):
     # The prepared voice prompt (speech token, mel features, speaker
     # embedding) is CPU-cloned, so several voices can be retained at once.
     SUPPORTS_MULTIPLE_VOICE_CLONES = True
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
 
     def __init__(self, device: DeviceType, sample_rate: int, use_phoneme: bool=False):
 
@@ -131,6 +134,31 @@ class GlmModel(GlmBaseModel):
             embedding=self.frontend._extract_spk_embedding(source_path).detach().cpu().clone(),
         )
 
+    def _get_voice_clone_disk_cache_key(self) -> str:
+        # Mel features depend on the sample rate
+        return f"{super()._get_voice_clone_disk_cache_key()}|{self.sample_rate}|{self.use_phoneme}"
+
+    def _voice_clone_to_arrays(self, value: GlmVoiceClone) -> dict[str, np.ndarray]:
+        arrays = VoiceCloneDiskCache.tensors_to_arrays({
+            "prompt_text_token": value.prompt_text_token,
+            "prompt_speech_token": value.prompt_speech_token,
+            "speech_feat": value.speech_feat,
+            "embedding": value.embedding,
+        })
+        arrays["prompt_text"] = np.array(value.prompt_text)
+        return arrays
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, np.ndarray], source_path: str, transcript: str) -> GlmVoiceClone:
+        tensors = VoiceCloneDiskCache.arrays_to_tensors(arrays)
+        return GlmVoiceClone(
+            source_path=source_path,
+            prompt_text=str(arrays["prompt_text"]),
+            prompt_text_token=tensors["prompt_text_token"],
+            prompt_speech_token=tensors["prompt_speech_token"],
+            speech_feat=tensors["speech_feat"],
+            embedding=tensors["embedding"],
+        )
+
     def generate_using_project(
             self, 
             project: Project, 
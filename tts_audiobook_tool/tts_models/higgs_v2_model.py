@@ -30,6 +30,7 @@ from tts_audiobook_tool.app_types import DeviceType, Sound, StreamChunkCallback,
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.tts_models.higgs_v2_base_model import HiggsV2BaseModel
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 from tts_audiobook_tool.project_support.project_voice_util import ProjectVoiceUtil
 
@@ -80,6 +81,7 @@ class HiggsV2Model(HiggsV2BaseModel):
     # Encoded audio tokens are CPU-cloned, so several voices can be
     # retained at once.
     SUPPORTS_MULTIPLE_VOICE_CLONES = True
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
 
     def __init__(self, device: DeviceType):
 
@@ -132,6 +134,12 @@ class HiggsV2Model(HiggsV2BaseModel):
         """
         return self.audio_tokenizer.encode(source_path).detach().cpu().clone()
 
+    def _voice_clone_to_arrays(self, value: Any) -> dict[str, ndarray]:
+        return VoiceCloneDiskCache.tensors_to_arrays({"audio_tokens": value})
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, ndarray], source_path: str, transcript: str) -> Any:
+        return VoiceCloneDiskCache.arrays_to_tensors(arrays)["audio_tokens"]
+
     def generate_using_project(
             self, 
             project: Project, 
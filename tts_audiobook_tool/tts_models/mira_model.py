@@ -1,5 +1,6 @@
 import random
 from itertools import cycle
+import numpy as np
 from tts_audiobook_tool.tts_models.tts_model_type import TtsModelType
 from tts_audiobook_tool import app_support
 from tts_audiobook_tool.app_types import Sound, StreamChunkCallback, StreamEndCallback
@@ -18,6 +19,7 @@ class MiraModel(MiraBaseModel):
     # Context tokens are a small string, so several voices can be
     # retained at once.
     SUPPORTS_MULTIPLE_VOICE_CLONES = True
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
 
     def __init__(self):
         self.mira_tts = MiraTTS('YatharthS/MiraTTS')
@@ -35,6 +37,12 @@ class MiraModel(MiraBaseModel):
         """
         return self.mira_tts.encode_audio(source_path)
 
+    def _voice_clone_to_arrays(self, value: str) -> dict[str, np.ndarray]:
+        return {"context_tokens": np.array(value)}
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, np.ndarray], source_path: str, transcript: str) -> str:
+        return str(arrays["context_tokens"])
+
     def clear_voice_clone(self) -> None:
         self.context_tokens = None
         self.clear_voice_clone_cache()
@@ -90,6 +90,10 @@ class MossBaseModel(TtsBaseModel):
 
         return MossConfigs.get_by_target(project.moss_target) == MossConfigs.LOCAL
 
+    @classmethod
+    def uses_rolling_continuation(cls, project: Project) -> bool:
+        return project.moss_rolling_cont > 0
+
     @classmethod
     def get_blocking_issues(
             cls, project: Project, instance: TtsBaseModel | None
@@ -14,6 +14,7 @@ from tts_audiobook_tool.app_types import DeviceType, Sound, StreamChunkCallback,
 from tts_audiobook_tool.constants import SEED_MAX
 from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.tts_models.moss_base_model import MossArchType, MossConfigs, MossBaseModel
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 
 from transformers import AutoModel, AutoProcessor  # type: ignore
@@ -25,6 +26,7 @@ class MossModel(MossBaseModel):
     # Audio codes are small (T x NQ int codes) and CPU-retained, so several
     # voices can be kept at once.
     SUPPORTS_MULTIPLE_VOICE_CLONES = True
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
 
     def __init__(self, device: DeviceType, model_target: str = MossConfigs.get_default_repo_id()):
 
@@ -307,6 +309,15 @@ class MossModel(MossBaseModel):
         voice_codes = self.processor.encode_audios_from_path([source_path])[0]
         return voice_codes.detach().cpu().clone()
 
+    def _get_voice_clone_disk_cache_key(self) -> str:
+        return f"{super()._get_voice_clone_disk_cache_key()}|{self.model_target}"
+
+    def _voice_clone_to_arrays(self, value: torch.Tensor) -> dict[str, np.ndarray]:
+        return VoiceCloneDiskCache.tensors_to_arrays({"voice_codes": value})
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, np.ndarray], source_path: str, transcript: str) -> torch.Tensor:
+        return VoiceCloneDiskCache.arrays_to_tensors(arrays)["voice_codes"]
+
     def generate_using_project(
             self,
             project: Project,
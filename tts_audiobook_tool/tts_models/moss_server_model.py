@@ -30,7 +30,7 @@ class MossServerModel(MossServerBaseModel):
             on_stream_end: StreamEndCallback | None = None,
             voice_selection_index: int = 0,
             print_generation_request: bool = False,
-    ) -> list[Sound] | str:
+    ) -> list[Sound | str] | str:
        
         voice_file_name, voice_transcript = ProjectVoiceUtil.current_voice_reference_pair(
             project, TtsModelType.MOSS_SERVER, voice_selection_index
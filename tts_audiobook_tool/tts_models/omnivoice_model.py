@@ -13,6 +13,7 @@ from tts_audiobook_tool.app_types import DeviceType, Sound, StreamChunkCallback,
 from tts_audiobook_tool.l import L
 from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.tts_models.omnivoice_base_model import OmniVoiceBaseModel
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 from tts_audiobook_tool.project_support.project_voice_util import ProjectVoiceUtil
 
@@ -29,6 +30,7 @@ class OmniVoiceModel(OmniVoiceBaseModel):
     # Voice clone prompts are small (C x T int codes) and CPU-retained, so
     # several voices can be kept at once.
     SUPPORTS_MULTIPLE_VOICE_CLONES = True
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
 
     def __init__(self, model_target: str, device: DeviceType):
 
@@ -158,6 +160,22 @@ class OmniVoiceModel(OmniVoiceBaseModel):
             ref_rms=prompt.ref_rms,
         )
 
+    def _get_voice_clone_disk_cache_key(self) -> str:
+        return f"{super()._get_voice_clone_disk_cache_key()}|{self._model_target}"
+
+    def _voice_clone_to_arrays(self, value: VoiceClonePrompt) -> dict[str, np.ndarray]:
+        arrays = VoiceCloneDiskCache.tensors_to_arrays({"ref_audio_tokens": value.ref_audio_tokens})
+        arrays["ref_text"] = np.array(value.ref_text or "")
+        arrays["ref_rms"] = np.array(float(value.ref_rms))
+        return arrays
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, np.ndarray], source_path: str, transcript: str) -> VoiceClonePrompt:
+        return VoiceClonePrompt(
+            ref_audio_tokens=VoiceCloneDiskCache.arrays_to_tensors(arrays)["ref_audio_tokens"],
+            ref_text=str(arrays["ref_text"]),
+            ref_rms=float(arrays["ref_rms"]),
+        )
+
     # ── Generation modes ──────────────────────────────────────────────────
 
     def _generate_voice_clone(
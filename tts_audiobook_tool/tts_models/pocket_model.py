@@ -10,6 +10,7 @@ from tts_audiobook_tool.app_types import DeviceType, Sound, StreamChunkCallback,
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.tts_models.pocket_base_model import PocketBaseModel
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 
 import torch
@@ -32,10 +33,12 @@ class PocketModel(PocketBaseModel):
     # most recently prepared voice is retained (the base cache evicts the
     # previous one when a different voice is selected).
     SUPPORTS_MULTIPLE_VOICE_CLONES = False
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
 
     def __init__(self, device: DeviceType, language: str = ""):
 
         # Rem, "language" dictates model
+        self._language = language
         self.model: TTSModel | None = TTSModel.load_model(language=language or None)
         assert self.model
 
@@ -105,6 +108,25 @@ class PocketModel(PocketBaseModel):
                 module_state[k] = v.to(device)
         return voice_state
 
+    def _get_voice_clone_disk_cache_key(self) -> str:
+        return f"{super()._get_voice_clone_disk_cache_key()}|{self._language}"
+
+    def _voice_clone_to_arrays(self, value: Any) -> dict[str, np.ndarray]:
+        return VoiceCloneDiskCache.tensors_to_arrays({
+            f"{module_name}{VOICE_STATE_KEY_SEPARATOR}{k}": v
+            for module_name, module_state in value.items()
+            for k, v in module_state.items()
+        })
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, np.ndarray], source_path: str, transcript: str) -> Any:
+        assert self.model
+        device = self.model.device
+        voice_state: dict[str, dict[str, Any]] = {}
+        for name, tensor in VoiceCloneDiskCache.arrays_to_tensors(arrays).items():
+            module_name, k = name.split(VOICE_STATE_KEY_SEPARATOR, 1)
+            voice_state.setdefault(module_name, {})[k] = tensor.to(device)
+        return voice_state
+
     def get_voice_clone_access_error_for_path(self, voice_path: str) -> str:
         try:
             assert self.model
@@ -212,3 +234,8 @@ class PocketModel(PocketBaseModel):
             return sounds
         except Exception as e:
             return make_error_string(e)
+
+# ---
+
+# Joins module name and key when flattening the voice state for the disk cache
+VOICE_STATE_KEY_SEPARATOR = "|"
@@ -114,6 +114,10 @@ class Qwen3BaseModel(TtsBaseModel):
     
     # ---
 
+    @classmethod
+    def uses_rolling_continuation(cls, project: Project) -> bool:
+        return project.qwen3_rolling_cont > 0
+
     @classmethod
     def get_blocking_issues(
             cls, project: Project, instance: TtsBaseModel | None
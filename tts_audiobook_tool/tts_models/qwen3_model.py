@@ -1,6 +1,7 @@
 import random
 from typing import cast
 
+import numpy as np
 import torch
 
 from qwen_tts import Qwen3TTSModel # type: ignore
@@ -11,6 +12,7 @@ from tts_audiobook_tool import app_support
 from tts_audiobook_tool.app_types import DeviceType, Sound, StreamChunkCallback, StreamEndCallback
 from tts_audiobook_tool.project import Project
 from tts_audiobook_tool.tts_models.qwen3_base_model import Qwen3BaseModel
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 from tts_audiobook_tool.project_support.project_voice_util import ProjectVoiceUtil
 
@@ -20,6 +22,7 @@ class Qwen3Model(Qwen3BaseModel):
     """
 
     SUPPORTS_MULTIPLE_VOICE_CLONES = True
+    VOICE_CLONE_DISK_CACHE_VERSION = 1
 
     def __init__(self, model_target: str, device: DeviceType): 
         
@@ -157,6 +160,29 @@ class Qwen3Model(Qwen3BaseModel):
             ref_text=prompt.ref_text,
         )
 
+    def _get_voice_clone_disk_cache_key(self) -> str:
+        return f"{super()._get_voice_clone_disk_cache_key()}|{self._model_target}"
+
+    def _voice_clone_to_arrays(self, value: VoiceClonePromptItem) -> dict[str, np.ndarray]:
+        arrays = VoiceCloneDiskCache.tensors_to_arrays({
+            "ref_code": value.ref_code,
+            "ref_spk_embedding": value.ref_spk_embedding,
+        })
+        arrays["x_vector_only_mode"] = np.array(bool(value.x_vector_only_mode))
+        arrays["icl_mode"] = np.array(bool(value.icl_mode))
+        arrays["ref_text"] = np.array(value.ref_text or "")
+        return arrays
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, np.ndarray], source_path: str, transcript: str) -> VoiceClonePromptItem:
+        tensors = VoiceCloneDiskCache.arrays_to_tensors(arrays)
+        return VoiceClonePromptItem(
+            ref_code=tensors.get("ref_code"),
+            ref_spk_embedding=tensors["ref_spk_embedding"],
+            x_vector_only_mode=bool(arrays["x_vector_only_mode"]),
+            icl_mode=bool(arrays["icl_mode"]),
+            ref_text=str(arrays["ref_text"]) or None,
+        )
+
     def generate_using_project(
             self, 
             project: Project, 
@@ -26,7 +26,7 @@ class Qwen3ServerModel(Qwen3ServerBaseModel):
             on_stream_end: StreamEndCallback | None = None,
             voice_selection_index: int = 0,
             print_generation_request: bool = False,
-    ) -> list[Sound] | str:
+    ) -> list[Sound | str] | str:
 
         voice_file_name, voice_transcript = ProjectVoiceUtil.current_voice_reference_pair(
             project, TtsModelType.QWEN3TTS_SERVER, voice_selection_index
@@ -1,11 +1,15 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 import os
-from typing import Any, Callable, TYPE_CHECKING
+from typing import Any, Callable, Sequence, TYPE_CHECKING
+
+import numpy as np
 
 from tts_audiobook_tool.app_types import DeviceType, Sound, StreamChunkCallback, StreamEndCallback, Strictness, VoiceDisplayInfo
 from tts_audiobook_tool.app_types import ReadinessIssue
+from tts_audiobook_tool.l import L
 from tts_audiobook_tool.tts_models.tts_model_type import TtsModelSpec, TtsModelType
+from tts_audiobook_tool.tts_models.voice_clone_disk_cache import VoiceCloneDiskCache
 from tts_audiobook_tool.util import *
 from tts_audiobook_tool.constants import *
 from tts_audiobook_tool.project_support.project_voice_util import ProjectVoiceUtil
@@ -46,6 +50,11 @@ class TtsBaseModel(ABC):
     # The default cache still avoids repeated preparation for the current voice.
     SUPPORTS_MULTIPLE_VOICE_CLONES = False
 
+    # Subclasses whose prepared clones can be persisted (see `VoiceCloneDiskCache`)
+    # set this to 1 or higher and implement `_voice_clone_to_arrays()` and
+    # `_voice_clone_from_arrays()`. Bump it when the prepared data changes.
+    VOICE_CLONE_DISK_CACHE_VERSION = 0
+
     # Optional persistent callback for streamed audio chunks
     stream_chunk_callback: StreamChunkCallback | None = None
     # Optional persistent callback invoked when a streaming generation finishes
@@ -96,7 +105,12 @@ class TtsBaseModel(ABC):
             return cache[key]
 
         # Do not modify the existing cache unless preparation succeeds.
-        value = factory()
+        entry_path = self._get_voice_clone_disk_cache_path(source_path, transcript)
+        value = self._load_voice_clone_from_disk(entry_path, source_path, transcript) if entry_path else None
+        if value is None:
+            value = factory()
+            if entry_path:
+                self._save_voice_clone_to_disk(entry_path, value)
 
         if self.SUPPORTS_MULTIPLE_VOICE_CLONES:
             # A changed transcript or file revision supersedes older prepared
@@ -117,6 +131,62 @@ class TtsBaseModel(ABC):
         if cache is not None:
             cache.clear()
 
+    def _get_voice_clone_disk_cache_key(self) -> str:
+        """
+        Identifies everything about the model that affects its prepared voice clones.
+        Subclasses which can load different checkpoints should add the checkpoint.
+        """
+        return f"{self.INFO.id}|v{self.VOICE_CLONE_DISK_CACHE_VERSION}"
+
+    def _voice_clone_to_arrays(self, value: Any) -> dict[str, np.ndarray]:
+        """
+        Converts a value made by the model's voice clone factory to named numpy arrays,
+        for `VoiceCloneDiskCache`. Required when `VOICE_CLONE_DISK_CACHE_VERSION` is set.
+        """
+        raise NotImplementedError
+
+    def _voice_clone_from_arrays(self, arrays: dict[str, np.ndarray], source_path: str, transcript: str) -> Any:
+        """
+        Inverse of `_voice_clone_to_arrays()`
+        """
+        raise NotImplementedError
+
+    def _get_voice_clone_disk_cache_path(self, source_path: str, transcript: str) -> str:
+        """
+        Returns the disk cache entry path for the voice clone, or empty string if
+        the disk cache is disabled or not supported by the model
+        """
+        if not VoiceCloneDiskCache.is_enabled() or self.VOICE_CLONE_DISK_CACHE_VERSION <= 0:
+            return ""
+        entry_path, err = VoiceCloneDiskCache.get_entry_path(
+            self._get_voice_clone_disk_cache_key(), source_path, transcript
+        )
+        if err:
+            L.w(f"Voice clone disk cache: {err}")
+        return entry_path
+
+    def _load_voice_clone_from_disk(self, entry_path: str, source_path: str, transcript: str) -> Any:
+        """ Returns cached voice clone or None """
+        arrays = VoiceCloneDiskCache.load(entry_path)
+        if arrays is None:
+            return None
+        try:
+            return self._voice_clone_from_arrays(arrays, source_path, transcript)
+        except Exception as e:
+            L.w(f"Couldn't restore voice clone from {entry_path}: {make_error_string(e)}")
+            delete_silently(entry_path)
+            return None
+
+    def _save_voice_clone_to_disk(self, entry_path: str, value: Any) -> None:
+        try:
+            arrays = self._voice_clone_to_arrays(value)
+        except Exception as e:
+            L.w(f"Couldn't serialize voice clone: {make_error_string(e)}")
+            return
+        err = VoiceCloneDiskCache.save(arrays, entry_path)
+        if err:
+            L.w(f"Couldn't save voice clone cache entry {entry_path}: {err}")
+
     @abstractmethod
     def kill(self) -> None:
         """
@@ -134,7 +204,7 @@ class TtsBaseModel(ABC):
             on_stream_chunk: StreamChunkCallback | None = None,
             on_stream_end: StreamEndCallback | None = None,
             voice_selection_index: int = 0,
-    ) -> list[Sound] | str:
+    ) -> Sequence[Sound | str] | str:
         """
         Generates Sound/s using the relevant TTS model attributes in the `project` object.
         Typically delegates-to/wraps a more "parameter-specific" concrete method.
@@ -153,6 +223,9 @@ class TtsBaseModel(ABC):
         Returns:
             A list of Sounds (one per prompt), or error string
             Sound.data must be of np.dtype("float32")
+            Implementations that generate prompts independently of each other may put an
+            error string in place of a Sound for an individual failed prompt, so that
+            only that prompt needs to be retried
 
         """
         ...
@@ -354,6 +427,15 @@ class TtsBaseModel(ABC):
         """
         return False
 
+    @classmethod
+    def uses_rolling_continuation(cls, project: Project) -> bool:
+        """
+        Does the project's configuration make each generation depend on the
+        continuation context cached by the previous one (which gets cleared
+        when that previous generation fails validation).
+        """
+        return False
+
     @classmethod
     def can_hallucinate_music(cls, project: Project, instance: TtsBaseModel | None=None) -> bool:
         """
@@ -0,0 +1,164 @@
+import os
+import time
+from typing import Any, cast
+
+import numpy as np
+
+from tts_audiobook_tool.app_support import app_hashing
+from tts_audiobook_tool.l import L
+from tts_audiobook_tool.util import *
+
+
+class VoiceCloneDiskCache:
+    """
+    Opt-in on-disk cache of prepared voice clones (speaker embeddings, codec tokens, etc),
+    so that reference encoding doesn't need to be re-run on every app launch, or every time
+    a model that only retains one clone in memory alternates between voices.
+
+    Entries are npz files of named numpy arrays. Converting a model's clone object to and
+    from arrays is the concrete model's job (see `TtsBaseModel._voice_clone_to_arrays()`).
+
+    Entries are keyed by the model type, the model's clone format version and model
+    identity, and the hash of the reference file's contents plus its transcript.
+    They are touched on every hit and pruned by age.
+    """
+
+    _enabled: bool = False
+    _dir: str = ""
+
+    # Entries not used for this long get deleted by `prune()`
+    MAX_AGE_SECONDS = 60 * 60 * 24 * 30
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return VoiceCloneDiskCache._enabled
+
+    @staticmethod
+    def set_enabled(value: bool) -> None:
+        VoiceCloneDiskCache._enabled = value
+
+    @staticmethod
+    def get_dir() -> str:
+        if VoiceCloneDiskCache._dir:
+            return VoiceCloneDiskCache._dir
+        from tts_audiobook_tool.app_support import app_paths
+        return app_paths.get_voice_clone_cache_dir()
+
+    @staticmethod
+    def set_dir(value: str) -> None:
+        """ Overrides the default cache directory (empty string = default) """
+        VoiceCloneDiskCache._dir = value
+
+    @staticmethod
+    def get_entry_path(model_key: str, source_path: str, transcript: str) -> tuple[str, str]:
+        """
+        Returns cache entry path for the given model and reference file, and error string.
+        The entry may or may not exist.
+
+        :param model_key: Identifies the model type and anything else about the model that
+            affects the prepared clone (eg, format version, checkpoint)
+        """
+        source_hash, err = app_hashing.calc_hash_file(source_path)
+        if err:
+            return "", err
+        key = app_hashing.calc_hash_string(f"{model_key}|{source_hash}|{transcript}")
+        return os.path.join(VoiceCloneDiskCache.get_dir(), f"{key}.npz"), ""
+
+    @staticmethod
+    def load(entry_path: str) -> dict[str, np.ndarray] | None:
+        """
+        Returns cached arrays, or None if not cached (or if unreadable).
+        Marks the entry as recently used.
+        """
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with np.load(entry_path, allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+        except Exception as e:
+            L.w(f"Couldn't read voice clone cache entry {entry_path}: {make_error_string(e)}")
+            delete_silently(entry_path)
+            return None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return arrays
+
+    @staticmethod
+    def save(arrays: dict[str, np.ndarray], entry_path: str) -> str:
+        """
+        Writes entry atomically. Returns error string on fail.
+        """
+        temp_path = entry_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                np.savez(f, **cast(dict[str, Any], arrays))
+            os.replace(temp_path, entry_path)
+            return ""
+        except Exception as e:
+            delete_silently(temp_path)
+            return make_error_string(e)
+
+    @staticmethod
+    def prune(max_age_seconds: float = MAX_AGE_SECONDS) -> int:
+        """
+        Deletes entries which haven't been used within `max_age_seconds`,
+        along with any leftover temp files. Returns number of files deleted.
+        """
+        cache_dir = VoiceCloneDiskCache.get_dir()
+        if not cache_dir or not os.path.isdir(cache_dir):
+            return 0
+        cutoff = time.time() - max_age_seconds
+        num_deleted = 0
+        for entry in os.scandir(cache_dir):
+            if not entry.is_file():
+                continue
+            try:
+                is_stale = entry.name.endswith(".tmp") or entry.stat().st_mtime < cutoff
+            except OSError:
+                continue
+            if is_stale:
+                delete_silently(entry.path)
+                num_deleted += 1
+        return num_deleted
+
+    @staticmethod
+    def tensors_to_arrays(tensors: dict[str, Any]) -> dict[str, np.ndarray]:
+        """
+        Converts named torch tensors (None values are skipped) to arrays for `save()`,
+        recording each tensor's dtype so that `arrays_to_tensors()` can restore it
+        (numpy has no bfloat16).
+        """
+        import torch
+        arrays: dict[str, np.ndarray] = {}
+        for name, tensor in tensors.items():
+            if tensor is None:
+                continue
+            tensor = tensor.detach().cpu()
+            arrays[name + DTYPE_SUFFIX] = np.array(str(tensor.dtype).removeprefix("torch."))
+            if tensor.dtype == torch.bfloat16:
+                tensor = tensor.to(torch.float32)
+            arrays[name] = tensor.numpy()
+        return arrays
+
+    @staticmethod
+    def arrays_to_tensors(arrays: dict[str, np.ndarray]) -> dict[str, Any]:
+        """
+        Inverse of `tensors_to_arrays()`. Tensors are on the CPU.
+        Arrays not written by `tensors_to_arrays()` are ignored.
+        """
+        import torch
+        tensors: dict[str, Any] = {}
+        for key, value in arrays.items():
+            if not key.endswith(DTYPE_SUFFIX):
+                continue
+            name = key.removesuffix(DTYPE_SUFFIX)
+            dtype = getattr(torch, str(value))
+            tensors[name] = torch.from_numpy(np.array(arrays[name])).to(dtype)
+        return tensors
+
+# ---
+
+DTYPE_SUFFIX = ".dtype"
@@ -23,7 +23,7 @@ class Zonos2ServerModel(Zonos2ServerBaseModel):
             on_stream_end: StreamEndCallback | None = None,
             voice_selection_index: int = 0,
             print_generation_request: bool = False,
-    ) -> list[Sound] | str:
+    ) -> list[Sound | str] | str:
         """
         SGL-Omni notes/limitations circa 2026-08:
 
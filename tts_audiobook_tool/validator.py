@@ -1,7 +1,8 @@
 from __future__ import annotations
 import math
 from dataclasses import dataclass
-from typing import Optional
+
+import numpy as np
 
 from tts_audiobook_tool.app_types import Sound, Strictness, Word
 from tts_audiobook_tool.model_manager import ModelManager
@@ -24,6 +25,24 @@ class WordErrorAlignmentStep:
     transcript_text: str
 
 
+# Word error alignment action codes, and their (name, source word count, transcript word count)
+_MATCH_DIRECT = 1
+_MATCH_HOMOPHONE = 2
+_UNCOMMON_PASS_1 = 3
+_MISMATCH_SUB = 4
+_UNCOMMON_PASS_2 = 5
+_SKIP_SOURCE = 6
+_SKIP_TRANSCRIPT = 7
+_ALIGNMENT_ACTIONS: dict[int, tuple[str, int, int]] = {
+    _MATCH_DIRECT: ("match_direct", 1, 1),
+    _MATCH_HOMOPHONE: ("match_homophone", 1, 1),
+    _UNCOMMON_PASS_1: ("uncommon_pass_1", 1, 1),
+    _MISMATCH_SUB: ("mismatch_sub", 1, 1),
+    _UNCOMMON_PASS_2: ("uncommon_pass_2", 1, 2),
+    _SKIP_SOURCE: ("skip_source", 1, 0),
+    _SKIP_TRANSCRIPT: ("skip_transcript", 0, 1),
+}
+
 from tts_audiobook_tool.transcriber import Transcriber
 
 class Validator:
@@ -403,91 +422,92 @@ class Validator:
         keeping get_word_errors() backward-compatible.
         """
 
-        def is_match(a: str, b: str) -> bool:
-            return (a == b) or sounds_the_same(a, b)
-
-        def sounds_the_same(a: str, b: str) -> bool:
-            return TextNormalizer.sounds_the_same_en(a, b) if language_code == "en" else False
-
-        def is_uncommon_word(word: str) -> bool:
-            return not Whitelist().has(word) if Whitelist.supports_language(language_code) else False
-
         source_words = normalized_source.split()
         transcript_words = normalized_transcript.split()
         n = len(source_words)
         m = len(transcript_words)
 
-        # dp[i][j] stores min failures to align source[:i] and transcript[:j]
-        dp: list[list[float]] = [[float('inf')] * (m + 1) for _ in range(n + 1)]
-        # parent[i][j] stores (prev_i, prev_j, action_description)
-        parent: list[list[Optional[tuple[int, int, str]]]] = [[None] * (m + 1) for _ in range(n + 1)]
-        
-        dp[0][0] = 0
+        # Word comparisons are done up front, once per distinct word,
+        # rather than once per DP cell
 
-        for i in range(n + 1):
-            for j in range(m + 1):
-                if i == 0 and j == 0:
-                    continue
-                
+        vocabulary: dict[str, int] = {}
+        source_ids = np.array([vocabulary.setdefault(word, len(vocabulary)) for word in source_words], dtype=np.int32)
+        transcript_ids = np.array([vocabulary.setdefault(word, len(vocabulary)) for word in transcript_words], dtype=np.int32)
+        is_direct = source_ids[:, None] == transcript_ids[None, :]
+
+        if language_code == "en":
+            code_ids: dict[str, int] = {}
+            word_code_ids = np.array(
+                [code_ids.setdefault(TextNormalizer.get_phonetic_code_en(word), len(code_ids)) for word in vocabulary],
+                dtype=np.int32
+            )
+            is_homophone = word_code_ids[source_ids][:, None] == word_code_ids[transcript_ids][None, :]
+        else:
+            is_homophone = np.zeros((n, m), dtype=bool)
+
+        if Whitelist.supports_language(language_code):
+            whitelist = Whitelist()
+            is_uncommon_by_word = {word: not whitelist.has(word) for word in set(source_words)}
+            is_uncommon = [is_uncommon_by_word[word] for word in source_words]
+        else:
+            is_uncommon = [False] * n
+
+        # dp row i stores min failures to align source[:i] and transcript[:j]
+        # actions[i][j] stores the action taken to reach (i, j)
+        # Rows are computed one at a time, vectorized over j
+        actions = np.zeros((n + 1, m + 1), dtype=np.int8)
+        actions[0, 1:] = _SKIP_TRANSCRIPT
+        columns = np.arange(m + 1, dtype=np.int32)
+        dp = columns.copy()
+
+        for i in range(1, n + 1):
+            row = np.empty(m + 1, dtype=np.int32)
+            row_actions = np.empty(m + 1, dtype=np.int8)
+            row[0] = dp[0] + 1
+            row_actions[0] = _SKIP_SOURCE
+
+            if m > 0:
                 # 1. Match or Substitution (Source matches Transcript)
-                if i > 0 and j > 0:
-                    s_word = source_words[i-1]
-                    t_word = transcript_words[j-1]
-                    
-                    matches = is_match(s_word, t_word)
-                    is_uncommon = is_uncommon_word(s_word)
-                    
-                    if matches:
-                        cost = dp[i-1][j-1] + 0
-                        if cost < dp[i][j]:
-                            dp[i][j] = cost
-                            parent[i][j] = (i-1, j-1, "match_direct" if s_word == t_word else "match_homophone")
-                    elif is_uncommon:
-                        # Free pass 1-to-1
-                        cost = dp[i-1][j-1] + 0
-                        if cost < dp[i][j]:
-                            dp[i][j] = cost
-                            parent[i][j] = (i-1, j-1, "uncommon_pass_1")
-                    else:
-                        # Substitution (Mismatch) -> Cost 1
-                        cost = dp[i-1][j-1] + 1
-                        if cost < dp[i][j]:
-                            dp[i][j] = cost
-                            parent[i][j] = (i-1, j-1, "mismatch_sub")
+                # Mismatches get a free pass 1-to-1 if source word is uncommon, otherwise cost 1
+                mismatch_action = _UNCOMMON_PASS_1 if is_uncommon[i-1] else _MISMATCH_SUB
+                diagonal_actions = np.where(
+                    is_direct[i-1],
+                    _MATCH_DIRECT,
+                    np.where(is_homophone[i-1], _MATCH_HOMOPHONE, mismatch_action)
+                ).astype(np.int8)
+                costs = dp[:-1] + (diagonal_actions == _MISMATCH_SUB)
+                costs_actions = diagonal_actions
 
                 # 2. Uncommon Match 1-to-2
-                if i > 0 and j > 1:
-                    s_word = source_words[i-1]
-                    if is_uncommon_word(s_word):
-                        cost = dp[i-1][j-2] + 0
-                        if cost < dp[i][j]:
-                            dp[i][j] = cost
-                            parent[i][j] = (i-1, j-2, "uncommon_pass_2")
+                if is_uncommon[i-1] and m > 1:
+                    is_better = dp[:-2] < costs[1:]
+                    costs[1:] = np.where(is_better, dp[:-2], costs[1:])
+                    costs_actions[1:] = np.where(is_better, _UNCOMMON_PASS_2, costs_actions[1:])
 
                 # 3. Skip Source (Deletion) -> Cost 1
-                if i > 0:
-                    cost = dp[i-1][j] + 1
-                    if cost < dp[i][j]:
-                        dp[i][j] = cost
-                        parent[i][j] = (i-1, j, "skip_source")
-
-                # 4. Skip Transcript (Insertion) -> Cost 1
-                if j > 0:
-                    cost = dp[i][j-1] + 1
-                    if cost < dp[i][j]:
-                        dp[i][j] = cost
-                        parent[i][j] = (i, j-1, "skip_transcript")
+                is_better = dp[1:] + 1 < costs
+                costs = np.where(is_better, dp[1:] + 1, costs)
+                costs_actions = np.where(is_better, _SKIP_SOURCE, costs_actions)
+
+                row[1:] = costs
+                row_actions[1:] = costs_actions
+
+            # 4. Skip Transcript (Insertion) -> Cost 1
+            # Depends on the row's own previous column, ie, row[j] = min(row[j], row[j-1] + 1),
+            # which resolves to a running minimum
+            relaxed = np.minimum.accumulate(row - columns) + columns
+            row_actions[relaxed < row] = _SKIP_TRANSCRIPT
+            actions[i] = row_actions
+            dp = relaxed
 
         # Reconstruct Path
         path: list[WordErrorAlignmentStep] = []
         curr_i, curr_j = n, m
 
         while curr_i > 0 or curr_j > 0:
-            node = parent[curr_i][curr_j]
-            if node is None:
-                # Should not happen if reachable
-                break
-            prev_i, prev_j, action = node
+            action_code = int(actions[curr_i, curr_j])
+            action, delta_i, delta_j = _ALIGNMENT_ACTIONS[action_code]
+            prev_i, prev_j = curr_i - delta_i, curr_j - delta_j
 
             s_sub = source_words[prev_i:curr_i]
             t_sub = transcript_words[prev_j:curr_j]